@@ -0,0 +1,575 @@
+"""Push-based lead intake — a small local HTTP service.
+
+An Apps Script ``onChange`` trigger (or any export hook) POSTs a lead as
+JSON; the service answers immediately and, within a short batching window,
+appends the queued leads to the sheet and sends each one the Stage 0 email.
+Time to first touch drops from one scheduler interval to a few seconds,
+without any extra polling of the sheet.
+
+    POST /leads   {"name": "...", "email": "...", "phone": "..."}
+                  → 202 {"status": "queued"} | 200 {"status": "duplicate"}
+    GET  /healthz → 200 {"status": "ok", "queued": N}
+
+Idempotency matches the scheduled job:
+
+- an email already present in the input tab is never appended or sent
+  again (the scheduled job owns it);
+- an existing status row is honoured through is_eligible_for_send();
+- the status row is created *with* a ``CLAIMED intake…`` lease (see
+  src/stage0/sharding.py) and before the input row, so a concurrently
+  running scheduled job never sees the lead as eligible.  ``SENDING`` is
+  written right before SMTP.  A claim that expires before its send, or
+  whose send fails before SMTP, is released at once; on startup and every
+  recover_seconds after, expired intake claims left behind (e.g. by a
+  failed batch) are released to the scheduled job and interrupted sends
+  are parked for the operator.
+
+Sends are paced like the scheduled job (SEND_THROTTLE_SECONDS between two
+SMTP sessions), so a burst of pushed leads does not trip provider rate
+limits.  A batch that sent anything clears the follow-up schedule
+(STAGE0_FOLLOWUP_SCHEDULE_PATH), so the next job tick schedules the
+follow-ups.  Each batch costs two reads (input + status) and two appends,
+plus two status writes per sent lead.
+
+Usage:
+    python -m api.intake                  # STAGE0_INTAKE_HOST / _PORT / _TOKEN
+"""
+
+from __future__ import annotations
+
+import hmac
+import json
+import logging
+import queue
+import re
+import sys
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Callable
+
+from src.core.lead_helpers import generate_vocative, warsaw_now_formatted
+from src.email.template_stage0 import build_stage0_email
+from src.integrations.email_sender import send_email_draft
+from src.stage0.process import SEND_THROTTLE_SECONDS, _friendly_email_error_status, _write_status
+from src.stage0.schedule import clear_schedule
+from src.stage0.sharding import (
+    CLAIMED,
+    IN_DOUBT_STATUS,
+    SENDING,
+    Lease,
+    default_worker_id,
+    parse_lease,
+)
+from src.stage0.test_mode import resolve_recipient_email
+from src.storage.sheets import is_eligible_for_send
+
+if TYPE_CHECKING:
+    from src.storage.sheets import SheetsClient
+
+logger = logging.getLogger(__name__)
+
+WORKER_PREFIX = "intake-"
+
+DEFAULT_BATCH_SECONDS = 2.0
+DEFAULT_MAX_BATCH = 50
+DEFAULT_LEASE_SECONDS = 600.0
+DEFAULT_RECOVER_SECONDS = 300.0
+MAX_BODY_BYTES = 16 * 1024
+
+_EMAIL_RE = re.compile(r"^[^@\s]+@[^@\s]+\.[^@\s]+$")
+
+# Accepted JSON keys per field (plain names and the sheet's own headers).
+_FIELD_ALIASES = {
+    "name": ("name", "Imię i nazwisko / Firma"),
+    "email": ("email", "Email"),
+    "phone": ("phone", "Telefon dodatkowy"),
+}
+
+
+@dataclass(frozen=True)
+class IntakeLead:
+    name: str
+    email: str  # normalized: stripped, lower-case
+    phone: str = ""
+
+
+@dataclass(frozen=True)
+class IntakeBatchReport:
+    received: int
+    appended: int
+    duplicates: int
+    emails_sent: int
+    emails_failed: int
+
+
+def parse_lead(payload: Any) -> IntakeLead:
+    """Validate a decoded JSON payload; raise ValueError with a client-safe message."""
+    if not isinstance(payload, dict):
+        raise ValueError("Expected a JSON object")
+
+    def field(key: str) -> str:
+        for alias in _FIELD_ALIASES[key]:
+            if alias in payload and payload[alias] is not None:
+                return str(payload[alias]).strip()
+        return ""
+
+    email = field("email").lower()
+    if not _EMAIL_RE.match(email) or len(email) > 254:
+        raise ValueError("Invalid or missing email")
+    name = field("name")
+    if len(name) > 200:
+        raise ValueError("name is too long")
+    phone = field("phone")
+    if len(phone) > 50:
+        raise ValueError("phone is too long")
+    return IntakeLead(name=name, email=email, phone=phone)
+
+
+def _email_of(row: dict[str, str]) -> str:
+    return str(row.get("Email", "")).strip().lower()
+
+
+def _utcnow() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+class IntakeService:
+    """Queue of pushed leads plus the batch step that appends and sends them.
+
+    submit() is called from HTTP handler threads; flush() runs on the single
+    background thread started by start() (or directly from tests).
+    """
+
+    def __init__(
+        self,
+        sheets_client: SheetsClient,
+        calendar_url: str,
+        *,
+        smtp_host: str,
+        smtp_port: int,
+        smtp_user: str,
+        smtp_password: str,
+        smtp_from_email: str,
+        attachments: list[Path],
+        test_mode: bool = False,
+        test_recipient: str | None = None,
+        worker_id: str | None = None,
+        batch_seconds: float = DEFAULT_BATCH_SECONDS,
+        max_batch: int = DEFAULT_MAX_BATCH,
+        lease_seconds: float = DEFAULT_LEASE_SECONDS,
+        send_delay: float = SEND_THROTTLE_SECONDS,
+        recover_seconds: float = DEFAULT_RECOVER_SECONDS,
+        schedule_path: str | Path | None = None,
+        now: Callable[[], datetime] = _utcnow,
+    ) -> None:
+        if test_mode and not (test_recipient or "").strip():
+            raise RuntimeError(
+                "TEST_RECIPIENT_EMAIL is required when STAGE0_TEST_MODE=1. "
+                "Set it to an internal address before running in test mode."
+            )
+        self._sheets = sheets_client
+        self._calendar_url = calendar_url
+        self._smtp = dict(
+            smtp_host=smtp_host,
+            smtp_port=smtp_port,
+            smtp_user=smtp_user,
+            smtp_password=smtp_password,
+            from_email=smtp_from_email,
+        )
+        self._attachments = attachments
+        self._test_mode = test_mode
+        self._test_recipient = test_recipient
+        self._worker_id = worker_id or WORKER_PREFIX + default_worker_id()
+        self._batch_seconds = batch_seconds
+        self._max_batch = max(1, max_batch)
+        self._lease_seconds = lease_seconds
+        self._send_delay = send_delay
+        self._recover_seconds = recover_seconds
+        self._schedule_path = schedule_path
+        self._now = now
+        self._last_send: float | None = None  # time.monotonic() of the last SMTP attempt
+        self._last_recover: datetime | None = None
+
+        self._queue: queue.Queue[IntakeLead] = queue.Queue()
+        self._lock = threading.Lock()
+        self._pending: set[str] = set()
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    # ------------------------------------------------------------------
+    # Intake side (HTTP threads)
+    # ------------------------------------------------------------------
+
+    def submit(self, lead: IntakeLead) -> bool:
+        """Queue *lead*; False when the same email is already waiting."""
+        with self._lock:
+            if lead.email in self._pending:
+                return False
+            self._pending.add(lead.email)
+        self._queue.put(lead)
+        return True
+
+    @property
+    def queued(self) -> int:
+        with self._lock:
+            return len(self._pending)
+
+    # ------------------------------------------------------------------
+    # Batch side (background thread)
+    # ------------------------------------------------------------------
+
+    def recover(self) -> None:
+        """Settle expired intake leases (a previous process's, or a failed batch's).
+
+        Expired ``CLAIMED`` rows go back to "" so the scheduled job sends
+        them; expired ``SENDING`` rows may or may not have been delivered
+        and are parked as IN_DOUBT_STATUS.  Runs at startup and, through
+        recover_if_due(), from the flush loop.
+        """
+        now = self._now()
+        self._last_recover = now
+        for idx, row in enumerate(self._sheets.read_status_rows()):
+            lease = parse_lease(row.get("Status emaila", ""))
+            if (
+                lease is None
+                or not lease.worker_id.startswith(WORKER_PREFIX)
+                or not lease.expired(now)
+                or str(row.get("Email wysłany", "")).strip()
+            ):
+                continue
+            if lease.phase == CLAIMED:
+                _write_status(self._sheets, idx + 2, _email_of(row), {"Status emaila": ""})
+            else:
+                logger.warning("Interrupted intake send in row %d — marked for operator review", idx + 2)
+                _write_status(self._sheets, idx + 2, _email_of(row), {"Status emaila": IN_DOUBT_STATUS})
+
+    def recover_if_due(self) -> None:
+        """recover() once recover_seconds have passed since the last one; never raises."""
+        if self._last_recover is not None and self._now() - self._last_recover < timedelta(
+            seconds=self._recover_seconds
+        ):
+            return
+        try:
+            self.recover()
+        except Exception:
+            logger.exception("Intake lease recovery failed — retried in %.0fs", self._recover_seconds)
+
+    def _drain(self, block: bool) -> list[IntakeLead]:
+        """Collect up to max_batch leads, waiting at most batch_seconds after the first."""
+        batch: list[IntakeLead] = []
+        try:
+            batch.append(self._queue.get(timeout=0.5) if block else self._queue.get_nowait())
+        except queue.Empty:
+            return batch
+        deadline = time.monotonic() + (self._batch_seconds if block else 0)
+        while len(batch) < self._max_batch:
+            remaining = deadline - time.monotonic()
+            try:
+                batch.append(self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def flush(self, *, block: bool = False) -> IntakeBatchReport:
+        """Append and send one batch of queued leads."""
+        batch = self._drain(block)
+        if not batch:
+            return IntakeBatchReport(0, 0, 0, 0, 0)
+        try:
+            return self._process_batch(batch)
+        finally:
+            with self._lock:
+                self._pending.difference_update(lead.email for lead in batch)
+
+    def _process_batch(self, batch: list[IntakeLead]) -> IntakeBatchReport:
+        known_inputs = {_email_of(r) for r in self._sheets.read_input_rows()}
+        status_rows = self._sheets.read_status_rows()
+        status_index = {_email_of(r): (idx + 2, r) for idx, r in enumerate(status_rows) if _email_of(r)}
+
+        claim = Lease(CLAIMED, self._worker_id, self._now() + timedelta(seconds=self._lease_seconds))
+        marker = claim.format()
+
+        duplicates = 0
+        new_inputs: list[list[str]] = []
+        new_status: list[list[str]] = []
+        new_status_leads: list[IntakeLead] = []
+        to_send: list[tuple[IntakeLead, int]] = []
+        for lead in batch:
+            if lead.email in known_inputs:
+                duplicates += 1
+                continue
+            known_inputs.add(lead.email)
+            new_inputs.append([lead.name, lead.email, lead.phone])
+            existing = status_index.get(lead.email)
+            if existing is None:
+                new_status.append([lead.name, lead.email, "", marker, "", "", ""])
+                new_status_leads.append(lead)
+            elif is_eligible_for_send(existing[1]):
+                _write_status(self._sheets, existing[0], lead.email, {"Status emaila": marker})
+                to_send.append((lead, existing[0]))
+
+        # Status rows first: once the input row is visible, the lead is
+        # already claimed (see module docstring).
+        if new_status:
+            first_row = self._sheets.append_status_rows(new_status)
+            for i, lead in enumerate(new_status_leads):
+                row_number = first_row + i if first_row is not None else self._locate(lead.email)
+                if row_number is not None:
+                    to_send.append((lead, row_number))
+        if new_inputs:
+            self._sheets.append_input_rows(new_inputs)
+
+        # _send() settles its own failures, so one bad lead never leaves the
+        # rest of the batch holding claims.
+        sent = failed = 0
+        for lead, row_number in to_send:
+            if self._send(lead, row_number, claim):
+                sent += 1
+            else:
+                failed += 1
+        if sent:
+            # The job's follow-up pass must schedule these sends (src/stage0/schedule.py).
+            clear_schedule(self._schedule_path)
+
+        report = IntakeBatchReport(
+            received=len(batch),
+            appended=len(new_inputs),
+            duplicates=duplicates,
+            emails_sent=sent,
+            emails_failed=failed,
+        )
+        logger.info(
+            "Intake batch done — received=%d appended=%d duplicates=%d sent=%d failed=%d",
+            report.received, report.appended, report.duplicates, sent, failed,
+        )
+        return report
+
+    def _send(self, lead: IntakeLead, row_number: int, claim: Lease) -> bool:
+        """Send one claimed lead; every failure is settled here, never raised."""
+        self._pace()
+        if claim.expired(self._now()):
+            logger.warning("Intake claim expired before send in row %d — released to the scheduled job", row_number)
+            self._release(row_number, lead.email)
+            return False
+        try:
+            draft = build_stage0_email(
+                calendar_url=self._calendar_url,
+                greeting=generate_vocative(lead.name),
+                attachments=self._attachments,
+            )
+            sending = Lease(SENDING, self._worker_id, self._now() + timedelta(seconds=self._lease_seconds))
+            _write_status(self._sheets, row_number, lead.email, {"Status emaila": sending.format()})
+        except Exception:
+            logger.exception("Failed to prepare send for row %d — releasing claim", row_number)
+            self._release(row_number, lead.email)
+            return False
+
+        recipient = resolve_recipient_email(
+            lead.email, test_mode=self._test_mode, test_recipient=self._test_recipient
+        )
+        self._last_send = time.monotonic()
+        try:
+            send_email_draft(to_email=recipient, draft=draft, **self._smtp)
+        except Exception as exc:
+            logger.error("Failed to send email to %s: %s", lead.email, str(exc)[:120])
+            self._write_result(row_number, lead.email, {"Status emaila": _friendly_email_error_status(exc)})
+            return False
+
+        self._write_result(row_number, lead.email, {
+            "Email wysłany": warsaw_now_formatted(),
+            "Status emaila": "SENT",
+        })
+        return True
+
+    def _pace(self) -> None:
+        """Wait until send_delay has passed since the previous SMTP attempt."""
+        if self._last_send is None:
+            return
+        wait = self._last_send + self._send_delay - time.monotonic()
+        if wait > 0:
+            time.sleep(wait)
+
+    def _locate(self, email: str) -> int | None:
+        """Row of a just-appended lead when the append response had no range.
+
+        None (the lead is skipped) when the lookup fails or finds nothing; its
+        claim then expires and recover() hands it to the scheduled job.
+        """
+        try:
+            row_number = self._sheets.get_status_row_number_by_email(email)
+        except Exception as exc:
+            logger.warning("Status row lookup failed (%s) — send skipped", type(exc).__name__)
+            return None
+        if row_number is None:
+            logger.warning("Appended status row not found — send skipped until the claim expires")
+        return row_number
+
+    def _release(self, row_number: int, email: str) -> None:
+        """Give a claimed row back to the scheduled job (recover() retries on failure)."""
+        try:
+            _write_status(self._sheets, row_number, email, {"Status emaila": ""})
+        except Exception as exc:
+            logger.warning(
+                "Could not release claim in row %d (%s) — released by recover() once it expires",
+                row_number, type(exc).__name__,
+            )
+
+    def _write_result(self, row_number: int, email: str, updates: dict[str, str]) -> None:
+        """Record the SMTP outcome; on failure the SENDING lease stays for recover()."""
+        try:
+            _write_status(self._sheets, row_number, email, updates)
+        except Exception as exc:
+            logger.error(
+                "Could not record send result in row %d (%s) — parked for review once the lease expires",
+                row_number, type(exc).__name__,
+            )
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            self.recover_if_due()
+            try:
+                self.flush(block=True)
+            except Exception:
+                # Leads of a failed batch may hold CLAIMED leases (or were
+                # never appended); recover_if_due() releases the expired ones.
+                logger.exception("Intake batch failed")
+                time.sleep(1.0)
+
+    def start(self) -> None:
+        self._thread = threading.Thread(target=self._run, name="intake-flush", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 30.0) -> None:
+        """Stop the background thread after flushing what is queued."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+        while not self._queue.empty():
+            self.flush()
+
+
+# ---------------------------------------------------------------------------
+# HTTP
+# ---------------------------------------------------------------------------
+
+def make_handler(service: IntakeService, token: str | None) -> type[BaseHTTPRequestHandler]:
+    """BaseHTTPRequestHandler subclass bound to *service*.
+
+    When *token* is set every POST must carry ``Authorization: Bearer <token>``.
+    """
+
+    class IntakeHandler(BaseHTTPRequestHandler):
+        server_version = "Stage0Intake/1"
+
+        def _reply(self, code: int, body: dict[str, Any]) -> None:
+            payload = json.dumps(body).encode("utf-8")
+            self.send_response(code)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+
+        def do_GET(self) -> None:  # noqa: N802 (http.server naming)
+            if self.path == "/healthz":
+                self._reply(200, {"status": "ok", "queued": service.queued})
+            else:
+                self._reply(404, {"error": "not found"})
+
+        def do_POST(self) -> None:  # noqa: N802
+            if self.path != "/leads":
+                self._reply(404, {"error": "not found"})
+                return
+            if token:
+                supplied = self.headers.get("Authorization", "")
+                if not hmac.compare_digest(supplied, f"Bearer {token}"):
+                    self._reply(401, {"error": "unauthorized"})
+                    return
+            try:
+                length = int(self.headers.get("Content-Length", "0"))
+            except ValueError:
+                length = -1
+            if not 0 < length <= MAX_BODY_BYTES:
+                self._reply(400, {"error": "invalid body size"})
+                return
+            try:
+                lead = parse_lead(json.loads(self.rfile.read(length)))
+            except (ValueError, UnicodeDecodeError) as exc:
+                self._reply(400, {"error": str(exc)[:100]})
+                return
+            if service.submit(lead):
+                self._reply(202, {"status": "queued"})
+            else:
+                self._reply(200, {"status": "duplicate"})
+
+        def log_message(self, format: str, *args: Any) -> None:  # noqa: A002
+            # Request lines carry no PII (no query strings); keep them at DEBUG.
+            logger.debug("%s — " + format, self.address_string(), *args)
+
+    return IntakeHandler
+
+
+def serve(service: IntakeService, host: str, port: int, token: str | None) -> ThreadingHTTPServer:
+    """Bind the HTTP server (port 0 = any free port); caller runs serve_forever()."""
+    if not token and host not in ("127.0.0.1", "localhost", "::1"):
+        raise RuntimeError(
+            "Missing required environment variable: STAGE0_INTAKE_TOKEN "
+            f"(required when binding to non-loopback host {host})"
+        )
+    return ThreadingHTTPServer((host, port), make_handler(service, token))
+
+
+def main() -> None:
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s [%(levelname)s] %(name)s — %(message)s",
+    )
+    try:
+        from src.core import config
+        from src.email.attachments_stage0 import get_stage0_attachments_from_env
+        from src.stage0.job import _build_sheets_client
+        from src.stage0.schedule import schedule_path_for
+
+        config.validate()
+        service = IntakeService(
+            _build_sheets_client(None, status_mirror=False),
+            config.CALENDAR_URL,
+            smtp_host=config.SMTP_HOST,
+            smtp_port=config.SMTP_PORT,
+            smtp_user=config.SMTP_USER,
+            smtp_password=config.SMTP_PASS,
+            smtp_from_email=config.SMTP_FROM_EMAIL,
+            attachments=get_stage0_attachments_from_env(),
+            test_mode=config.STAGE0_TEST_MODE,
+            test_recipient=config.TEST_RECIPIENT_EMAIL,
+            batch_seconds=config.STAGE0_INTAKE_BATCH_SECONDS,
+            schedule_path=(
+                schedule_path_for(config.STAGE0_FOLLOWUP_SCHEDULE_PATH, None)
+                if config.STAGE0_FOLLOWUP_SCHEDULE_PATH
+                else None
+            ),
+        )
+        service.recover()
+        server = serve(
+            service, config.STAGE0_INTAKE_HOST, config.STAGE0_INTAKE_PORT, config.STAGE0_INTAKE_TOKEN
+        )
+    except Exception:
+        logger.exception("Intake service failed to start")
+        sys.exit(1)
+
+    service.start()
+    logger.info("Intake service listening on %s:%d", *server.server_address[:2])
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        service.stop()
+
+
+if __name__ == "__main__":
+    main()
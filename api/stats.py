@@ -0,0 +1,193 @@
+"""Read-only stats API — lead counts and follow-up queues for dashboards.
+
+Serves the snapshot the job writes after each run (src/stage0/stats_snapshot.py,
+STAGE0_STATS_SNAPSHOT_PATH).  No request ever reaches Google or the lead
+store: a file read, re-parsed only when the job has replaced it.
+
+    GET /healthz                      → 200 {"status": "ok"}
+    GET /v1/status-counts             → leads per status category
+    GET /v1/followups/due?limit=100   → due-now count, upcoming per day, due queue
+    GET /v1/runs/last                 → last run's counters and timings
+    GET /v1/sends/daily?days=30       → emails sent per Warsaw day (≤ 90 days)
+
+Every /v1 endpoint takes ``?tenant=<name>`` on multi-tenant hosts, answers
+404 until the first snapshot exists, and includes ``generated_at`` (when
+the data was read).  Leads appear only as sheet row numbers and 16-hex
+hashes — never as names or addresses.
+
+Usage:
+    python -m api.stats                   # STAGE0_STATS_HOST / _PORT / _TOKEN
+"""
+
+from __future__ import annotations
+
+import hmac
+import json
+import logging
+import sys
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any
+from urllib.parse import parse_qs, urlsplit
+
+from src.stage0.metrics import tenant_path
+from src.stage0.stats_snapshot import SEND_HISTORY_DAYS, load_stats_snapshot, send_days
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_QUEUE_LIMIT = 100
+DEFAULT_SEND_DAYS = 30
+
+
+class StatsStore:
+    """Snapshots per tenant, re-read only when the file changed on disk."""
+
+    def __init__(self, path: str | Path) -> None:
+        self._path = Path(path)
+        self._lock = threading.Lock()
+        self._cache: dict[str | None, tuple[tuple[int, int], dict[str, Any]]] = {}
+
+    def get(self, tenant: str | None = None) -> dict[str, Any] | None:
+        try:
+            stat = tenant_path(self._path, tenant).stat()
+        except OSError:
+            return None
+        # The job replaces the file (os.replace), so a new version is a new inode.
+        version = (stat.st_ino, stat.st_mtime_ns)
+        with self._lock:
+            cached = self._cache.get(tenant)
+            if cached is not None and cached[0] == version:
+                return cached[1]
+        snapshot = load_stats_snapshot(self._path, tenant)
+        if snapshot is not None:
+            with self._lock:
+                self._cache[tenant] = (version, snapshot)
+        return snapshot
+
+
+def _int_param(query: dict[str, list[str]], name: str, default: int, maximum: int) -> int:
+    """Query parameter *name* clamped to 0..*maximum*; ValueError when not a number."""
+    raw = query.get(name, [str(default)])[0]
+    return max(0, min(int(raw), maximum))
+
+
+def render(path: str, snapshot: dict[str, Any], query: dict[str, list[str]]) -> dict[str, Any] | None:
+    """Response body for a /v1 *path*, or None for an unknown path."""
+    base = {"tenant": snapshot.get("tenant"), "generated_at": snapshot.get("generated_at")}
+    if path == "/v1/status-counts":
+        return {**base, "status_counts": snapshot["status_counts"]}
+    if path == "/v1/followups/due":
+        followups = snapshot["followups"]
+        limit = _int_param(query, "limit", DEFAULT_QUEUE_LIMIT, len(followups["queue"]))
+        return {
+            **base,
+            "due_now": followups["due_now"],
+            "upcoming_per_day": followups["upcoming_per_day"],
+            "queue": followups["queue"][:limit],
+        }
+    if path == "/v1/runs/last":
+        return {**base, "last_run": snapshot.get("last_run")}
+    if path == "/v1/sends/daily":
+        days = _int_param(query, "days", DEFAULT_SEND_DAYS, SEND_HISTORY_DAYS)
+        return {**base, "sends_per_day": send_days(snapshot, days)}
+    return None
+
+
+# ---------------------------------------------------------------------------
+# HTTP
+# ---------------------------------------------------------------------------
+
+def make_handler(store: StatsStore, token: str | None) -> type[BaseHTTPRequestHandler]:
+    """BaseHTTPRequestHandler subclass bound to *store*.
+
+    When *token* is set every /v1 request must carry ``Authorization: Bearer <token>``.
+    """
+
+    class StatsHandler(BaseHTTPRequestHandler):
+        server_version = "Stage0Stats/1"
+
+        def _reply(self, code: int, body: dict[str, Any]) -> None:
+            payload = json.dumps(body, ensure_ascii=False).encode("utf-8")
+            self.send_response(code)
+            self.send_header("Content-Type", "application/json; charset=utf-8")
+            self.send_header("Content-Length", str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+
+        def do_GET(self) -> None:  # noqa: N802 (http.server naming)
+            url = urlsplit(self.path)
+            if url.path == "/healthz":
+                self._reply(200, {"status": "ok"})
+                return
+            if not url.path.startswith("/v1/"):
+                self._reply(404, {"error": "not found"})
+                return
+            if token:
+                supplied = self.headers.get("Authorization", "")
+                if not hmac.compare_digest(supplied, f"Bearer {token}"):
+                    self._reply(401, {"error": "unauthorized"})
+                    return
+            query = parse_qs(url.query)
+            snapshot = store.get(query.get("tenant", [None])[0])
+            if snapshot is None:
+                self._reply(404, {"error": "no snapshot yet"})
+                return
+            try:
+                body = render(url.path, snapshot, query)
+            except ValueError:
+                self._reply(400, {"error": "invalid query parameter"})
+                return
+            if body is None:
+                self._reply(404, {"error": "not found"})
+            else:
+                self._reply(200, body)
+
+        def log_message(self, format: str, *args: Any) -> None:  # noqa: A002
+            # Request lines carry no PII (tenant names at most); keep them at DEBUG.
+            logger.debug("%s — " + format, self.address_string(), *args)
+
+    return StatsHandler
+
+
+def serve(store: StatsStore, host: str, port: int, token: str | None) -> ThreadingHTTPServer:
+    """Bind the HTTP server (port 0 = any free port); caller runs serve_forever()."""
+    if not token and host not in ("127.0.0.1", "localhost", "::1"):
+        raise RuntimeError(
+            "Missing required environment variable: STAGE0_STATS_TOKEN "
+            f"(required when binding to non-loopback host {host})"
+        )
+    return ThreadingHTTPServer((host, port), make_handler(store, token))
+
+
+def main() -> None:
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s [%(levelname)s] %(name)s — %(message)s",
+    )
+    try:
+        from src.core import config
+
+        if not config.STAGE0_STATS_SNAPSHOT_PATH:
+            raise RuntimeError("Missing required environment variable: STAGE0_STATS_SNAPSHOT_PATH")
+        server = serve(
+            StatsStore(config.STAGE0_STATS_SNAPSHOT_PATH),
+            config.STAGE0_STATS_HOST,
+            config.STAGE0_STATS_PORT,
+            config.STAGE0_STATS_TOKEN,
+        )
+    except Exception:
+        logger.exception("Stats API failed to start")
+        sys.exit(1)
+
+    logger.info("Stats API listening on %s:%d", *server.server_address[:2])
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
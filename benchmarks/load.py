@@ -0,0 +1,408 @@
+"""Load benchmark — run_stage0_job() end to end on synthetic sheets.
+
+Builds input and status tabs with N leads and runs one full Stage 0 job
+(status sync, sends, follow-up step) against in-memory stand-ins:
+
+- the real SheetsClient on top of a fake gspread client that keeps the
+  tabs in lists and counts every call by method;
+- smtplib.SMTP replaced by a recorder (the real MIME message is built
+  with three small PDF attachments, then dropped).
+
+The 10 s pause between sends is skipped.  The lead mix per scenario is
+fixed (see MIX): new leads, ERROR retries, sent leads with a future or a
+due follow-up, sent leads not scheduled yet and completed follow-ups.
+
+``--backend sqlite`` runs the same scenarios on LocalSheetsClient
+(src/storage/local.py) instead; Sheets call counts are then empty.
+``--backend emulator`` serves the tabs from benchmarks/sheets_emulator.py
+over real HTTP, with ``--latency-ms`` / ``--read-quota`` /
+``--write-quota`` / ``--error-rate`` injected; call counts are then per
+API endpoint.  Quota 429s make SheetsClient really back off (60 s+).
+
+Each scenario reports wall time, peak traced memory, Sheets calls by
+method and SMTP messages; ``--output`` saves them as JSON and
+``--compare`` diffs against an earlier file (exit code 1 when a scenario
+makes more Sheets calls than before).
+
+Usage:
+    python -m benchmarks.load                               # 1k, 10k, 100k
+    python -m benchmarks.load --sizes 1000 --output load.json
+    python -m benchmarks.load --compare load.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import logging
+import platform
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+from collections import Counter
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any
+from unittest.mock import patch
+
+from src.core.lead_helpers import WARSAW_TZ
+from src.storage.sheets import INPUT_HEADERS, STATUS_HEADERS
+
+DEFAULT_SIZES = (1_000, 10_000, 100_000)
+
+# Share of leads per kind.  Sends = new + error_retry.
+MIX = (
+    ("new", 0.10),
+    ("error_retry", 0.05),
+    ("sent_scheduled", 0.35),   # Follow-up od in the future
+    ("sent_due", 0.30),         # Follow-up od passed, flag still NO
+    ("sent_unscheduled", 0.10), # Follow-up od not set yet
+    ("followup_done", 0.10),
+)
+
+_DT_FMT = "%Y-%m-%d %H:%M"
+
+
+# ---------------------------------------------------------------------------
+# In-memory gspread stand-in
+# ---------------------------------------------------------------------------
+
+class FakeWorksheet:
+    """One tab as a list of rows (row 1 = headers)."""
+
+    def __init__(self, book: FakeSpreadsheet, sheet_id: int, title: str, rows: list[list[str]]) -> None:
+        self._book = book
+        self.id = sheet_id
+        self.title = title
+        self.rows = rows
+        self._properties = {"sheetId": sheet_id, "title": title, "index": sheet_id}
+
+    def _call(self, method: str) -> None:
+        self._book.calls[method] += 1
+
+    def row_values(self, row: int) -> list[str]:
+        self._call("row_values")
+        return list(self.rows[row - 1]) if row <= len(self.rows) else []
+
+    def col_values(self, col: int) -> list[str]:
+        self._call("col_values")
+        return [r[col - 1] if col <= len(r) else "" for r in self.rows]
+
+    def get_all_records(self, head: int = 1, default_blank: str = "", **_: Any) -> list[dict[str, Any]]:
+        self._call("get_all_records")
+        header = self.rows[head - 1]
+        width = len(header)
+        return [
+            dict(zip(header, r + [default_blank] * (width - len(r))))
+            for r in self.rows[head:]
+        ]
+
+    def batch_update(self, data: list[dict[str, Any]], **_: Any) -> dict[str, Any]:
+        import gspread
+
+        self._call("batch_update")
+        for item in data:
+            # A block range ("C5:D9") is anchored at its top-left cell.
+            top, left = gspread.utils.a1_to_rowcol(item["range"].split("!")[-1].split(":")[0])
+            for r, values in enumerate(item["values"], start=top):
+                while len(self.rows) < r:
+                    self.rows.append([])
+                cells = self.rows[r - 1]
+                last = left + len(values) - 1
+                if len(cells) < last:
+                    cells.extend([""] * (last - len(cells)))
+                for c, value in enumerate(values, start=left):
+                    cells[c - 1] = str(value)
+        return {}
+
+    def append_rows(self, values: list[list[str]], **_: Any) -> dict[str, Any]:
+        self._call("append_rows")
+        first = len(self.rows) + 1
+        self.rows.extend([list(map(str, v)) for v in values])
+        return {"updates": {"updatedRange": f"'{self.title}'!A{first}:G{len(self.rows)}"}}
+
+
+class FakeSpreadsheet:
+    def __init__(self, title: str) -> None:
+        self.title = title
+        self.calls: Counter[str] = Counter()
+        self._tabs: dict[str, FakeWorksheet] = {}
+
+    def add_tab(self, title: str, rows: list[list[str]]) -> FakeWorksheet:
+        ws = FakeWorksheet(self, len(self._tabs), title, rows)
+        self._tabs[title] = ws
+        return ws
+
+    def worksheet(self, title: str) -> FakeWorksheet:
+        self.calls["worksheet"] += 1
+        return self._tabs[title]
+
+    def batch_update(self, body: dict[str, Any]) -> dict[str, Any]:
+        self.calls["spreadsheet_batch_update"] += 1
+        return {}
+
+
+class FakeGspreadClient:
+    def __init__(self, book: FakeSpreadsheet) -> None:
+        self._book = book
+
+    def open_by_key(self, key: str) -> FakeSpreadsheet:  # noqa: ARG002
+        self._book.calls["open_by_key"] += 1
+        return self._book
+
+
+class RecordingSMTP:
+    """smtplib.SMTP stand-in: accepts everything, keeps counters only."""
+
+    messages = 0
+    bytes_sent = 0
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        pass
+
+    def __enter__(self) -> RecordingSMTP:
+        return self
+
+    def __exit__(self, *exc: Any) -> bool:
+        return False
+
+    def ehlo(self) -> None:
+        pass
+
+    def starttls(self) -> None:
+        pass
+
+    def login(self, user: str, password: str) -> None:
+        pass
+
+    def send_message(self, msg: Any) -> None:
+        type(self).messages += 1
+        type(self).bytes_sent += len(msg.as_bytes())
+
+
+# ---------------------------------------------------------------------------
+# Synthetic data
+# ---------------------------------------------------------------------------
+
+def generate_sheet(n: int, *, seed: int = 0, now: datetime | None = None) -> tuple[FakeSpreadsheet, Counter[str]]:
+    """Return a spreadsheet with *n* leads in the MIX proportions, plus counts per kind."""
+    now = now or datetime.now(WARSAW_TZ)
+    kinds = [kind for kind, share in MIX for _ in range(round(n * share))]
+    kinds = (kinds + ["new"] * n)[:n]
+    random.Random(seed).shuffle(kinds)
+
+    input_rows = [list(INPUT_HEADERS)]
+    status_rows = [list(STATUS_HEADERS)]
+    long_ago = (now - timedelta(days=10)).strftime(_DT_FMT)
+    recently = (now - timedelta(days=1)).strftime(_DT_FMT)
+    for i, kind in enumerate(kinds):
+        name, email = f"Lead {i}", f"lead{i}@example.com"
+        input_rows.append([name, email, f"600{i:06d}"])
+        if kind == "new":
+            continue
+        if kind == "error_retry":
+            status = [name, email, "", "ERROR: OCZEKUJE NA PONOWIENIE: 421", "", "", ""]
+        elif kind == "sent_scheduled":
+            status = [name, email, recently, "SENT", (now + timedelta(days=2)).strftime(_DT_FMT), "NO", ""]
+        elif kind == "sent_due":
+            status = [name, email, long_ago, "SENT", (now - timedelta(days=7)).strftime(_DT_FMT), "NO", ""]
+        elif kind == "sent_unscheduled":
+            status = [name, email, recently, "SENT", "", "", ""]
+        else:  # followup_done
+            status = [name, email, long_ago, "SENT", (now - timedelta(days=7)).strftime(_DT_FMT), "NO", recently]
+        status_rows.append(status)
+
+    book = FakeSpreadsheet(f"bench-{n}")
+    book.add_tab("input", input_rows)
+    book.add_tab("status", status_rows)
+    return book, Counter(kinds)
+
+
+# ---------------------------------------------------------------------------
+# Scenario run
+# ---------------------------------------------------------------------------
+
+@dataclass(frozen=True)
+class ScenarioResult:
+    leads: int
+    wall_s: float
+    peak_mb: float
+    sheets_calls: dict[str, int]
+    sheets_calls_total: int
+    smtp_messages: int
+    smtp_mb: float
+    emails_sent: int
+    emails_failed: int
+    mix: dict[str, int]
+    timings: dict[str, float] = field(default_factory=dict)
+
+
+def run_scenario(
+    n: int,
+    *,
+    seed: int = 0,
+    trace_memory: bool = True,
+    backend: str = "sheets",
+    faults: Any = None,
+) -> ScenarioResult:
+    """Run one Stage 0 job on *n* synthetic leads and measure it."""
+    from src.stage0.job import run_stage0_job
+    from src.stage0.tenants import SmtpProfile, TenantConfig
+    from src.storage.sheets import SheetsClient
+
+    # Import what the run loads lazily, so peak_mb measures the run itself.
+    import email.mime.application  # noqa: F401
+    import email.mime.multipart  # noqa: F401
+    import email.mime.text  # noqa: F401
+    import gspread  # noqa: F401
+
+    book, mix = generate_sheet(n, seed=seed)
+    with tempfile.TemporaryDirectory() as tmp:
+        attachments = []
+        for name in ("a.pdf", "b.pdf", "c.pdf"):
+            path = Path(tmp) / name
+            path.write_bytes(b"%PDF-1.4\n" + b"0" * 2048)
+            attachments.append(str(path))
+        tenant = TenantConfig(
+            name="bench",
+            sheet_id=book.title,
+            input_tab="input",
+            status_tab="status",
+            service_account_json="",
+            smtp=SmtpProfile("smtp.invalid", 587, "bench", "bench", "bench@example.com"),
+            calendar_url="https://calendly.com/bench",
+            attachments=tuple(attachments),
+        )
+        RecordingSMTP.messages = RecordingSMTP.bytes_sent = 0
+
+        with patch("smtplib.SMTP", RecordingSMTP), patch("src.stage0.process.time.sleep"):
+            if trace_memory:
+                tracemalloc.start()
+            started = time.perf_counter()
+            if backend == "sqlite":
+                from src.storage.local import LocalSheetsClient
+
+                sheets = LocalSheetsClient(Path(tmp) / "bench.sqlite3")
+                for tab in ("input", "status"):
+                    sheets.write_tab_values(tab, book.worksheet(tab).rows[1:])
+                book.calls.clear()
+            elif backend == "emulator":
+                from benchmarks.sheets_emulator import SheetsEmulator
+
+                emulator = SheetsEmulator(faults).start()
+                emulator.add_spreadsheet(book.title, {tab: book.worksheet(tab).rows for tab in ("input", "status")})
+                book.calls.clear()
+                sheets = SheetsClient("", book.title, input_tab="input", status_tab="status",
+                                      gspread_client=emulator.gspread_client())
+            else:
+                sheets = SheetsClient("", book.title, input_tab="input", status_tab="status",
+                                      gspread_client=FakeGspreadClient(book))
+            report = run_stage0_job(sheets_client=sheets, tenant=tenant)
+            wall_s = time.perf_counter() - started
+            peak = tracemalloc.get_traced_memory()[1] if trace_memory else 0
+            if trace_memory:
+                tracemalloc.stop()
+            if backend == "sqlite":
+                sheets.close()
+            if backend == "emulator":
+                emulator.stop()
+                book.calls.update(emulator.requests)
+
+    calls = dict(sorted(book.calls.items()))
+    return ScenarioResult(
+        leads=n,
+        wall_s=round(wall_s, 3),
+        peak_mb=round(peak / 1e6, 2),
+        sheets_calls=calls,
+        sheets_calls_total=sum(calls.values()),
+        smtp_messages=RecordingSMTP.messages,
+        smtp_mb=round(RecordingSMTP.bytes_sent / 1e6, 2),
+        emails_sent=report.emails_sent,
+        emails_failed=report.emails_failed,
+        mix=dict(sorted(mix.items())),
+        timings=report.timings,
+    )
+
+
+def compare(current: list[ScenarioResult], baseline: dict[str, Any]) -> list[str]:
+    """Print deltas against *baseline* (a saved --output file); return regressions."""
+    previous = {s["leads"]: s for s in baseline.get("scenarios", [])}
+    regressions: list[str] = []
+    for result in current:
+        before = previous.get(result.leads)
+        if before is None:
+            print(f"{result.leads:>7} leads: no baseline")
+            continue
+        print(
+            f"{result.leads:>7} leads: wall {before['wall_s']:.2f}s → {result.wall_s:.2f}s, "
+            f"peak {before['peak_mb']:.1f} → {result.peak_mb:.1f} MB, "
+            f"sheets calls {before['sheets_calls_total']} → {result.sheets_calls_total}"
+        )
+        if result.sheets_calls_total > before["sheets_calls_total"]:
+            regressions.append(
+                f"{result.leads} leads: Sheets calls grew "
+                f"{before['sheets_calls_total']} → {result.sheets_calls_total}"
+            )
+    return regressions
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(DEFAULT_SIZES))
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--no-memory", action="store_true", help="skip tracemalloc (faster, no peak_mb)")
+    parser.add_argument("--backend", choices=("sheets", "sqlite", "emulator"), default="sheets")
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="emulator: per-request latency")
+    parser.add_argument("--read-quota", type=int, default=0, help="emulator: reads per minute (0 = unlimited)")
+    parser.add_argument("--write-quota", type=int, default=0, help="emulator: writes per minute (0 = unlimited)")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="emulator: share of 500/503 responses")
+    parser.add_argument("--output", help="write results as JSON to this file")
+    parser.add_argument("--compare", help="earlier --output file to diff against")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.WARNING)
+    faults = None
+    if args.backend == "emulator":
+        from benchmarks.sheets_emulator import Faults
+
+        faults = Faults(
+            latency_ms=args.latency_ms,
+            read_quota=args.read_quota,
+            write_quota=args.write_quota,
+            error_rate=args.error_rate,
+            seed=args.seed,
+        )
+    results = []
+    for n in args.sizes:
+        result = run_scenario(n, seed=args.seed, trace_memory=not args.no_memory, backend=args.backend, faults=faults)
+        results.append(result)
+        print(
+            f"{n:>7} leads: {result.wall_s:8.2f} s  peak {result.peak_mb:7.1f} MB  "
+            f"sheets {result.sheets_calls_total:>6}  smtp {result.smtp_messages:>6}  "
+            f"sent {result.emails_sent} failed {result.emails_failed}"
+        )
+        for method, count in result.sheets_calls.items():
+            print(f"          {method:<26} {count:>6}")
+
+    if args.output:
+        Path(args.output).write_text(json.dumps({
+            "created_at": datetime.now(WARSAW_TZ).isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "scenarios": [asdict(r) for r in results],
+        }, indent=2), encoding="utf-8")
+
+    if args.compare:
+        baseline = json.loads(Path(args.compare).read_text(encoding="utf-8"))
+        regressions = compare(results, baseline)
+        for problem in regressions:
+            print(f"FAIL: {problem}")
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
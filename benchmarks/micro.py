@@ -0,0 +1,195 @@
+"""Microbenchmarks — per-row cost of the pure Stage 0 domain functions.
+
+apply_followup_logic, is_eligible_for_send, generate_vocative,
+warsaw_now_formatted, followup_due_formatted and is_followup_due run once
+per status row on every tick.  Each is timed over a realistic row mix
+(the same kinds as benchmarks/load.py), reporting the best-of-N
+nanoseconds per row and the mean peak bytes a call allocates.  The
+column-at-a-time engine (src/stage0/batch.py) is timed on the same rows,
+one call per batch, and reported per row too.
+
+Results are compared against a baseline file (default
+benchmarks/micro_baseline.json, recorded with ``--save-baseline``); a
+function more than ``--tolerance`` times slower than its baseline is a
+regression (exit code 1).  Baselines are machine-specific — record one on
+the host you compare on.
+
+Usage:
+    python -m benchmarks.micro                      # print results
+    python -m benchmarks.micro --save-baseline      # record baseline
+    python -m benchmarks.micro --compare            # diff against baseline
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import platform
+import random
+import sys
+import time
+import tracemalloc
+from dataclasses import asdict, dataclass
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Callable
+
+from src.core.lead_helpers import (
+    WARSAW_TZ,
+    followup_due_formatted,
+    generate_vocative,
+    is_followup_due,
+    warsaw_now_formatted,
+)
+from src.stage0.batch import evaluate_followups, to_columns
+from src.stage0.followup import apply_followup_logic
+from src.storage.sheets import is_eligible_for_send
+
+DEFAULT_BASELINE = Path(__file__).resolve().parent / "micro_baseline.json"
+DEFAULT_ROWS = 5_000
+DEFAULT_TOLERANCE = 1.25
+
+_DT_FMT = "%Y-%m-%d %H:%M"
+
+
+@dataclass(frozen=True)
+class Case:
+    name: str
+    fn: Callable[[Any], Any]
+    rows: list[Any]
+    rows_per_item: int = 1  # batch cases: one item holds a whole tab
+
+
+@dataclass(frozen=True)
+class MicroResult:
+    name: str
+    rows: int
+    ns_per_row: float
+    peak_bytes_per_row: float
+
+
+def status_rows(n: int, *, seed: int = 0, now: datetime | None = None) -> list[dict[str, str]]:
+    """Status rows in roughly production proportions (see benchmarks.load.MIX)."""
+    now = now or datetime.now(WARSAW_TZ)
+    rng = random.Random(seed)
+    recently = (now - timedelta(days=1)).strftime(_DT_FMT)
+    long_ago = (now - timedelta(days=10)).strftime(_DT_FMT)
+    future = (now + timedelta(days=2)).strftime(_DT_FMT)
+    past = (now - timedelta(days=7)).strftime(_DT_FMT)
+    templates = [
+        ({"Email wysłany": "", "Status emaila": "", "Follow-up od": "", "Wymaga follow-upu": "", "Follow-up wykonany": ""}, 10),
+        ({"Email wysłany": "", "Status emaila": "ERROR: OCZEKUJE NA PONOWIENIE: 421", "Follow-up od": "", "Wymaga follow-upu": "", "Follow-up wykonany": ""}, 5),
+        ({"Email wysłany": recently, "Status emaila": "SENT", "Follow-up od": future, "Wymaga follow-upu": "NO", "Follow-up wykonany": ""}, 35),
+        ({"Email wysłany": long_ago, "Status emaila": "SENT", "Follow-up od": past, "Wymaga follow-upu": "NO", "Follow-up wykonany": ""}, 30),
+        ({"Email wysłany": recently, "Status emaila": "SENT", "Follow-up od": "", "Wymaga follow-upu": "", "Follow-up wykonany": ""}, 10),
+        ({"Email wysłany": long_ago, "Status emaila": "SENT", "Follow-up od": past, "Wymaga follow-upu": "NO", "Follow-up wykonany": recently}, 10),
+    ]
+    rows = []
+    for i, template in enumerate(rng.choices([t for t, _ in templates], weights=[w for _, w in templates], k=n)):
+        rows.append({"Lead": f"Lead {i}", "Email": f"lead{i}@example.com", **template})
+    return rows
+
+
+def cases(n: int = DEFAULT_ROWS, *, seed: int = 0) -> list[Case]:
+    rows = status_rows(n, seed=seed)
+    columns = to_columns(rows, list(rows[0]))
+    now = datetime.now(WARSAW_TZ)
+    sent_at = [r["Email wysłany"] for r in rows if r["Email wysłany"]]
+    return [
+        Case("apply_followup_logic", apply_followup_logic, rows),
+        Case("apply_followup_logic(now=)", lambda r: apply_followup_logic(r, now=now), rows),
+        Case("is_eligible_for_send", is_eligible_for_send, rows + [None] * (n // 10)),
+        Case("generate_vocative", generate_vocative, [r["Lead"] for r in rows]),
+        Case("warsaw_now_formatted", lambda _: warsaw_now_formatted(), rows),
+        Case("followup_due_formatted", followup_due_formatted, sent_at),
+        Case("is_followup_due", is_followup_due, rows),
+        Case("evaluate_followups(batch)", lambda c: evaluate_followups(c, now=now), [columns], n),
+    ]
+
+
+def measure(case: Case, *, repeat: int = 5, memory_sample: int = 1_000) -> MicroResult:
+    """Best-of-*repeat* time per row, plus mean peak bytes allocated per call.
+
+    Memory is traced call by call (peak reset before each) over the first
+    *memory_sample* rows — the transient allocations a call makes, which
+    is what per-row work costs the allocator.
+    """
+    fn, rows = case.fn, case.rows
+    for row in rows:  # warm-up: caches, zoneinfo, strptime regexes
+        fn(row)
+    best = float("inf")
+    for _ in range(max(1, repeat)):
+        started = time.perf_counter_ns()
+        for row in rows:
+            fn(row)
+        best = min(best, time.perf_counter_ns() - started)
+
+    sample = rows[:memory_sample]
+    allocated = 0
+    tracemalloc.start()
+    for row in sample:
+        before = tracemalloc.get_traced_memory()[0]
+        tracemalloc.reset_peak()
+        fn(row)
+        allocated += tracemalloc.get_traced_memory()[1] - before
+    tracemalloc.stop()
+
+    total_rows = len(rows) * case.rows_per_item
+    return MicroResult(
+        name=case.name,
+        rows=total_rows,
+        ns_per_row=round(best / max(1, total_rows), 1),
+        peak_bytes_per_row=round(allocated / max(1, len(sample) * case.rows_per_item), 1),
+    )
+
+
+def compare(results: list[MicroResult], baseline: dict[str, Any], *, tolerance: float) -> list[str]:
+    """Print per-function ratios against *baseline*; return regressions."""
+    previous = baseline.get("results", {})
+    regressions: list[str] = []
+    for result in results:
+        before = previous.get(result.name)
+        if before is None:
+            print(f"  {result.name:<28} no baseline")
+            continue
+        ratio = result.ns_per_row / before["ns_per_row"] if before["ns_per_row"] else float("inf")
+        print(f"  {result.name:<28} {before['ns_per_row']:>9.0f} → {result.ns_per_row:>9.0f} ns/row  x{ratio:.2f}")
+        if ratio > tolerance:
+            regressions.append(f"{result.name}: x{ratio:.2f} slower than baseline (tolerance x{tolerance:.2f})")
+    return regressions
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=DEFAULT_ROWS)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--baseline", type=Path, default=DEFAULT_BASELINE)
+    parser.add_argument("--save-baseline", action="store_true", help="write results to --baseline")
+    parser.add_argument("--compare", action="store_true", help="diff against --baseline")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE, help="allowed slowdown ratio")
+    args = parser.parse_args(argv)
+
+    results = [measure(case, repeat=args.repeat) for case in cases(args.rows)]
+    for r in results:
+        print(f"  {r.name:<28} {r.ns_per_row:>9.0f} ns/row  {r.peak_bytes_per_row:>8.1f} B/row peak")
+
+    if args.save_baseline:
+        args.baseline.write_text(json.dumps({
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "rows": args.rows,
+            "results": {r.name: asdict(r) for r in results},
+        }, indent=2) + "\n", encoding="utf-8")
+        print(f"baseline written to {args.baseline}")
+
+    if args.compare:
+        baseline = json.loads(args.baseline.read_text(encoding="utf-8"))
+        regressions = compare(results, baseline, tolerance=args.tolerance)
+        for problem in regressions:
+            print(f"FAIL: {problem}")
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,810 @@
+"""Local Google Sheets v4 emulator — real HTTP, injected latency, 429s and 5xx.
+
+Serves the endpoints SheetsClient reaches through gspread, over plain
+HTTP on 127.0.0.1:
+
+    GET  /v4/spreadsheets/{id}                      spreadsheets.get
+    GET  /v4/spreadsheets/{id}/values/{range}       values.get
+    GET  /v4/spreadsheets/{id}/values:batchGet      values.batchGet
+    PUT  /v4/spreadsheets/{id}/values/{range}       values.update
+    POST /v4/spreadsheets/{id}/values/{range}:append values.append
+    POST /v4/spreadsheets/{id}/values:batchUpdate   values.batchUpdate
+    POST /v4/spreadsheets/{id}/values:batchClear    values.batchClear
+    POST /v4/spreadsheets/{id}/values:batchUpdateByDataFilter
+                                                    values.batchUpdateByDataFilter
+    POST /v4/spreadsheets/{id}:batchUpdate          batchUpdate
+
+Cells are kept as strings, except numbers written with
+valueInputOption=RAW (or seeded as numbers), which stay numbers — date
+serials among them.  valueRenderOption=UNFORMATTED_VALUE returns those
+numbers as numbers, the default FORMATTED_VALUE as text (no number
+formats are applied).  A USER_ENTERED value with a leading apostrophe
+is stored as the text after it, as Sheets does.  Formulas ("=..."
+written USER_ENTERED) are kept but not evaluated: valueRenderOption=
+FORMULA returns them, the other renders show the leading string of a ``={"text"; ...}`` array (the shape
+of a header-row formula) and blank otherwise.  Null cells in written
+values are skipped.  Responses trim trailing blank cells and rows the
+way Sheets does.
+spreadsheets.batchUpdate applies addSheet, createDeveloperMetadata (on
+one row), deleteDimension and moveDimension (ROWS — row metadata is
+deleted or moves with its row), updateSpreadsheetProperties (the listed
+fields, e.g. timeZone) and accepts any other request without
+effect (formatting is not emulated).  values.batchUpdateByDataFilter
+supports developerMetadataLookup filters on row metadata only.
+spreadsheets.get lists row metadata under each sheet's
+"developerMetadata" and honours a ``fields`` mask (paths and
+``a(b,c)`` groups; no wildcards).  Responses are gzipped when the
+request asks for gzip in both Accept-Encoding and the User-Agent, as
+Google does; byte counts are what went over the wire.
+
+Faults are injected per request, in the order Google applies them:
+``latency_ms`` (+ uniform ``jitter_ms``), then the per-minute quotas
+(sliding 60 s window, reads = GET, writes = PUT/POST; 0 = unlimited;
+Google's default is 60 per user per minute each) answered with 429
+RESOURCE_EXHAUSTED, then ``error_rate`` random 500 / 503 responses.
+``GET /_emulator/stats`` returns request, throttle, error and byte counts.
+
+gspread_client() returns a gspread.Client whose requests go to the
+emulator instead of sheets.googleapis.com, so SheetsClient (retry,
+batching, backoff accounting) runs unmodified:
+
+    with SheetsEmulator(Faults(latency_ms=80, write_quota=60)) as emu:
+        emu.add_spreadsheet("sheet", {"input": rows, "status": rows})
+        sheets = SheetsClient("", "sheet", gspread_client=emu.gspread_client())
+
+Usage:
+    python -m benchmarks.sheets_emulator --port 8765 --leads 1000 \\
+        --latency-ms 80 --read-quota 60 --write-quota 60 --error-rate 0.01
+"""
+
+from __future__ import annotations
+
+import argparse
+import gzip
+import json
+import random
+import re
+import threading
+import time
+from collections import Counter, deque
+from dataclasses import dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any
+from urllib.parse import parse_qs, unquote, urlsplit
+
+import requests
+
+GOOGLE_API_BASE = "https://sheets.googleapis.com/v4/spreadsheets"
+
+_MIN_ROWS, _MIN_COLS = 1000, 26
+_CELL = re.compile(r"^([A-Za-z]*)(\d*)$")
+_ERRORS = (
+    (500, "Internal error encountered.", "INTERNAL"),
+    (503, "The service is currently unavailable.", "UNAVAILABLE"),
+)
+
+
+@dataclass(frozen=True)
+class Faults:
+    latency_ms: float = 0.0
+    jitter_ms: float = 0.0
+    read_quota: int = 0    # requests per minute, 0 = unlimited
+    write_quota: int = 0
+    error_rate: float = 0.0
+    seed: int | None = None
+
+
+class _EmulatorError(Exception):
+    def __init__(self, code: int, message: str, status: str) -> None:
+        super().__init__(message)
+        self.code, self.message, self.status = code, message, status
+
+
+# ---------------------------------------------------------------------------
+# A1 notation
+# ---------------------------------------------------------------------------
+
+def _col_number(letters: str) -> int:
+    n = 0
+    for ch in letters.upper():
+        n = n * 26 + ord(ch) - 64
+    return n
+
+
+def _col_letters(n: int) -> str:
+    letters = ""
+    while n:
+        n, rem = divmod(n - 1, 26)
+        letters = chr(65 + rem) + letters
+    return letters
+
+
+def _split_sheet(a1: str) -> tuple[str | None, str]:
+    """"'My tab'!A1:B2" → ("My tab", "A1:B2"); "A1" → (None, "A1")."""
+    if a1.startswith("'"):
+        i, title = 1, ""
+        while i < len(a1):
+            if a1[i] == "'":
+                if a1[i + 1:i + 2] == "'":
+                    title, i = title + "'", i + 2
+                    continue
+                break
+            title, i = title + a1[i], i + 1
+        rest = a1[i + 1:]
+        return title, rest[1:] if rest.startswith("!") else rest
+    if "!" in a1:
+        title, cells = a1.split("!", 1)
+        return title, cells
+    return None, a1
+
+
+def _parse_cells(cells: str) -> tuple[int, int, int | None, int | None]:
+    """"A2:Z" → (row 2, col 1, row None, col 26); None = open-ended, 1-based."""
+    if not cells:
+        return 1, 1, None, None
+    start, _, end = cells.partition(":")
+    m1 = _CELL.match(start)
+    if m1 is None:
+        raise _EmulatorError(400, f"Unable to parse range: {cells}", "INVALID_ARGUMENT")
+    r1 = int(m1.group(2)) if m1.group(2) else 1
+    c1 = _col_number(m1.group(1)) if m1.group(1) else 1
+    if not end:
+        if not m1.group(1) or not m1.group(2):
+            raise _EmulatorError(400, f"Unable to parse range: {cells}", "INVALID_ARGUMENT")
+        return r1, c1, r1, c1
+    m2 = _CELL.match(end)
+    if m2 is None:
+        raise _EmulatorError(400, f"Unable to parse range: {cells}", "INVALID_ARGUMENT")
+    r2 = int(m2.group(2)) if m2.group(2) else None
+    c2 = _col_number(m2.group(1)) if m2.group(1) else None
+    return r1, c1, r2, c2
+
+
+# ---------------------------------------------------------------------------
+# Spreadsheet state
+# ---------------------------------------------------------------------------
+
+class _Tab:
+    def __init__(self, sheet_id: int, index: int, title: str, rows: list[list[str]]) -> None:
+        self.sheet_id, self.index, self.title = sheet_id, index, title
+        self.rows = [[_typed(v) for v in row] for row in rows]
+        # Row developer metadata: metadataId → entry; "row" is 0-based.
+        self.row_metadata: dict[int, dict[str, Any]] = {}
+
+    def developer_metadata(self) -> list[dict[str, Any]]:
+        return [
+            {
+                "metadataId": meta_id,
+                "metadataKey": entry["key"],
+                "metadataValue": entry["value"],
+                "location": {"locationType": "ROW", "dimensionRange": {
+                    "sheetId": self.sheet_id, "dimension": "ROWS",
+                    "startIndex": entry["row"], "endIndex": entry["row"] + 1,
+                }},
+                "visibility": "DOCUMENT",
+            }
+            for meta_id, entry in sorted(self.row_metadata.items())
+        ]
+
+    def properties(self) -> dict[str, Any]:
+        width = max((len(r) for r in self.rows), default=0)
+        return {
+            "sheetId": self.sheet_id,
+            "title": self.title,
+            "index": self.index,
+            "sheetType": "GRID",
+            "gridProperties": {
+                "rowCount": max(_MIN_ROWS, len(self.rows)),
+                "columnCount": max(_MIN_COLS, width),
+            },
+        }
+
+    def last_row(self) -> int:
+        for i in range(len(self.rows) - 1, -1, -1):
+            if any(self.rows[i]):
+                return i + 1
+        return 0
+
+    def read(self, r1: int, c1: int, r2: int | None, c2: int | None) -> list[list[str]]:
+        values = []
+        for row in self.rows[r1 - 1:r2]:
+            cells = row[c1 - 1:c2]
+            while cells and cells[-1] == "":
+                cells.pop()
+            values.append(cells)
+        while values and not values[-1]:
+            values.pop()
+        return values
+
+    def write(self, r1: int, c1: int, values: list[list[Any]], *, raw: bool = False) -> tuple[int, int]:
+        store = _typed if raw else _entered
+        width = 0
+        for offset, new in enumerate(values):
+            idx = r1 - 1 + offset
+            while len(self.rows) <= idx:
+                self.rows.append([])
+            row = self.rows[idx]
+            need = c1 - 1 + len(new)
+            if len(row) < need:
+                row.extend([""] * (need - len(row)))
+            for c, v in enumerate(new, start=c1 - 1):
+                if v is not None:
+                    row[c] = store(v)
+            width = max(width, len(new))
+        return len(values), width
+
+    def clear(self, r1: int, c1: int, r2: int | None, c2: int | None) -> None:
+        for row in self.rows[r1 - 1:r2]:
+            end = len(row) if c2 is None else min(c2, len(row))
+            for c in range(c1 - 1, end):
+                row[c] = ""
+
+
+def _cell(value: Any) -> str:
+    if value is None:
+        return ""
+    if isinstance(value, bool):
+        return "TRUE" if value else "FALSE"
+    return str(value)
+
+
+class _Formula(str):
+    """A cell holding a formula (USER_ENTERED text starting with "=")."""
+
+
+_ARRAY_HEADER = re.compile(r'^=\s*\{\s*"((?:[^"]|"")*)"\s*;')
+
+
+def _entered(value: Any) -> str:
+    text = _cell(value)
+    if text.startswith("'"):
+        return text[1:]
+    return _Formula(text) if text.startswith("=") else text
+
+
+def _rendered(value: Any, render: str) -> Any:
+    """A stored cell as returned for valueRenderOption *render*."""
+    if isinstance(value, _Formula):
+        if render == "FORMULA":
+            return str(value)
+        match = _ARRAY_HEADER.match(value)
+        return match.group(1).replace('""', '"') if match else ""
+    return value if render == "UNFORMATTED_VALUE" else _cell(value)
+
+
+def _typed(value: Any) -> Any:
+    """Numbers stay numbers (RAW input); everything else as _cell()."""
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return value
+    return _cell(value)
+
+
+class _Spreadsheet:
+    def __init__(self, spreadsheet_id: str, title: str) -> None:
+        self.id, self.title = spreadsheet_id, title
+        self.properties: dict[str, Any] = {"locale": "pl_PL", "timeZone": "Europe/Warsaw"}
+        self.tabs: dict[str, _Tab] = {}
+        self.metadata_ids = 0
+
+    def add_tab(self, title: str, rows: list[list[str]]) -> _Tab:
+        tab = _Tab(len(self.tabs), len(self.tabs), title, rows)
+        self.tabs[title] = tab
+        return tab
+
+    def apply(self, request: dict[str, Any]) -> dict[str, Any]:
+        """One spreadsheets.batchUpdate request; returns its reply."""
+        if "addSheet" in request:
+            title = request["addSheet"].get("properties", {}).get("title") or f"Sheet{len(self.tabs) + 1}"
+            if title in self.tabs:
+                raise _EmulatorError(400, f"A sheet with the name \"{title}\" already exists.", "INVALID_ARGUMENT")
+            return {"addSheet": {"properties": self.add_tab(title, []).properties()}}
+        if "updateSpreadsheetProperties" in request:
+            update = request["updateSpreadsheetProperties"]
+            for name in update["fields"].split(","):
+                self.properties[name.strip()] = update["properties"].get(name.strip())
+            return {}
+        if "deleteDimension" in request:
+            span = request["deleteDimension"]["range"]
+            tab = self._tab_by_id(span.get("sheetId", 0))
+            if span.get("dimension") == "ROWS":
+                start, end = span["startIndex"], span["endIndex"]
+                del tab.rows[start:end]
+                for meta_id, entry in list(tab.row_metadata.items()):
+                    if start <= entry["row"] < end:
+                        del tab.row_metadata[meta_id]
+                    elif entry["row"] >= end:
+                        entry["row"] -= end - start
+            return {}
+        if "moveDimension" in request:
+            source = request["moveDimension"]["source"]
+            tab = self._tab_by_id(source.get("sheetId", 0))
+            if source.get("dimension") == "ROWS":
+                start, end = source["startIndex"], source["endIndex"]
+                dest = request["moveDimension"]["destinationIndex"]
+                # destinationIndex counts rows before the source is removed.
+                order = list(range(max(len(tab.rows), end, dest)))
+                block = order[start:end]
+                del order[start:end]
+                if dest > start:
+                    dest -= end - start
+                order[dest:dest] = block
+                while len(tab.rows) < len(order):
+                    tab.rows.append([])
+                tab.rows = [tab.rows[i] for i in order]
+                moved_to = {old: new for new, old in enumerate(order)}
+                for entry in tab.row_metadata.values():
+                    entry["row"] = moved_to[entry["row"]]
+            return {}
+        if "createDeveloperMetadata" in request:
+            meta = request["createDeveloperMetadata"]["developerMetadata"]
+            span = meta["location"]["dimensionRange"]
+            tab = self._tab_by_id(span.get("sheetId", 0))
+            if span.get("dimension") != "ROWS" or span["endIndex"] - span["startIndex"] != 1:
+                raise _EmulatorError(400, "Only single-row developer metadata is emulated.", "INVALID_ARGUMENT")
+            self.metadata_ids += 1
+            tab.row_metadata[self.metadata_ids] = {
+                "key": meta.get("metadataKey"), "value": meta.get("metadataValue"), "row": span["startIndex"],
+            }
+            return {"createDeveloperMetadata": {"developerMetadata": {
+                **meta,
+                "metadataId": self.metadata_ids,
+                "location": {"locationType": "ROW", "sheetId": tab.sheet_id, "dimensionRange": span},
+            }}}
+        return {}
+
+    def _tab_by_id(self, sheet_id: int) -> _Tab:
+        tab = next((t for t in self.tabs.values() if t.sheet_id == sheet_id), None)
+        if tab is None:
+            raise _EmulatorError(400, f"No grid with id: {sheet_id}", "INVALID_ARGUMENT")
+        return tab
+
+    def matching_rows(self, lookup: dict[str, Any]) -> list[tuple[_Tab, int]]:
+        """(tab, 1-based row) for each row metadata entry matching a developerMetadataLookup."""
+        sheet_id = lookup.get("metadataLocation", {}).get("sheetId")
+        matches = []
+        for tab in self.tabs.values():
+            if sheet_id is not None and tab.sheet_id != sheet_id:
+                continue
+            for entry in tab.row_metadata.values():
+                if (
+                    lookup.get("metadataKey") in (None, entry["key"])
+                    and lookup.get("metadataValue") in (None, entry["value"])
+                ):
+                    matches.append((tab, entry["row"] + 1))
+        return matches
+
+    def resolve(self, a1: str) -> tuple[_Tab, tuple[int, int, int | None, int | None]]:
+        title, cells = _split_sheet(a1)
+        if title is None and cells in self.tabs:
+            title, cells = cells, ""
+        if title is None:
+            if not self.tabs:
+                raise _EmulatorError(400, f"Unable to parse range: {a1}", "INVALID_ARGUMENT")
+            tab = next(iter(self.tabs.values()))
+        else:
+            tab = self.tabs.get(title)
+            if tab is None:
+                raise _EmulatorError(400, f"Unable to parse range: {a1}", "INVALID_ARGUMENT")
+        return tab, _parse_cells(cells)
+
+    def metadata(self) -> dict[str, Any]:
+        return {
+            "spreadsheetId": self.id,
+            "properties": {"title": self.title, **self.properties},
+            "sheets": [
+                {"properties": tab.properties(), **({"developerMetadata": meta} if (meta := tab.developer_metadata()) else {})}
+                for tab in self.tabs.values()
+            ],
+            "spreadsheetUrl": f"https://docs.google.com/spreadsheets/d/{self.id}/edit",
+        }
+
+
+def _field_tree(fields: str) -> dict[str, Any]:
+    """Parse a fields mask ("a,b.c,d(e,f)") into nested dicts; None = whole value."""
+    tree: dict[str, Any] = {}
+    depth, start = 0, 0
+    parts = []
+    for i, ch in enumerate(fields + ","):
+        if ch == "(":
+            depth += 1
+        elif ch == ")":
+            depth -= 1
+        elif ch == "," and depth == 0:
+            parts.append(fields[start:i].strip())
+            start = i + 1
+    for part in filter(None, parts):
+        head, paren, group = part.partition("(")
+        *parents, leaf = head.split(".")
+        node = tree
+        for name in parents:
+            if name in node and node[name] is None:
+                break  # an enclosing path is already selected whole
+            node = node.setdefault(name, {})
+        else:
+            if not paren:
+                node[leaf] = None
+            elif node.get(leaf, {}) is not None:
+                node.setdefault(leaf, {}).update(_field_tree(group[:-1]))
+    return tree
+
+
+def _masked(value: Any, tree: dict[str, Any] | None) -> Any:
+    if tree is None:
+        return value
+    if isinstance(value, list):
+        return [_masked(item, tree) for item in value]
+    if not isinstance(value, dict):
+        return value
+    return {k: _masked(value[k], sub) for k, sub in tree.items() if k in value}
+
+
+def _a1(tab: _Tab, r1: int, c1: int, r2: int | None, c2: int | None) -> str:
+    props = tab.properties()["gridProperties"]
+    r2 = r2 if r2 is not None else props["rowCount"]
+    c2 = c2 if c2 is not None else props["columnCount"]
+    return f"'{tab.title}'!{_col_letters(c1)}{r1}:{_col_letters(c2)}{r2}"
+
+
+# ---------------------------------------------------------------------------
+# Emulator
+# ---------------------------------------------------------------------------
+
+class SheetsEmulator:
+    """In-process Sheets v4 HTTP server; use as a context manager or start()/stop()."""
+
+    def __init__(self, faults: Faults | None = None, *, host: str = "127.0.0.1", port: int = 0) -> None:
+        self.faults = faults or Faults()
+        self._lock = threading.Lock()
+        self._rng = random.Random(self.faults.seed)
+        self._books: dict[str, _Spreadsheet] = {}
+        self._windows: dict[str, deque[float]] = {"read": deque(), "write": deque()}
+        self.requests: Counter[str] = Counter()
+        self.throttled = 0
+        self.errors = 0
+        self.bytes_in = 0
+        self.bytes_out = 0
+        self._server = ThreadingHTTPServer((host, port), _handler_for(self))
+        self._server.daemon_threads = True
+        self._thread: threading.Thread | None = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}/v4/spreadsheets"
+
+    def start(self) -> SheetsEmulator:
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._server.serve_forever, name="sheets-emulator", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        if self._thread is not None:
+            self._server.shutdown()
+            self._thread.join()
+            self._thread = None
+        self._server.server_close()
+
+    def __enter__(self) -> SheetsEmulator:
+        return self.start()
+
+    def __exit__(self, *exc: Any) -> None:
+        self.stop()
+
+    # -- state ---------------------------------------------------------------
+
+    def add_spreadsheet(self, spreadsheet_id: str, tabs: dict[str, list[list[str]]], *, title: str | None = None) -> None:
+        """Create (or replace) a spreadsheet; *tabs* maps tab title → rows (row 1 = headers)."""
+        book = _Spreadsheet(spreadsheet_id, title or spreadsheet_id)
+        for tab_title, rows in tabs.items():
+            book.add_tab(tab_title, rows)
+        with self._lock:
+            self._books[spreadsheet_id] = book
+
+    def values(self, spreadsheet_id: str, tab: str) -> list[list[str]]:
+        """Current rows of *tab* (trailing blanks trimmed), for assertions."""
+        with self._lock:
+            return self._books[spreadsheet_id].tabs[tab].read(1, 1, None, None)
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            return {
+                "requests": dict(sorted(self.requests.items())),
+                "requests_total": sum(self.requests.values()),
+                "throttled": self.throttled,
+                "errors": self.errors,
+                "bytes_in": self.bytes_in,
+                "bytes_out": self.bytes_out,
+            }
+
+    def reset_stats(self) -> None:
+        with self._lock:
+            self.requests.clear()
+            self.throttled = self.errors = self.bytes_in = self.bytes_out = 0
+            for window in self._windows.values():
+                window.clear()
+
+    def gspread_client(self, *, pool_size: int | None = None) -> Any:
+        """gspread.Client routed to this emulator (no credentials needed).
+
+        The session is set up like production's (src/storage/transport.py):
+        keep-alive pool, gzip, CountingHTTPClient.
+        """
+        from src.storage import transport
+
+        session = transport.configure_session(
+            _RedirectSession(self.base_url), pool_size=pool_size or transport.DEFAULT_POOL_SIZE,
+        )
+        return transport.client_for_session(session)
+
+    # -- request pipeline ----------------------------------------------------
+
+    def _inject(self, kind: str) -> None:
+        faults = self.faults
+        with self._lock:
+            delay = faults.latency_ms + (self._rng.uniform(0, faults.jitter_ms) if faults.jitter_ms else 0.0)
+        if delay:
+            time.sleep(delay / 1000)
+        quota = faults.read_quota if kind == "read" else faults.write_quota
+        with self._lock:
+            if quota:
+                window, now = self._windows[kind], time.monotonic()
+                while window and now - window[0] >= 60:
+                    window.popleft()
+                if len(window) >= quota:
+                    self.throttled += 1
+                    raise _EmulatorError(
+                        429,
+                        f"Quota exceeded for quota metric '{kind.capitalize()} requests' and limit "
+                        f"'{kind.capitalize()} requests per minute per user'.",
+                        "RESOURCE_EXHAUSTED",
+                    )
+                window.append(now)
+            if faults.error_rate and self._rng.random() < faults.error_rate:
+                self.errors += 1
+                raise _EmulatorError(*self._rng.choice(_ERRORS))
+
+    def handle(self, method: str, path: str, query: dict[str, list[str]], body: dict[str, Any]) -> tuple[str, dict[str, Any]]:
+        """Route one API request; returns (endpoint name, response JSON)."""
+        prefix = "/v4/spreadsheets/"
+        if not path.startswith(prefix):
+            raise _EmulatorError(404, "Requested entity was not found.", "NOT_FOUND")
+        rest = path[len(prefix):]
+        spreadsheet_id, _, tail = rest.partition("/")
+        if ":" in spreadsheet_id and not tail:
+            spreadsheet_id, _, action = spreadsheet_id.partition(":")
+            tail = ":" + action
+
+        if tail == "" and method == "GET":
+            endpoint = "spreadsheets.get"
+        elif tail == ":batchUpdate" and method == "POST":
+            endpoint = "batchUpdate"
+        elif tail == "values:batchGet" and method == "GET":
+            endpoint = "values.batchGet"
+        elif tail == "values:batchUpdate" and method == "POST":
+            endpoint = "values.batchUpdate"
+        elif tail == "values:batchClear" and method == "POST":
+            endpoint = "values.batchClear"
+        elif tail == "values:batchUpdateByDataFilter" and method == "POST":
+            endpoint = "values.batchUpdateByDataFilter"
+        elif tail.startswith("values/") and tail.endswith(":append") and method == "POST":
+            endpoint = "values.append"
+        elif tail.startswith("values/") and method == "GET":
+            endpoint = "values.get"
+        elif tail.startswith("values/") and method == "PUT":
+            endpoint = "values.update"
+        else:
+            raise _EmulatorError(404, f"Unsupported endpoint: {method} {tail}", "NOT_FOUND")
+
+        with self._lock:
+            self.requests[endpoint] += 1
+        self._inject("read" if method == "GET" else "write")
+
+        with self._lock:
+            book = self._books.get(unquote(spreadsheet_id))
+            if book is None:
+                raise _EmulatorError(404, "Requested entity was not found.", "NOT_FOUND")
+            return endpoint, self._dispatch(endpoint, book, tail, query, body)
+
+    def _dispatch(self, endpoint: str, book: _Spreadsheet, tail: str, query: dict[str, list[str]], body: dict[str, Any]) -> dict[str, Any]:
+        if endpoint == "spreadsheets.get":
+            fields = query.get("fields", [""])[0]
+            return _masked(book.metadata(), _field_tree(fields) if fields else None)
+
+        if endpoint == "batchUpdate":
+            return {"spreadsheetId": book.id, "replies": [book.apply(r) for r in body.get("requests", [])]}
+
+        if endpoint in ("values.get", "values.batchGet"):
+            ranges = [unquote(tail[len("values/"):])] if endpoint == "values.get" else query.get("ranges", [])
+            value_ranges = []
+            for a1 in ranges:
+                tab, bounds = book.resolve(a1)
+                dimension = query.get("majorDimension", ["ROWS"])[0]
+                value_range: dict[str, Any] = {"range": _a1(tab, *bounds), "majorDimension": dimension}
+                render = query.get("valueRenderOption", ["FORMATTED_VALUE"])[0]
+                values = [[_rendered(v, render) for v in row] for row in tab.read(*bounds)]
+                if dimension == "COLUMNS":
+                    values = _columns(values)
+                if values:
+                    value_range["values"] = values
+                value_ranges.append(value_range)
+            if endpoint == "values.get":
+                return value_ranges[0]
+            return {"spreadsheetId": book.id, "valueRanges": value_ranges}
+
+        if endpoint == "values.update":
+            tab, (r1, c1, _, _) = book.resolve(unquote(tail[len("values/"):]))
+            raw = query.get("valueInputOption", [""])[0] == "RAW"
+            return {"spreadsheetId": book.id, **_updated(tab, r1, c1, body.get("values", []), raw=raw)}
+
+        if endpoint == "values.batchUpdate":
+            responses = []
+            raw = body.get("valueInputOption") == "RAW"
+            for item in body.get("data", []):
+                tab, (r1, c1, _, _) = book.resolve(item["range"])
+                responses.append({"spreadsheetId": book.id, **_updated(tab, r1, c1, item.get("values", []), raw=raw)})
+            return {
+                "spreadsheetId": book.id,
+                "totalUpdatedRows": sum(r["updatedRows"] for r in responses),
+                "totalUpdatedCells": sum(r["updatedCells"] for r in responses),
+                "responses": responses,
+            }
+
+        if endpoint == "values.batchUpdateByDataFilter":
+            responses = []
+            raw = body.get("valueInputOption") == "RAW"
+            for item in body.get("data", []):
+                lookup = item["dataFilter"].get("developerMetadataLookup")
+                if lookup is None:
+                    raise _EmulatorError(400, "Only developerMetadataLookup filters are emulated.", "INVALID_ARGUMENT")
+                for tab, row in book.matching_rows(lookup):
+                    responses.append({
+                        "dataFilter": item["dataFilter"],
+                        **_updated(tab, row, 1, item.get("values", []), raw=raw),
+                    })
+            return {
+                "spreadsheetId": book.id,
+                "totalUpdatedRows": sum(r["updatedRows"] for r in responses),
+                "totalUpdatedCells": sum(r["updatedCells"] for r in responses),
+                "responses": responses,
+            }
+
+        if endpoint == "values.batchClear":
+            cleared = []
+            for a1 in body.get("ranges", []):
+                tab, bounds = book.resolve(a1)
+                tab.clear(*bounds)
+                cleared.append(_a1(tab, *bounds))
+            return {"spreadsheetId": book.id, "clearedRanges": cleared}
+
+        # values.append — after the last non-empty row of the tab
+        tab, (_, c1, _, _) = book.resolve(unquote(tail[len("values/"):-len(":append")]))
+        table_end = tab.last_row()
+        raw = query.get("valueInputOption", [""])[0] == "RAW"
+        return {
+            "spreadsheetId": book.id,
+            "tableRange": _a1(tab, 1, c1, max(table_end, 1), None) if table_end else None,
+            "updates": {"spreadsheetId": book.id, **_updated(tab, table_end + 1, c1, body.get("values", []), raw=raw)},
+        }
+
+
+def _columns(rows: list[list[str]]) -> list[list[str]]:
+    """Transpose trimmed rows to trimmed columns (majorDimension=COLUMNS)."""
+    width = max((len(r) for r in rows), default=0)
+    columns = [[r[c] if c < len(r) else "" for r in rows] for c in range(width)]
+    for column in columns:
+        while column and column[-1] == "":
+            column.pop()
+    return columns
+
+
+def _updated(tab: _Tab, r1: int, c1: int, values: list[list[Any]], *, raw: bool = False) -> dict[str, Any]:
+    rows, width = tab.write(r1, c1, values, raw=raw)
+    return {
+        "updatedRange": _a1(tab, r1, c1, r1 + max(rows, 1) - 1, c1 + max(width, 1) - 1),
+        "updatedRows": rows,
+        "updatedColumns": width,
+        "updatedCells": sum(v is not None for r in values for v in r),
+    }
+
+
+def _handler_for(emulator: SheetsEmulator) -> type[BaseHTTPRequestHandler]:
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"  # keep-alive, like the real API
+        disable_nagle_algorithm = True  # headers and body go out as separate writes
+
+        def _serve(self, method: str) -> None:
+            url = urlsplit(self.path)
+            length = int(self.headers.get("Content-Length") or 0)
+            raw = self.rfile.read(length) if length else b""
+            try:
+                if url.path == "/_emulator/stats":
+                    status, payload = 200, emulator.stats()
+                else:
+                    body = json.loads(raw) if raw else {}
+                    _, payload = emulator.handle(method, url.path, parse_qs(url.query), body)
+                    status = 200
+            except _EmulatorError as exc:
+                status = exc.code
+                payload = {"error": {"code": exc.code, "message": exc.message, "status": exc.status}}
+            except (ValueError, KeyError, TypeError) as exc:
+                status = 400
+                payload = {"error": {"code": 400, "message": f"Invalid request: {type(exc).__name__}", "status": "INVALID_ARGUMENT"}}
+            data = json.dumps(payload).encode("utf-8")
+            gzipped = "gzip" in self.headers.get("Accept-Encoding", "") and "gzip" in self.headers.get("User-Agent", "")
+            if gzipped:
+                data = gzip.compress(data, compresslevel=6)
+            with emulator._lock:
+                emulator.bytes_in += len(raw)
+                emulator.bytes_out += len(data)
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json; charset=UTF-8")
+            if gzipped:
+                self.send_header("Content-Encoding", "gzip")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def do_GET(self) -> None:  # noqa: N802
+            self._serve("GET")
+
+        def do_POST(self) -> None:  # noqa: N802
+            self._serve("POST")
+
+        def do_PUT(self) -> None:  # noqa: N802
+            self._serve("PUT")
+
+        def log_message(self, format: str, *args: Any) -> None:  # noqa: A002
+            pass
+
+    return Handler
+
+
+class _RedirectSession(requests.Session):
+    """requests.Session that sends sheets.googleapis.com calls to the emulator."""
+
+    def __init__(self, base_url: str) -> None:
+        super().__init__()
+        self.base_url = base_url
+
+    def request(self, method: str, url: str, *args: Any, **kwargs: Any) -> Any:
+        if url.startswith(GOOGLE_API_BASE):
+            url = self.base_url + url[len(GOOGLE_API_BASE):]
+        return super().request(method, url, *args, **kwargs)
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--sheet-id", default="emulator", help="spreadsheet ID to create")
+    parser.add_argument("--leads", type=int, default=0, help="seed input/status tabs with N synthetic leads (benchmarks.load mix)")
+    parser.add_argument("--latency-ms", type=float, default=0.0)
+    parser.add_argument("--jitter-ms", type=float, default=0.0)
+    parser.add_argument("--read-quota", type=int, default=0, help="read requests per minute (0 = unlimited; Google: 60)")
+    parser.add_argument("--write-quota", type=int, default=0, help="write requests per minute (0 = unlimited; Google: 60)")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="share of requests answered 500/503")
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args(argv)
+
+    from benchmarks.load import generate_sheet
+
+    book, _ = generate_sheet(args.leads, seed=args.seed or 0)
+    emulator = SheetsEmulator(
+        Faults(args.latency_ms, args.jitter_ms, args.read_quota, args.write_quota, args.error_rate, args.seed),
+        host=args.host,
+        port=args.port,
+    )
+    emulator.add_spreadsheet(args.sheet_id, {tab: book.worksheet(tab).rows for tab in ("input", "status")})
+    print(f"Sheets emulator on {emulator.base_url}/{args.sheet_id} (tabs: input, status) — Ctrl+C to stop")
+    try:
+        emulator._server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        emulator._server.server_close()
+        print(json.dumps(emulator.stats(), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,157 @@
+"""Startup benchmark — cold import cost of the scheduler entrypoint.
+
+Runs a fresh interpreter with ``-X importtime`` and parses its report, so
+the numbers include everything the scheduler pays on each tick before
+run_stage0_job() does any work.  Fails (exit code 1) when the import of
+the entry module exceeds the budget or pulls in a module that should only
+load when its step runs.
+
+Usage:
+    python -m benchmarks.startup                  # default budget
+    python -m benchmarks.startup --budget-ms 40   # stricter budget
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import subprocess
+import sys
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+
+_PROJECT_ROOT = Path(__file__).resolve().parent.parent
+
+ENTRY_MODULE = "src.stage0.job"
+
+# Import-time budget for ENTRY_MODULE (cumulative, milliseconds).
+# Measured ~15 ms on a warm Linux dev box; the budget leaves headroom for
+# slower Windows hosts.  Override with STAGE0_STARTUP_BUDGET_MS.
+DEFAULT_BUDGET_MS = 60.0
+
+# Top-level packages / module prefixes that must not be imported by the
+# no-op path.  Each one belongs to a step that loads it on demand.
+HEAVY_MODULES = (
+    "gspread",
+    "google.auth",
+    "google.oauth2",
+    "requests",
+    "dotenv",
+    "smtplib",
+    "email.mime",
+)
+
+
+@dataclass(frozen=True)
+class StartupProfile:
+    """Parsed ``-X importtime`` result for one cold interpreter run."""
+
+    module: str
+    import_ms: float            # cumulative import time of *module*
+    wall_ms: float              # interpreter start → exit, as seen by the parent
+    imported: dict[str, float] = field(default_factory=dict)  # module → cumulative ms
+
+    def heavy_imports(self) -> list[str]:
+        """Return imported module names matching HEAVY_MODULES."""
+        return sorted(
+            name for name in self.imported
+            if any(name == h or name.startswith(h + ".") for h in HEAVY_MODULES)
+        )
+
+
+def _parse_importtime(stderr: str) -> dict[str, float]:
+    """Map module name → cumulative import time (ms) from -X importtime output."""
+    result: dict[str, float] = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        parts = line[len("import time:"):].split("|")
+        if len(parts) != 3:
+            continue
+        try:
+            cumulative_us = int(parts[1].strip())
+        except ValueError:
+            continue  # header line
+        result[parts[2].strip()] = cumulative_us / 1000.0
+    return result
+
+
+def measure_startup(module: str = ENTRY_MODULE) -> StartupProfile:
+    """Import *module* in a fresh interpreter and return its profile.
+
+    The child runs with an empty environment (apart from PATH / SYSTEMROOT)
+    so that a developer's .env or exported settings do not change what is
+    imported.
+    """
+    env = {k: v for k, v in os.environ.items() if k in ("PATH", "SYSTEMROOT", "PYTHONPATH")}
+    started = time.perf_counter()
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=_PROJECT_ROOT,
+        env=env,
+        capture_output=True,
+        text=True,
+        check=False,
+    )
+    wall_ms = (time.perf_counter() - started) * 1000.0
+    if proc.returncode != 0:
+        raise RuntimeError(f"Importing {module} failed:\n{proc.stderr[-2000:]}")
+
+    imported = _parse_importtime(proc.stderr)
+    return StartupProfile(
+        module=module,
+        import_ms=imported.get(module, 0.0),
+        wall_ms=wall_ms,
+        imported=imported,
+    )
+
+
+def budget_ms() -> float:
+    """Return the configured budget (STAGE0_STARTUP_BUDGET_MS or the default)."""
+    raw = os.getenv("STAGE0_STARTUP_BUDGET_MS", "").strip()
+    return float(raw) if raw else DEFAULT_BUDGET_MS
+
+
+def check_budget(profile: StartupProfile, limit_ms: float) -> list[str]:
+    """Return a list of human-readable violations (empty when within budget)."""
+    problems: list[str] = []
+    if profile.import_ms > limit_ms:
+        problems.append(
+            f"{profile.module} import took {profile.import_ms:.1f} ms "
+            f"(budget {limit_ms:.1f} ms)"
+        )
+    heavy = profile.heavy_imports()
+    if heavy:
+        problems.append(f"heavy modules imported at startup: {', '.join(heavy)}")
+    return problems
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--module", default=ENTRY_MODULE)
+    parser.add_argument("--budget-ms", type=float, default=None)
+    parser.add_argument("--runs", type=int, default=5, help="best-of-N runs")
+    parser.add_argument("--top", type=int, default=10, help="slowest imports to print")
+    args = parser.parse_args(argv)
+
+    limit = args.budget_ms if args.budget_ms is not None else budget_ms()
+    profiles = [measure_startup(args.module) for _ in range(max(args.runs, 1))]
+    best = min(profiles, key=lambda p: p.import_ms)
+
+    print(f"module:      {best.module}")
+    print(f"import time: {best.import_ms:.1f} ms (best of {len(profiles)})")
+    print(f"wall time:   {best.wall_ms:.1f} ms (interpreter + imports)")
+    print(f"budget:      {limit:.1f} ms")
+    print("slowest imports (cumulative):")
+    for name, ms in sorted(best.imported.items(), key=lambda kv: -kv[1])[: args.top]:
+        print(f"  {ms:8.2f} ms  {name}")
+
+    problems = check_budget(best, limit)
+    for problem in problems:
+        print(f"FAIL: {problem}")
+    return 1 if problems else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,15 +1,33 @@
-"""Stage 0 configuration — loads .env and exposes typed settings."""
+"""Stage 0 configuration — loads .env and exposes typed settings.
+
+Settings are resolved lazily: importing this module reads nothing and
+validates nothing.  The first attribute access loads ``.env`` (python-dotenv
+is imported at that point) and each setting is validated when it is first
+read, then cached as a plain module attribute.  ``validate()`` resolves every
+required setting at once for callers that want fail-fast behaviour.
+"""
 
 from __future__ import annotations
 
 import os
 from pathlib import Path
-
-from dotenv import load_dotenv
+from typing import Any, Callable
 
 # Load .env from project root (three levels up from src/core/config.py)
 _PROJECT_ROOT = Path(__file__).resolve().parent.parent.parent
-load_dotenv(_PROJECT_ROOT / ".env")
+
+_env_loaded = False
+
+
+def _load_env() -> None:
+    """Load .env once per process (python-dotenv is imported lazily)."""
+    global _env_loaded
+    if _env_loaded:
+        return
+    from dotenv import load_dotenv
+
+    load_dotenv(_PROJECT_ROOT / ".env")
+    _env_loaded = True
 
 
 def _require(key: str) -> str:
@@ -20,46 +38,155 @@ def _require(key: str) -> str:
     return value
 
 
-# Google Sheets
-GOOGLE_SHEET_ID: str = _require("GOOGLE_SHEET_ID")
-GOOGLE_SHEET_TAB_INPUT: str = os.getenv("GOOGLE_SHEET_TAB_INPUT", "").strip()
-GOOGLE_SHEET_TAB_STATUS: str = os.getenv("GOOGLE_SHEET_TAB_STATUS", "").strip()
+def _optional(key: str, default: str = "") -> str:
+    return os.getenv(key, default).strip()
 
-if not GOOGLE_SHEET_TAB_INPUT:
-    raise RuntimeError("Missing required env variable: GOOGLE_SHEET_TAB_INPUT")
 
-if not GOOGLE_SHEET_TAB_STATUS:
-    raise RuntimeError("Missing required env variable: GOOGLE_SHEET_TAB_STATUS")
+def _optional_float(key: str) -> float | None:
+    value = _optional(key)
+    return float(value) if value else None
 
-GOOGLE_SHEET_TAB: str = GOOGLE_SHEET_TAB_INPUT  # alias used by run_once
 
-GOOGLE_SERVICE_ACCOUNT_JSON: str = _require("GOOGLE_SERVICE_ACCOUNT_JSON")
+def _storage_backend() -> str:
+    value = (_optional("STAGE0_STORAGE_BACKEND", "sheets") or "sheets").lower()
+    if value not in ("sheets", "sqlite"):
+        raise RuntimeError(f"Invalid STAGE0_STORAGE_BACKEND: {value!r} (expected 'sheets' or 'sqlite')")
+    return value
 
-# SMTP
-SMTP_HOST: str = _require("SMTP_HOST")
-SMTP_PORT: int = int(os.getenv("SMTP_PORT", "587"))
-SMTP_USER: str = _require("SMTP_USER")
-SMTP_PASS: str = _require("SMTP_PASS")
-SMTP_FROM_EMAIL: str = _require("SMTP_FROM_EMAIL")
-SMTP_FROM_NAME: str = os.getenv("SMTP_FROM_NAME", "").strip()
 
-# Calendar
-CALENDAR_URL: str = _require("CALENDAR_URL")
+def _optional_int(key: str) -> int | None:
+    value = _optional(key)
+    return int(value) if value else None
+
+
+# Setting name → zero-argument factory.  Evaluated on first access only.
+_SETTINGS: dict[str, Callable[[], Any]] = {
+    # Google Sheets
+    "GOOGLE_SHEET_ID": lambda: _require("GOOGLE_SHEET_ID"),
+    "GOOGLE_SHEET_TAB_INPUT": lambda: _require("GOOGLE_SHEET_TAB_INPUT"),
+    "GOOGLE_SHEET_TAB_STATUS": lambda: _require("GOOGLE_SHEET_TAB_STATUS"),
+    "GOOGLE_SHEET_TAB": lambda: _require("GOOGLE_SHEET_TAB_INPUT"),  # alias used by run_once
+    "GOOGLE_SERVICE_ACCOUNT_JSON": lambda: _require("GOOGLE_SERVICE_ACCOUNT_JSON"),
+    # Opt-in metadata cache (token, worksheet IDs, headers).  Empty = disabled.
+    "STAGE0_SHEETS_CACHE_PATH": lambda: _optional("STAGE0_SHEETS_CACHE_PATH"),
+    # Opt-in status tab mirror (block diff sync, holds lead rows).  Empty = disabled.
+    "STAGE0_STATUS_MIRROR_PATH": lambda: _optional("STAGE0_STATUS_MIRROR_PATH"),
+    # Typed date path (src/storage/serial_dates.py): dates as serial numbers, RAW.
+    "STAGE0_SHEETS_SERIAL_DATES": lambda: _optional("STAGE0_SHEETS_SERIAL_DATES", "0") == "1",
+    # Rows per append call when creating status rows (failed chunks halve).
+    "STAGE0_APPEND_CHUNK_ROWS": lambda: _optional_int("STAGE0_APPEND_CHUNK_ROWS") or 1000,
+    # Row anchors: developer metadata per status row; writes target the lead.
+    "STAGE0_ROW_ANCHORS": lambda: _optional("STAGE0_ROW_ANCHORS", "0") == "1",
+    # Archive of settled leads (src/stage0/archive.py).  The tab name enables
+    # the archive index (never-resend check); the age enables the job's
+    # archival step.  Empty = disabled.
+    "STAGE0_ARCHIVE_TAB": lambda: _optional("STAGE0_ARCHIVE_TAB") or None,
+    "STAGE0_ARCHIVE_AFTER_DAYS": lambda: _optional_int("STAGE0_ARCHIVE_AFTER_DAYS"),
+    # Lead store: "sheets" (Google) or "sqlite" (src/storage/local.py).
+    "STAGE0_STORAGE_BACKEND": lambda: _storage_backend(),
+    "STAGE0_SQLITE_PATH": lambda: _optional("STAGE0_SQLITE_PATH", "data/stage0.sqlite3"),
+    # SMTP
+    "SMTP_HOST": lambda: _require("SMTP_HOST"),
+    "SMTP_PORT": lambda: int(os.getenv("SMTP_PORT", "587")),
+    "SMTP_USER": lambda: _require("SMTP_USER"),
+    "SMTP_PASS": lambda: _require("SMTP_PASS"),
+    "SMTP_FROM_EMAIL": lambda: _require("SMTP_FROM_EMAIL"),
+    "SMTP_FROM_NAME": lambda: _optional("SMTP_FROM_NAME"),
+    # Calendar
+    "CALENDAR_URL": lambda: _require("CALENDAR_URL"),
+    # Attachments (paths relative to project root)
+    "STAGE0_PDF_1": lambda: _require("STAGE0_PDF_1"),
+    "STAGE0_PDF_2": lambda: _require("STAGE0_PDF_2"),
+    "STAGE0_PDF_3": lambda: _require("STAGE0_PDF_3"),
+    # Aliases used by run_once (map old names → new STAGE0_PDF_* constants)
+    "ATTACHMENT_A": lambda: _require("STAGE0_PDF_1"),
+    "ATTACHMENT_B": lambda: _require("STAGE0_PDF_2"),
+    "ATTACHMENT_C": lambda: _require("STAGE0_PDF_3"),
+    "APP_ENV": lambda: _optional("APP_ENV", "local"),
+    # Per-run limits for process_new_leads.  Empty = unlimited; the rest is
+    # carried over to the next scheduled run.
+    "STAGE0_RUN_BUDGET_SECONDS": lambda: _optional_float("STAGE0_RUN_BUDGET_SECONDS"),
+    "STAGE0_MAX_SENDS_PER_RUN": lambda: _optional_int("STAGE0_MAX_SENDS_PER_RUN"),
+    # Run metrics export (src/stage0/metrics.py); empty = disabled.
+    "STAGE0_METRICS_PROM_PATH": lambda: _optional("STAGE0_METRICS_PROM_PATH"),
+    "STAGE0_METRICS_JSONL_PATH": lambda: _optional("STAGE0_METRICS_JSONL_PATH"),
+    # Chrome trace-event output (src/core/tracing.py); empty = tracing off.
+    "STAGE0_TRACE_PATH": lambda: _optional("STAGE0_TRACE_PATH"),
+    # Next-due follow-up schedule (src/stage0/schedule.py); empty = full pass every run.
+    "STAGE0_FOLLOWUP_SCHEDULE_PATH": lambda: _optional("STAGE0_FOLLOWUP_SCHEDULE_PATH"),
+    # Formula mode: the sheet computes "Wymaga follow-upu" (ARRAYFORMULA in its header).
+    # The sheet recalculates hourly, so a flag may turn YES up to an hour after its
+    # due time; installing the formula also sets the spreadsheet zone to Europe/Warsaw.
+    "STAGE0_FOLLOWUP_FORMULA": lambda: _optional("STAGE0_FOLLOWUP_FORMULA", "0") == "1",
+    # Per-run cProfile / tracemalloc reports (src/core/profiling.py): cpu | memory | all.
+    "STAGE0_PROFILE": lambda: _optional("STAGE0_PROFILE"),
+    "STAGE0_PROFILE_DIR": lambda: _optional("STAGE0_PROFILE_DIR", "logs") or "logs",
+    "STAGE0_PROFILE_TOP": lambda: _optional_int("STAGE0_PROFILE_TOP") or 25,
+    # Multi-tenant runner (python -m src.stage0.tenants)
+    "STAGE0_TENANTS_FILE": lambda: _optional("STAGE0_TENANTS_FILE"),
+    "STAGE0_TENANT_WORKERS": lambda: int(_optional("STAGE0_TENANT_WORKERS", "4") or "4"),
+    # Sharded send mode (python -m src.stage0.sharding)
+    "STAGE0_SHARD_COUNT": lambda: int(_optional("STAGE0_SHARD_COUNT", "1") or "1"),
+    "STAGE0_SHARD_INDEX": lambda: int(_optional("STAGE0_SHARD_INDEX", "0") or "0"),
+    "STAGE0_WORKER_ID": lambda: _optional("STAGE0_WORKER_ID"),
+    "STAGE0_LEASE_SECONDS": lambda: float(_optional("STAGE0_LEASE_SECONDS", "900") or "900"),
+    # Push intake service (python -m api.intake)
+    "STAGE0_INTAKE_HOST": lambda: _optional("STAGE0_INTAKE_HOST", "127.0.0.1"),
+    "STAGE0_INTAKE_PORT": lambda: int(_optional("STAGE0_INTAKE_PORT", "8081") or "8081"),
+    "STAGE0_INTAKE_TOKEN": lambda: _optional("STAGE0_INTAKE_TOKEN") or None,
+    "STAGE0_INTAKE_BATCH_SECONDS": lambda: float(_optional("STAGE0_INTAKE_BATCH_SECONDS", "2") or "2"),
+    # Read-only stats API (python -m api.stats); the job writes the snapshot
+    # it serves (src/stage0/stats_snapshot.py).  Empty path = no snapshot.
+    "STAGE0_STATS_SNAPSHOT_PATH": lambda: _optional("STAGE0_STATS_SNAPSHOT_PATH"),
+    "STAGE0_STATS_HOST": lambda: _optional("STAGE0_STATS_HOST", "127.0.0.1"),
+    "STAGE0_STATS_PORT": lambda: int(_optional("STAGE0_STATS_PORT", "8082") or "8082"),
+    "STAGE0_STATS_TOKEN": lambda: _optional("STAGE0_STATS_TOKEN") or None,
+    # Test mode — redirects all outbound emails to a single internal address.
+    # TEST_RECIPIENT_EMAIL is validated at runtime (process_new_leads startup),
+    # not here, because it is only required when STAGE0_TEST_MODE=1.
+    "STAGE0_TEST_MODE": lambda: _optional("STAGE0_TEST_MODE", "0") == "1",
+    "TEST_RECIPIENT_EMAIL": lambda: _optional("TEST_RECIPIENT_EMAIL") or None,
+}
+
+# Settings that must be present for a production run (checked by validate()).
+# The Google ones are skipped when STAGE0_STORAGE_BACKEND=sqlite.
+_REQUIRED_SHEETS = (
+    "GOOGLE_SHEET_ID",
+    "GOOGLE_SHEET_TAB_INPUT",
+    "GOOGLE_SHEET_TAB_STATUS",
+    "GOOGLE_SERVICE_ACCOUNT_JSON",
+)
+_REQUIRED = _REQUIRED_SHEETS + (
+    "SMTP_HOST",
+    "SMTP_USER",
+    "SMTP_PASS",
+    "SMTP_FROM_EMAIL",
+    "CALENDAR_URL",
+    "STAGE0_PDF_1",
+    "STAGE0_PDF_2",
+    "STAGE0_PDF_3",
+)
+
+
+def __getattr__(name: str) -> Any:
+    factory = _SETTINGS.get(name)
+    if factory is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    _load_env()
+    value = factory()
+    globals()[name] = value  # cache — later reads are plain attribute lookups
+    return value
 
-# Attachments (paths relative to project root)
-STAGE0_PDF_1: str = _require("STAGE0_PDF_1")
-STAGE0_PDF_2: str = _require("STAGE0_PDF_2")
-STAGE0_PDF_3: str = _require("STAGE0_PDF_3")
 
-# Aliases used by run_once (map old names → new STAGE0_PDF_* constants)
-ATTACHMENT_A: str = STAGE0_PDF_1
-ATTACHMENT_B: str = STAGE0_PDF_2
-ATTACHMENT_C: str = STAGE0_PDF_3
+def __dir__() -> list[str]:
+    return sorted(set(globals()) | set(_SETTINGS))
 
-APP_ENV: str = os.getenv("APP_ENV", "local").strip()
 
-# Test mode — redirects all outbound emails to a single internal address.
-# TEST_RECIPIENT_EMAIL is validated at runtime (process_new_leads startup),
-# not here, because it is only required when STAGE0_TEST_MODE=1.
-STAGE0_TEST_MODE: bool = os.getenv("STAGE0_TEST_MODE", "0").strip() == "1"
-TEST_RECIPIENT_EMAIL: str | None = os.getenv("TEST_RECIPIENT_EMAIL", "").strip() or None
+def validate() -> None:
+    """Resolve every required setting; raise RuntimeError on the first missing one."""
+    required = _REQUIRED
+    if __getattr__("STAGE0_STORAGE_BACKEND") == "sqlite":
+        required = tuple(n for n in _REQUIRED if n not in _REQUIRED_SHEETS)
+    for name in required:
+        if name not in globals():
+            __getattr__(name)
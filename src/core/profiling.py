@@ -0,0 +1,171 @@
+"""Optional per-run profiling — cProfile and tracemalloc reports in logs/.
+
+When a production run suddenly takes 10× longer, re-running blind rarely
+reproduces it.  With STAGE0_PROFILE (or ``python -m src.stage0.job
+--profile ...``) the real run is recorded instead:
+
+- ``cpu``    — cProfile; writes ``stage0-<ts>-<pid>.prof`` (open with
+  ``python -m pstats``, snakeviz, ...) and ``stage0-<ts>-<pid>-cpu.txt``
+  (top functions by cumulative time);
+- ``memory`` — tracemalloc; writes ``stage0-<ts>-<pid>-alloc.txt`` (top
+  allocation sites by size, plus current / peak traced memory);
+- ``all`` (or ``cpu,memory``) — both.
+
+Files go to STAGE0_PROFILE_DIR (default ``logs/``); reports list
+STAGE0_PROFILE_TOP entries (default 25).  Both report kinds hold only
+code locations, sizes and timings — never cell values, names or emails.
+
+session() knows the file paths up front, so the job can put them in its
+run summary (log line and metrics JSON) while the run is still going.
+cProfile and tracemalloc slow the run down (tracemalloc noticeably);
+leave the switch off outside investigations.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Iterator
+
+logger = logging.getLogger(__name__)
+
+MODES = ("cpu", "memory")
+DEFAULT_TOP = 25
+
+_active: Profile | None = None
+
+
+def parse_modes(value: str | None) -> frozenset[str]:
+    """"cpu" / "memory" / "all" / "cpu,memory" → set of modes; "" → empty."""
+    modes: set[str] = set()
+    for part in (value or "").replace(" ", "").lower().split(","):
+        if not part or part in ("0", "off", "none"):
+            continue
+        if part == "all":
+            modes.update(MODES)
+        elif part in MODES:
+            modes.add(part)
+        else:
+            raise RuntimeError(f"Invalid STAGE0_PROFILE: {value!r} (expected cpu, memory or all)")
+    return frozenset(modes)
+
+
+class Profile:
+    """One profiled run: the modes and the report paths it writes."""
+
+    def __init__(self, modes: frozenset[str], directory: str | Path, top: int) -> None:
+        self.modes = modes
+        self.top = max(1, top)
+        stem = f"stage0-{time.strftime('%Y%m%d-%H%M%S')}-{os.getpid()}"
+        base = Path(directory)
+        self.paths: dict[str, Path] = {}
+        if "cpu" in modes:
+            self.paths["cpu_profile"] = base / f"{stem}.prof"
+            self.paths["cpu_report"] = base / f"{stem}-cpu.txt"
+        if "memory" in modes:
+            self.paths["memory_report"] = base / f"{stem}-alloc.txt"
+
+    def summary(self) -> dict[str, str]:
+        """Report paths as strings (for log lines and metrics JSON)."""
+        return {name: str(path) for name, path in self.paths.items()}
+
+
+def current() -> Profile | None:
+    """The profile being recorded, if any."""
+    return _active
+
+
+@contextmanager
+def session(
+    modes: frozenset[str] | str | None,
+    directory: str | Path = "logs",
+    *,
+    top: int = DEFAULT_TOP,
+) -> Iterator[Profile | None]:
+    """Profile the enclosed block; does nothing when *modes* is empty.
+
+    Reports are written even when the block raises.  Write errors are
+    logged, never raised — profiling must not fail the run.
+    """
+    global _active
+    if isinstance(modes, str) or modes is None:
+        modes = parse_modes(modes)
+    if not modes:
+        yield None
+        return
+
+    profile = Profile(modes, directory, top)
+    profiler = None
+    started_tracemalloc = False
+    if "memory" in modes:
+        import tracemalloc
+
+        if not tracemalloc.is_tracing():  # leave an outer tracer (benchmarks) running
+            tracemalloc.start()
+            started_tracemalloc = True
+    if "cpu" in modes:
+        import cProfile
+
+        profiler = cProfile.Profile()
+        profiler.enable()
+    _active = profile
+    try:
+        yield profile
+    finally:
+        _active = None
+        if profiler is not None:
+            profiler.disable()
+        try:
+            Path(directory).mkdir(parents=True, exist_ok=True)
+            if profiler is not None:
+                _write_cpu(profile, profiler)
+            if "memory" in modes:
+                _write_memory(profile)
+            logger.info("Profile written — %s", " ".join(f"{k}={v}" for k, v in profile.summary().items()))
+        except OSError as exc:
+            logger.warning("Could not write profile to %s: %s", directory, exc)
+        finally:
+            if started_tracemalloc:
+                import tracemalloc
+
+                tracemalloc.stop()
+
+
+def _write_cpu(profile: Profile, profiler: Any) -> None:
+    import io
+    import pstats
+
+    profiler.dump_stats(str(profile.paths["cpu_profile"]))
+    buffer = io.StringIO()
+    stats = pstats.Stats(profiler, stream=buffer)
+    stats.sort_stats("cumulative").print_stats(profile.top)
+    profile.paths["cpu_report"].write_text(buffer.getvalue(), encoding="utf-8")
+
+
+def _write_memory(profile: Profile) -> None:
+    import tracemalloc
+
+    current_bytes, peak_bytes = tracemalloc.get_traced_memory()
+    snapshot = tracemalloc.take_snapshot().filter_traces((
+        tracemalloc.Filter(False, tracemalloc.__file__),
+        tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+        tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+        tracemalloc.Filter(False, "<unknown>"),
+    ))
+    stats = snapshot.statistics("lineno")
+    lines = [
+        f"traced memory: current={current_bytes / 1e6:.2f} MB peak={peak_bytes / 1e6:.2f} MB",
+        f"top {profile.top} allocation sites by size (of {len(stats)}):",
+        "",
+    ]
+    for index, stat in enumerate(stats[: profile.top], 1):
+        frame = stat.traceback[0]
+        lines.append(
+            f"#{index:<3} {frame.filename}:{frame.lineno}  "
+            f"size={stat.size / 1024:.1f} KiB  count={stat.count}  "
+            f"avg={stat.size // max(stat.count, 1)} B"
+        )
+    profile.paths["memory_report"].write_text("\n".join(lines) + "\n", encoding="utf-8")
@@ -0,0 +1,203 @@
+"""Optional tracing — timed spans exported as Chrome trace-event JSON.
+
+Spans wrap SheetsClient calls (and each 429 retry attempt), the SMTP
+phases of send_email_draft() and per-lead / follow-up batch work, so a
+slow run can be opened in chrome://tracing or https://ui.perfetto.dev
+and read off a timeline.
+
+Disabled by default.  While disabled, span() returns a shared no-op
+object and @traced functions call straight through after one global
+check, so instrumented code pays well under a microsecond per call.
+
+Enable with STAGE0_TRACE_PATH (the job, tenants and shard entrypoints
+call session()); ``{pid}`` in the path is replaced by the process id,
+so several sharded workers can trace side by side.
+
+Spans are PII-free: an ``email`` attribute is never stored, it is
+replaced by ``lead`` — a short SHA-256 of the normalized address, the
+same for the same lead across runs.  Exceptions are recorded by type
+name only (SMTP / API messages may quote addresses).
+"""
+
+from __future__ import annotations
+
+import functools
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Callable, Iterator, TypeVar
+
+logger = logging.getLogger(__name__)
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+_tracer: Tracer | None = None
+
+
+def hash_email(email: str) -> str:
+    """Stable, non-reversible lead id for logs and traces."""
+    import hashlib
+
+    return hashlib.sha256(email.strip().lower().encode("utf-8")).hexdigest()[:16]
+
+
+class Tracer:
+    """Collects finished spans as Chrome "complete" (ph=X) events."""
+
+    def __init__(self) -> None:
+        self._origin_ns = time.perf_counter_ns()
+        self._pid = os.getpid()
+        self._events: list[dict[str, Any]] = []
+        self._threads: dict[int, str] = {}
+        self._lock = threading.Lock()
+
+    def record(self, name: str, start_ns: int, end_ns: int, args: dict[str, Any]) -> None:
+        thread = threading.current_thread()
+        event = {
+            "name": name,
+            "ph": "X",
+            "ts": (start_ns - self._origin_ns) / 1000,
+            "dur": (end_ns - start_ns) / 1000,
+            "pid": self._pid,
+            "tid": thread.ident,
+            "args": args,
+        }
+        with self._lock:
+            self._events.append(event)
+            self._threads.setdefault(thread.ident or 0, thread.name)
+
+    def events(self) -> list[dict[str, Any]]:
+        """Recorded spans plus thread-name metadata, in Chrome trace-event form."""
+        with self._lock:
+            spans = list(self._events)
+            threads = dict(self._threads)
+        names = [
+            {"name": "thread_name", "ph": "M", "pid": self._pid, "tid": tid, "args": {"name": name}}
+            for tid, name in threads.items()
+        ]
+        return names + spans
+
+
+class _NoopSpan:
+    __slots__ = ()
+
+    def __enter__(self) -> _NoopSpan:
+        return self
+
+    def __exit__(self, *exc: Any) -> bool:
+        return False
+
+    def set(self, **attrs: Any) -> None:
+        pass
+
+
+_NOOP = _NoopSpan()
+
+
+class _Span:
+    __slots__ = ("_tracer", "_name", "_args", "_start_ns")
+
+    def __init__(self, tracer: Tracer, name: str, attrs: dict[str, Any]) -> None:
+        self._tracer = tracer
+        self._name = name
+        self._args = _scrub(attrs)
+        self._start_ns = 0
+
+    def __enter__(self) -> _Span:
+        self._start_ns = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, exc_type: Any, exc: Any, tb: Any) -> bool:
+        if exc_type is not None:
+            self._args["error"] = exc_type.__name__
+        self._tracer.record(self._name, self._start_ns, time.perf_counter_ns(), self._args)
+        return False
+
+    def set(self, **attrs: Any) -> None:
+        self._args.update(_scrub(attrs))
+
+
+def _scrub(attrs: dict[str, Any]) -> dict[str, Any]:
+    if "email" in attrs:
+        attrs = dict(attrs)
+        attrs["lead"] = hash_email(str(attrs.pop("email") or ""))
+    return attrs
+
+
+def span(name: str, **attrs: Any) -> _Span | _NoopSpan:
+    """Context manager timing one span; a no-op while tracing is disabled."""
+    tracer = _tracer
+    if tracer is None:
+        return _NOOP
+    return _Span(tracer, name, attrs)
+
+
+def traced(name: str) -> Callable[[F], F]:
+    """Decorator: run the function inside span(*name*) when tracing is on."""
+
+    def decorator(fn: F) -> F:
+        @functools.wraps(fn)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            tracer = _tracer
+            if tracer is None:
+                return fn(*args, **kwargs)
+            with _Span(tracer, name, {}):
+                return fn(*args, **kwargs)
+
+        return wrapper  # type: ignore[return-value]
+
+    return decorator
+
+
+def enabled() -> bool:
+    return _tracer is not None
+
+
+def enable() -> Tracer:
+    """Start collecting spans process-wide (replaces any active tracer)."""
+    global _tracer
+    _tracer = Tracer()
+    return _tracer
+
+
+def disable() -> Tracer | None:
+    """Stop collecting; returns the tracer that was active, if any."""
+    global _tracer
+    tracer, _tracer = _tracer, None
+    return tracer
+
+
+def write_chrome_trace(path: str | Path, tracer: Tracer) -> Path:
+    """Write *tracer*'s spans as a Chrome trace-event JSON file."""
+    import json
+
+    target = Path(str(path).replace("{pid}", str(os.getpid())))
+    target.parent.mkdir(parents=True, exist_ok=True)
+    with open(target, "w", encoding="utf-8") as fh:
+        json.dump({"traceEvents": tracer.events(), "displayTimeUnit": "ms"}, fh)
+    return target
+
+
+@contextmanager
+def session(path: str | None) -> Iterator[Tracer | None]:
+    """Trace the enclosed block to *path*; does nothing when *path* is empty.
+
+    The file is written even when the block raises, so failed runs can be
+    inspected too.  Write errors are logged, never raised.
+    """
+    if not path:
+        yield None
+        return
+    tracer = enable()
+    try:
+        yield tracer
+    finally:
+        disable()
+        try:
+            written = write_chrome_trace(path, tracer)
+            logger.info("Trace written — path=%s events=%d", written, len(tracer.events()))
+        except OSError as exc:
+            logger.warning("Could not write trace to %s: %s", path, exc)
@@ -3,16 +3,35 @@
 from __future__ import annotations
 
 import logging
-import smtplib
-from email.mime.application import MIMEApplication
-from email.mime.multipart import MIMEMultipart
-from email.mime.text import MIMEText
+from functools import lru_cache
+from pathlib import Path
+from typing import TYPE_CHECKING
 
-from src.email.template_stage0 import EmailDraft
+from src.core.tracing import span
+
+if TYPE_CHECKING:
+    from src.email.template_stage0 import EmailDraft
 
 logger = logging.getLogger(__name__)
 
 
+@lru_cache(maxsize=32)
+def _read_attachment_cached(path: str, mtime_ns: int, size: int) -> bytes:  # noqa: ARG001
+    with open(path, "rb") as fh:
+        return fh.read()
+
+
+def read_attachment_bytes(path: Path) -> bytes:
+    """Return the content of *path*, cached per process.
+
+    The cache key includes mtime and size, so replacing a PDF on disk is
+    picked up on the next send.  Every lead (and every tenant in a
+    multi-tenant run) that uses the same file shares one in-memory copy.
+    """
+    stat = path.stat()
+    return _read_attachment_cached(str(path.resolve()), stat.st_mtime_ns, stat.st_size)
+
+
 def send_email_draft(
     *,
     smtp_host: str,
@@ -26,26 +45,38 @@ def send_email_draft(
     """Send *draft* to *to_email* via SMTP with STARTTLS.
 
     Raises on any failure so the caller can record the error.
+    The SMTP client and MIME stack are imported here, on the first send,
+    so runs with nothing to send never pay for them.
     """
-    msg = MIMEMultipart()
-    msg["From"] = from_email
-    msg["To"] = to_email
-    msg["Subject"] = draft.subject
-    msg.attach(MIMEText(draft.body, "plain", "utf-8"))
-
-    for path in draft.attachments:
-        if not path.is_file():
-            raise FileNotFoundError(f"Attachment not found: {path}")
-        with open(path, "rb") as fh:
-            part = MIMEApplication(fh.read(), Name=path.name)
-        part["Content-Disposition"] = f'attachment; filename="{path.name}"'
-        msg.attach(part)
-
-    with smtplib.SMTP(smtp_host, smtp_port, timeout=30) as server:
-        server.ehlo()
-        server.starttls()
-        server.ehlo()
-        server.login(smtp_user, smtp_password)
-        server.send_message(msg)
+    import smtplib
+    from email.mime.application import MIMEApplication
+    from email.mime.multipart import MIMEMultipart
+    from email.mime.text import MIMEText
+
+    with span("smtp.mime", attachments=len(draft.attachments)):
+        msg = MIMEMultipart()
+        msg["From"] = from_email
+        msg["To"] = to_email
+        msg["Subject"] = draft.subject
+        msg.attach(MIMEText(draft.body, "plain", "utf-8"))
+
+        for path in draft.attachments:
+            if not path.is_file():
+                raise FileNotFoundError(f"Attachment not found: {path}")
+            part = MIMEApplication(read_attachment_bytes(path), Name=path.name)
+            part["Content-Disposition"] = f'attachment; filename="{path.name}"'
+            msg.attach(part)
+
+    with span("smtp.connect"):
+        connection = smtplib.SMTP(smtp_host, smtp_port, timeout=30)
+    with connection as server:
+        with span("smtp.starttls"):
+            server.ehlo()
+            server.starttls()
+            server.ehlo()
+        with span("smtp.login"):
+            server.login(smtp_user, smtp_password)
+        with span("smtp.send", email=to_email):
+            server.send_message(msg)
 
     logger.info("Email sent to=%s subject=%r", to_email, draft.subject)
@@ -0,0 +1,123 @@
+"""Streaming reader for Meta Lead Ads exports (CSV or XLSX).
+
+Yields one lead at a time, mapped to the input tab's columns
+(INPUT_HEADERS), so exports of any size are read in constant memory.
+
+Meta's CSV download is usually UTF-16 with tab separators and phone values
+prefixed with ``p:`` (to stop spreadsheet apps from reformatting them); all
+of that is handled here.  XLSX needs the optional ``openpyxl`` package,
+which is imported only when an .xlsx file is read.
+"""
+
+from __future__ import annotations
+
+import codecs
+import csv
+import re
+from pathlib import Path
+from typing import Any, Iterator
+
+# Normalized Meta column name → input-tab field.  First match wins.  The
+# input tab's own headers are accepted too (CSV downloads of the tab).
+_NAME_COLUMNS = (
+    "full_name", "imię_i_nazwisko", "imie_i_nazwisko", "name", "company_name",
+    "imię_i_nazwisko_/_firma",
+)
+_FIRST_LAST = ("first_name", "last_name")
+_EMAIL_COLUMNS = ("email", "e-mail", "adres_e-mail", "work_email")
+_PHONE_COLUMNS = (
+    "phone_number", "phone", "telefon", "numer_telefonu", "work_phone_number", "telefon_dodatkowy",
+)
+
+
+def _normalize_column(name: Any) -> str:
+    return re.sub(r"\s+", "_", str(name or "").strip().lower())
+
+
+def _clean_phone(value: str) -> str:
+    value = value.strip()
+    return value[2:].strip() if value.lower().startswith("p:") else value
+
+
+class _ColumnMap:
+    """Resolves the export's header row to name / email / phone positions."""
+
+    def __init__(self, header: list[Any]) -> None:
+        cols = {}
+        for idx, raw in enumerate(header):
+            cols.setdefault(_normalize_column(raw), idx)
+
+        def first(candidates: tuple[str, ...]) -> int | None:
+            return next((cols[c] for c in candidates if c in cols), None)
+
+        self.email = first(_EMAIL_COLUMNS)
+        if self.email is None:
+            raise ValueError(f"No email column in export header (looked for: {', '.join(_EMAIL_COLUMNS)})")
+        self.name = first(_NAME_COLUMNS)
+        self.first_last = tuple(cols.get(c) for c in _FIRST_LAST)
+        self.phone = first(_PHONE_COLUMNS)
+
+    def to_lead(self, row: list[Any]) -> dict[str, str]:
+        def cell(idx: int | None) -> str:
+            if idx is None or idx >= len(row) or row[idx] is None:
+                return ""
+            return str(row[idx]).strip()
+
+        name = cell(self.name)
+        if not name:
+            name = " ".join(p for p in (cell(i) for i in self.first_last) if p)
+        return {
+            "Imię i nazwisko / Firma": name,
+            "Email": cell(self.email),
+            "Telefon dodatkowy": _clean_phone(cell(self.phone)),
+        }
+
+
+def _detect_encoding(path: Path) -> str:
+    with open(path, "rb") as fh:
+        head = fh.read(4)
+    if head.startswith((codecs.BOM_UTF16_LE, codecs.BOM_UTF16_BE)):
+        return "utf-16"
+    return "utf-8-sig"
+
+
+def _iter_csv_rows(path: Path) -> Iterator[list[str]]:
+    with open(path, encoding=_detect_encoding(path), newline="") as fh:
+        first_line = fh.readline()
+        delimiter = max(("\t", ",", ";"), key=first_line.count)
+        fh.seek(0)
+        yield from csv.reader(fh, delimiter=delimiter)
+
+
+def _iter_xlsx_rows(path: Path) -> Iterator[list[Any]]:
+    try:
+        from openpyxl import load_workbook
+    except ImportError as exc:
+        raise RuntimeError("Reading .xlsx exports requires openpyxl (pip install openpyxl)") from exc
+
+    workbook = load_workbook(path, read_only=True, data_only=True)
+    try:
+        for row in workbook.active.iter_rows(values_only=True):
+            yield list(row)
+    finally:
+        workbook.close()
+
+
+def iter_meta_leads(path: str | Path) -> Iterator[dict[str, str]]:
+    """Yield leads from a Meta export as dicts keyed by INPUT_HEADERS.
+
+    Values are stripped; emails are returned as written (normalization and
+    deduplication are the caller's job, as with read_input_rows()).  Blank
+    lines are skipped.  Raises ValueError when the header has no email column.
+    """
+    path = Path(path)
+    rows = _iter_xlsx_rows(path) if path.suffix.lower() in (".xlsx", ".xlsm") else _iter_csv_rows(path)
+
+    column_map: _ColumnMap | None = None
+    for row in rows:
+        if not any(str(v or "").strip() for v in row):
+            continue
+        if column_map is None:
+            column_map = _ColumnMap(row)
+            continue
+        yield column_map.to_lead(row)
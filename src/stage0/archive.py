@@ -0,0 +1,171 @@
+"""Stage 0 — move settled leads out of the status tab.
+
+A status row is *settled* once the email went out ("Email wysłany") and a
+salesperson recorded the follow-up ("Follow-up wykonany"): nothing in
+Stage 0 writes to it again, yet every run still downloads and evaluates
+it.  run_archive() moves settled rows older than STAGE0_ARCHIVE_AFTER_DAYS
+(counted from the later of the two dates) into the archive tab
+(STAGE0_ARCHIVE_TAB, or the ``archive`` table of the SQLite store) with
+one append and one batched delete, so the status tab grows with active
+leads rather than total history.
+
+Never resend: input rows are not archived, and ensure_status_rows_exist()
+/ get_new_leads() check SheetsClient.get_archived_emails(), so an
+archived lead neither gets a new status row nor counts as new.  Keep
+STAGE0_ARCHIVE_TAB set once rows have been archived.
+
+Deleting rows renumbers the rows below them.  The job archives after
+sending and the follow-up pass, re-reading the tab first; do not enable
+it where the intake service or sharded workers write to the same tab
+concurrently — run ``python -m src.stage0.archive`` in a quiet window
+instead.
+
+Usage:
+    python -m src.stage0.archive                  # STAGE0_ARCHIVE_AFTER_DAYS
+    python -m src.stage0.archive --after-days 90 --dry-run
+"""
+
+from __future__ import annotations
+
+import argparse
+import logging
+import sys
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import TYPE_CHECKING, Any, Mapping, Sequence
+
+from src.stage0.batch import parse_sheet_datetime
+from src.stage0.followup import _SHEET_DT_FMT, WARSAW_TZ
+from src.stage0.metrics import StageTimer
+from src.storage.sheets import ARCHIVE_HEADERS, ARCHIVED_AT_COLUMN
+
+if TYPE_CHECKING:
+    from src.storage.sheets import SheetsClient
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class ArchiveReport:
+    rows_scanned: int
+    rows_archived: int
+    # read / archive wall time in seconds.
+    timings: dict[str, float] = field(default_factory=dict, compare=False)
+
+
+def _parsed(raw: Any) -> datetime | None:
+    try:
+        return parse_sheet_datetime(str(raw or "").strip())
+    except ValueError:
+        return None
+
+
+def settled_at(row: Mapping[str, Any]) -> datetime | None:
+    """When a status row became settled, or None while it is still active.
+
+    Settled = "Email wysłany" holds a valid timestamp and "Follow-up
+    wykonany" is filled.  The later of the two dates counts; a follow-up
+    note that is not a date leaves the send time.
+    """
+    if not str(row.get("Follow-up wykonany") or "").strip():
+        return None
+    sent = _parsed(row.get("Email wysłany"))
+    if sent is None:
+        return None
+    done = _parsed(row.get("Follow-up wykonany"))
+    return max(sent, done) if done is not None else sent
+
+
+def select_settled(
+    rows: Sequence[Mapping[str, Any]],
+    *,
+    now: datetime,
+    after_days: int,
+) -> list[int]:
+    """Indices of *rows* settled at least *after_days* before *now*."""
+    cutoff = now - timedelta(days=after_days)
+    selected = []
+    for idx, row in enumerate(rows):
+        if not str(row.get("Email", "")).strip():
+            continue
+        at = settled_at(row)
+        if at is not None and at <= cutoff:
+            selected.append(idx)
+    return selected
+
+
+def run_archive(
+    sheets_client: SheetsClient,
+    *,
+    after_days: int,
+    now: datetime | None = None,
+    dry_run: bool = False,
+) -> ArchiveReport:
+    """Move settled status rows older than *after_days* to the archive.
+
+    Reads the status tab once, then calls archive_status_rows() once with
+    every selected row (archive timestamp = *now*, Warsaw time).  With
+    *dry_run* only counts what would move.
+    """
+    timer = StageTimer()
+    timer_started = time.perf_counter()
+    if now is None:
+        now = datetime.now(WARSAW_TZ)
+
+    with timer.stage("read"):
+        rows = sheets_client.read_status_rows()
+        selected = select_settled(rows, now=now, after_days=after_days)
+
+    archived = 0
+    if selected and not dry_run:
+        archived_at = now.strftime(_SHEET_DT_FMT)
+        with timer.stage("archive"):
+            archived = sheets_client.archive_status_rows({
+                idx + 2: [
+                    archived_at if name == ARCHIVED_AT_COLUMN else str(rows[idx].get(name) or "")
+                    for name in ARCHIVE_HEADERS
+                ]
+                for idx in selected
+            })
+
+    timer.add("total", time.perf_counter() - timer_started)
+    logger.info(
+        "Archive pass done — scanned=%d settled=%d archived=%d dry_run=%s",
+        len(rows), len(selected), archived, dry_run,
+    )
+    return ArchiveReport(
+        rows_scanned=len(rows),
+        rows_archived=len(selected) if dry_run else archived,
+        timings=timer.as_dict(),
+    )
+
+
+def main(argv: list[str] | None = None) -> None:
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s [%(levelname)s] %(name)s — %(message)s",
+    )
+    parser = argparse.ArgumentParser(description="Move settled Stage 0 leads to the archive tab.")
+    parser.add_argument("--after-days", type=int, default=None, help="minimum age in days (default: STAGE0_ARCHIVE_AFTER_DAYS)")
+    parser.add_argument("--dry-run", action="store_true", help="only count the rows that would move")
+    args = parser.parse_args(argv)
+
+    try:
+        from src.core import config
+        from src.stage0.job import _build_sheets_client
+
+        after_days = args.after_days if args.after_days is not None else config.STAGE0_ARCHIVE_AFTER_DAYS
+        if after_days is None:
+            raise RuntimeError("Missing required environment variable: STAGE0_ARCHIVE_AFTER_DAYS (or pass --after-days)")
+        sheets = _build_sheets_client(None)
+        if not sheets.archive_enabled:
+            raise RuntimeError("Missing required environment variable: STAGE0_ARCHIVE_TAB")
+        run_archive(sheets, after_days=after_days, dry_run=args.dry_run)
+    except Exception:
+        logger.exception("Archive pass failed")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
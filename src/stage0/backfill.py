@@ -0,0 +1,235 @@
+"""Stage 0 — register historical leads as already contacted, without sending.
+
+A client onboarded with leads that were emailed by hand would otherwise
+see every one of them in get_new_leads().  run_backfill() gives each lead
+a status row with "Email wysłany" = *sent_at* and "Status emaila" =
+PRE_CONTACTED_STATUS.  A filled "Email wysłany" is what
+is_eligible_for_send() treats as delivered, so the job never emails these
+leads; nothing here touches SMTP.
+
+The leads come from the input tab, or from a CSV / XLSX file (any export
+iter_meta_leads() reads, including a download of the input tab); leads
+from a file that are not in the input tab yet are appended there too.
+Leads whose row already holds an "Email wysłany" are left alone, and so
+are rows a sender holds right now ("CLAIMED …" / "SENDING …" leases,
+IN_DOUBT_STATUS): only rows is_eligible_for_send() accepts are updated.
+
+Sheets cost is a few calls, not one per lead: one read of each tab, new
+status rows through append_status_rows_in_chunks() (status before input,
+as in src/stage0/ingest.py), and existing blank / ERROR rows through
+update_rows().  "Follow-up od" / "Wymaga follow-upu" are written as the
+follow-up pass would compute them (evaluate_followups()), so the next
+pass has nothing to rewrite; in formula mode the flag is left to the
+sheet.
+
+Usage:
+    python -m src.stage0.backfill                       # input tab, sent now
+    python -m src.stage0.backfill --csv exports/historical.csv --sent-at "2025-01-31 12:00"
+    python -m src.stage0.backfill --dry-run
+"""
+
+from __future__ import annotations
+
+import argparse
+import logging
+import sys
+import time
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import TYPE_CHECKING, Iterable, Mapping
+
+from src.stage0.batch import evaluate_followups, parse_sheet_datetime
+from src.stage0.followup import _SHEET_DT_FMT, WARSAW_TZ
+from src.stage0.metrics import StageTimer
+from src.stage0.schedule import clear_schedule
+from src.storage.sheets import STATUS_HEADERS, is_eligible_for_send
+
+if TYPE_CHECKING:
+    from src.storage.sheets import SheetsClient
+
+logger = logging.getLogger(__name__)
+
+PRE_CONTACTED_STATUS = "PRE-CONTACTED"
+
+
+@dataclass(frozen=True)
+class BackfillReport:
+    leads_read: int
+    missing_email: int
+    duplicates: int
+    already_contacted: int
+    leased: int  # rows held by a sender (lease / in-doubt) — left alone
+    status_rows_appended: int
+    status_rows_updated: int
+    input_rows_appended: int
+    # read / followups / append / update wall time in seconds.
+    timings: dict[str, float] = field(default_factory=dict, compare=False)
+
+
+def _followup_values(sent_at: str, now: datetime, formula: bool) -> dict[str, str]:
+    """Follow-up columns a row sent at *sent_at* settles on after follow-up passes.
+
+    The first pass only schedules (flag "NO"); the second flags a due date
+    that already passed, so both run here.
+    """
+    columns: dict[str, list] = {"Email wysłany": [sent_at]}
+    for _ in range(2):
+        result = evaluate_followups(columns, now=now)
+        columns.update({"Follow-up od": result.due_at, "Wymaga follow-upu": result.needs_followup})
+    values = {"Follow-up od": str(result.due_at[0] or "")}
+    if not formula:
+        values["Wymaga follow-upu"] = str(result.needs_followup[0] or "")
+    return values
+
+
+def run_backfill(
+    sheets_client: SheetsClient,
+    *,
+    sent_at: str,
+    leads: Iterable[Mapping[str, str]] | None = None,
+    now: datetime | None = None,
+    formula: bool = False,
+    dry_run: bool = False,
+    schedule_path: str | Path | None = None,
+) -> BackfillReport:
+    """Mark *leads* (default: the input tab) as contacted at *sent_at*.
+
+    *sent_at* is a 'YYYY-MM-DD HH:MM' Warsaw time (ValueError otherwise).
+    *leads* are dicts keyed by INPUT_HEADERS.  With *formula* (formula
+    mode) "Wymaga follow-upu" is not written.  With *dry_run* only counts.
+    After writing, the follow-up schedule at *schedule_path* is cleared
+    (src/stage0/schedule.py): its due times do not include the new rows.
+    """
+    parse_sheet_datetime(sent_at)
+    timer = StageTimer()
+    timer_started = time.perf_counter()
+    if now is None:
+        now = datetime.now(WARSAW_TZ)
+
+    with timer.stage("read"):
+        input_rows = sheets_client.read_input_rows()
+        known_inputs = {str(r.get("Email", "")).strip().lower() for r in input_rows}
+        status_rows = sheets_client.read_status_rows()
+        status_index = {
+            str(r.get("Email", "")).strip().lower(): (idx + 2, r)
+            for idx, r in enumerate(status_rows)
+            if str(r.get("Email", "")).strip()
+        }
+        archived = sheets_client.get_archived_emails()
+        if leads is None:
+            leads = input_rows
+
+    with timer.stage("followups"):
+        contacted = {
+            "Email wysłany": sent_at,
+            "Status emaila": PRE_CONTACTED_STATUS,
+            **_followup_values(sent_at, now, formula),
+        }
+
+    seen: set[str] = set()
+    new_inputs: list[list[str]] = []
+    new_status: list[list[str]] = []
+    updates: dict[int, dict[str, str]] = {}
+    leads_read = missing = duplicates = already = leased = 0
+    for lead in leads:
+        leads_read += 1
+        email = str(lead.get("Email", "")).strip().lower()
+        if not email:
+            missing += 1
+            continue
+        if email in seen:
+            duplicates += 1
+            continue
+        seen.add(email)
+        name = str(lead.get("Imię i nazwisko / Firma", "")).strip()
+        if email not in known_inputs:
+            new_inputs.append([name, email, str(lead.get("Telefon dodatkowy", "")).strip()])
+
+        existing = status_index.get(email)
+        if email in archived or (existing and str(existing[1].get("Email wysłany", "")).strip()):
+            already += 1
+        elif existing is None:
+            new_status.append([
+                name if h == "Lead" else email if h == "Email" else contacted.get(h, "")
+                for h in STATUS_HEADERS
+            ])
+        elif is_eligible_for_send(existing[1]):
+            updates[existing[0]] = dict(contacted)
+        else:
+            leased += 1
+
+    if not dry_run:
+        with timer.stage("append"):
+            if new_status:
+                sheets_client.append_status_rows_in_chunks(new_status)
+            if new_inputs:
+                sheets_client.append_input_rows(new_inputs)
+        with timer.stage("update"):
+            if updates:
+                sheets_client.update_rows(updates)
+        if new_status or updates:
+            clear_schedule(schedule_path)
+
+    timer.add("total", time.perf_counter() - timer_started)
+    report = BackfillReport(
+        leads_read=leads_read,
+        missing_email=missing,
+        duplicates=duplicates,
+        already_contacted=already,
+        leased=leased,
+        status_rows_appended=len(new_status),
+        status_rows_updated=len(updates),
+        input_rows_appended=len(new_inputs),
+        timings=timer.as_dict(),
+    )
+    logger.info(
+        "Backfill done — leads=%d appended=%d updated=%d already_contacted=%d leased=%d "
+        "duplicates=%d missing_email=%d new_inputs=%d dry_run=%s",
+        leads_read, len(new_status), len(updates), already, leased, duplicates, missing, len(new_inputs), dry_run,
+    )
+    return report
+
+
+def main(argv: list[str] | None = None) -> None:
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s [%(levelname)s] %(name)s — %(message)s",
+    )
+    parser = argparse.ArgumentParser(description="Register historical leads as contacted without sending.")
+    parser.add_argument("--csv", type=Path, default=None, help="read leads from a .csv / .xlsx file instead of the input tab")
+    parser.add_argument("--sent-at", default=None, help="'YYYY-MM-DD HH:MM' Warsaw time (default: now)")
+    parser.add_argument("--dry-run", action="store_true", help="only count what would be written")
+    args = parser.parse_args(argv)
+
+    try:
+        from src.core import config
+        from src.stage0.job import _build_sheets_client
+        from src.stage0.schedule import schedule_path_for
+
+        sent_at = args.sent_at or datetime.now(WARSAW_TZ).strftime(_SHEET_DT_FMT)
+        leads = None
+        if args.csv is not None:
+            from src.integrations.meta_export import iter_meta_leads
+
+            leads = iter_meta_leads(args.csv)
+        sheets = _build_sheets_client(None)
+        run_backfill(
+            sheets,
+            sent_at=sent_at,
+            leads=leads,
+            formula=config.STAGE0_FOLLOWUP_FORMULA,
+            dry_run=args.dry_run,
+            schedule_path=(
+                schedule_path_for(config.STAGE0_FOLLOWUP_SCHEDULE_PATH, None)
+                if config.STAGE0_FOLLOWUP_SCHEDULE_PATH
+                else None
+            ),
+        )
+    except Exception:
+        logger.exception("Backfill failed")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
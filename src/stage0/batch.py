@@ -0,0 +1,136 @@
+"""Stage 0 domain logic — column-at-a-time evaluation of the per-row rules.
+
+apply_followup_logic() takes one row dict at a time; the follow-up pass
+calls it for every status row and pays two strptime() calls per row.
+This module evaluates the same rules over the status tab as columns (one
+list per header):
+
+- date strings are parsed once per distinct value (a run's rows share a
+  few thousand timestamps at most) through a fixed-format fast path, with
+  strptime() only for unusual spellings;
+- due-date comparisons are memoised per distinct "Follow-up od" value,
+  since *now* is fixed for the batch.
+
+Results are identical to the row functions (tests/stage0/test_batch.py
+checks every rule), with missing cells read as "" — the way gspread
+returns blanks.  Pure functions only: no Sheets calls, no side effects.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Any, Mapping, Sequence
+
+from src.stage0.followup import _FOLLOWUP_DAYS, _SHEET_DT_FMT, WARSAW_TZ
+
+Columns = Mapping[str, Sequence[Any]]
+
+_SENT = "Email wysłany"
+_DUE = "Follow-up od"
+_FLAG = "Wymaga follow-upu"
+_DONE = "Follow-up wykonany"
+
+
+def to_columns(rows: Sequence[Mapping[str, Any]], names: Sequence[str]) -> dict[str, list[Any]]:
+    """Pivot row dicts into one list per column name (missing cells → "")."""
+    return {name: [row.get(name, "") for row in rows] for name in names}
+
+
+def parse_sheet_datetime(text: str) -> datetime:
+    """Parse 'YYYY-MM-DD HH:MM' (Warsaw time); ValueError when malformed.
+
+    Same result as ``datetime.strptime(text, _SHEET_DT_FMT)`` with the
+    Warsaw zone attached, without strptime's cost for canonical strings.
+    """
+    if (
+        len(text) == 16
+        and text[4] == "-" and text[7] == "-" and text[10] == " " and text[13] == ":"
+        and text.isascii()
+        and (text[:4] + text[5:7] + text[8:10] + text[11:13] + text[14:]).isdigit()
+    ):
+        return datetime(
+            int(text[:4]), int(text[5:7]), int(text[8:10]), int(text[11:13]), int(text[14:]),
+            tzinfo=WARSAW_TZ,
+        )
+    return datetime.strptime(text, _SHEET_DT_FMT).replace(tzinfo=WARSAW_TZ)
+
+
+def _parse_or_none(raw: Any) -> datetime | None:
+    try:
+        return parse_sheet_datetime(str(raw).strip())
+    except ValueError:
+        return None
+
+
+@dataclass(frozen=True)
+class FollowupColumns:
+    """Follow-up columns after the rules ran, plus the rows that changed.
+
+    ``due_at[i]`` / ``needs_followup[i]`` equal
+    ``apply_followup_logic(row_i)["Follow-up od" / "Wymaga follow-upu"]``;
+    ``changed`` lists the indices where apply_followup_logic() would have
+    returned a new dict rather than the input row.
+    """
+
+    due_at: list[Any]
+    needs_followup: list[Any]
+    changed: list[int]
+
+
+def evaluate_followups(columns: Columns, *, now: datetime | None = None) -> FollowupColumns:
+    """apply_followup_logic() over every row of *columns* in one pass.
+
+    Needs the "Email wysłany", "Follow-up od", "Wymaga follow-upu" and
+    "Follow-up wykonany" columns (absent columns read as blanks).  *now*
+    defaults to ``datetime.now(WARSAW_TZ)``, taken once for the batch.
+    """
+    if now is None:
+        now = datetime.now(WARSAW_TZ)
+    sent_col = columns.get(_SENT, ())
+    n = len(sent_col)
+    due_col = list(columns.get(_DUE, [""] * n))
+    flag_col = list(columns.get(_FLAG, [""] * n))
+    done_col = columns.get(_DONE, [""] * n)
+
+    scheduled: dict[Any, str | None] = {}   # sent value → new due string (None = malformed)
+    expected: dict[Any, str | None] = {}    # due value → YES / NO (None = malformed)
+    changed: list[int] = []
+
+    for i in range(n):
+        sent_raw = sent_col[i]
+        if not str(sent_raw or "").strip():
+            continue  # Rule 1 — email not sent yet
+
+        if done_col[i]:  # Rule 2 — follow-up already completed
+            if flag_col[i] != "NO":
+                flag_col[i] = "NO"
+                changed.append(i)
+            continue
+
+        if sent_raw not in scheduled:
+            sent_dt = _parse_or_none(sent_raw)
+            scheduled[sent_raw] = (
+                None if sent_dt is None else (sent_dt + timedelta(days=_FOLLOWUP_DAYS)).strftime(_SHEET_DT_FMT)
+            )
+        new_due = scheduled[sent_raw]
+        if new_due is None:
+            continue  # malformed sent_at — leave unchanged
+
+        due_raw = due_col[i]
+        if not str(due_raw or "").strip():  # Rule 3 — first-time scheduling
+            due_col[i] = new_due
+            flag_col[i] = "NO"
+            changed.append(i)
+            continue
+
+        if due_raw not in expected:  # Rule 4 — evaluate against now
+            due_dt = _parse_or_none(due_raw)
+            expected[due_raw] = None if due_dt is None else ("YES" if now >= due_dt else "NO")
+        flag = expected[due_raw]
+        if flag is None or flag_col[i] == flag:
+            continue
+        flag_col[i] = flag
+        changed.append(i)
+
+    return FollowupColumns(due_at=due_col, needs_followup=flag_col, changed=changed)
@@ -0,0 +1,153 @@
+"""Stage 0 — ingest a Meta Lead Ads export straight into the sheet.
+
+Replaces the manual copy-paste of Meta exports into the input tab.  The
+file is streamed row by row (src/integrations/meta_export.py); emails are
+normalized and deduplicated exactly like read_input_rows() does (strip,
+lower-case, first occurrence wins) against both the file itself and the
+leads already in the sheet.
+
+Sheets cost is fixed, not per row: one read of each tab up front, then one
+append per tab for every *chunk_size* new leads (a single call each for
+typical exports; status appends are split further by
+STAGE0_APPEND_CHUNK_ROWS).  Status rows are appended before input rows, so a
+scheduled job running at the same time never creates duplicates.  Memory
+stays flat apart from the set of seen emails.  Export values are
+third-party data: the input tab gets them RAW and the status tab
+quote-prefixed, so a name like "=IMPORTXML(...)" is never a formula.
+
+Unless ``--no-send`` is given, the Stage 0 job then runs once on the same
+client, so new leads are emailed right away (fresh leads first, honouring
+STAGE0_RUN_BUDGET_SECONDS / STAGE0_MAX_SENDS_PER_RUN).
+
+Usage:
+    python -m src.stage0.ingest exports/meta_leads.csv
+    python -m src.stage0.ingest exports/meta_leads.xlsx --no-send
+"""
+
+from __future__ import annotations
+
+import argparse
+import logging
+import sys
+from dataclasses import dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from src.integrations.meta_export import iter_meta_leads
+
+if TYPE_CHECKING:
+    from src.storage.sheets import SheetsClient
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CHUNK_ROWS = 10_000
+
+
+@dataclass(frozen=True)
+class IngestReport:
+    rows_read: int
+    missing_email: int
+    duplicates_in_file: int
+    already_in_sheet: int
+    appended: int
+    append_calls: int
+
+
+def ingest_meta_export(
+    path: str | Path,
+    sheets_client: SheetsClient,
+    *,
+    chunk_size: int = DEFAULT_CHUNK_ROWS,
+) -> IngestReport:
+    """Append the new leads of a Meta export to the input and status tabs."""
+    known_inputs = {
+        str(r.get("Email", "")).strip().lower() for r in sheets_client.read_input_rows()
+    }
+    known_status = {
+        str(r.get("Email", "")).strip().lower() for r in sheets_client.read_status_rows()
+    }
+
+    seen: set[str] = set()
+    input_buffer: list[list[str]] = []
+    status_buffer: list[list[str]] = []
+    rows_read = missing_email = duplicates = already = appended = append_calls = 0
+
+    def flush() -> None:
+        nonlocal appended, append_calls, input_buffer, status_buffer
+        if status_buffer:
+            # Split further by STAGE0_APPEND_CHUNK_ROWS, with its resume and
+            # retry handling (SheetsClient.append_status_rows_in_chunks()).
+            sheets_client.append_status_rows_in_chunks(status_buffer)
+            per_call = sheets_client.append_chunk_rows or len(status_buffer)
+            append_calls += -(-len(status_buffer) // per_call)
+        if input_buffer:
+            sheets_client.append_input_rows(input_buffer)
+            append_calls += 1
+        appended += len(input_buffer)
+        input_buffer, status_buffer = [], []
+
+    for lead in iter_meta_leads(path):
+        rows_read += 1
+        email = lead["Email"].strip().lower()
+        if not email:
+            missing_email += 1
+            continue
+        if email in seen:
+            duplicates += 1
+            continue
+        seen.add(email)
+        if email in known_inputs:
+            already += 1
+            continue
+
+        name = lead["Imię i nazwisko / Firma"]
+        input_buffer.append([name, email, lead["Telefon dodatkowy"]])
+        if email not in known_status:
+            status_buffer.append([name, email, "", "", "", "", ""])
+        if len(input_buffer) >= max(1, chunk_size):
+            flush()
+    flush()
+
+    report = IngestReport(
+        rows_read=rows_read,
+        missing_email=missing_email,
+        duplicates_in_file=duplicates,
+        already_in_sheet=already,
+        appended=appended,
+        append_calls=append_calls,
+    )
+    logger.info(
+        "Meta export ingested — rows=%d appended=%d already_in_sheet=%d "
+        "duplicates=%d missing_email=%d append_calls=%d",
+        rows_read, appended, already, duplicates, missing_email, append_calls,
+    )
+    return report
+
+
+def main(argv: list[str] | None = None) -> None:
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s [%(levelname)s] %(name)s — %(message)s",
+    )
+    parser = argparse.ArgumentParser(description="Ingest a Meta Lead Ads export (CSV / XLSX).")
+    parser.add_argument("path", help="exported .csv or .xlsx file")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_ROWS, help="rows per append call")
+    parser.add_argument("--no-send", action="store_true", help="only append; leave sending to the scheduled job")
+    args = parser.parse_args(argv)
+
+    try:
+        from src.core import config
+        from src.stage0.job import _build_sheets_client, run_stage0_job
+
+        config.validate()
+        sheets = _build_sheets_client(None)
+        ingest_meta_export(args.path, sheets, chunk_size=args.chunk_size)
+        if not args.no_send:
+            run_stage0_job(sheets_client=sheets)
+    except Exception:
+        logger.exception("Meta export ingestion failed")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -7,24 +7,35 @@ function is testable without live credentials.
 
 Usage (production):
     python -m src.stage0.job
+    python -m src.stage0.job --profile all   # cProfile + tracemalloc reports in logs/
 """
 
 from __future__ import annotations
 
+import contextlib
+import dataclasses
 import logging
 import sys
+import time
 from typing import TYPE_CHECKING
 
-from src.stage0.process import ProcessReport, process_followups, process_new_leads
+from src.stage0.process import ProcessReport, process_new_leads, run_followups
 
 if TYPE_CHECKING:
+    import gspread
+
+    from src.stage0.tenants import TenantConfig
+    from src.storage.metadata_cache import MetadataCache
     from src.storage.sheets import SheetsClient
+    from src.storage.status_mirror import StatusMirror
 
 logger = logging.getLogger(__name__)
 
 
 def run_stage0_job(
     sheets_client: "SheetsClient | None" = None,
+    *,
+    tenant: "TenantConfig | None" = None,
 ) -> ProcessReport:
     """Run the Stage 0 auto-reply pipeline once.
 
@@ -34,11 +45,20 @@ def run_stage0_job(
     c) Create a real SheetsClient when *sheets_client* is not injected.
     d) Call process_new_leads() and return its ProcessReport.
     e) Log job start / complete with counters; never log PII.
+    f) Export counters and stage timings when STAGE0_METRICS_PROM_PATH /
+       STAGE0_METRICS_JSONL_PATH are set (src/stage0/metrics.py), and
+       refresh the stats API snapshot when STAGE0_STATS_SNAPSHOT_PATH is
+       set (src/stage0/stats_snapshot.py).
+    g) When the run is profiled (src/core/profiling.py), name the report
+       files in the summary log line and in the exported metrics.
 
     Arguments:
         sheets_client: injected SheetsClient for testing.  When None a
             real client is built from config and
             ensure_date_column_format() is called on it.
+        tenant: per-tenant settings (multi-tenant runner).  When given,
+            sheet, SMTP profile, calendar URL, attachments and test mode
+            come from *tenant* instead of the process-wide config.
 
     Raises:
         RuntimeError: if STAGE0_TEST_MODE=1 and TEST_RECIPIENT_EMAIL is
@@ -46,57 +66,256 @@ def run_stage0_job(
     """
     from src.core import config  # lazy import — avoids config load during tests
 
-    test_mode: bool = config.STAGE0_TEST_MODE
-    test_recipient: str | None = config.TEST_RECIPIENT_EMAIL
+    if tenant is None:
+        test_mode: bool = config.STAGE0_TEST_MODE
+        test_recipient: str | None = config.TEST_RECIPIENT_EMAIL
+    else:
+        test_mode = tenant.test_mode
+        test_recipient = tenant.test_recipient
 
     logger.info("Stage0 job start — test_mode=%s", test_mode)
     if test_mode:
         logger.info("TEST MODE active — all outbound emails go to test recipient")
 
+    client_init_s: float | None = None
     if sheets_client is None:
-        from src.storage.sheets import SheetsClient as _SheetsClient
-        sheets_client = _SheetsClient(
-            service_account_json=config.GOOGLE_SERVICE_ACCOUNT_JSON,
-            sheet_id=config.GOOGLE_SHEET_ID,
-        )
+        client_started = time.perf_counter()
+        sheets_client = _build_sheets_client(tenant)
         try:
             sheets_client.ensure_date_column_format()
         except Exception as exc:
             logger.warning("ensure_date_column_format skipped: %s", exc)
+        client_init_s = round(time.perf_counter() - client_started, 6)
 
-    report = process_new_leads(
-        sheets_client,
-        config.CALENDAR_URL,
-        smtp_host=config.SMTP_HOST,
-        smtp_port=config.SMTP_PORT,
-        smtp_user=config.SMTP_USER,
-        smtp_password=config.SMTP_PASS,
-        smtp_from_email=config.SMTP_FROM_EMAIL,
-        test_mode=test_mode,
-        test_recipient=test_recipient,
+    # Run limits are host-wide (they protect the scheduler slot), not per tenant.
+    limits = dict(
+        time_budget_s=config.STAGE0_RUN_BUDGET_SECONDS,
+        max_sends=config.STAGE0_MAX_SENDS_PER_RUN,
     )
 
+    if tenant is None:
+        report = process_new_leads(
+            sheets_client,
+            config.CALENDAR_URL,
+            smtp_host=config.SMTP_HOST,
+            smtp_port=config.SMTP_PORT,
+            smtp_user=config.SMTP_USER,
+            smtp_password=config.SMTP_PASS,
+            smtp_from_email=config.SMTP_FROM_EMAIL,
+            test_mode=test_mode,
+            test_recipient=test_recipient,
+            **limits,
+        )
+    else:
+        report = process_new_leads(
+            sheets_client,
+            tenant.calendar_url,
+            smtp_host=tenant.smtp.host,
+            smtp_port=tenant.smtp.port,
+            smtp_user=tenant.smtp.user,
+            smtp_password=tenant.smtp.password,
+            smtp_from_email=tenant.smtp.from_email,
+            test_mode=test_mode,
+            test_recipient=test_recipient,
+            attachments=tenant.attachment_paths(),
+            **limits,
+        )
+
+    if client_init_s is not None:
+        report = dataclasses.replace(report, timings={"client_init": client_init_s, **report.timings})
+
     logger.info(
-        "Stage0 job complete — scanned=%d new=%d sent=%d failed=%d",
+        "Stage0 job complete — scanned=%d new=%d sent=%d failed=%d carried_over=%d",
         report.total_input_leads,
         report.new_leads_detected,
         report.emails_sent,
         report.emails_failed,
+        report.carried_over,
     )
 
-    followup_updated = process_followups(sheets_client)
-    logger.info("Stage0 follow-up step complete — updated=%d", followup_updated)
+    schedule_path = None
+    if config.STAGE0_FOLLOWUP_SCHEDULE_PATH:
+        from src.stage0.schedule import schedule_path_for
+
+        schedule_path = schedule_path_for(config.STAGE0_FOLLOWUP_SCHEDULE_PATH, tenant.name if tenant else None)
+    followup_report = run_followups(
+        sheets_client,
+        schedule_path=schedule_path,
+        new_sends=report.emails_sent,
+        formula=config.STAGE0_FOLLOWUP_FORMULA,
+    )
+    logger.info("Stage0 follow-up step complete — updated=%d", followup_report.rows_updated)
+
+    archive_report = None
+    if config.STAGE0_ARCHIVE_AFTER_DAYS is not None:
+        if sheets_client.archive_enabled:
+            from src.stage0.archive import run_archive
+
+            archive_report = run_archive(sheets_client, after_days=config.STAGE0_ARCHIVE_AFTER_DAYS)
+        else:
+            logger.warning("STAGE0_ARCHIVE_AFTER_DAYS is set but no archive tab is configured — archival skipped")
+
+    artifacts = _profile_artifacts()
+    if artifacts:
+        logger.info("Stage0 profile — %s", " ".join(f"{k}={v}" for k, v in artifacts.items()))
+
+    metrics_enabled = bool(config.STAGE0_METRICS_PROM_PATH or config.STAGE0_METRICS_JSONL_PATH)
+    if metrics_enabled or config.STAGE0_STATS_SNAPSHOT_PATH:
+        from src.stage0.metrics import RunMetrics, export_run_metrics
+
+        metrics = RunMetrics.from_reports(
+            report, followup_report, archive_report,
+            tenant=tenant.name if tenant else None, artifacts=artifacts,
+            transport=_transport_stats(sheets_client),
+        )
+        if metrics_enabled:
+            export_run_metrics(
+                metrics,
+                prom_path=config.STAGE0_METRICS_PROM_PATH,
+                jsonl_path=config.STAGE0_METRICS_JSONL_PATH,
+            )
+        if config.STAGE0_STATS_SNAPSHOT_PATH:
+            from src.stage0.stats_snapshot import export_stats_snapshot
+
+            export_stats_snapshot(
+                sheets_client, config.STAGE0_STATS_SNAPSHOT_PATH,
+                last_run=metrics, tenant=tenant.name if tenant else None,
+            )
 
     return report
 
 
-def main() -> None:
+def _transport_stats(sheets_client: "SheetsClient") -> dict[str, int]:
+    """Sheets transport counters, or {} for stores / test doubles without them."""
+    stats = getattr(sheets_client, "transport_stats", None)
+    result = stats() if callable(stats) else None
+    return result if isinstance(result, dict) else {}
+
+
+def _profile_artifacts() -> dict[str, str]:
+    """Report paths of the active profile (empty when not profiling)."""
+    profiling = sys.modules.get("src.core.profiling")  # loaded only by a profiled main()
+    profile = profiling.current() if profiling is not None else None
+    return profile.summary() if profile is not None else {}
+
+
+def _build_sheets_client(tenant: "TenantConfig | None", *, status_mirror: bool = True) -> "SheetsClient":
+    """Build the configured store: Google Sheets, or SQLite (LocalSheetsClient).
+
+    The SQLite store is chosen by ``sqlite_path`` on *tenant*, or by
+    STAGE0_STORAGE_BACKEND=sqlite for the single-sheet setup.  Pass
+    *status_mirror* False where other processes write the same status
+    rows (sharded workers).
+    """
+    from src.core import config
+
+    sqlite_path = tenant.sqlite_path if tenant is not None else (
+        config.STAGE0_SQLITE_PATH if config.STAGE0_STORAGE_BACKEND == "sqlite" else None
+    )
+    if sqlite_path:
+        from src.storage.local import LocalSheetsClient
+
+        return LocalSheetsClient(sqlite_path)
+    return _build_google_sheets_client(tenant, status_mirror=status_mirror)
+
+
+def _build_metadata_cache() -> "MetadataCache | None":
+    """The configured Sheets metadata cache (STAGE0_SHEETS_CACHE_PATH), or None."""
+    from src.core import config
+
+    if not config.STAGE0_SHEETS_CACHE_PATH:
+        return None
+    from src.storage.metadata_cache import MetadataCache
+
+    return MetadataCache(config.STAGE0_SHEETS_CACHE_PATH)
+
+
+def _build_status_mirror() -> "StatusMirror | None":
+    """The configured status tab mirror (STAGE0_STATUS_MIRROR_PATH), or None."""
+    from src.core import config
+
+    if not config.STAGE0_STATUS_MIRROR_PATH:
+        return None
+    from src.storage.status_mirror import StatusMirror
+
+    return StatusMirror(config.STAGE0_STATUS_MIRROR_PATH)
+
+
+def _build_google_sheets_client(
+    tenant: "TenantConfig | None",
+    *,
+    status_mirror: bool = True,
+    gspread_client: "gspread.Client | None" = None,
+    metadata_cache: "MetadataCache | None" = None,
+) -> "SheetsClient":
+    """Build a real SheetsClient from config (or from *tenant* settings).
+
+    The multi-tenant runner injects its shared *gspread_client* and
+    *metadata_cache*; otherwise the client authorizes itself and the cache
+    comes from STAGE0_SHEETS_CACHE_PATH.
+    """
+    from src.core import config
+    from src.storage.sheets import SheetsClient as _SheetsClient
+
+    if metadata_cache is None:
+        metadata_cache = _build_metadata_cache()
+    if tenant is None:
+        sheet = dict(
+            service_account_json=config.GOOGLE_SERVICE_ACCOUNT_JSON,
+            sheet_id=config.GOOGLE_SHEET_ID,
+            archive_tab=config.STAGE0_ARCHIVE_TAB,
+        )
+    else:
+        sheet = dict(
+            service_account_json=tenant.service_account_json,
+            sheet_id=tenant.sheet_id,
+            input_tab=tenant.input_tab,
+            status_tab=tenant.status_tab,
+            archive_tab=tenant.archive_tab,
+        )
+    return _SheetsClient(
+        **sheet,
+        gspread_client=gspread_client,
+        metadata_cache=metadata_cache,
+        serial_dates=config.STAGE0_SHEETS_SERIAL_DATES,
+        row_anchors=config.STAGE0_ROW_ANCHORS,
+        append_chunk_rows=config.STAGE0_APPEND_CHUNK_ROWS,
+        status_mirror=_build_status_mirror() if status_mirror else None,
+    )
+
+
+def main(argv: list[str] | None = None) -> None:
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Run the Stage 0 job once.")
+    parser.add_argument(
+        "--profile",
+        default=None,
+        help="cpu, memory or all — write cProfile / tracemalloc reports (overrides STAGE0_PROFILE)",
+    )
+    args = parser.parse_args(argv)
+
     logging.basicConfig(
         level=logging.INFO,
         format="%(asctime)s [%(levelname)s] %(name)s — %(message)s",
     )
     try:
-        run_stage0_job()
+        from src.core import config
+
+        from src.core import tracing
+
+        config.validate()  # fail fast on missing env vars before any I/O
+        profile_modes = args.profile if args.profile is not None else config.STAGE0_PROFILE
+        if profile_modes:
+            from src.core import profiling
+
+            profile_session = profiling.session(
+                profile_modes, config.STAGE0_PROFILE_DIR, top=config.STAGE0_PROFILE_TOP,
+            )
+        else:
+            profile_session = contextlib.nullcontext()
+        with profile_session, tracing.session(config.STAGE0_TRACE_PATH):
+            run_stage0_job()
     except Exception:
         logger.exception("Stage0 job failed")
         sys.exit(1)
@@ -0,0 +1,184 @@
+"""Stage 0 — per-stage wall-time accounting and run metrics export.
+
+StageTimer accumulates wall time per named stage; the totals end up in
+ProcessReport.timings / FollowupReport.timings.  After each run the job
+exports them (plus the counters) when enabled:
+
+- STAGE0_METRICS_PROM_PATH — Prometheus textfile (node_exporter textfile
+  collector), rewritten atomically each run;
+- STAGE0_METRICS_JSONL_PATH — one JSON object appended per run.
+
+Google Sheets clients add their transport counters (requests, gzip
+responses, response bytes, pool connections opened / reused — see
+src/storage/transport.py) as ``sheets_*`` counters.
+
+Multi-tenant runs write one textfile per tenant (``stage0.prom`` →
+``stage0.<tenant>.prom``) and tag JSON lines with the tenant name.
+Only counters and timings are exported — never emails or names.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Iterator
+
+if TYPE_CHECKING:
+    from src.stage0.archive import ArchiveReport
+    from src.stage0.process import FollowupReport, ProcessReport
+
+logger = logging.getLogger(__name__)
+
+
+class StageTimer:
+    """Accumulates wall time (seconds) per stage name."""
+
+    def __init__(self) -> None:
+        self._totals: dict[str, float] = {}
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(name, time.perf_counter() - started)
+
+    def add(self, name: str, seconds: float) -> None:
+        self._totals[name] = self._totals.get(name, 0.0) + seconds
+
+    def as_dict(self) -> dict[str, float]:
+        return {name: round(value, 6) for name, value in self._totals.items()}
+
+
+@dataclass(frozen=True)
+class RunMetrics:
+    """One run's numbers, flattened for export."""
+
+    finished_at: float  # unix seconds
+    tenant: str | None
+    counters: dict[str, int]
+    timings: dict[str, float]
+    artifacts: dict[str, str] = field(default_factory=dict)  # e.g. profile report paths
+
+    @classmethod
+    def from_reports(
+        cls,
+        process_report: ProcessReport,
+        followup_report: FollowupReport | None = None,
+        archive_report: ArchiveReport | None = None,
+        *,
+        tenant: str | None = None,
+        artifacts: dict[str, str] | None = None,
+        transport: dict[str, int] | None = None,
+    ) -> "RunMetrics":
+        counters = {
+            "input_leads": process_report.total_input_leads,
+            "new_leads": process_report.new_leads_detected,
+            "emails_sent": process_report.emails_sent,
+            "emails_failed": process_report.emails_failed,
+            "carried_over": process_report.carried_over,
+        }
+        timings = dict(process_report.timings)
+        if followup_report is not None:
+            counters["followup_rows_updated"] = followup_report.rows_updated
+            counters["followup_skipped"] = int(followup_report.skipped)
+            timings.update({f"followup_{k}": v for k, v in followup_report.timings.items()})
+        if archive_report is not None:
+            counters["archived_rows"] = archive_report.rows_archived
+            timings.update({f"archive_{k}": v for k, v in archive_report.timings.items()})
+        counters.update({f"sheets_{k}": int(v) for k, v in (transport or {}).items()})
+        return cls(
+            finished_at=time.time(),
+            tenant=tenant,
+            counters=counters,
+            timings=timings,
+            artifacts=dict(artifacts or {}),
+        )
+
+    def to_json(self) -> dict[str, Any]:
+        data: dict[str, Any] = {
+            "ts": round(self.finished_at, 3),
+            "tenant": self.tenant,
+            "counters": self.counters,
+            "timings_s": self.timings,
+        }
+        if self.artifacts:
+            data["artifacts"] = self.artifacts
+        return data
+
+    def to_prometheus(self) -> str:
+        base = {"tenant": self.tenant} if self.tenant else {}
+        lines = [
+            "# HELP stage0_run_stage_seconds Wall time per Stage 0 stage in the last run.",
+            "# TYPE stage0_run_stage_seconds gauge",
+        ]
+        for stage, seconds in sorted(self.timings.items()):
+            lines.append(f"stage0_run_stage_seconds{_labels({**base, 'stage': stage})} {seconds:.6f}")
+        for name, value in sorted(self.counters.items()):
+            lines.append(f"# TYPE stage0_run_{name} gauge")
+            lines.append(f"stage0_run_{name}{_labels(base)} {value}")
+        lines.append("# TYPE stage0_run_last_finished_timestamp_seconds gauge")
+        lines.append(f"stage0_run_last_finished_timestamp_seconds{_labels(base)} {self.finished_at:.3f}")
+        return "\n".join(lines) + "\n"
+
+
+def _escape_label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", " ")
+
+
+def _labels(pairs: dict[str, str]) -> str:
+    """Prometheus label set, or "" when there are no labels."""
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{k}="{_escape_label(str(v))}"' for k, v in pairs.items()) + "}"
+
+
+def tenant_path(path: Path, tenant: str | None) -> Path:
+    """*path* for one tenant: ``name.ext`` → ``name.<tenant>.ext`` (unchanged without one)."""
+    if not tenant:
+        return path
+    safe = "".join(c if c.isalnum() or c in "-_" else "_" for c in tenant)
+    return path.with_name(f"{path.stem}.{safe}{path.suffix}")
+
+
+def write_prometheus_textfile(path: str | Path, metrics: RunMetrics) -> Path:
+    """Atomically replace the textfile (the collector must never see half a file)."""
+    target = tenant_path(Path(path), metrics.tenant)
+    target.parent.mkdir(parents=True, exist_ok=True)
+    tmp = target.with_suffix(target.suffix + ".tmp")
+    tmp.write_text(metrics.to_prometheus(), encoding="utf-8")
+    os.replace(tmp, target)
+    return target
+
+
+def append_jsonl(path: str | Path, metrics: RunMetrics) -> None:
+    import json
+
+    target = Path(path)
+    target.parent.mkdir(parents=True, exist_ok=True)
+    with open(target, "a", encoding="utf-8") as fh:
+        fh.write(json.dumps(metrics.to_json(), ensure_ascii=False) + "\n")
+
+
+def export_run_metrics(
+    metrics: RunMetrics,
+    *,
+    prom_path: str | None,
+    jsonl_path: str | None,
+) -> None:
+    """Write *metrics* to the configured sinks; export failures never fail the run."""
+    for sink, path, writer in (
+        ("prometheus", prom_path, write_prometheus_textfile),
+        ("jsonl", jsonl_path, append_jsonl),
+    ):
+        if not path:
+            continue
+        try:
+            writer(path, metrics)
+        except OSError as exc:
+            logger.warning("Could not write %s metrics to %s: %s", sink, path, exc)
@@ -2,23 +2,33 @@
 
 from __future__ import annotations
 
+import dataclasses
 import logging
 import sys
 import time
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from datetime import datetime
 from pathlib import Path
+from typing import TYPE_CHECKING
 
 from src.email.attachments_stage0 import get_stage0_attachments_from_env
 from src.email.template_stage0 import build_stage0_email
 from src.integrations.email_sender import send_email_draft
 from src.core.lead_helpers import generate_vocative, warsaw_now_formatted
-from src.stage0.followup import apply_followup_logic
+from src.core.tracing import span
+from src.stage0.batch import evaluate_followups, to_columns
+from src.stage0.followup import WARSAW_TZ
+from src.stage0.metrics import StageTimer
 from src.stage0.test_mode import resolve_recipient_email
-from src.storage.sheets import SheetsClient
+
+if TYPE_CHECKING:
+    from src.storage.sheets import SheetsClient
 
 logger = logging.getLogger(__name__)
 
+# Pause between two sends — keeps SMTP providers' per-second limits away.
+SEND_THROTTLE_SECONDS = 10.0
+
 
 def _friendly_email_error_status(exc: Exception) -> str:
     """Map a send exception to a user-readable ERROR: status for the sheet.
@@ -49,6 +59,41 @@ class ProcessReport:
     new_leads_detected: int
     emails_sent: int
     emails_failed: int
+    # Eligible leads left for the next run (time budget or send cap reached).
+    carried_over: int = 0
+    # Wall time per stage in seconds (see process_new_leads); excluded from
+    # equality so reports compare by counters.
+    timings: dict[str, float] = field(default_factory=dict, compare=False)
+
+
+@dataclass(frozen=True)
+class FollowupReport:
+    rows_scanned: int
+    rows_updated: int
+    # probe / read / evaluate / status_write wall time in seconds.
+    timings: dict[str, float] = field(default_factory=dict, compare=False)
+    # True when the next-due schedule showed nothing to do (src/stage0/schedule.py).
+    skipped: bool = False
+
+
+def prioritize_leads(
+    new_leads: list[dict[str, str]],
+    status_index: dict[str, dict[str, str]],
+) -> list[dict[str, str]]:
+    """Order eligible leads for sending: fresh leads first, then ERROR retries.
+
+    Fresh leads (no status row, or an empty ``Status emaila``) come newest
+    first — input rows are appended at the bottom, so that is reverse sheet
+    order.  Retries follow in sheet order (oldest failure first).  Keeps a
+    retry backlog from delaying the answer to a new inquiry.
+    """
+    fresh: list[dict[str, str]] = []
+    retries: list[dict[str, str]] = []
+    for lead in new_leads:
+        email = str(lead.get("Email", "")).strip().lower()
+        status = str((status_index.get(email) or {}).get("Status emaila", "")).strip()
+        (retries if status.startswith("ERROR") else fresh).append(lead)
+    return fresh[::-1] + retries
 
 
 def process_new_leads(
@@ -62,6 +107,9 @@ def process_new_leads(
     smtp_from_email: str,
     test_mode: bool = False,
     test_recipient: str | None = None,
+    attachments: list[Path] | None = None,
+    time_budget_s: float | None = None,
+    max_sends: int | None = None,
 ) -> ProcessReport:
     """Send auto-reply emails for new leads and record status in the sheet.
 
@@ -73,7 +121,24 @@ def process_new_leads(
     When *test_mode* is True every outbound email is redirected to
     *test_recipient*.  If *test_recipient* is missing the function raises
     immediately before touching any data.
+
+    *attachments* overrides the STAGE0_PDF_* env paths (multi-tenant runs
+    pass each tenant's own files).
+
+    Leads are processed in prioritize_leads() order.  The run stops before
+    the next lead once *time_budget_s* seconds have elapsed or *max_sends*
+    emails were sent (None = no limit); the remaining leads stay eligible
+    and are counted in ProcessReport.carried_over.
+
+    ProcessReport.timings holds wall time per stage: status_sync,
+    eligibility, attachments, then summed over all leads build, smtp,
+    status_write and send_throttle (the pause between sends), plus
+    sheets_backoff (429 retry sleeps) and total.
     """
+    started = time.monotonic()
+    timer = StageTimer()
+    timer_started = time.perf_counter()
+    backoff_before = _backoff_seconds(sheets_client)
     if test_mode:
         if not (test_recipient or "").strip():
             raise RuntimeError(
@@ -82,87 +147,116 @@ def process_new_leads(
             )
         logger.info("TEST MODE active — recipient override in effect")
 
-    sheets_client.ensure_status_rows_exist()
+    with timer.stage("status_sync"):
+        sheets_client.ensure_status_rows_exist()
 
-    input_rows = sheets_client.read_input_rows()
-    new_leads = sheets_client.get_new_leads()
+    with timer.stage("eligibility"):
+        input_rows = sheets_client.read_input_rows()
+        new_leads = sheets_client.get_new_leads()
 
-    # Build email→row_number index once to avoid N separate API reads
-    status_rows_snapshot = sheets_client.read_status_rows()
-    row_number_index: dict[str, int] = {
-        str(r.get("Email", "")).strip().lower(): idx + 2
-        for idx, r in enumerate(status_rows_snapshot)
-        if str(r.get("Email", "")).strip().lower()
-    }
+        # Build email→row_number index once to avoid N separate API reads
+        status_rows_snapshot = sheets_client.read_status_rows()
+        row_number_index: dict[str, int] = {
+            str(r.get("Email", "")).strip().lower(): idx + 2
+            for idx, r in enumerate(status_rows_snapshot)
+            if str(r.get("Email", "")).strip().lower()
+        }
+        queue = prioritize_leads(new_leads, {
+            str(r.get("Email", "")).strip().lower(): r for r in status_rows_snapshot
+        })
 
-    attachments: list[Path] = get_stage0_attachments_from_env()
+    # Attachments are only needed when something will be sent.
+    with timer.stage("attachments"):
+        if attachments is None:
+            attachments = get_stage0_attachments_from_env() if new_leads else []
 
     emails_sent = 0
     emails_failed = 0
-
-    for lead in new_leads:
-        email = lead.get("Email", "").strip().lower()
-        if not email:
-            logger.warning("Skipping lead with missing email: %r", lead)
-            continue
-
-        full_name = lead.get("Imię i nazwisko / Firma", "")
-        greeting = generate_vocative(full_name)
-
-        try:
-            draft = build_stage0_email(
-                calendar_url=calendar_url,
-                greeting=greeting,
-                attachments=attachments,
-            )
-        except Exception:
-            logger.exception("Failed to build draft for email=%s — skipping", email)
-            emails_failed += 1
-            continue
-
-        row_number = row_number_index.get(email)
-        if row_number is None:
-            logger.error("Status row not found for email=%s — skipping", email)
-            emails_failed += 1
-            continue
-
-        recipient = resolve_recipient_email(
-            email, test_mode=test_mode, test_recipient=test_recipient
-        )
-        try:
-            send_email_draft(
-                smtp_host=smtp_host,
-                smtp_port=smtp_port,
-                smtp_user=smtp_user,
-                smtp_password=smtp_password,
-                from_email=smtp_from_email,
-                to_email=recipient,
-                draft=draft,
+    carried_over = 0
+
+    for position, lead in enumerate(queue):
+        if max_sends is not None and emails_sent >= max_sends:
+            carried_over = len(queue) - position
+            logger.info("Send cap reached (%d) — carrying over %d lead(s)", max_sends, carried_over)
+            break
+        if time_budget_s is not None and time.monotonic() - started >= time_budget_s:
+            carried_over = len(queue) - position
+            logger.info("Time budget reached (%.0fs) — carrying over %d lead(s)", time_budget_s, carried_over)
+            break
+
+        with span("stage0.lead", position=position) as lead_span:
+            email = lead.get("Email", "").strip().lower()
+            lead_span.set(email=email)
+            if not email:
+                logger.warning("Skipping lead with missing email: %r", lead)
+                continue
+
+            full_name = lead.get("Imię i nazwisko / Firma", "")
+            greeting = generate_vocative(full_name)
+
+            try:
+                with timer.stage("build"):
+                    draft = build_stage0_email(
+                        calendar_url=calendar_url,
+                        greeting=greeting,
+                        attachments=attachments,
+                    )
+            except Exception:
+                logger.exception("Failed to build draft for email=%s — skipping", email)
+                emails_failed += 1
+                continue
+
+            row_number = row_number_index.get(email)
+            if row_number is None:
+                logger.error("Status row not found for email=%s — skipping", email)
+                emails_failed += 1
+                continue
+
+            recipient = resolve_recipient_email(
+                email, test_mode=test_mode, test_recipient=test_recipient
             )
-        except Exception as exc:
-            error_msg = str(exc)[:120]
-            logger.error("Failed to send email to %s: %s", email, error_msg)
-            sheets_client.update_row(
-                row_number,
-                {"Status emaila": _friendly_email_error_status(exc)},
-            )
-            emails_failed += 1
-            continue
-
-        sent_at = warsaw_now_formatted()
-        sheets_client.update_row(row_number, {
-            "Email wysłany": sent_at,
-            "Status emaila": "SENT",
-        })
-        emails_sent += 1
-        time.sleep(10)
+            try:
+                with timer.stage("smtp"):
+                    send_email_draft(
+                        smtp_host=smtp_host,
+                        smtp_port=smtp_port,
+                        smtp_user=smtp_user,
+                        smtp_password=smtp_password,
+                        from_email=smtp_from_email,
+                        to_email=recipient,
+                        draft=draft,
+                    )
+            except Exception as exc:
+                error_msg = str(exc)[:120]
+                logger.error("Failed to send email to %s: %s", email, error_msg)
+                with timer.stage("status_write"):
+                    _write_status(
+                        sheets_client, row_number, email,
+                        {"Status emaila": _friendly_email_error_status(exc)},
+                    )
+                emails_failed += 1
+                continue
+
+            sent_at = warsaw_now_formatted()
+            with timer.stage("status_write"):
+                _write_status(sheets_client, row_number, email, {
+                    "Email wysłany": sent_at,
+                    "Status emaila": "SENT",
+                })
+            emails_sent += 1
+            with timer.stage("send_throttle"):
+                time.sleep(SEND_THROTTLE_SECONDS)
+
+    timer.add("sheets_backoff", _backoff_seconds(sheets_client) - backoff_before)
+    timer.add("total", time.perf_counter() - timer_started)
 
     logger.info(
-        "process_new_leads done — input=%d new=%d sent=%d failed=%d",
+        "process_new_leads done — input=%d new=%d sent=%d failed=%d carried_over=%d",
         len(input_rows),
         len(new_leads),
         emails_sent,
         emails_failed,
+        carried_over,
     )
 
     return ProcessReport(
@@ -170,58 +264,157 @@ def process_new_leads(
         new_leads_detected=len(new_leads),
         emails_sent=emails_sent,
         emails_failed=emails_failed,
+        carried_over=carried_over,
+        timings=timer.as_dict(),
     )
 
 
+def _backoff_seconds(sheets_client: SheetsClient) -> float:
+    """SheetsClient.backoff_seconds, or 0.0 for clients that do not track it."""
+    value = getattr(sheets_client, "backoff_seconds", 0.0)
+    return float(value) if isinstance(value, (int, float)) else 0.0
+
+
+def _write_status(
+    sheets_client: SheetsClient,
+    row_number: int,
+    email: str,
+    updates: dict[str, str],
+) -> None:
+    """Persist *updates* for one lead.
+
+    With row anchors on (SheetsClient.row_anchors) the write addresses the
+    lead via update_lead(), so a row moved since the snapshot was read is
+    still the one written; otherwise update_row() at the snapshot's
+    *row_number*.
+    """
+    if getattr(sheets_client, "row_anchors", False) is True:
+        sheets_client.update_lead(email, updates)
+    else:
+        sheets_client.update_row(row_number, updates)
+
+
 _FOLLOWUP_FIELDS = ("Follow-up od", "Wymaga follow-upu")
+_FOLLOWUP_INPUTS = ("Email wysłany",) + _FOLLOWUP_FIELDS + ("Follow-up wykonany",)
 
 
 def process_followups(
     sheets_client: SheetsClient,
     *,
     now: datetime | None = None,
+    formula: bool = False,
 ) -> int:
+    """Apply follow-up scheduling and return the number of rows updated.
+
+    Shorthand for ``run_followups(...).rows_updated``.
+    """
+    return run_followups(sheets_client, now=now, formula=formula).rows_updated
+
+
+def run_followups(
+    sheets_client: SheetsClient,
+    *,
+    now: datetime | None = None,
+    schedule_path: str | Path | None = None,
+    new_sends: int = 0,
+    formula: bool = False,
+) -> FollowupReport:
     """Apply follow-up scheduling logic to all status rows and persist changes.
 
-    For each status row with a valid email:
-    - Computes the desired state via apply_followup_logic().
+    The rules of apply_followup_logic() are evaluated for the whole tab at
+    once (evaluate_followups() in src/stage0/batch.py — same results, date
+    strings parsed once).  For each changed row with a valid email:
     - Builds a patch containing only the fields that changed
       (Follow-up od, Wymaga follow-upu).
-    - Writes the patch via update_row() when non-empty.
+    - Writes the patch via update_row() (update_lead() with row anchors)
+      when non-empty.
 
     Arguments:
         sheets_client: provides read_status_rows / get_status_row_number_by_email
-            / update_row.
-        now: reference time forwarded to apply_followup_logic for due-date
-            evaluation.  Defaults to datetime.now(WARSAW_TZ) when None.
-
-    Returns the number of rows that were updated.
+            / update_row (/ update_lead).
+        now: reference time for due-date evaluation.  Defaults to
+            datetime.now(WARSAW_TZ) when None.
+        schedule_path: next-due schedule file (src/stage0/schedule.py).
+            When given, the pass is skipped unless something can have
+            changed, and the schedule is rewritten after a full pass.
+        new_sends: emails sent earlier in this run (they schedule new
+            follow-ups, so the pass must run).
+        formula: formula mode — ensure_followup_formula() makes the sheet
+            compute Wymaga follow-upu, so the pass only writes Follow-up od
+            (no time-based flag writes) and the schedule keeps no due
+            times.  Stores without formulas fall back to writing flags.
+
+    Returns a FollowupReport (rows scanned / updated, stage timings;
+    ``skipped`` when the schedule showed nothing to do).
     Logs a PII-free summary line when done.
     """
-    rows = sheets_client.read_status_rows()
+    timer = StageTimer()
+    timer_started = time.perf_counter()
+    backoff_before = _backoff_seconds(sheets_client)
+    if now is None:
+        now = datetime.now(WARSAW_TZ)
+
+    probe = None
+    if schedule_path:
+        from src.stage0 import schedule as followup_schedule
+
+        with timer.stage("probe"):
+            probe = followup_schedule.probe_fingerprint(
+                sheets_client.read_status_column(followup_schedule.PROBE_COLUMN)
+            )
+            stored = followup_schedule.load_schedule(schedule_path)
+            reason = followup_schedule.reason_to_run(stored, now=now, new_sends=new_sends, probe=probe)
+        if reason is None:
+            timer.add("total", time.perf_counter() - timer_started)
+            logger.info("Follow-up pass skipped — next_due=%s", stored.next_due() if stored else None)
+            return FollowupReport(rows_scanned=0, rows_updated=0, timings=timer.as_dict(), skipped=True)
+        logger.info("Follow-up pass running — reason=%s", reason)
+
+    fields = _FOLLOWUP_FIELDS
+    if formula:
+        with timer.stage("formula"):
+            if sheets_client.ensure_followup_formula():
+                fields = ("Follow-up od",)
+
+    with timer.stage("read"):
+        rows = sheets_client.read_status_rows()
     updated = 0
 
-    for idx, row in enumerate(rows):
-        email = str(row.get("Email", "")).strip().lower()
-        if not email:
-            continue
-
-        new_row = apply_followup_logic(row, now=now)  # type: ignore[arg-type]
-
-        patch = {
-            field: str(new_row.get(field) or "")
-            for field in _FOLLOWUP_FIELDS
-            if str(new_row.get(field) or "").strip() != str(row.get(field) or "").strip()
-        }
-
-        if not patch:
-            continue
-
-        sheets_client.update_row(idx + 2, patch)
-        updated += 1
-
+    with span("followup.batch", rows=len(rows)) as batch_span:
+        with timer.stage("evaluate"):
+            columns = to_columns(rows, _FOLLOWUP_INPUTS)
+            result = evaluate_followups(columns, now=now)
+            new_values = dict(zip(_FOLLOWUP_FIELDS, (result.due_at, result.needs_followup)))
+
+        for idx in result.changed:
+            row = rows[idx]
+            email = str(row.get("Email", "")).strip().lower()
+            if not email:
+                continue
+
+            patch = {
+                name: str(new_values[name][idx] or "")
+                for name in fields
+                if str(new_values[name][idx] or "").strip() != str(row.get(name) or "").strip()
+            }
+            if not patch:
+                continue
+
+            with timer.stage("status_write"):
+                _write_status(sheets_client, idx + 2, email, patch)
+            updated += 1
+        batch_span.set(updated=updated)
+
+    if schedule_path and probe is not None:
+        schedule = followup_schedule.build_schedule(columns, result, now=now, probe=probe)
+        if fields != _FOLLOWUP_FIELDS:
+            schedule = dataclasses.replace(schedule, due_times=())  # the sheet flips the flags
+        followup_schedule.save_schedule(schedule_path, schedule)
+
+    timer.add("sheets_backoff", _backoff_seconds(sheets_client) - backoff_before)
+    timer.add("total", time.perf_counter() - timer_started)
     logger.info("Follow-up processing done — updated=%d", updated)
-    return updated
+    return FollowupReport(rows_scanned=len(rows), rows_updated=updated, timings=timer.as_dict())
 
 
 def main() -> None:
@@ -230,6 +423,7 @@ def main() -> None:
         format="%(asctime)s [%(levelname)s] %(name)s — %(message)s",
     )
     from src.core import config  # lazy import — avoids config load during tests
+    from src.storage.sheets import SheetsClient
 
     sheets = SheetsClient(
         service_account_json=config.GOOGLE_SERVICE_ACCOUNT_JSON,
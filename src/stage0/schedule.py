@@ -0,0 +1,172 @@
+"""Stage 0 — next-due schedule that lets the follow-up pass sleep.
+
+Follow-up flags only change when a "Follow-up od" time passes, when a
+send schedules a new follow-up, or when a salesperson fills "Follow-up
+wykonany".  After each full pass the job stores:
+
+- ``due_times`` — sorted upcoming "Follow-up od" times of open rows (the
+  earliest one is the next wake-up);
+- ``probe`` — a fingerprint of the "Follow-up wykonany" column, re-read
+  each tick with one small call (SheetsClient.read_status_column);
+- ``full_pass_at`` — when the last full pass ran.
+
+The next tick runs the full pass only when reason_to_run() finds a
+reason: no / unreadable schedule, emails sent this run, a changed probe
+(manual edit), the earliest due time has passed, or REFRESH_AFTER has
+elapsed (a backstop for edits the probe cannot see).  Otherwise the
+whole-tab read and evaluation are skipped.
+
+Sends by the job itself force the pass (``new_sends``).  Writers outside
+the job — the intake service (api/intake.py) and backfill — call
+clear_schedule() after writing, so their new rows are scheduled on the
+next tick; Meta export ingestion sends through the job.
+
+Enabled by STAGE0_FOLLOWUP_SCHEDULE_PATH; multi-tenant runs keep one
+file per tenant (``followup.json`` → ``followup.<tenant>.json``).  The
+file holds timestamps and a hash only — no lead data.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+from dataclasses import asdict, dataclass
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Sequence
+
+from src.stage0.batch import FollowupColumns, parse_sheet_datetime
+from src.stage0.followup import _SHEET_DT_FMT
+
+logger = logging.getLogger(__name__)
+
+PROBE_COLUMN = "Follow-up wykonany"
+REFRESH_AFTER = timedelta(hours=24)
+_VERSION = 1
+
+
+@dataclass(frozen=True)
+class FollowupSchedule:
+    due_times: tuple[str, ...]  # 'YYYY-MM-DD HH:MM' Warsaw time, ascending
+    probe: str
+    full_pass_at: str           # 'YYYY-MM-DD HH:MM' Warsaw time
+
+    def next_due(self) -> str | None:
+        return self.due_times[0] if self.due_times else None
+
+
+def probe_fingerprint(values: Sequence[str]) -> str:
+    """Short hash of a column's values (position-sensitive)."""
+    digest = hashlib.sha256()
+    for value in values:
+        digest.update(str(value).strip().encode("utf-8"))
+        digest.update(b"\x1f")
+    return f"{len(values)}:{digest.hexdigest()[:16]}"
+
+
+def build_schedule(
+    columns: dict[str, Sequence[Any]],
+    result: FollowupColumns,
+    *,
+    now: datetime,
+    probe: str,
+) -> FollowupSchedule:
+    """Schedule after a full pass: upcoming due times of rows still open."""
+    sent_col = columns.get("Email wysłany", ())
+    done_col = columns.get(PROBE_COLUMN, [""] * len(sent_col))
+    upcoming: set[datetime] = set()
+    parsed: dict[Any, datetime | None] = {}
+    for i, due_raw in enumerate(result.due_at):
+        if not str(sent_col[i] or "").strip() or done_col[i] or result.needs_followup[i] != "NO":
+            continue
+        if due_raw not in parsed:
+            try:
+                parsed[due_raw] = parse_sheet_datetime(str(due_raw or "").strip())
+            except ValueError:
+                parsed[due_raw] = None
+        due_dt = parsed[due_raw]
+        if due_dt is not None and due_dt > now:
+            upcoming.add(due_dt)
+    return FollowupSchedule(
+        due_times=tuple(dt.strftime(_SHEET_DT_FMT) for dt in sorted(upcoming)),
+        probe=probe,
+        full_pass_at=now.strftime(_SHEET_DT_FMT),
+    )
+
+
+def reason_to_run(
+    schedule: FollowupSchedule | None,
+    *,
+    now: datetime,
+    new_sends: int,
+    probe: str,
+) -> str | None:
+    """Why the full follow-up pass must run now, or None to skip it."""
+    if schedule is None:
+        return "no_schedule"
+    if new_sends:
+        return "new_sends"
+    if probe != schedule.probe:
+        return "manual_edit"
+    try:
+        next_due = schedule.next_due()
+        if next_due is not None and parse_sheet_datetime(next_due) <= now:
+            return "due"
+        if now - parse_sheet_datetime(schedule.full_pass_at) >= REFRESH_AFTER:
+            return "refresh"
+    except ValueError:
+        return "no_schedule"
+    return None
+
+
+def schedule_path_for(path: str | Path, tenant: str | None) -> Path:
+    from src.stage0.metrics import tenant_path
+
+    return tenant_path(Path(path), tenant)
+
+
+def load_schedule(path: str | Path) -> FollowupSchedule | None:
+    """Stored schedule, or None when missing or unreadable (forces a full pass)."""
+    try:
+        data = json.loads(Path(path).read_text(encoding="utf-8"))
+        if data.get("version") != _VERSION:
+            return None
+        return FollowupSchedule(
+            due_times=tuple(data["due_times"]),
+            probe=str(data["probe"]),
+            full_pass_at=str(data["full_pass_at"]),
+        )
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError, KeyError, TypeError) as exc:
+        logger.warning("Ignoring unreadable follow-up schedule %s: %s", path, exc)
+        return None
+
+
+def save_schedule(path: str | Path, schedule: FollowupSchedule) -> None:
+    """Atomically replace the schedule file; write errors are logged, not raised."""
+    target = Path(path)
+    try:
+        target.parent.mkdir(parents=True, exist_ok=True)
+        tmp = target.with_suffix(target.suffix + ".tmp")
+        tmp.write_text(json.dumps({"version": _VERSION, **asdict(schedule)}), encoding="utf-8")
+        os.replace(tmp, target)
+    except OSError as exc:
+        logger.warning("Could not write follow-up schedule to %s: %s", path, exc)
+
+
+def clear_schedule(path: str | Path | None) -> None:
+    """Delete the schedule so the next tick runs the full pass; errors are logged, not raised.
+
+    For writers outside the job's follow-up pass (the intake service,
+    backfill) that fill "Email wysłany" / "Follow-up od" the stored
+    schedule does not know about.  No-op for *path* None.
+    """
+    if path is None:
+        return
+    try:
+        Path(path).unlink(missing_ok=True)
+    except OSError as exc:
+        logger.warning("Could not clear follow-up schedule %s: %s", path, exc)
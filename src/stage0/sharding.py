@@ -0,0 +1,445 @@
+"""Stage 0 — sharded send mode for several cooperating workers.
+
+K workers (on one or several hosts) split the eligible leads between them:
+a lead belongs to shard ``shard_for_email(email, K)``, a stable hash of the
+normalized email, so every worker computes the same partition without
+talking to the others.  Worker *i* runs ``process_shard(shard_index=i, ...)``.
+
+Double sends are prevented by a lease written into ``Status emaila`` — the
+sheet is the only state the workers share:
+
+1. **Claim.**  ``CLAIMED <worker> until <UTC>`` is written for a batch of
+   the shard's eligible leads, then read back; leads whose claim was
+   overwritten are dropped.
+2. **Send.**  Right before SMTP the worker checks that its claim still has
+   ``safety_margin_s`` left and writes ``SENDING <worker> until <UTC>``.
+   After the send it writes ``Email wysłany`` + ``SENT`` (or an ``ERROR:``
+   status on failure) exactly as process_new_leads() does.
+
+Both markers are "any other status" for is_eligible_for_send(), so the
+single-host job never touches a leased row.  Recovery after a crash:
+
+- an expired ``CLAIMED`` lease means the SMTP step was never reached — the
+  next worker on the shard reclaims the lead;
+- an expired ``SENDING`` lease means the worker died while the email may
+  or may not have left.  It is never resent automatically: the row becomes
+  ``WYMAGA WERYFIKACJI: przerwana wysyłka`` for the operator, unless a
+  *was_delivered* callback (e.g. a Sent-folder lookup) can settle it.
+
+A worker whose lease ran out while it was merely slow stops before writing
+``SENDING``; a lease is only taken over after ``expiry + clock_skew_s``.
+The guarantee therefore assumes worker clocks agree within clock_skew_s and
+that each shard index is run by one worker at a time (a takeover worker
+starts after the previous one died or finished).
+
+Usage:
+    python -m src.stage0.sharding --shard-index 0 --shard-count 3
+    python -m src.stage0.sharding --shard-index 1 --shard-count 3 --worker-id host-b
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import logging
+import os
+import re
+import socket
+import sys
+import time
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import TYPE_CHECKING, Callable
+
+from src.core.lead_helpers import generate_vocative, warsaw_now_formatted
+from src.email.attachments_stage0 import get_stage0_attachments_from_env
+from src.email.template_stage0 import build_stage0_email
+from src.integrations.email_sender import send_email_draft
+from src.stage0.process import _friendly_email_error_status
+from src.stage0.test_mode import resolve_recipient_email
+
+if TYPE_CHECKING:
+    from src.storage.sheets import SheetsClient
+
+logger = logging.getLogger(__name__)
+
+CLAIMED = "CLAIMED"
+SENDING = "SENDING"
+
+# Terminal status for an interrupted send.  Does not start with "ERROR", so
+# is_eligible_for_send() keeps the row out of every automatic retry.
+IN_DOUBT_STATUS = "WYMAGA WERYFIKACJI: przerwana wysyłka"
+
+DEFAULT_LEASE_SECONDS = 900.0
+DEFAULT_SENDING_LEASE_SECONDS = 300.0
+DEFAULT_BATCH_SIZE = 25
+
+_LEASE_RE = re.compile(rf"^({CLAIMED}|{SENDING}) (\S+) until (\S+)$")
+_WORKER_ID_RE = re.compile(r"^[A-Za-z0-9._:@-]+$")
+
+
+def shard_for_email(email: str, shard_count: int) -> int:
+    """Return the shard (0 … shard_count-1) that owns *email*.
+
+    Uses SHA-256 of the normalized (stripped, lower-cased) address, so the
+    result is identical across processes, hosts and Python versions —
+    unlike the built-in hash(), which is salted per process.
+    """
+    if shard_count < 1:
+        raise ValueError(f"shard_count must be >= 1, got {shard_count}")
+    digest = hashlib.sha256(email.strip().lower().encode("utf-8")).digest()
+    return int.from_bytes(digest[:8], "big") % shard_count
+
+
+@dataclass(frozen=True)
+class Lease:
+    """A parsed CLAIMED / SENDING marker from ``Status emaila``."""
+
+    phase: str
+    worker_id: str
+    expires_at: datetime  # aware, UTC
+
+    def format(self) -> str:
+        stamp = self.expires_at.astimezone(timezone.utc).strftime("%Y-%m-%dT%H:%M:%S.%fZ")
+        return f"{self.phase} {self.worker_id} until {stamp}"
+
+    def expired(self, now: datetime, *, clock_skew_s: float = 0.0) -> bool:
+        """True once the lease (plus the allowed clock skew) has run out."""
+        return now >= self.expires_at + timedelta(seconds=clock_skew_s)
+
+
+def parse_lease(status: str) -> Lease | None:
+    """Return the Lease encoded in *status*, or None for any other status."""
+    match = _LEASE_RE.match(str(status or "").strip())
+    if not match:
+        return None
+    phase, worker_id, stamp = match.groups()
+    try:
+        expires_at = datetime.strptime(stamp, "%Y-%m-%dT%H:%M:%S.%fZ").replace(tzinfo=timezone.utc)
+    except ValueError:
+        return None
+    return Lease(phase=phase, worker_id=worker_id, expires_at=expires_at)
+
+
+def default_worker_id() -> str:
+    """hostname:pid — unique per running worker."""
+    host = re.sub(r"[^A-Za-z0-9._-]", "-", socket.gethostname()) or "host"
+    return f"{host}:{os.getpid()}"
+
+
+def _utcnow() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+@dataclass(frozen=True)
+class ShardReport:
+    shard_index: int
+    shard_count: int
+    worker_id: str
+    candidates: int
+    claimed: int
+    claims_lost: int
+    emails_sent: int
+    emails_failed: int
+    in_doubt: int
+    reconciled: int
+
+
+@dataclass
+class _Candidate:
+    email: str
+    name: str
+    row_number: int
+    previous_status: str
+
+
+def _email_of(row: dict[str, str]) -> str:
+    return str(row.get("Email", "")).strip().lower()
+
+
+def process_shard(
+    sheets_client: SheetsClient,
+    calendar_url: str,
+    *,
+    shard_index: int,
+    shard_count: int,
+    worker_id: str,
+    smtp_host: str,
+    smtp_port: int,
+    smtp_user: str,
+    smtp_password: str,
+    smtp_from_email: str,
+    test_mode: bool = False,
+    test_recipient: str | None = None,
+    attachments: list[Path] | None = None,
+    lease_seconds: float = DEFAULT_LEASE_SECONDS,
+    sending_lease_seconds: float = DEFAULT_SENDING_LEASE_SECONDS,
+    safety_margin_s: float = 60.0,
+    clock_skew_s: float = 30.0,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    send_interval_s: float = 10.0,
+    was_delivered: Callable[[str], bool | None] | None = None,
+    now: Callable[[], datetime] = _utcnow,
+) -> ShardReport:
+    """Send auto-replies for the eligible leads of one shard.
+
+    The sharded counterpart of process_new_leads(): same eligibility rules
+    (get_new_leads() / is_eligible_for_send()), same email and status
+    columns, plus the CLAIMED / SENDING lease protocol described in the
+    module docstring.
+
+    Arguments (beyond process_new_leads()):
+        shard_index / shard_count: which part of the leads this worker owns.
+        worker_id: unique per running worker; written into the leases.
+        lease_seconds: lifetime of a CLAIMED lease.  Claims are taken in
+            batches of *batch_size*, so it must comfortably cover
+            ``batch_size * send_interval_s``.
+        sending_lease_seconds: how long a SENDING marker protects an SMTP
+            call before the row is treated as interrupted.
+        safety_margin_s: minimum claim lifetime left to start a send.
+        clock_skew_s: extra wait before another worker's lease is taken over.
+        was_delivered: optional ``email -> True / False / None`` lookup used
+            to settle interrupted sends; None (or a None answer) parks the
+            row for the operator.
+        now: clock returning an aware UTC datetime (tests).
+    """
+    if not 0 <= shard_index < shard_count:
+        raise ValueError(f"shard_index must be in 0..{shard_count - 1}, got {shard_index}")
+    if not _WORKER_ID_RE.match(worker_id):
+        raise ValueError(f"Invalid worker_id (letters, digits and ._:@- only): {worker_id!r}")
+    if test_mode:
+        if not (test_recipient or "").strip():
+            raise RuntimeError(
+                "TEST_RECIPIENT_EMAIL is required when STAGE0_TEST_MODE=1. "
+                "Set it to an internal address before running in test mode."
+            )
+        logger.info("TEST MODE active — recipient override in effect")
+
+    def in_shard(email: str) -> bool:
+        return shard_for_email(email, shard_count) == shard_index
+
+    sheets_client.ensure_status_rows_exist(email_filter=in_shard)
+
+    status_rows = sheets_client.read_status_rows()
+    row_number_index: dict[str, int] = {
+        _email_of(r): idx + 2 for idx, r in enumerate(status_rows) if _email_of(r)
+    }
+
+    # Expired leases in this shard: SENDING → settle, CLAIMED → reclaim.
+    in_doubt = reconciled = 0
+    reclaimable: list[_Candidate] = []
+    current = now()
+    for idx, row in enumerate(status_rows):
+        email = _email_of(row)
+        if not email or not in_shard(email) or str(row.get("Email wysłany", "")).strip():
+            continue
+        lease = parse_lease(row.get("Status emaila", ""))
+        if lease is None or not lease.expired(current, clock_skew_s=clock_skew_s):
+            continue
+        if lease.phase == CLAIMED:
+            reclaimable.append(_Candidate(
+                email=email,
+                name=str(row.get("Lead", "")),
+                row_number=idx + 2,
+                previous_status="",
+            ))
+            continue
+        delivered = was_delivered(email) if was_delivered is not None else None
+        if delivered is None:
+            logger.warning(
+                "Interrupted send in row %d (worker %s) — marked for operator review",
+                idx + 2, lease.worker_id,
+            )
+            sheets_client.update_row(idx + 2, {"Status emaila": IN_DOUBT_STATUS})
+            in_doubt += 1
+        elif delivered:
+            sheets_client.update_row(idx + 2, {
+                "Email wysłany": warsaw_now_formatted(),
+                "Status emaila": "SENT",
+            })
+            reconciled += 1
+        else:
+            # Confirmed not sent — clear the marker so the lead is eligible again.
+            sheets_client.update_row(idx + 2, {"Status emaila": ""})
+            reconciled += 1
+
+    # Fresh / ERROR leads come from the regular eligibility rules.
+    candidates: list[_Candidate] = []
+    seen: set[str] = set()
+    status_by_email = {_email_of(r): r for r in status_rows if _email_of(r)}
+    for lead in sheets_client.get_new_leads():
+        email = _email_of(lead)
+        if not email or not in_shard(email) or email in seen:
+            continue
+        row_number = row_number_index.get(email)
+        if row_number is None:
+            logger.error("Status row not found for a lead in shard %d — skipping", shard_index)
+            continue
+        seen.add(email)
+        candidates.append(_Candidate(
+            email=email,
+            name=str(lead.get("Imię i nazwisko / Firma", "")),
+            row_number=row_number,
+            previous_status=str(status_by_email.get(email, {}).get("Status emaila", "")),
+        ))
+    for cand in reclaimable:
+        if cand.email not in seen:
+            seen.add(cand.email)
+            candidates.append(cand)
+
+    if attachments is None:
+        attachments = get_stage0_attachments_from_env() if candidates else []
+
+    claimed = claims_lost = emails_sent = emails_failed = 0
+    for start in range(0, len(candidates), max(1, batch_size)):
+        batch = candidates[start:start + max(1, batch_size)]
+
+        # 1. Claim the batch.
+        claim = Lease(CLAIMED, worker_id, now() + timedelta(seconds=lease_seconds))
+        marker = claim.format()
+        for cand in batch:
+            sheets_client.update_row(cand.row_number, {"Status emaila": marker})
+
+        # 2. Read back — keep only rows that still carry our marker.
+        fresh = sheets_client.read_status_rows()
+        owned: list[_Candidate] = []
+        for cand in batch:
+            pos = cand.row_number - 2
+            row = fresh[pos] if 0 <= pos < len(fresh) else {}
+            if _email_of(row) == cand.email and str(row.get("Status emaila", "")).strip() == marker:
+                owned.append(cand)
+        claimed += len(owned)
+        if len(owned) < len(batch):
+            claims_lost += len(batch) - len(owned)
+            logger.warning(
+                "Shard %d: %d claim(s) lost to another worker",
+                shard_index, len(batch) - len(owned),
+            )
+
+        # 3. Send while the claim is still safely ours.
+        for pos, cand in enumerate(owned):
+            if now() + timedelta(seconds=safety_margin_s) >= claim.expires_at:
+                logger.warning(
+                    "Shard %d: claim lease running out — leaving %d lead(s) for the next run",
+                    shard_index, len(owned) - pos,
+                )
+                break
+
+            try:
+                draft = build_stage0_email(
+                    calendar_url=calendar_url,
+                    greeting=generate_vocative(cand.name),
+                    attachments=attachments,
+                )
+            except Exception:
+                logger.exception("Failed to build draft for row %d — releasing claim", cand.row_number)
+                sheets_client.update_row(cand.row_number, {"Status emaila": cand.previous_status})
+                emails_failed += 1
+                continue
+
+            sending = Lease(SENDING, worker_id, now() + timedelta(seconds=sending_lease_seconds))
+            sheets_client.update_row(cand.row_number, {"Status emaila": sending.format()})
+
+            recipient = resolve_recipient_email(
+                cand.email, test_mode=test_mode, test_recipient=test_recipient
+            )
+            try:
+                send_email_draft(
+                    smtp_host=smtp_host,
+                    smtp_port=smtp_port,
+                    smtp_user=smtp_user,
+                    smtp_password=smtp_password,
+                    from_email=smtp_from_email,
+                    to_email=recipient,
+                    draft=draft,
+                )
+            except Exception as exc:
+                logger.error("Failed to send email to %s: %s", cand.email, str(exc)[:120])
+                sheets_client.update_row(
+                    cand.row_number,
+                    {"Status emaila": _friendly_email_error_status(exc)},
+                )
+                emails_failed += 1
+                continue
+
+            sheets_client.update_row(cand.row_number, {
+                "Email wysłany": warsaw_now_formatted(),
+                "Status emaila": "SENT",
+            })
+            emails_sent += 1
+            if send_interval_s > 0:
+                time.sleep(send_interval_s)
+
+    report = ShardReport(
+        shard_index=shard_index,
+        shard_count=shard_count,
+        worker_id=worker_id,
+        candidates=len(candidates),
+        claimed=claimed,
+        claims_lost=claims_lost,
+        emails_sent=emails_sent,
+        emails_failed=emails_failed,
+        in_doubt=in_doubt,
+        reconciled=reconciled,
+    )
+    logger.info(
+        "process_shard done — shard=%d/%d candidates=%d claimed=%d lost=%d "
+        "sent=%d failed=%d in_doubt=%d reconciled=%d",
+        shard_index, shard_count, report.candidates, claimed, claims_lost,
+        emails_sent, emails_failed, in_doubt, reconciled,
+    )
+    return report
+
+
+def main(argv: list[str] | None = None) -> None:
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s [%(levelname)s] %(name)s — %(message)s",
+    )
+    parser = argparse.ArgumentParser(description="Run Stage 0 for one shard of the leads.")
+    parser.add_argument("--shard-index", type=int, default=None, help="default: STAGE0_SHARD_INDEX")
+    parser.add_argument("--shard-count", type=int, default=None, help="default: STAGE0_SHARD_COUNT")
+    parser.add_argument("--worker-id", default=None, help="default: STAGE0_WORKER_ID or hostname:pid")
+    args = parser.parse_args(argv)
+
+    try:
+        from src.core import config, tracing
+        from src.stage0.job import _build_sheets_client
+        from src.stage0.process import process_followups
+
+        config.validate()
+        shard_count = args.shard_count if args.shard_count is not None else config.STAGE0_SHARD_COUNT
+        shard_index = args.shard_index if args.shard_index is not None else config.STAGE0_SHARD_INDEX
+        worker_id = args.worker_id or config.STAGE0_WORKER_ID or default_worker_id()
+
+        with tracing.session(config.STAGE0_TRACE_PATH):
+            # No status mirror: other workers' claims land in rows it would not re-fetch.
+            sheets = _build_sheets_client(None, status_mirror=False)
+            process_shard(
+                sheets,
+                config.CALENDAR_URL,
+                shard_index=shard_index,
+                shard_count=shard_count,
+                worker_id=worker_id,
+                smtp_host=config.SMTP_HOST,
+                smtp_port=config.SMTP_PORT,
+                smtp_user=config.SMTP_USER,
+                smtp_password=config.SMTP_PASS,
+                smtp_from_email=config.SMTP_FROM_EMAIL,
+                test_mode=config.STAGE0_TEST_MODE,
+                test_recipient=config.TEST_RECIPIENT_EMAIL,
+                lease_seconds=config.STAGE0_LEASE_SECONDS,
+            )
+            # Follow-up scheduling covers the whole status tab — shard 0 owns it
+            # so the workers do not race on the same cells.
+            if shard_index == 0:
+                updated = process_followups(sheets, formula=config.STAGE0_FOLLOWUP_FORMULA)
+                logger.info("Stage0 follow-up step complete — updated=%d", updated)
+    except Exception:
+        logger.exception("Stage0 shard run failed")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
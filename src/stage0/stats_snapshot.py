@@ -0,0 +1,181 @@
+"""Stage 0 — PII-minimal stats snapshot for the read-only stats API.
+
+After each run the job condenses the status tab into one small JSON file
+(STAGE0_STATS_SNAPSHOT_PATH); api/stats.py serves it, so dashboard
+requests never reach Google.  The snapshot holds:
+
+- ``status_counts`` — leads per status category (STATUS_CATEGORIES);
+- ``followups`` — due-now count, upcoming counts per day, and the due
+  queue as (sheet row, lead hash, due time), oldest first;
+- ``sends_per_day`` — emails sent per Warsaw day over SEND_HISTORY_DAYS
+  (backfilled PRE-CONTACTED rows are not sends);
+- ``last_run`` — the run's counters and timings (RunMetrics.to_json()).
+
+Leads appear only as row numbers and hash_email() ids — never as names
+or addresses.  The status rows are read once more after the run; with
+the status mirror (STAGE0_STATUS_MIRROR_PATH) that read is a probe.
+Multi-tenant runs write one file per tenant (``stats.json`` →
+``stats.<tenant>.json``).
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+from collections import Counter
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Iterable, Mapping
+
+from src.core.tracing import hash_email
+from src.stage0.batch import parse_sheet_datetime
+from src.stage0.followup import _SHEET_DT_FMT, WARSAW_TZ
+from src.stage0.metrics import tenant_path
+
+if TYPE_CHECKING:
+    from src.stage0.metrics import RunMetrics
+    from src.storage.sheets import SheetsClient
+
+logger = logging.getLogger(__name__)
+
+STATUS_CATEGORIES = ("pending", "sent", "error", "pre_contacted", "claimed", "sending", "in_doubt")
+SEND_HISTORY_DAYS = 90
+UPCOMING_DAYS = 7
+# Longest due queue kept in the file (the count is always exact).
+MAX_QUEUE = 500
+_VERSION = 1
+
+
+def status_category(row: Mapping[str, Any]) -> str:
+    """STATUS_CATEGORIES entry for one status row."""
+    from src.stage0.backfill import PRE_CONTACTED_STATUS
+    from src.stage0.sharding import IN_DOUBT_STATUS, parse_lease
+
+    status = str(row.get("Status emaila", "")).strip()
+    lease = parse_lease(status)
+    if lease is not None:
+        return lease.phase.lower()
+    if status == IN_DOUBT_STATUS:
+        return "in_doubt"
+    if status.startswith("ERROR"):
+        return "error"
+    if status == PRE_CONTACTED_STATUS:
+        return "pre_contacted"
+    if str(row.get("Email wysłany", "")).strip():
+        return "sent"
+    return "pending"
+
+
+def _parse(value: Any) -> datetime | None:
+    try:
+        return parse_sheet_datetime(str(value).strip())
+    except ValueError:
+        return None
+
+
+def build_stats_snapshot(
+    status_rows: Iterable[Mapping[str, Any]],
+    *,
+    now: datetime,
+    last_run: RunMetrics | None = None,
+    tenant: str | None = None,
+) -> dict[str, Any]:
+    """The snapshot dict for *status_rows* (read_status_rows() order) at *now*."""
+    now = now.astimezone(WARSAW_TZ)
+    counts: Counter[str] = Counter({category: 0 for category in STATUS_CATEGORIES})
+    sends: Counter[str] = Counter()
+    upcoming: Counter[str] = Counter()
+    queue: list[tuple[datetime, int, str]] = []
+    first_day = (now - timedelta(days=SEND_HISTORY_DAYS - 1)).date()
+    last_upcoming = (now + timedelta(days=UPCOMING_DAYS)).date()
+
+    for idx, row in enumerate(status_rows):
+        email = str(row.get("Email", "")).strip().lower()
+        if not email:
+            continue
+        category = status_category(row)
+        counts[category] += 1
+
+        sent_at = _parse(row.get("Email wysłany", ""))
+        if sent_at is not None and category != "pre_contacted" and sent_at.date() >= first_day:
+            sends[sent_at.date().isoformat()] += 1
+
+        due_at = _parse(row.get("Follow-up od", ""))
+        if due_at is None or str(row.get("Follow-up wykonany", "")).strip():
+            continue
+        if due_at <= now or str(row.get("Wymaga follow-upu", "")).strip().upper() == "YES":
+            queue.append((due_at, idx + 2, hash_email(email)))
+        elif due_at.date() <= last_upcoming:
+            upcoming[due_at.date().isoformat()] += 1
+
+    queue.sort()
+    days = [(first_day + timedelta(days=i)).isoformat() for i in range(SEND_HISTORY_DAYS)]
+    return {
+        "version": _VERSION,
+        "tenant": tenant,
+        "generated_at": now.strftime(_SHEET_DT_FMT),
+        "status_counts": {"total": sum(counts.values()), **dict(counts)},
+        "followups": {
+            "due_now": len(queue),
+            "upcoming_per_day": dict(sorted(upcoming.items())),
+            "queue": [
+                {"row": row, "lead": lead, "due_at": due_at.strftime(_SHEET_DT_FMT)}
+                for due_at, row, lead in queue[:MAX_QUEUE]
+            ],
+        },
+        "sends_per_day": {day: sends.get(day, 0) for day in days},
+        "last_run": last_run.to_json() if last_run is not None else None,
+    }
+
+
+def write_stats_snapshot(path: str | Path, snapshot: dict[str, Any]) -> Path:
+    """Atomically replace the (per-tenant) snapshot file — readers never see half a file."""
+    target = tenant_path(Path(path), snapshot.get("tenant"))
+    target.parent.mkdir(parents=True, exist_ok=True)
+    tmp = target.with_suffix(target.suffix + ".tmp")
+    tmp.write_text(json.dumps(snapshot, ensure_ascii=False), encoding="utf-8")
+    os.replace(tmp, target)
+    return target
+
+
+def export_stats_snapshot(
+    sheets_client: SheetsClient,
+    path: str | Path,
+    *,
+    last_run: RunMetrics | None = None,
+    tenant: str | None = None,
+    now: datetime | None = None,
+) -> Path | None:
+    """Read the status rows, write the snapshot; failures never fail the run."""
+    if now is None:
+        now = datetime.now(WARSAW_TZ)
+    try:
+        snapshot = build_stats_snapshot(
+            sheets_client.read_status_rows(), now=now, last_run=last_run, tenant=tenant,
+        )
+        target = write_stats_snapshot(path, snapshot)
+    except Exception as exc:
+        logger.warning("Could not write stats snapshot: %s: %s", type(exc).__name__, str(exc)[:200])
+        return None
+    logger.info(
+        "Stats snapshot written — leads=%d due_followups=%d",
+        snapshot["status_counts"]["total"], snapshot["followups"]["due_now"],
+    )
+    return target
+
+
+def load_stats_snapshot(path: str | Path, tenant: str | None = None) -> dict[str, Any] | None:
+    """The snapshot for *tenant*, or None when missing / unreadable / another version."""
+    try:
+        data = json.loads(tenant_path(Path(path), tenant).read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+    return data if isinstance(data, dict) and data.get("version") == _VERSION else None
+
+
+def send_days(snapshot: Mapping[str, Any], days: int) -> dict[str, int]:
+    """The last *days* entries of ``sends_per_day``."""
+    per_day = snapshot.get("sends_per_day") or {}
+    keys = sorted(per_day)[-days:] if days > 0 else []
+    return {day: per_day[day] for day in keys}
@@ -0,0 +1,354 @@
+"""Stage 0 — multi-tenant runner.
+
+Runs run_stage0_job() for several client spreadsheets in one process, so
+tenants share interpreter start-up, one service-account credential (and
+access token) per key file, one keep-alive HTTP connection pool per
+credential, and the process-wide attachment cache.
+
+Each tenant runs in its own worker thread with its own SheetsClient and
+settings; a failure in one tenant is logged and reported but never stops
+the others.  Sheets requests are counted per tenant (quota accounting).
+
+Tenants file (JSON)::
+
+    {
+      "defaults": {
+        "service_account_json": "secrets/service_account.json",
+        "input_tab": "automation_stage0_input",
+        "status_tab": "automation_stage0_status"
+      },
+      "smtp_profiles": {
+        "main": {"host": "smtp.example.com", "port": 587, "user": "bot@example.com",
+                 "password_env": "SMTP_PASS_MAIN", "from_email": "bot@example.com"}
+      },
+      "tenants": [
+        {"name": "acme", "sheet_id": "...", "smtp_profile": "main",
+         "calendar_url": "https://...", "attachments": ["a.pdf", "b.pdf", "c.pdf"],
+         "test_mode": true, "test_recipient": "qa@example.com"}
+      ]
+    }
+
+A tenant with ``"sqlite_path": "data/acme.sqlite3"`` keeps its leads in
+SQLite (src/storage/local.py) instead of the Google tabs; its sheet can
+then be refreshed as a read-only view with ``python -m src.storage.local
+export``.  ``"archive_tab"`` (or a default) names the tab that settled
+leads move to (src/stage0/archive.py).
+
+SMTP passwords are never stored in the file — ``password_env`` names an
+environment variable (set in ``.env``) that holds the password.
+
+Usage:
+    python -m src.stage0.tenants                       # STAGE0_TENANTS_FILE
+    python -m src.stage0.tenants --tenants tenants.json --workers 8
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import logging
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+from src.stage0.process import ProcessReport
+
+if TYPE_CHECKING:
+    from src.storage.metadata_cache import MetadataCache
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_WORKERS = 4
+
+_TENANT_FIELDS_WITH_DEFAULTS = ("service_account_json", "input_tab", "status_tab", "archive_tab")
+
+
+@dataclass(frozen=True)
+class SmtpProfile:
+    host: str
+    port: int
+    user: str
+    password: str
+    from_email: str
+
+
+@dataclass(frozen=True)
+class TenantConfig:
+    """Everything run_stage0_job() needs for one client spreadsheet."""
+
+    name: str
+    sheet_id: str
+    input_tab: str
+    status_tab: str
+    service_account_json: str
+    smtp: SmtpProfile
+    calendar_url: str
+    attachments: tuple[str, ...]
+    test_mode: bool = False
+    test_recipient: str | None = None
+    # SQLite lead store (src/storage/local.py) instead of the Google tabs.
+    sqlite_path: str | None = None
+    # Archive tab for settled leads (src/stage0/archive.py); None = no archive.
+    archive_tab: str | None = None
+
+    def attachment_paths(self) -> list[Path]:
+        """Return the tenant's attachment paths; raise ValueError when one is missing."""
+        paths: list[Path] = []
+        for value in self.attachments:
+            p = Path(value)
+            if not p.exists():
+                raise ValueError(f"File not found for tenant '{self.name}' attachment: {p}")
+            paths.append(p)
+        return paths
+
+
+@dataclass(frozen=True)
+class TenantResult:
+    name: str
+    report: ProcessReport | None
+    error: str | None
+    duration_s: float
+    sheets_requests: int
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+# ---------------------------------------------------------------------------
+# Loading
+# ---------------------------------------------------------------------------
+
+def _require_field(entry: dict[str, Any], key: str, where: str) -> str:
+    value = str(entry.get(key, "") or "").strip()
+    if not value:
+        raise RuntimeError(f"Missing required field '{key}' in {where}")
+    return value
+
+
+def _load_smtp_profile(name: str, raw: dict[str, Any]) -> SmtpProfile:
+    where = f"smtp profile '{name}'"
+    password_env = _require_field(raw, "password_env", where)
+    password = os.getenv(password_env, "").strip()
+    if not password:
+        raise RuntimeError(f"Missing required environment variable: {password_env} ({where})")
+    return SmtpProfile(
+        host=_require_field(raw, "host", where),
+        port=int(raw.get("port", 587)),
+        user=_require_field(raw, "user", where),
+        password=password,
+        from_email=_require_field(raw, "from_email", where),
+    )
+
+
+def parse_tenants(data: dict[str, Any]) -> list[TenantConfig]:
+    """Build TenantConfig objects from the decoded tenants file.
+
+    Raises RuntimeError with a clear message on the first invalid entry, so
+    a broken file stops the run before any tenant is touched.
+    """
+    defaults = data.get("defaults") or {}
+    profiles = {
+        name: _load_smtp_profile(name, raw)
+        for name, raw in (data.get("smtp_profiles") or {}).items()
+    }
+
+    tenants: list[TenantConfig] = []
+    seen: set[str] = set()
+    for idx, raw in enumerate(data.get("tenants") or []):
+        entry = {**{k: defaults[k] for k in _TENANT_FIELDS_WITH_DEFAULTS if k in defaults}, **raw}
+        name = _require_field(entry, "name", f"tenant #{idx + 1}")
+        where = f"tenant '{name}'"
+        if name in seen:
+            raise RuntimeError(f"Duplicate tenant name: {name}")
+        seen.add(name)
+
+        profile_name = _require_field(entry, "smtp_profile", where)
+        if profile_name not in profiles:
+            raise RuntimeError(f"Unknown smtp_profile '{profile_name}' in {where}")
+
+        attachments = tuple(str(a) for a in entry.get("attachments") or [])
+        if len(attachments) != 3:
+            raise RuntimeError(f"Expected exactly 3 attachments in {where}, got {len(attachments)}")
+
+        test_mode = bool(entry.get("test_mode", False))
+        test_recipient = str(entry.get("test_recipient") or "").strip() or None
+
+        tenants.append(TenantConfig(
+            name=name,
+            sheet_id=_require_field(entry, "sheet_id", where),
+            input_tab=_require_field(entry, "input_tab", where),
+            status_tab=_require_field(entry, "status_tab", where),
+            service_account_json=_require_field(entry, "service_account_json", where),
+            smtp=profiles[profile_name],
+            calendar_url=_require_field(entry, "calendar_url", where),
+            attachments=attachments,
+            test_mode=test_mode,
+            test_recipient=test_recipient,
+            sqlite_path=str(entry.get("sqlite_path") or "").strip() or None,
+            archive_tab=str(entry.get("archive_tab") or "").strip() or None,
+        ))
+    return tenants
+
+
+def load_tenants(path: str | Path) -> list[TenantConfig]:
+    """Read and validate the tenants JSON file at *path*."""
+    with open(path, encoding="utf-8") as fh:
+        return parse_tenants(json.load(fh))
+
+
+# ---------------------------------------------------------------------------
+# Shared resources
+# ---------------------------------------------------------------------------
+
+class _SharedSheetsResources:
+    """One credential + session (connection pool) per service-account file.
+
+    Tenants that use the same key file share the access token and the
+    keep-alive connections; each tenant still gets its own gspread client
+    so request counts stay per tenant.  *metadata_cache*
+    (STAGE0_SHEETS_CACHE_PATH) is shared too: one file, one entry per
+    sheet and tabs.
+    """
+
+    def __init__(self, pool_size: int, metadata_cache: MetadataCache | None = None) -> None:
+        self._pool_size = pool_size
+        self.metadata_cache = metadata_cache
+        self._lock = threading.Lock()
+        self._sessions: dict[str, Any] = {}
+
+    def client_for(self, tenant: TenantConfig) -> Any:
+        from src.storage import transport
+
+        key = str(Path(tenant.service_account_json).resolve())
+        with self._lock:
+            session = self._sessions.get(key)
+            if session is None:
+                creds = transport.load_credentials(tenant.service_account_json)
+                session = transport.build_shared_session(creds, pool_size=self._pool_size)
+                self._sessions[key] = session
+        return transport.client_for_session(session)
+
+
+# ---------------------------------------------------------------------------
+# Running
+# ---------------------------------------------------------------------------
+
+def _run_one(tenant: TenantConfig, shared: _SharedSheetsResources) -> TenantResult:
+    from src.stage0.job import _build_google_sheets_client, run_stage0_job
+    from src.storage.sheets import SheetsClient
+
+    started = time.perf_counter()
+    # Thread name shows up in log lines, tying run_stage0_job's output to the tenant.
+    thread = threading.current_thread()
+    previous_name, thread.name = thread.name, f"tenant:{tenant.name}"
+    gc = None
+    try:
+        if tenant.sqlite_path:
+            from src.storage.local import LocalSheetsClient
+
+            sheets: SheetsClient = LocalSheetsClient(tenant.sqlite_path)
+        else:
+            gc = shared.client_for(tenant)
+            sheets = _build_google_sheets_client(
+                tenant, gspread_client=gc, metadata_cache=shared.metadata_cache,
+            )
+            try:
+                sheets.ensure_date_column_format()
+            except Exception as exc:
+                logger.warning("Tenant %s: ensure_date_column_format skipped: %s", tenant.name, exc)
+
+        report = run_stage0_job(sheets_client=sheets, tenant=tenant)
+        error = None
+    except Exception as exc:
+        logger.exception("Tenant %s: Stage0 job failed", tenant.name)
+        report = None
+        error = f"{type(exc).__name__}: {str(exc)[:200]}"
+    finally:
+        thread.name = previous_name
+
+    requests_made = getattr(getattr(gc, "http_client", None), "total_requests", 0)
+    return TenantResult(
+        name=tenant.name,
+        report=report,
+        error=error,
+        duration_s=time.perf_counter() - started,
+        sheets_requests=requests_made,
+    )
+
+
+def run_tenants(
+    tenants: list[TenantConfig],
+    *,
+    max_workers: int = DEFAULT_WORKERS,
+) -> list[TenantResult]:
+    """Run every tenant once, up to *max_workers* in parallel.
+
+    Results are returned in the same order as *tenants*.  One summary line
+    per tenant is logged (tenant name and counters only — no PII).
+    """
+    if not tenants:
+        return []
+    workers = max(1, min(max_workers, len(tenants)))
+    from src.stage0.job import _build_metadata_cache
+
+    shared = _SharedSheetsResources(pool_size=workers, metadata_cache=_build_metadata_cache())
+
+    logger.info("Stage0 multi-tenant run start — tenants=%d workers=%d", len(tenants), workers)
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="stage0-tenant") as pool:
+        results = list(pool.map(lambda t: _run_one(t, shared), tenants))
+
+    for r in results:
+        if r.report is not None:
+            logger.info(
+                "Tenant %s complete — sent=%d failed=%d sheets_requests=%d duration=%.1fs",
+                r.name, r.report.emails_sent, r.report.emails_failed,
+                r.sheets_requests, r.duration_s,
+            )
+        else:
+            logger.error(
+                "Tenant %s failed — %s sheets_requests=%d duration=%.1fs",
+                r.name, r.error, r.sheets_requests, r.duration_s,
+            )
+    failed = sum(1 for r in results if not r.ok)
+    logger.info(
+        "Stage0 multi-tenant run complete — tenants=%d failed=%d sheets_requests=%d",
+        len(results), failed, sum(r.sheets_requests for r in results),
+    )
+    return results
+
+
+def main(argv: list[str] | None = None) -> None:
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s [%(levelname)s] %(name)s [%(threadName)s] — %(message)s",
+    )
+    parser = argparse.ArgumentParser(description="Run Stage 0 for every configured tenant.")
+    parser.add_argument("--tenants", default=None, help="tenants JSON file (default: STAGE0_TENANTS_FILE)")
+    parser.add_argument("--workers", type=int, default=None, help="parallel tenants (default: STAGE0_TENANT_WORKERS or 4)")
+    args = parser.parse_args(argv)
+
+    try:
+        from src.core import config, tracing
+
+        path = args.tenants or config.STAGE0_TENANTS_FILE
+        if not path:
+            raise RuntimeError("Missing required environment variable: STAGE0_TENANTS_FILE")
+        workers = args.workers or config.STAGE0_TENANT_WORKERS
+        with tracing.session(config.STAGE0_TRACE_PATH):
+            results = run_tenants(load_tenants(path), max_workers=workers)
+    except Exception:
+        logger.exception("Stage0 multi-tenant run failed")
+        sys.exit(1)
+
+    if any(not r.ok for r in results):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
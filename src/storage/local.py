@@ -0,0 +1,374 @@
+"""SQLite-backed SheetsClient — offline runs, load tests, large tenants.
+
+LocalSheetsClient is a drop-in SheetsClient: it subclasses it and swaps
+only the Google I/O, so header validation, input deduplication and
+duplicate marking, the SYSTEM_COLUMNS guard, eligibility and status row
+creation are the same code paths.  Each tab is a table whose columns are
+the tab headers; ``row_number`` is the sheet row (header = row 1, first
+lead = row 2), so numbering matches the Google tab row for row: rows are
+appended, and archival (src/stage0/archive.py) renumbers the rows below
+the ones it removes, as deleting sheet rows does.  The input table also
+keeps column D's "Duplikat" marker; the ``archive`` table plays the
+archive tab.
+
+Select it with STAGE0_STORAGE_BACKEND=sqlite (database at
+STAGE0_SQLITE_PATH), or per tenant with ``"sqlite_path"`` in the
+tenants file.  The Google tabs can then be kept as a read-only view:
+
+    python -m src.storage.local import             # Google tabs → SQLite
+    python -m src.storage.local export --overwrite # SQLite → Google tabs
+    python -m src.storage.local import --tenant acme  # tenants-file entry
+"""
+
+from __future__ import annotations
+
+import argparse
+import logging
+import sqlite3
+import sys
+import threading
+from pathlib import Path
+from typing import Any
+
+from src.core.tracing import hash_email
+from src.storage.sheets import (
+    ARCHIVE_HEADERS,
+    INPUT_HEADERS,
+    STATUS_HEADERS,
+    SYSTEM_COLUMNS,
+    SheetsClient,
+)
+
+logger = logging.getLogger(__name__)
+
+_TABLES = {"input": INPUT_HEADERS, "status": STATUS_HEADERS, "archive": ARCHIVE_HEADERS}
+_MARKER = "_marker"  # input column D — "Duplikat"
+
+
+def _q(name: str) -> str:
+    """Quote an SQL identifier (headers contain spaces and Polish letters)."""
+    return '"' + name.replace('"', '""') + '"'
+
+
+class LocalSheetsClient(SheetsClient):
+    """SheetsClient whose input and status tabs live in one SQLite file."""
+
+    def __init__(self, path: str | Path) -> None:
+        # SheetsClient.__init__ is not called: it connects to Google.  The
+        # options it would set are all off (no mirror, anchors, formula...).
+        self._configure(
+            sheet_id="",
+            input_tab="input",
+            status_tab="status",
+            append_chunk_rows=None,  # one transaction, whatever the size
+        )
+        self._path = Path(path)
+        self._path.parent.mkdir(parents=True, exist_ok=True)
+        # One connection shared by the intake worker thread and the caller;
+        # the lock serializes statements, WAL lets shard processes coexist.
+        self._conn = sqlite3.connect(self._path, isolation_level=None, check_same_thread=False, timeout=30)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._lock = threading.RLock()
+        self._headers_input = list(INPUT_HEADERS)
+        self._headers_status = list(STATUS_HEADERS)
+        self._create_schema()
+        logger.info("Opened local sheet store %s", self._path.name)
+
+    def _create_schema(self) -> None:
+        with self._lock:
+            self._conn.execute("CREATE TABLE IF NOT EXISTS headers (tab TEXT PRIMARY KEY, names TEXT NOT NULL)")
+            for tab, headers in _TABLES.items():
+                extra = f", {_q(_MARKER)} TEXT NOT NULL DEFAULT ''" if tab == "input" else ""
+                columns = ", ".join(f"{_q(h)} TEXT NOT NULL DEFAULT ''" for h in headers)
+                self._conn.execute(
+                    f"CREATE TABLE IF NOT EXISTS {_q(tab)} (row_number INTEGER PRIMARY KEY, {columns}{extra})"
+                )
+                stored = self._conn.execute("SELECT names FROM headers WHERE tab = ?", (tab,)).fetchone()
+                if stored is None:
+                    self._conn.execute("INSERT INTO headers VALUES (?, ?)", (tab, "\t".join(headers)))
+                else:
+                    self._validate_headers(stored[0].split("\t"), headers, tab)
+            self._conn.execute(
+                f'CREATE INDEX IF NOT EXISTS status_email ON status (lower(trim({_q("Email")})))'
+            )
+
+    def close(self) -> None:
+        self._conn.close()
+
+    # ------------------------------------------------------------------
+    # Storage primitives used by the inherited SheetsClient methods
+    # ------------------------------------------------------------------
+
+    def _get_records(self, tab: str) -> list[dict[str, Any]]:
+        headers = _TABLES[tab]
+        with self._lock:
+            cursor = self._conn.execute(
+                f"SELECT {', '.join(_q(h) for h in headers)} FROM {_q(tab)} ORDER BY row_number"
+            )
+            return [dict(zip(headers, row)) for row in cursor]
+
+    def _append(self, tab: str, rows: list[list[str]]) -> int:
+        headers = _TABLES[tab]
+        placeholders = ", ".join("?" for _ in range(len(headers) + 1))
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                first = self._next_row(tab)
+                self._conn.executemany(
+                    f"INSERT INTO {_q(tab)} (row_number, {', '.join(_q(h) for h in headers)}) VALUES ({placeholders})",
+                    (
+                        [first + i, *(str(v) for v in (list(row) + [""] * len(headers))[: len(headers)])]
+                        for i, row in enumerate(rows)
+                    ),
+                )
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+        return first
+
+    def _next_row(self, tab: str) -> int:
+        (last,) = self._conn.execute(f"SELECT MAX(row_number) FROM {_q(tab)}").fetchone()
+        return (last or 1) + 1
+
+    # ------------------------------------------------------------------
+    # SheetsClient interface — writes
+    # ------------------------------------------------------------------
+
+    def append_status_rows(self, rows: list[list[str]]) -> int | None:
+        """Append full status rows; returns the row number of the first one."""
+        return self._append("status", rows) if rows else None
+
+    def append_input_rows(self, rows: list[list[str]]) -> None:
+        if rows:
+            self._append("input", rows)
+
+    def update_row(self, row_number: int, updates: dict[str, str]) -> None:
+        """Write *updates* into status row *row_number* (SYSTEM_COLUMNS only)."""
+        for col_name in updates:
+            if col_name not in SYSTEM_COLUMNS:
+                raise ValueError(f"Refusing to write non-system column: {col_name}")
+        if not updates:
+            return
+        assignments = ", ".join(f"{_q(c)} = ?" for c in updates)
+        with self._lock:
+            cursor = self._conn.execute(
+                f"UPDATE status SET {assignments} WHERE row_number = ?",
+                [str(v) for v in updates.values()] + [row_number],
+            )
+        if cursor.rowcount == 0:
+            raise ValueError(f"Status row {row_number} does not exist")
+        logger.info("Updated row %d: %s", row_number, list(updates.keys()))
+
+    def update_rows(self, updates: dict[int, dict[str, str]]) -> None:
+        """update_row() for many rows, in one transaction."""
+        for row_updates in updates.values():
+            for col_name in row_updates:
+                if col_name not in SYSTEM_COLUMNS:
+                    raise ValueError(f"Refusing to write non-system column: {col_name}")
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                for row_number, row_updates in sorted(updates.items()):
+                    if not row_updates:
+                        continue
+                    assignments = ", ".join(f"{_q(c)} = ?" for c in row_updates)
+                    cursor = self._conn.execute(
+                        f"UPDATE status SET {assignments} WHERE row_number = ?",
+                        [str(v) for v in row_updates.values()] + [row_number],
+                    )
+                    if cursor.rowcount == 0:
+                        raise ValueError(f"Status row {row_number} does not exist")
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+        logger.info("Updated %d status row(s)", len(updates))
+
+    def update_lead(self, email: str, updates: dict[str, str]) -> bool:
+        """update_row() on the lead's current row; False when it has none.
+
+        Row numbers only change under archive_status_rows(), which holds the
+        lock, so looking the row up by email is exact — no anchors needed.
+        """
+        with self._lock:
+            row_number = self.get_status_row_number_by_email(email)
+            if row_number is None:
+                logger.error("No status row for lead %s — update skipped", hash_email(email))
+                return False
+            self.update_row(row_number, updates)
+        return True
+
+    def transport_stats(self) -> dict[str, int]:
+        """Empty — no HTTP transport."""
+        return {}
+
+    def ensure_date_column_format(self) -> None:
+        """No-op — dates are stored as 'YYYY-MM-DD HH:MM' text."""
+
+    def ensure_followup_formula(self) -> bool:
+        """False — SQLite has no formulas; the follow-up pass keeps writing flags."""
+        return False
+
+    def get_status_row_number_by_email(self, email: str) -> int | None:
+        with self._lock:
+            row = self._conn.execute(
+                f'SELECT MIN(row_number) FROM status WHERE lower(trim({_q("Email")})) = ?',
+                (email.strip().lower(),),
+            ).fetchone()
+        return row[0] if row else None
+
+    def read_status_column(self, col_name: str) -> list[str]:
+        if col_name not in STATUS_HEADERS:
+            raise ValueError(f"Column '{col_name}' not found in status headers")
+        with self._lock:
+            values = [v for (v,) in self._conn.execute(f"SELECT {_q(col_name)} FROM status ORDER BY row_number")]
+        while values and values[-1] == "":
+            values.pop()  # as col_values() on the sheet
+        return values
+
+    # ------------------------------------------------------------------
+    # Archive (always available — the table lives in the same file)
+    # ------------------------------------------------------------------
+
+    @property
+    def archive_enabled(self) -> bool:
+        return True
+
+    def get_archived_emails(self) -> frozenset[str]:
+        with self._lock:
+            return frozenset(
+                email for (email,) in self._conn.execute(f'SELECT lower(trim({_q("Email")})) FROM archive') if email
+            )
+
+    def archive_status_rows(self, rows: dict[int, list[str]]) -> int:
+        """Move status rows into the archive table and renumber the rest, atomically."""
+        if not rows:
+            return 0
+        headers = ARCHIVE_HEADERS
+        email_idx = headers.index("Email")
+        placeholders = ", ".join("?" for _ in range(len(headers) + 1))
+        with self._lock:
+            archived = set(self.get_archived_emails())
+            fresh = []
+            for _, values in sorted(rows.items()):
+                email = str(values[email_idx]).strip().lower()
+                if email not in archived:
+                    archived.add(email)
+                    fresh.append(values)
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                first = self._next_row("archive")
+                self._conn.executemany(
+                    f"INSERT INTO archive (row_number, {', '.join(_q(h) for h in headers)}) VALUES ({placeholders})",
+                    (
+                        [first + i, *(str(v) for v in (list(row) + [""] * len(headers))[: len(headers)])]
+                        for i, row in enumerate(fresh)
+                    ),
+                )
+                self._conn.executemany("DELETE FROM status WHERE row_number = ?", ((n,) for n in rows))
+                remaining = [n for (n,) in self._conn.execute("SELECT row_number FROM status ORDER BY row_number")]
+                # Ascending order: each target number is already free.
+                self._conn.executemany(
+                    "UPDATE status SET row_number = ? WHERE row_number = ?",
+                    ((idx + 2, n) for idx, n in enumerate(remaining) if n != idx + 2),
+                )
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+        logger.info("Archived %d status row(s) (%d added to the archive table)", len(rows), len(fresh))
+        return len(rows)
+
+    def _mark_input_duplicate(self, row_number: int) -> None:
+        with self._lock:
+            self._conn.execute(f"UPDATE input SET {_q(_MARKER)} = 'Duplikat' WHERE row_number = ?", (row_number,))
+
+    # ------------------------------------------------------------------
+    # Whole-tab copy (same shape as SheetsClient.read/write_tab_values)
+    # ------------------------------------------------------------------
+
+    def read_tab_values(self, tab: str) -> list[list[str]]:
+        columns = list(_TABLES[tab]) + ([_MARKER] if tab == "input" else [])
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT {', '.join(_q(c) for c in columns)} FROM {_q(tab)} ORDER BY row_number"
+            ).fetchall()
+        if tab == "input":
+            # Column D stays empty unless marked, as on the sheet.
+            return [list(r) if r[-1] else list(r[:-1]) for r in rows]
+        return [list(r) for r in rows]
+
+    def write_tab_values(self, tab: str, rows: list[list[str]]) -> None:
+        """Replace the table with *rows*; row *i* becomes row_number ``i + 2``."""
+        columns = list(_TABLES[tab]) + ([_MARKER] if tab == "input" else [])
+        width = len(columns)
+        placeholders = ", ".join("?" for _ in range(width + 1))
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                self._conn.execute(f"DELETE FROM {_q(tab)}")
+                self._conn.executemany(
+                    f"INSERT INTO {_q(tab)} (row_number, {', '.join(_q(c) for c in columns)}) VALUES ({placeholders})",
+                    (
+                        [idx + 2, *(str(v) for v in (list(row) + [""] * width)[:width])]
+                        for idx, row in enumerate(rows)
+                    ),
+                )
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+
+
+def copy_tabs(source: SheetsClient, target: SheetsClient) -> dict[str, int]:
+    """Copy both tabs from *source* to *target*; returns rows copied per tab."""
+    copied = {}
+    for tab in ("input", "status"):
+        rows = source.read_tab_values(tab)
+        target.write_tab_values(tab, rows)
+        copied[tab] = len(rows)
+    return copied
+
+
+def main(argv: list[str] | None = None) -> None:
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s [%(levelname)s] %(name)s — %(message)s",
+    )
+    parser = argparse.ArgumentParser(description="Copy Stage 0 tabs between Google Sheets and SQLite.")
+    parser.add_argument("direction", choices=("import", "export"), help="import: Google → SQLite; export: SQLite → Google")
+    parser.add_argument("--db", default=None, help="SQLite file (default: STAGE0_SQLITE_PATH)")
+    parser.add_argument("--tenant", default=None, help="tenant name from STAGE0_TENANTS_FILE (uses its sheet and sqlite_path)")
+    parser.add_argument("--overwrite", action="store_true", help="required for export: replaces the Google tabs' rows")
+    args = parser.parse_args(argv)
+
+    try:
+        from src.core import config
+        from src.stage0.job import _build_google_sheets_client
+
+        if args.direction == "export" and not args.overwrite:
+            raise RuntimeError("Export replaces every data row in the Google tabs — pass --overwrite to confirm")
+        tenant = None
+        if args.tenant:
+            from src.stage0.tenants import load_tenants
+
+            if not config.STAGE0_TENANTS_FILE:
+                raise RuntimeError("Missing required environment variable: STAGE0_TENANTS_FILE")
+            tenant = next((t for t in load_tenants(config.STAGE0_TENANTS_FILE) if t.name == args.tenant), None)
+            if tenant is None:
+                raise RuntimeError(f"Unknown tenant: {args.tenant}")
+        db_path = args.db or (tenant.sqlite_path if tenant else None) or config.STAGE0_SQLITE_PATH
+        local = LocalSheetsClient(db_path)
+        google = _build_google_sheets_client(tenant)
+        source, target = (google, local) if args.direction == "import" else (local, google)
+        copied = copy_tabs(source, target)
+        logger.info("%s complete — input=%d status=%d", args.direction.capitalize(), copied["input"], copied["status"])
+    except Exception:
+        logger.exception("Local store %s failed", args.direction)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,150 @@
+"""Local cache of Sheets connection metadata — opt-in, one JSON file.
+
+Holds what SheetsClient would otherwise fetch on every construction:
+the OAuth access token (until it expires), the spreadsheet / worksheet
+properties, and both header rows together with a validation hash.
+
+The file contains a live access token.  It is written with owner-only
+permissions where the OS supports it and must live outside version control
+(the default location ``.cache/`` is gitignored).
+
+No PII is stored — only IDs, tab titles and column headers.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import threading
+from dataclasses import asdict, dataclass, replace
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+# Bump when the on-disk layout changes; older entries are ignored.
+_CACHE_VERSION = 1
+
+# A cached token is reused only while it has at least this much life left.
+TOKEN_MIN_REMAINING = timedelta(minutes=5)
+
+
+def headers_hash(headers: list[str]) -> str:
+    """Stable hash of a header row (order-sensitive, whitespace-trimmed)."""
+    payload = json.dumps([str(h).strip() for h in headers], ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:16]
+
+
+@dataclass(frozen=True)
+class SheetsMetadata:
+    """Everything SheetsClient needs to start without touching the API."""
+
+    sheet_id: str
+    spreadsheet_title: str
+    input_tab: str
+    status_tab: str
+    input_properties: dict[str, Any]
+    status_properties: dict[str, Any]
+    headers_input: list[str]
+    headers_status: list[str]
+    headers_hash: str = ""
+    access_token: str | None = None
+    token_expiry: str | None = None  # naive UTC ISO-8601, as google-auth stores it
+
+    def with_hash(self) -> "SheetsMetadata":
+        combined = headers_hash(self.headers_input) + headers_hash(self.headers_status)
+        return replace(self, headers_hash=combined)
+
+    def is_consistent(self) -> bool:
+        """True when the stored hash matches the stored header rows."""
+        return self.headers_hash == self.with_hash().headers_hash
+
+    def token_usable(self, now_utc: datetime) -> bool:
+        """True when the cached token has at least TOKEN_MIN_REMAINING left."""
+        if not self.access_token or not self.token_expiry:
+            return False
+        try:
+            expiry = datetime.fromisoformat(self.token_expiry)
+        except ValueError:
+            return False
+        return expiry - now_utc >= TOKEN_MIN_REMAINING
+
+
+class MetadataCache:
+    """JSON-file store of SheetsMetadata keyed by (sheet_id, input_tab, status_tab).
+
+    One instance may be shared by threads (the multi-tenant runner): writes
+    are read-modify-write of the whole file, serialized by a lock.
+    """
+
+    def __init__(self, path: str | Path) -> None:
+        self._path = Path(path)
+        self._lock = threading.Lock()
+
+    @property
+    def path(self) -> Path:
+        return self._path
+
+    @staticmethod
+    def _key(sheet_id: str, input_tab: str, status_tab: str) -> str:
+        return f"{sheet_id}|{input_tab}|{status_tab}"
+
+    def _read_all(self) -> dict[str, Any]:
+        try:
+            data = json.loads(self._path.read_text(encoding="utf-8"))
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError) as exc:
+            logger.warning("Sheets metadata cache unreadable, ignoring: %s", exc)
+            return {}
+        if not isinstance(data, dict) or data.get("version") != _CACHE_VERSION:
+            return {}
+        entries = data.get("entries")
+        return entries if isinstance(entries, dict) else {}
+
+    def load(self, sheet_id: str, input_tab: str, status_tab: str) -> SheetsMetadata | None:
+        """Return the cached entry, or None when missing / corrupt."""
+        raw = self._read_all().get(self._key(sheet_id, input_tab, status_tab))
+        if raw is None:
+            return None
+        try:
+            meta = SheetsMetadata(**raw)
+        except TypeError:
+            return None
+        if not meta.is_consistent():
+            logger.warning("Sheets metadata cache entry failed hash check, ignoring")
+            return None
+        return meta
+
+    def _write_all(self, entries: dict[str, Any]) -> None:
+        """Atomically replace the cache file; failures are logged, never raised."""
+        payload = json.dumps({"version": _CACHE_VERSION, "entries": entries}, ensure_ascii=False)
+        tmp = self._path.with_suffix(self._path.suffix + ".tmp")
+        try:
+            self._path.parent.mkdir(parents=True, exist_ok=True)
+            tmp.write_text(payload, encoding="utf-8")
+            try:
+                os.chmod(tmp, 0o600)
+            except OSError:
+                pass  # best effort (e.g. Windows ACLs)
+            os.replace(tmp, self._path)
+        except OSError as exc:
+            logger.warning("Could not write Sheets metadata cache: %s", exc)
+
+    def save(self, meta: SheetsMetadata) -> None:
+        """Persist *meta*, replacing any entry for the same sheet and tabs."""
+        meta = meta.with_hash()
+        with self._lock:
+            entries = self._read_all()
+            entries[self._key(meta.sheet_id, meta.input_tab, meta.status_tab)] = asdict(meta)
+            self._write_all(entries)
+
+    def invalidate(self, sheet_id: str, input_tab: str, status_tab: str) -> None:
+        """Drop one entry (e.g. after the sheet structure changed)."""
+        with self._lock:
+            entries = self._read_all()
+            if entries.pop(self._key(sheet_id, input_tab, status_tab), None) is not None:
+                self._write_all(entries)
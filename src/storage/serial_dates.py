@@ -0,0 +1,117 @@
+"""Typed date path — status-tab dates as Sheets serial numbers.
+
+By default the job writes "Email wysłany" / "Follow-up od" as
+'YYYY-MM-DD HH:MM' text with valueInputOption=USER_ENTERED and reads them
+back as formatted strings, so the value the code sees depends on the
+column's display format (and the sheet locale).  With
+STAGE0_SHEETS_SERIAL_DATES=1 SheetsClient instead:
+
+- reads the status tab with valueRenderOption=UNFORMATTED_VALUE (dates
+  arrive as serial numbers — dateTimeRenderOption defaults to
+  SERIAL_NUMBER) and converts the date columns in bulk, once per distinct
+  serial, back to canonical 'YYYY-MM-DD HH:MM' strings;
+- writes those columns as serial numbers with valueInputOption=RAW.
+
+A serial is days since 1899-12-30, the fraction being the time of day,
+as wall-clock time in the spreadsheet's zone — the job writes Warsaw
+times, so the spreadsheet should be set to Europe/Warsaw.  Cells that are
+not numbers (legacy text dates, blanks, anything a person typed) pass
+through unchanged, as do strings that are not sheet date-times on write.
+ensure_date_column_format() is then display-only.
+"""
+
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+from typing import Any, Iterable, MutableMapping, Sequence
+
+from src.storage.sheets import DATE_COLUMNS
+
+# Date-time columns converted on read and write.  "Follow-up wykonany" is
+# filled in by hand; a date typed there comes back as a serial too.
+SERIAL_COLUMNS = (*DATE_COLUMNS, "Follow-up wykonany")
+
+SERIAL_EPOCH = datetime(1899, 12, 30)
+_MINUTES_PER_DAY = 24 * 60
+_SHEET_DT_FMT = "%Y-%m-%d %H:%M"
+
+
+def serial_to_text(serial: float) -> str:
+    """'YYYY-MM-DD HH:MM' for a serial number (rounded to the minute)."""
+    minutes = round(float(serial) * _MINUTES_PER_DAY)
+    return (SERIAL_EPOCH + timedelta(minutes=minutes)).strftime(_SHEET_DT_FMT)
+
+
+def text_to_serial(value: Any) -> Any:
+    """Serial number for a 'YYYY-MM-DD HH:MM' string; anything else unchanged."""
+    if not isinstance(value, str) or not value.strip():
+        return value
+    from src.stage0.batch import parse_sheet_datetime
+
+    try:
+        dt = parse_sheet_datetime(value.strip()).replace(tzinfo=None)
+    except ValueError:
+        return value
+    minutes = (dt - SERIAL_EPOCH) // timedelta(minutes=1)
+    return minutes / _MINUTES_PER_DAY
+
+
+def _is_serial(value: Any) -> bool:
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def decode_records(records: Sequence[MutableMapping[str, Any]]) -> None:
+    """Replace serials in SERIAL_COLUMNS of *records* with date strings, in place."""
+    memo: dict[float, str] = {}
+    for name in SERIAL_COLUMNS:
+        for record in records:
+            value = record.get(name)
+            if _is_serial(value):
+                if value not in memo:
+                    memo[value] = serial_to_text(value)
+                record[name] = memo[value]
+
+
+def decode_values(values: Iterable[Any]) -> list[Any]:
+    """decode_records() for one column's values."""
+    memo: dict[float, str] = {}
+    out = []
+    for value in values:
+        if _is_serial(value):
+            if value not in memo:
+                memo[value] = serial_to_text(value)
+            value = memo[value]
+        out.append(value)
+    return out
+
+
+def serial_positions(headers: Sequence[str]) -> list[int]:
+    """0-based positions of SERIAL_COLUMNS in a header row."""
+    return [i for i, name in enumerate(headers) if name in SERIAL_COLUMNS]
+
+
+def decode_rows(rows: Sequence[list[Any]], positions: Sequence[int]) -> None:
+    """decode_records() for positional rows (cells at *positions*), in place."""
+    memo: dict[float, str] = {}
+    for row in rows:
+        for i in positions:
+            if i < len(row) and _is_serial(row[i]):
+                if row[i] not in memo:
+                    memo[row[i]] = serial_to_text(row[i])
+                row[i] = memo[row[i]]
+
+
+def encode_rows(rows: Sequence[Sequence[Any]], positions: Sequence[int]) -> list[list[Any]]:
+    """Copies of *rows* with the date strings at *positions* as serials."""
+    memo: dict[Any, Any] = {}
+    out = []
+    for row in rows:
+        row = list(row)
+        for i in positions:
+            if i < len(row):
+                value = row[i]
+                if value not in memo:
+                    memo[value] = text_to_serial(value)
+                row[i] = memo[value]
+        out.append(row)
+    return out
@@ -1,7 +1,6 @@
 """Google Sheets integration — read/write lead rows by column name."""
 
 from __future__ import annotations
-from src.core.config import GOOGLE_SHEET_TAB_INPUT, GOOGLE_SHEET_TAB_STATUS
 
 INPUT_HEADERS = [
     "Imię i nazwisko / Firma",
@@ -25,23 +24,51 @@ STATUS_HEADERS = [
     "Follow-up wykonany",
 ]
 
+# Archive tab (src/stage0/archive.py): the status columns plus the time the
+# row was moved out of the status tab.
+ARCHIVED_AT_COLUMN = "Zarchiwizowano"
+ARCHIVE_HEADERS = [*STATUS_HEADERS, ARCHIVED_AT_COLUMN]
+_ARCHIVE_EMAIL_CELLS = "B2:B"  # "Email" below the header
+
 
 import logging
+import re
 import time
-from typing import Any
+from datetime import datetime, timezone
+from typing import TYPE_CHECKING, Any, Callable, Iterable
+
+from src.core.tracing import hash_email, span, traced
+
+if TYPE_CHECKING:
+    import gspread
+
+    from src.storage.metadata_cache import MetadataCache, SheetsMetadata
+    from src.storage.status_mirror import MirrorSnapshot, StatusMirror
 
-import gspread
-from google.oauth2.service_account import Credentials
+# gspread and google-auth are imported inside the functions that need them.
+# Together they cost ~130 ms of import time, which is paid only once a
+# SheetsClient is actually constructed (not when this module is imported).
 
 logger = logging.getLogger(__name__)
 
 
-def _with_retry(fn, max_retries: int = 5, base_delay: int = 60) -> Any:
-    """Call fn(), retrying on Sheets API 429 with exponential backoff."""
+def _with_retry(
+    fn,
+    max_retries: int = 5,
+    base_delay: int = 60,
+    on_backoff: Callable[[float], None] | None = None,
+) -> Any:
+    """Call fn(), retrying on Sheets API 429 with exponential backoff.
+
+    *on_backoff* is called with each sleep duration before sleeping.
+    """
+    import gspread
+
     delay = base_delay
     for attempt in range(max_retries):
         try:
-            return fn()
+            with span("sheets.attempt", attempt=attempt + 1):
+                return fn()
         except gspread.exceptions.APIError as exc:
             is_429 = (
                 hasattr(exc, "response")
@@ -52,11 +79,99 @@ def _with_retry(fn, max_retries: int = 5, base_delay: int = 60) -> Any:
                     "Sheets API 429 — waiting %ds before retry %d/%d",
                     delay, attempt + 1, max_retries,
                 )
-                time.sleep(delay)
+                if on_backoff is not None:
+                    on_backoff(delay)
+                with span("sheets.backoff", seconds=delay):
+                    time.sleep(delay)
                 delay = min(delay * 2, 300)
             else:
                 raise
 
+class _StaleHeadersError(Exception):
+    """Live header row differs from the cached one (column added / moved)."""
+
+
+def _is_metadata_error(exc: Exception) -> bool:
+    """True for failures that stale cached metadata can explain.
+
+    Header mismatches and "sheet / range not found" style API errors (400 /
+    404) qualify; quota and server errors do not.
+    """
+    if isinstance(exc, _StaleHeadersError):
+        return True
+    status = getattr(getattr(exc, "response", None), "status_code", None)
+    if status is None:
+        return True  # GSpreadException raised client-side (e.g. unknown headers)
+    return status in (400, 404)
+
+
+def _trim_headers(headers: list[str]) -> list[str]:
+    """Strip cells and drop trailing blanks (row_values omits them, records pad them)."""
+    cleaned = [str(h).strip() for h in headers]
+    while cleaned and not cleaned[-1]:
+        cleaned.pop()
+    return cleaned
+
+
+def _to_records(headers: list[str], rows: list[list[Any]]) -> list[dict[str, Any]]:
+    """get_all_records() over already-fetched rows: padded, numericised, keyed by header."""
+    from gspread.utils import numericise_all, to_records
+
+    width = len(headers)
+    return to_records(headers, [
+        numericise_all((list(row) + [""] * width)[:width], False, "") for row in rows
+    ])
+
+
+def _first_appended_row(response: Any) -> int | None:
+    """First row number from an append response ("'tab'!A12:G14" → 12)."""
+    try:
+        updated_range = response["updates"]["updatedRange"]
+    except (KeyError, TypeError):
+        return None
+    match = re.search(r"![A-Z]+(\d+)", str(updated_range))
+    return int(match.group(1)) if match else None
+
+
+def _is_retryable_append_error(exc: Exception) -> bool:
+    """Append failures that a second try, or a smaller chunk, can get past.
+
+    Transport errors (timeouts, dropped connections), 5xx, 413 and the 400
+    Sheets answers for an oversized payload qualify; 429 is retried by
+    _with_retry() already.
+    """
+    import requests
+
+    if isinstance(exc, requests.exceptions.RequestException):
+        return True
+    status = getattr(getattr(exc, "response", None), "status_code", None)
+    if status is None:
+        return False
+    return status >= 500 or status == 413 or (status == 400 and "payload" in str(exc).lower())
+
+
+def _delete_row_requests(sheet_id: int, row_numbers: Any) -> list[dict[str, Any]]:
+    """deleteDimension requests removing *row_numbers* (1-based) from a sheet.
+
+    Contiguous rows share one request; requests go bottom-up so each one
+    leaves the row indices of the next untouched.
+    """
+    requests: list[dict[str, Any]] = []
+    for row in sorted(set(row_numbers), reverse=True):
+        if requests and requests[-1]["deleteDimension"]["range"]["startIndex"] == row:
+            requests[-1]["deleteDimension"]["range"]["startIndex"] = row - 1
+            continue
+        requests.append({"deleteDimension": {"range": {
+            "sheetId": sheet_id, "dimension": "ROWS", "startIndex": row - 1, "endIndex": row,
+        }}})
+    return requests
+
+
+def _utcnow() -> datetime:
+    """Naive UTC now — the convention google-auth uses for token expiry."""
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
 SCOPES = [
     "https://www.googleapis.com/auth/spreadsheets",
 ]
@@ -76,6 +191,84 @@ DATE_COLUMNS = ("Email wysłany", "Follow-up od")
 # Google Sheets number format pattern for datetime columns.
 _DATE_NUMBER_FORMAT = {"type": "DATE_TIME", "pattern": "yyyy-mm-dd hh:mm"}
 
+# ensure_status_rows_exist() appends at most this many rows per call
+# (STAGE0_APPEND_CHUNK_ROWS); a failed chunk is retried at half the size.
+DEFAULT_APPEND_CHUNK_ROWS = 1000
+_APPEND_ATTEMPTS = 4
+# update_rows() sends at most this many rows per values.batchUpdate call.
+_UPDATE_CHUNK_ROWS = 1000
+
+# Formula mode (STAGE0_FOLLOWUP_FORMULA): the sheet derives this column.
+FORMULA_COLUMN = "Wymaga follow-upu"
+# NOW() in that formula runs in the spreadsheet's zone; the job's dates are Warsaw time.
+SHEET_TIME_ZONE = "Europe/Warsaw"
+
+# Leading characters that make USER_ENTERED parse a cell as a formula.
+_FORMULA_PREFIXES = ("=", "+", "-", "@")
+
+
+def _as_text(value: Any) -> Any:
+    """*value* quote-prefixed when USER_ENTERED would turn it into a formula.
+
+    Status rows carry lead data from outside (intake, imports, backfill);
+    a name like "=IMPORTXML(...)" must land as text.  Sheets stores the
+    text without the apostrophe.
+    """
+    if isinstance(value, str) and value.startswith(_FORMULA_PREFIXES):
+        return "'" + value
+    return value
+
+
+def followup_formula(headers: list[str]) -> str:
+    """Header-cell ARRAYFORMULA that computes FORMULA_COLUMN for every row.
+
+    The rules of apply_followup_logic() once "Follow-up od" is scheduled:
+    NO when "Follow-up wykonany" is filled, otherwise YES from the due
+    time on (NOW() in the spreadsheet's zone), else NO.  The array starts
+    with the header text, so header reads are unchanged; rows without an
+    email or due date stay truly blank, so values.append still finds the
+    end of the table.
+    """
+    import gspread
+
+    def col(name: str) -> str:
+        return gspread.utils.rowcol_to_a1(1, headers.index(name) + 1)[:-1]
+
+    email, due, done = col("Email"), col("Follow-up od"), col("Follow-up wykonany")
+    return (
+        f'={{"{FORMULA_COLUMN}"; ARRAYFORMULA('
+        f'IF({email}2:{email}="",, IF({due}2:{due}="",, '
+        f'IF({done}2:{done}<>"", "NO", IF(NOW()>={due}2:{due}, "YES", "NO")))))}}'
+    )
+
+
+# Row anchors (STAGE0_ROW_ANCHORS): developer metadata on each status row,
+# value = hash_email() of the lead, so writes can address the lead itself.
+ANCHOR_KEY = "stage0.lead"
+_VALUES_BY_DATA_FILTER_URL = (
+    "https://sheets.googleapis.com/v4/spreadsheets/%s/values:batchUpdateByDataFilter"
+)
+
+
+def _anchor_request(sheet_id: int, row_number: int, email: str) -> dict[str, Any]:
+    """createDeveloperMetadata request anchoring *email* to a 1-based row."""
+    return {"createDeveloperMetadata": {"developerMetadata": {
+        "metadataKey": ANCHOR_KEY,
+        "metadataValue": hash_email(email),
+        "location": {"dimensionRange": {
+            "sheetId": sheet_id, "dimension": "ROWS",
+            "startIndex": row_number - 1, "endIndex": row_number,
+        }},
+        "visibility": "DOCUMENT",
+    }}}
+
+
+def _same_formula(a: Any, b: str) -> bool:
+    """Formula equality ignoring whitespace and case (Sheets may reformat both)."""
+    def norm(f: Any) -> str:
+        return "".join(str(f or "").split()).upper()
+    return norm(a) == norm(b)
+
 
 def is_eligible_for_send(status_row: dict[str, str] | None) -> bool:
     """Return True when a lead should receive (or retry) the auto-reply email.
@@ -91,7 +284,8 @@ def is_eligible_for_send(status_row: dict[str, str] | None) -> bool:
        An ERROR status with no ``Email wysłany`` means the previous run failed
        before confirming delivery — retry is safe.
     4. Any other status (e.g. "SENT" with a missing timestamp due to a bug,
-       or a future status value) → not eligible.
+       a sharded worker's "CLAIMED …" / "SENDING …" lease, or a future
+       status value) → not eligible.
     """
     if status_row is None:
         return True
@@ -104,31 +298,394 @@ def is_eligible_for_send(status_row: dict[str, str] | None) -> bool:
 class SheetsClient:
     """Thin wrapper around gspread for column-name-based access."""
 
-    def __init__(self, service_account_json: str, sheet_id: str, *, tab_name: str | None = None) -> None:
-        creds = Credentials.from_service_account_file(service_account_json, scopes=SCOPES)
-        gc = gspread.authorize(creds)
-        self._spreadsheet = gc.open_by_key(sheet_id)
-        self._ws_input = self._spreadsheet.worksheet(GOOGLE_SHEET_TAB_INPUT)
-        self._ws_status = self._spreadsheet.worksheet(GOOGLE_SHEET_TAB_STATUS)
-        self._headers_input: list[str] = self._ws_input.row_values(1)
-        self._headers_status: list[str] = self._ws_status.row_values(1)
+    def __init__(
+        self,
+        service_account_json: str,
+        sheet_id: str,
+        *,
+        tab_name: str | None = None,
+        input_tab: str | None = None,
+        status_tab: str | None = None,
+        metadata_cache: "MetadataCache | None" = None,
+        gspread_client: "gspread.Client | None" = None,
+        serial_dates: bool = False,
+        archive_tab: str | None = None,
+        row_anchors: bool = False,
+        append_chunk_rows: int | None = DEFAULT_APPEND_CHUNK_ROWS,
+        status_mirror: "StatusMirror | None" = None,
+    ) -> None:
+        if input_tab is None or status_tab is None:
+            from src.core import config
+
+            input_tab = input_tab or config.GOOGLE_SHEET_TAB_INPUT
+            status_tab = status_tab or config.GOOGLE_SHEET_TAB_STATUS
+
+        if gspread_client is None:
+            from src.storage import transport
+
+            gspread_client = transport.authorize(transport.load_credentials(service_account_json))
+        self._gc = gspread_client
+        self._configure(
+            sheet_id=sheet_id,
+            input_tab=input_tab,
+            status_tab=status_tab,
+            metadata_cache=metadata_cache,
+            serial_dates=serial_dates,
+            archive_tab=archive_tab,
+            row_anchors=row_anchors,
+            append_chunk_rows=append_chunk_rows,
+            status_mirror=status_mirror,
+        )
+
+        cached = (
+            metadata_cache.load(sheet_id, self._input_tab, self._status_tab)
+            if metadata_cache is not None
+            else None
+        )
+        if cached is not None:
+            self._apply_cached_metadata(cached)
+        else:
+            self._load_metadata()
 
         logger.info(
-            "Connected to sheet '%s' tabs input='%s' (%d cols), status='%s' (%d cols)",
+            "Connected to sheet '%s' tabs input='%s' (%d cols), status='%s' (%d cols) metadata=%s",
             sheet_id[:8] + "...",
-            GOOGLE_SHEET_TAB_INPUT,
+            self._input_tab,
             len(self._headers_input),
-            GOOGLE_SHEET_TAB_STATUS,
+            self._status_tab,
             len(self._headers_status),
-)
+            "cache" if self._metadata_from_cache else "api",
+        )
+
+    def _configure(
+        self,
+        *,
+        sheet_id: str,
+        input_tab: str,
+        status_tab: str,
+        metadata_cache: "MetadataCache | None" = None,
+        serial_dates: bool = False,
+        archive_tab: str | None = None,
+        row_anchors: bool = False,
+        append_chunk_rows: int | None = DEFAULT_APPEND_CHUNK_ROWS,
+        status_mirror: "StatusMirror | None" = None,
+    ) -> None:
+        """Set every option and per-client state attribute (no API calls).
+
+        Subclasses that replace the Google I/O (src/storage/local.py) call
+        this instead of __init__, so inherited methods find the same state.
+        """
+        self._sheet_id = sheet_id
+        self._input_tab = input_tab
+        self._status_tab = status_tab
+        self._metadata_cache = metadata_cache
+        self._metadata_from_cache = False
+        # Typed date path (src/storage/serial_dates.py): status dates are
+        # read UNFORMATTED and written as serial numbers with RAW input.
+        self._serial_dates = serial_dates
+        # Settled leads moved out of the status tab; None = no archive.
+        self._archive_tab = archive_tab
+        self._ws_archive: "gspread.Worksheet | None" = None
+        self._archived_emails: frozenset[str] | None = None
+        # New status rows get a developer-metadata anchor; update_lead()
+        # writes through it (src/stage0/process.py checks this flag).
+        self.row_anchors = row_anchors
+        # Rows per append call in ensure_status_rows_exist(); None = one call.
+        self.append_chunk_rows = append_chunk_rows
+        # Status reads diff-sync a local copy (src/storage/status_mirror.py);
+        # email → row number as of the last sync, for write invalidation.
+        self._status_mirror = status_mirror
+        self._mirror_rows: dict[str, int] = {}
+        # Set by ensure_followup_formula(): FORMULA_COLUMN belongs to the sheet.
+        self._followup_formula = False
+        # Seconds spent sleeping on 429 backoff (reported in run timings).
+        self.backoff_seconds = 0.0
+
+    # ------------------------------------------------------------------
+    # Connection metadata (optionally cached across runs)
+    # ------------------------------------------------------------------
+
+    def _load_metadata(self) -> None:
+        """Fetch spreadsheet, worksheets and header rows from the API.
+
+        Costs a token fetch (when needed), open_by_key, two worksheet()
+        lookups and two header reads.  The result is written to the
+        metadata cache when one is configured.
+        """
+        self._spreadsheet = self._gc.open_by_key(self._sheet_id)
+        self._ws_input = self._spreadsheet.worksheet(self._input_tab)
+        self._ws_status = self._spreadsheet.worksheet(self._status_tab)
+        self._headers_input = self._ws_input.row_values(1)
+        self._headers_status = self._ws_status.row_values(1)
+        self._metadata_from_cache = False
+        self._save_metadata()
+
+    def _apply_cached_metadata(self, meta: "SheetsMetadata") -> None:
+        """Rebuild spreadsheet / worksheet handles from *meta* without API calls.
+
+        The access token is reused while it has enough life left; otherwise it
+        is refreshed once here and the new token is written back to the cache.
+        """
+        import gspread
+
+        auth = self._gc.http_client.auth
+        if meta.token_usable(_utcnow()):
+            auth.token = meta.access_token
+            auth.expiry = datetime.fromisoformat(meta.token_expiry)  # type: ignore[arg-type]
+            token_refreshed = False
+        else:
+            from google.auth.transport.requests import Request
+
+            auth.refresh(Request())
+            token_refreshed = True
+
+        http_client = self._gc.http_client
+        # Spreadsheet.__init__ always calls fetch_sheet_metadata(); bypass it and
+        # set the two attributes it would have populated (gspread 6.x layout).
+        spreadsheet = gspread.Spreadsheet.__new__(gspread.Spreadsheet)
+        spreadsheet.client = http_client
+        spreadsheet._properties = {"id": meta.sheet_id, "title": meta.spreadsheet_title}
+        self._spreadsheet = spreadsheet
+        self._ws_input = gspread.Worksheet(
+            spreadsheet, dict(meta.input_properties), meta.sheet_id, http_client
+        )
+        self._ws_status = gspread.Worksheet(
+            spreadsheet, dict(meta.status_properties), meta.sheet_id, http_client
+        )
+        self._headers_input = list(meta.headers_input)
+        self._headers_status = list(meta.headers_status)
+        self._metadata_from_cache = True
+
+        if token_refreshed:
+            self._save_metadata()
+
+    def _save_metadata(self) -> None:
+        if self._metadata_cache is None:
+            return
+        from src.storage.metadata_cache import SheetsMetadata
+
+        auth = self._gc.http_client.auth
+        expiry = getattr(auth, "expiry", None)
+        self._metadata_cache.save(SheetsMetadata(
+            sheet_id=self._sheet_id,
+            spreadsheet_title=str(self._spreadsheet.title),
+            input_tab=self._input_tab,
+            status_tab=self._status_tab,
+            input_properties=dict(self._ws_input._properties),
+            status_properties=dict(self._ws_status._properties),
+            headers_input=list(self._headers_input),
+            headers_status=list(self._headers_status),
+            access_token=getattr(auth, "token", None),
+            token_expiry=expiry.isoformat() if expiry else None,
+        ))
+
+    def _with_fresh_metadata(self, fn: Callable[[], Any]) -> Any:
+        """Call fn(); if it fails because cached metadata is stale, reload once and retry.
+
+        Only applies while the handles came from the cache — freshly loaded
+        metadata cannot be stale, so errors then propagate unchanged.
+        """
+        import gspread
+
+        try:
+            return fn()
+        except (_StaleHeadersError, gspread.exceptions.GSpreadException) as exc:
+            if not self._metadata_from_cache or not _is_metadata_error(exc):
+                raise
+            logger.warning(
+                "Cached sheet metadata is stale (%s) — reloading and retrying once",
+                type(exc).__name__,
+            )
+            self._load_metadata()
+            return fn()
+
+    def _retry(self, fn: Callable[[], Any]) -> Any:
+        """_with_retry() that adds backoff sleeps to self.backoff_seconds."""
+        return _with_retry(fn, on_backoff=self._add_backoff)
+
+    def _add_backoff(self, seconds: float) -> None:
+        self.backoff_seconds += seconds
+
+    def transport_stats(self) -> dict[str, int]:
+        """Request, gzip, byte and connection-reuse counts (src/storage/transport.py).
+
+        Empty when the gspread client does not use its CountingHTTPClient
+        (e.g. a caller-supplied plain gspread.Client).
+        """
+        from src.storage.transport import CountingHTTPClient
+
+        http_client = getattr(self._gc, "http_client", None)
+        return http_client.stats() if isinstance(http_client, CountingHTTPClient) else {}
+
+    def _get_records(self, tab: str) -> list[dict[str, Any]]:
+        """get_all_records() for the "input" or "status" tab.
+
+        When headers came from the cache, the header row returned with the
+        data is compared against them; a mismatch raises _StaleHeadersError
+        (handled by _with_fresh_metadata).  With a status mirror, status
+        reads go through _mirrored_status_records().
+        """
+        if tab == "status" and self._status_mirror is not None:
+            return self._with_fresh_metadata(self._mirrored_status_records)
+
+        def read() -> list[dict[str, Any]]:
+            if tab == "input":
+                ws, expected, cached = self._ws_input, INPUT_HEADERS, self._headers_input
+            else:
+                ws, expected, cached = self._ws_status, STATUS_HEADERS, self._headers_status
+            if tab == "status" and self._serial_dates:
+                from src.storage.serial_dates import decode_records
+
+                records = ws.get_all_records(
+                    head=1, default_blank="", expected_headers=expected,
+                    value_render_option="UNFORMATTED_VALUE",
+                )
+                decode_records(records)
+            else:
+                records = ws.get_all_records(head=1, default_blank="", expected_headers=expected)
+            if (
+                self._metadata_from_cache
+                and records
+                and _trim_headers(list(records[0])) != _trim_headers(cached)
+            ):
+                raise _StaleHeadersError(tab)
+            return records
+
+        return self._with_fresh_metadata(read)
+
+    def _mirrored_status_records(self) -> list[dict[str, Any]]:
+        """Status records from the mirror, after syncing the blocks that changed.
+
+        Falls back to one full read (and reseeds the mirror) when there is
+        no usable snapshot, the header row changed, or a full sync is due.
+        """
+        from src.storage.status_mirror import block_hashes
+
+        mirror = self._status_mirror
+        key = mirror.key(self._sheet_id, self._status_tab)
+        render = "UNFORMATTED_VALUE" if self._serial_dates else "FORMATTED_VALUE"
+        now = datetime.now(timezone.utc)
+
+        snapshot = mirror.load(key)
+        # Before any fetch: a write landing after it must not be masked (save()).
+        generation = snapshot.generation if snapshot is not None else mirror.generation(key)
+        synced = None
+        if snapshot is not None and not snapshot.full_sync_due(now):
+            synced = self._sync_mirror_blocks(key, snapshot, render)
+        if synced is None:
+            values = self._retry(lambda: self._ws_status.get(value_render_option=render, pad_values=True))
+            headers = [str(h) for h in values[0]] if values and values[0] else []
+            rows = [list(r) for r in values[1:]]
+            probes = self._probe_columns(headers, rows)
+            rows = rows[:max((len(c) for c in probes), default=0)]
+            mirror.save(
+                key, headers=headers, rows=rows,
+                hashes=block_hashes(probes, len(rows), mirror.block_rows), full_sync_at=now,
+                generation=generation,
+            )
+            logger.info("Status mirror full sync — rows=%d", len(rows))
+            synced = headers, rows
+        headers, rows = synced
+
+        if self._metadata_from_cache and _trim_headers(headers) != _trim_headers(self._headers_status):
+            raise _StaleHeadersError("status")
+        missing = set(STATUS_HEADERS) - set(headers)
+        if missing:
+            import gspread
+
+            raise gspread.exceptions.GSpreadException(f"Status tab is missing headers: {sorted(missing)}")
+        records = _to_records(headers, rows)
+        if self._serial_dates:
+            from src.storage.serial_dates import decode_records
+
+            decode_records(records)
+        email_idx = headers.index("Email")
+        self._mirror_rows = {
+            str(row[email_idx]).strip().lower(): i + 2
+            for i, row in enumerate(rows)
+            if len(row) > email_idx and str(row[email_idx]).strip()
+        }
+        return records
+
+    def _sync_mirror_blocks(
+        self, key: str, snapshot: "MirrorSnapshot", render: str,
+    ) -> tuple[list[str], list[list[Any]]] | None:
+        """Re-fetch the blocks whose probe hash changed; None = a full read is needed.
+
+        Two calls at most: the header row plus PROBE_COLUMNS in one
+        batchGet, then the changed blocks in another.
+        """
+        import gspread
+
+        from src.storage.status_mirror import PROBE_COLUMNS, block_hashes, changed_blocks
+
+        mirror = self._status_mirror
+        headers = snapshot.headers
+        if not all(name in headers for name in PROBE_COLUMNS):
+            return None
+        letters = [gspread.utils.rowcol_to_a1(1, headers.index(name) + 1)[:-1] for name in PROBE_COLUMNS]
+        last = gspread.utils.rowcol_to_a1(1, max(len(headers), 1))[:-1]
+        ws = self._ws_status
+        header_range, *columns = self._retry(lambda: ws.batch_get(
+            ["1:1", *(f"{letter}2:{letter}" for letter in letters)],
+            value_render_option=render,
+        ))
+        live_headers = [str(h) for h in header_range[0]] if header_range else []
+        if _trim_headers(live_headers) != _trim_headers(headers):
+            return None
+
+        probes = [[row[0] if row else "" for row in column] for column in columns]
+        row_count = max((len(c) for c in probes), default=0)
+        hashes = block_hashes(probes, row_count, mirror.block_rows)
+        changed = changed_blocks(snapshot.hashes, hashes)
+        rows = snapshot.rows[:row_count] + [[] for _ in range(row_count - len(snapshot.rows))]
+        if changed:
+            size = mirror.block_rows
+            spans = [(i * size, min((i + 1) * size, row_count)) for i in changed]
+            fetched = self._retry(lambda: ws.batch_get(
+                [f"A{start + 2}:{last}{end + 1}" for start, end in spans],
+                value_render_option=render,
+            ))
+            for (start, end), values in zip(spans, fetched):
+                block = [list(r) for r in values][:end - start]
+                rows[start:end] = block + [[] for _ in range(end - start - len(block))]
+        mirror.save(
+            key, headers=headers, rows=rows, hashes=hashes, blocks=changed, generation=snapshot.generation,
+        )
+        logger.info(
+            "Status mirror sync — rows=%d blocks=%d fetched=%d", row_count, len(hashes), len(changed),
+        )
+        return headers, rows
+
+    @staticmethod
+    def _probe_columns(headers: list[str], rows: list[list[Any]]) -> list[list[Any]]:
+        """PROBE_COLUMNS values of *rows*, trailing blanks dropped (as the API returns them)."""
+        from src.storage.status_mirror import PROBE_COLUMNS
+
+        columns = []
+        for name in PROBE_COLUMNS:
+            idx = headers.index(name) if name in headers else None
+            column = [row[idx] if idx is not None and idx < len(row) else "" for row in rows]
+            while column and not str(column[-1]).strip():
+                column.pop()
+            columns.append(column)
+        return columns
+
+    def _mirror_touch(self, row_numbers: Iterable[int] | None) -> None:
+        """Mark mirror blocks of *row_numbers* for re-fetch (None = the whole tab)."""
+        if self._status_mirror is not None:
+            self._status_mirror.invalidate(
+                self._status_mirror.key(self._sheet_id, self._status_tab), row_numbers,
+            )
 
     # ------------------------------------------------------------------
     # Read
     # ------------------------------------------------------------------
 
+    @traced("sheets.read_input_rows")
     def read_input_rows(self) -> list[dict[str, str]]:
         """Return all non-empty input rows with normalized email, deduplicated by email."""
-        records = self._ws_input.get_all_records(head=1, default_blank="", expected_headers=INPUT_HEADERS)
+        records = self._get_records("input")
 
         seen_emails: set[str] = set()
         cleaned_rows: list[dict[str, str]] = []
@@ -151,17 +708,20 @@ class SheetsClient:
         return cleaned_rows
 
 
+    @traced("sheets.get_all_rows")
     def get_all_rows(self) -> list[dict[str, str]]:
         """Return every data row as a dict keyed by header name."""
-        records = self._ws_status.get_all_records(head=1, default_blank="", expected_headers=STATUS_HEADERS)
+        records = self._get_records("status")
         return [{k: str(v) for k, v in row.items()} for row in records]
 
+    @traced("sheets.read_status_rows")
     def read_status_rows(self) -> list[dict[str, str]]:
         """Return every status row as a dict keyed by header name."""
-        records = self._ws_status.get_all_records(head=1, default_blank="", expected_headers=STATUS_HEADERS)
+        records = self._get_records("status")
         return [{k: str(v) for k, v in row.items()} for row in records]
 
 
+    @traced("sheets.get_status_index_by_email")
     def get_status_index_by_email(self) -> dict[str, dict[str, str]]:
         """Map: email -> status row dict (email normalized)."""
         rows = self.read_status_rows()
@@ -175,15 +735,17 @@ class SheetsClient:
 
         return mapping
 
+    @traced("sheets.get_new_leads")
     def get_new_leads(self) -> list[dict[str, str]]:
         """Return input rows eligible for the auto-reply email (idempotent)."""
         input_rows = self.read_input_rows()
         status_index = self.get_status_index_by_email()
+        archived = self.get_archived_emails()
 
         new_rows: list[dict[str, str]] = []
         for row in input_rows:
             email = str(row.get("Email", "")).strip().lower()
-            if not email:
+            if not email or email in archived:
                 continue
 
             status_row = status_index.get(email)
@@ -192,22 +754,40 @@ class SheetsClient:
 
         return new_rows
 
-    def ensure_status_rows_exist(self) -> None:
+    @traced("sheets.ensure_status_rows_exist")
+    def ensure_status_rows_exist(
+        self,
+        *,
+        email_filter: Callable[[str], bool] | None = None,
+    ) -> dict[str, int]:
         """Ensure every input email has a row in the status sheet.
 
         New rows are created with Lead and Email pre-populated.
         The logical key is Email (unique per lead).
+
+        *email_filter* restricts row creation to matching (normalized)
+        emails — sharded workers only create rows for their own shard, so
+        concurrent workers never append the same lead twice.
+
+        Archived leads (get_archived_emails()) already had their row; it
+        is not recreated.
+
+        Rows go out through append_status_rows_in_chunks(); returns its
+        email → row number map of the rows created.
         """
         input_rows = self.read_input_rows()
         status_index = self.get_status_index_by_email()
+        archived = self.get_archived_emails()
 
         new_rows = []
         for row in input_rows:
             email = str(row.get("Email", "")).strip().lower()
             if not email:
                 continue
+            if email_filter is not None and not email_filter(email):
+                continue
 
-            if email not in status_index:
+            if email not in status_index and email not in archived:
                 lead_name = str(row.get("Imię i nazwisko / Firma", "")).strip()
                 new_rows.append([
                     lead_name,  # Lead
@@ -219,25 +799,125 @@ class SheetsClient:
                     "",         # Follow-up wykonany
                 ])
 
-        if new_rows:
-            _with_retry(lambda: self._ws_status.append_rows(new_rows, value_input_option="USER_ENTERED"))
+        return self.append_status_rows_in_chunks(new_rows) if new_rows else {}
+
+    @traced("sheets.append_status_rows_in_chunks")
+    def append_status_rows_in_chunks(self, rows: list[list[str]]) -> dict[str, int]:
+        """Append status rows in chunks; return email → row number of the new rows.
+
+        Each chunk is one append_status_rows() call and is committed on its
+        own: when a run fails midway, the chunks before the failure stay,
+        and the next ensure_status_rows_exist() appends only the emails
+        still missing — it resumes at the first uncommitted chunk.
+
+        Chunks hold self.append_chunk_rows rows (None = everything in one
+        call).  When a chunk fails with a retryable error
+        (_is_retryable_append_error()), the Email column is read once — the
+        append may have landed before the response was lost — and a chunk
+        that is not there is retried at half the size, which the rest of
+        the pass keeps.  After _APPEND_ATTEMPTS failures in a row the error
+        propagates.  Row numbers come from each response's updatedRange.
+        """
+        email_idx = STATUS_HEADERS.index("Email")
+        size = self.append_chunk_rows or len(rows)
+        appended: dict[str, int] = {}
+        start = failures = 0
+        while start < len(rows):
+            chunk = rows[start:start + size]
+            emails = [str(row[email_idx]).strip().lower() for row in chunk]
+            try:
+                first = self.append_status_rows(chunk)
+            except Exception as exc:
+                if not _is_retryable_append_error(exc):
+                    raise
+                failures += 1
+                landed = self._status_row_numbers(emails)
+                if len(landed) < len(set(emails)):
+                    if failures >= _APPEND_ATTEMPTS:
+                        logger.error(
+                            "Status append failed %d times — %d/%d row(s) committed; "
+                            "the next run appends the rest",
+                            failures, start, len(rows),
+                        )
+                        raise
+                    size = max(1, len(chunk) // 2)
+                    logger.warning(
+                        "Status append of %d row(s) failed (%s) — retrying with chunks of %d",
+                        len(chunk), type(exc).__name__, size,
+                    )
+                    continue
+                appended.update(landed)  # committed; only the response was lost
+            else:
+                if first is not None:
+                    appended.update((email, first + i) for i, email in enumerate(emails))
+            failures = 0
+            start += len(chunk)
+            logger.info("Status rows appended: %d/%d", start, len(rows))
+        return appended
+
+    def _status_row_numbers(self, emails: list[str]) -> dict[str, int]:
+        """Row numbers of the given (normalized) emails found in the Email column."""
+        wanted = set(emails)
+        found: dict[str, int] = {}
+        for idx, value in enumerate(self.read_status_column("Email")):
+            email = str(value).strip().lower()
+            if email in wanted:
+                found.setdefault(email, idx + 2)
+        return found
+
+    @traced("sheets.append_status_rows")
+    def append_status_rows(self, rows: list[list[str]]) -> int | None:
+        """Append full status rows (STATUS_HEADERS order) in one API call.
+
+        Returns the 1-based sheet row number of the first appended row, or
+        None when the API response does not say (rows are contiguous, so
+        row *i* of *rows* lands on ``first + i``).  With row anchors on,
+        the new rows are then anchored in one more call.
+        """
+        values, option = self._status_values(rows)
+        response = self._with_fresh_metadata(lambda: self._retry(
+            lambda: self._ws_status.append_rows(values, value_input_option=option)
+        ))
+        first = _first_appended_row(response)
+        if self.row_anchors:
+            email_idx = STATUS_HEADERS.index("Email")
+            if first is None:
+                logger.warning("Append response has no row range — %d new row(s) left unanchored", len(rows))
+            else:
+                self._anchor_rows({first + i: str(row[email_idx]) for i, row in enumerate(rows)})
+        return first
+
+    @traced("sheets.append_input_rows")
+    def append_input_rows(self, rows: list[list[str]]) -> None:
+        """Append leads (INPUT_HEADERS order) to the input tab in one API call.
+
+        Values are written RAW: they come from outside (intake / imports), so
+        a name like "=IMPORTXML(...)" must stay text, never become a formula.
+        """
+        self._with_fresh_metadata(lambda: self._retry(
+            lambda: self._ws_input.append_rows(rows, value_input_option="RAW")
+        ))
 
     # ------------------------------------------------------------------
-    # Write (only system columns, USER_ENTERED)
+    # Write (only system columns; USER_ENTERED, or RAW serials)
     # ------------------------------------------------------------------
 
+    @traced("sheets.update_row")
     def update_row(self, row_number: int, updates: dict[str, str]) -> None:
         """Write *updates* into the given 1-based row (header = row 1).
 
         Only columns listed in SYSTEM_COLUMNS are allowed.
-        Uses valueInputOption=USER_ENTERED so Sheets parses dates natively.
+        Uses valueInputOption=USER_ENTERED so Sheets parses dates natively;
+        with serial dates on, date values go out as serial numbers, RAW.
         """
-        for col_name in updates:
-            if col_name not in SYSTEM_COLUMNS:
-                raise ValueError(f"Refusing to write non-system column: {col_name}")
+        import gspread
 
+        updates, option = self._update_values(updates)
         items = list(updates.items())
-        _with_retry(lambda: self._ws_status.batch_update(
+        self._mirror_touch([row_number])
+        # Ranges are built inside the callable so a metadata reload re-resolves
+        # column positions before the retry.
+        self._with_fresh_metadata(lambda: self._retry(lambda: self._ws_status.batch_update(
             [
                 {
                     "range": gspread.utils.rowcol_to_a1(row_number, self._col_index(cn)),
@@ -245,18 +925,301 @@ class SheetsClient:
                 }
                 for cn, v in items
             ],
-            value_input_option="USER_ENTERED",
-        ))
+            value_input_option=option,
+        )))
         logger.info("Updated row %d: %s", row_number, list(updates.keys()))
 
+    @traced("sheets.update_rows")
+    def update_rows(self, updates: dict[int, dict[str, str]]) -> None:
+        """update_row() for many rows: *updates* maps 1-based row → column values.
+
+        One range per row (its first to last updated column; cells in
+        between that are not updated go out as null and stay untouched),
+        _UPDATE_CHUNK_ROWS rows per values.batchUpdate call.
+        """
+        import gspread
+
+        encoded: list[tuple[int, dict[str, Any]]] = []
+        option = "USER_ENTERED"
+        for row_number, row_updates in sorted(updates.items()):
+            row_updates, option = self._update_values(row_updates)
+            if row_updates:
+                encoded.append((row_number, row_updates))
+        self._mirror_touch([row_number for row_number, _ in encoded])
+
+        def data(chunk: list[tuple[int, dict[str, Any]]]) -> list[dict[str, Any]]:
+            ranges = []
+            for row_number, row_updates in chunk:
+                cols = {self._col_index(cn): v for cn, v in row_updates.items()}
+                first, last = min(cols), max(cols)
+                ranges.append({
+                    "range": gspread.utils.rowcol_to_a1(row_number, first) + ":"
+                    + gspread.utils.rowcol_to_a1(row_number, last),
+                    "values": [[cols.get(c) for c in range(first, last + 1)]],
+                })
+            return ranges
+
+        for start in range(0, len(encoded), _UPDATE_CHUNK_ROWS):
+            chunk = encoded[start:start + _UPDATE_CHUNK_ROWS]
+            self._with_fresh_metadata(lambda: self._retry(lambda: self._ws_status.batch_update(
+                data(chunk), value_input_option=option,
+            )))
+        logger.info("Updated %d status row(s) in %d call(s)", len(encoded), -(-len(encoded) // _UPDATE_CHUNK_ROWS))
+
+    @traced("sheets.update_lead")
+    def update_lead(self, email: str, updates: dict[str, str]) -> bool:
+        """Write *updates* into the status row anchored to *email*.
+
+        One values:batchUpdateByDataFilter call that addresses the row by
+        its developer metadata (ANCHOR_KEY = hash_email(email)) instead of
+        a row number, so the write follows the lead when rows were
+        inserted, deleted or moved since the tab was read.  Same column
+        rules as update_row(); columns not in *updates* are sent as null,
+        which leaves them untouched.
+
+        A row without an anchor (created before STAGE0_ROW_ANCHORS was
+        on) is found by an Email column scan, written with update_row()
+        and anchored for next time.  Returns False when the lead has no
+        status row.
+        """
+        updates, option = self._update_values(updates)
+        if not updates:
+            return True
+        written = self._with_fresh_metadata(lambda: self._retry(
+            lambda: self._write_anchored(email, updates, option)
+        ))
+        if written:
+            logger.info("Updated anchored row: %s", list(updates.keys()))
+            return True
+
+        row_number = self.get_status_row_number_by_email(email)
+        if row_number is None:
+            logger.error("No status row for lead %s — update skipped", hash_email(email))
+            return False
+        self.update_row(row_number, updates)
+        self._anchor_rows({row_number: email})
+        return True
+
+    def _write_anchored(self, email: str, updates: dict[str, Any], option: str) -> int:
+        """Rows written by one data-filter update (0 = no anchor matched)."""
+        row: list[Any] = [None] * max(self._col_index(cn) for cn in updates)
+        for cn, v in updates.items():
+            row[self._col_index(cn) - 1] = v
+        if self._status_mirror is not None:
+            # A row that moved since the last sync changes the Email probe
+            # of both blocks, so the last-known position is enough.
+            known = self._mirror_rows.get(email.strip().lower())
+            self._mirror_touch([known] if known else None)
+        response = self._gc.http_client.request(
+            "post",
+            _VALUES_BY_DATA_FILTER_URL % self._sheet_id,
+            json={
+                "valueInputOption": option,
+                "data": [{
+                    "dataFilter": {"developerMetadataLookup": {
+                        "metadataKey": ANCHOR_KEY,
+                        "metadataValue": hash_email(email),
+                        "locationType": "ROW",
+                        "metadataLocation": {"sheetId": self._ws_status.id},
+                    }},
+                    "majorDimension": "ROWS",
+                    "values": [row],
+                }],
+            },
+        )
+        return int(response.json().get("totalUpdatedRows") or 0)
+
+    def _anchor_rows(self, rows: dict[int, str]) -> None:
+        """Anchor 1-based status rows to their emails in one batchUpdate.
+
+        Best effort: a failure is logged and the rows stay unanchored
+        (update_lead() falls back to an email scan for them).
+        """
+        import gspread
+
+        requests = [
+            _anchor_request(self._ws_status.id, row_number, email)
+            for row_number, email in sorted(rows.items())
+            if email.strip()
+        ]
+        if not requests:
+            return
+        try:
+            self._retry(lambda: self._spreadsheet.batch_update({"requests": requests}))
+        except gspread.exceptions.APIError as exc:
+            logger.warning("Could not anchor %d status row(s): %s", len(requests), exc)
+            return
+        logger.info("Anchored %d status row(s)", len(requests))
+
+    def _update_values(self, updates: dict[str, str]) -> tuple[dict[str, Any], str]:
+        """Check *updates* against the column rules; return them as sent, with the valueInputOption."""
+        for col_name in updates:
+            if col_name not in SYSTEM_COLUMNS:
+                raise ValueError(f"Refusing to write non-system column: {col_name}")
+        if self._followup_formula and FORMULA_COLUMN in updates:
+            # A value below the header would stop the array formula expanding.
+            raise ValueError(f"Refusing to write formula column: {FORMULA_COLUMN}")
+        if not self._serial_dates:
+            return updates, "USER_ENTERED"
+        from src.storage.serial_dates import SERIAL_COLUMNS, text_to_serial
+
+        return {
+            cn: text_to_serial(v) if cn in SERIAL_COLUMNS else v
+            for cn, v in updates.items()
+        }, "RAW"
+
+    # ------------------------------------------------------------------
+    # Whole-tab copy (src/storage/local.py import / export)
+    # ------------------------------------------------------------------
+
+    @traced("sheets.read_tab_values")
+    def read_tab_values(self, tab: str) -> list[list[str]]:
+        """Every data row of the "input" or "status" tab as raw cell values.
+
+        Rows keep their sheet positions (blank rows included), so row *i*
+        of the result is sheet row ``i + 2``.
+        """
+        if tab == "status" and self._serial_dates:
+            from src.storage.serial_dates import decode_rows, serial_positions
+
+            values = self._retry(
+                lambda: self._ws_status.get_all_values(value_render_option="UNFORMATTED_VALUE")
+            )
+            decode_rows(values, serial_positions(self._headers_status))
+        else:
+            ws = self._ws_input if tab == "input" else self._ws_status
+            values = self._retry(lambda: ws.get_all_values())
+        return [[str(v) for v in row] for row in values[1:]]
+
+    @traced("sheets.write_tab_values")
+    def write_tab_values(self, tab: str, rows: list[list[str]]) -> None:
+        """Replace every data row of the "input" or "status" tab with *rows*.
+
+        The header row is left alone; two calls (write, then clear the
+        leftover cells).  Input values are written RAW (they
+        are lead data), status values USER_ENTERED so dates stay dates (or
+        RAW with serial dates on).
+        """
+        import gspread
+
+        # Every row is padded to one width, then written before anything is
+        # cleared: a failed export leaves the old rows, never an empty tab.
+        width = len(INPUT_HEADERS) + 1 if tab == "input" else len(STATUS_HEADERS)  # + column D marker
+        width = max([width] + [len(r) for r in rows])
+        rows = [list(r) + [""] * (width - len(r)) for r in rows]
+        if tab == "input":
+            ws, option = self._ws_input, "RAW"
+        else:
+            ws = self._ws_status
+            rows, option = self._status_values(rows)
+            self._mirror_touch(None)
+        if rows:
+            self._retry(lambda: ws.update(values=rows, range_name="A2", value_input_option=option))
+        # Then only what the new rows did not overwrite: rows below them and
+        # columns right of them.
+        leftovers = [f"A{len(rows) + 2}:Z"]
+        if rows and width < 26:
+            leftovers.append(f"{gspread.utils.rowcol_to_a1(2, width + 1)}:Z{len(rows) + 1}")
+        self._retry(lambda: ws.batch_clear(leftovers))
+
+    # ------------------------------------------------------------------
+    # Archive of settled leads (src/stage0/archive.py)
+    # ------------------------------------------------------------------
+
+    @property
+    def archive_enabled(self) -> bool:
+        return self._archive_tab is not None
+
+    @traced("sheets.get_archived_emails")
+    def get_archived_emails(self) -> frozenset[str]:
+        """Normalized emails of archived leads (empty when there is no archive).
+
+        One API call per client — the result is kept and updated by
+        archive_status_rows().  A missing archive tab reads as empty.
+        """
+        if self._archive_tab is None:
+            return frozenset()
+        if self._archived_emails is None:
+            import gspread
+
+            range_name = gspread.utils.absolute_range_name(self._archive_tab, _ARCHIVE_EMAIL_CELLS)
+            try:
+                response = self._retry(lambda: self._spreadsheet.values_get(
+                    range_name, params={"majorDimension": "COLUMNS"},
+                ))
+            except gspread.exceptions.APIError as exc:
+                if getattr(exc.response, "status_code", None) != 400:
+                    raise
+                response = {}  # "Unable to parse range" — the tab does not exist yet
+            values = (response.get("values") or [[]])[0]
+            self._archived_emails = frozenset(
+                str(v).strip().lower() for v in values if str(v).strip()
+            )
+        return self._archived_emails
+
+    @traced("sheets.archive_status_rows")
+    def archive_status_rows(self, rows: dict[int, list[str]]) -> int:
+        """Move status rows to the archive tab — one append, one batched delete.
+
+        *rows* maps 1-based status row numbers to their values in
+        ARCHIVE_HEADERS order.  The append runs first, so a failure in
+        between leaves a row in both tabs, never in neither; rows whose
+        email is already archived are then only deleted.  Deleting
+        renumbers the rows below: row numbers read before this call are
+        stale afterwards.  Returns the number of status rows removed.
+        """
+        if not rows:
+            return 0
+        if self._archive_tab is None:
+            raise RuntimeError("No archive tab configured (STAGE0_ARCHIVE_TAB)")
+        email_idx = ARCHIVE_HEADERS.index("Email")
+        archived = set(self.get_archived_emails())
+        fresh: list[list[str]] = []
+        for _, values in sorted(rows.items()):
+            email = str(values[email_idx]).strip().lower()
+            if email not in archived:
+                archived.add(email)
+                fresh.append(values)
+
+        if fresh:
+            ws = self._archive_worksheet()
+            values, option = self._status_values(fresh, ARCHIVE_HEADERS)
+            self._retry(lambda: ws.append_rows(values, value_input_option=option))
+        self._with_fresh_metadata(lambda: self._retry(lambda: self._spreadsheet.batch_update(
+            {"requests": _delete_row_requests(self._ws_status.id, rows)}
+        )))
+        self._archived_emails = frozenset(archived)
+        logger.info("Archived %d status row(s) (%d appended to '%s')", len(rows), len(fresh), self._archive_tab)
+        return len(rows)
+
+    def _archive_worksheet(self) -> "gspread.Worksheet":
+        """The archive tab, created with ARCHIVE_HEADERS on first use."""
+        if self._ws_archive is None:
+            import gspread
+
+            try:
+                ws = self._retry(lambda: self._spreadsheet.worksheet(self._archive_tab))
+            except gspread.exceptions.WorksheetNotFound:
+                ws = self._retry(lambda: self._spreadsheet.add_worksheet(
+                    self._archive_tab, rows=1000, cols=len(ARCHIVE_HEADERS),
+                ))
+                self._retry(lambda: ws.update(values=[ARCHIVE_HEADERS], range_name="A1", value_input_option="RAW"))
+                logger.info("Created archive tab '%s'", self._archive_tab)
+            else:
+                self._validate_headers(self._retry(lambda: ws.row_values(1)), ARCHIVE_HEADERS, self._archive_tab)
+            self._ws_archive = ws
+        return self._ws_archive
+
     # ------------------------------------------------------------------
     # Date column formatting (idempotent)
     # ------------------------------------------------------------------
 
+    @traced("sheets.ensure_date_column_format")
     def ensure_date_column_format(self) -> None:
         """Apply yyyy-mm-dd hh:mm number format to date columns.
 
-        Uses the Sheets API batchUpdate / repeatCell request.
+        Display only: with serial dates on, the values read back do not
+        depend on this format.  Uses the Sheets API batchUpdate / repeatCell request.
         Safe to call multiple times — the format is simply overwritten.
         """
         sheet_id = self._ws_status.id
@@ -290,18 +1253,86 @@ class SheetsClient:
             self._spreadsheet.batch_update({"requests": requests})
             logger.info("Date column format applied to: %s", list(DATE_COLUMNS))
 
+    # ------------------------------------------------------------------
+    # Follow-up formula (formula mode)
+    # ------------------------------------------------------------------
+
+    @traced("sheets.ensure_followup_formula")
+    def ensure_followup_formula(self) -> bool:
+        """Make the sheet compute FORMULA_COLUMN; True once it does.
+
+        Reads the header cell's formula (one call).  When it is missing or
+        different, clears the column below the header (an array result
+        cannot expand over values), writes followup_formula() and, in one
+        batchUpdate, sets the spreadsheet to recalculate hourly (so NOW()
+        moves without edits — a flag may lag its due time by up to an
+        hour) and its time zone to SHEET_TIME_ZONE (NOW() compares against
+        the Warsaw dates the job writes).  An installed formula in a sheet
+        whose zone differs gets the zone reset; with cached metadata the
+        zone is read once (one more call).  From then on
+        update_row() refuses to write the column.
+        """
+        import gspread
+
+        cell = gspread.utils.rowcol_to_a1(1, self._col_index(FORMULA_COLUMN))
+        letter = cell[:-1]
+        expected = followup_formula(self._headers_status)
+        current = self._with_fresh_metadata(lambda: self._retry(
+            lambda: self._ws_status.acell(cell, value_render_option="FORMULA").value
+        ))
+        if not _same_formula(current, expected):
+            self._mirror_touch(None)
+            self._retry(lambda: self._ws_status.batch_clear([f"{letter}2:{letter}"]))
+            self._retry(lambda: self._ws_status.update(
+                values=[[expected]], range_name=cell, value_input_option="USER_ENTERED",
+            ))
+            self._set_spreadsheet_properties({"autoRecalc": "HOUR", "timeZone": SHEET_TIME_ZONE})
+            logger.info("Follow-up formula installed in %s of the status tab", cell)
+        else:
+            zone = getattr(self._spreadsheet, "_properties", {}).get("timeZone")
+            if zone is None:
+                zone = self._read_time_zone()  # metadata came from the cache
+            if zone is not None and zone != SHEET_TIME_ZONE:
+                logger.warning(
+                    "Spreadsheet time zone is %s — resetting to %s for the follow-up formula",
+                    zone, SHEET_TIME_ZONE,
+                )
+                self._set_spreadsheet_properties({"timeZone": SHEET_TIME_ZONE})
+        self._followup_formula = True
+        return True
+
+    def _read_time_zone(self) -> str | None:
+        """The spreadsheet's time zone, read with one fields-masked get and kept."""
+        meta = self._retry(lambda: self._spreadsheet.fetch_sheet_metadata(
+            params={"fields": "properties.timeZone"},
+        ))
+        zone = meta.get("properties", {}).get("timeZone")
+        if zone is not None and isinstance(getattr(self._spreadsheet, "_properties", None), dict):
+            self._spreadsheet._properties["timeZone"] = zone
+        return zone
+
+    def _set_spreadsheet_properties(self, properties: dict[str, str]) -> None:
+        """One updateSpreadsheetProperties request for *properties*."""
+        self._retry(lambda: self._spreadsheet.batch_update({"requests": [{
+            "updateSpreadsheetProperties": {"properties": properties, "fields": ",".join(properties)},
+        }]}))
+        if isinstance(getattr(self._spreadsheet, "_properties", None), dict):
+            self._spreadsheet._properties.update(properties)
+
     # ------------------------------------------------------------------
     # Helpers
     # ------------------------------------------------------------------
 
+    @traced("sheets.get_status_row_number_by_email")
     def get_status_row_number_by_email(self, email: str) -> int | None:
         """Return 1-based row number in status sheet for *email*, or None.
 
         Header is row 1; first data row is row 2.
         """
         email_norm = email.strip().lower()
-        col_idx = self._col_index("Email")               # 1-based for gspread
-        col_values = self._ws_status.col_values(col_idx) # header at index 0
+        col_values = self._with_fresh_metadata(
+            lambda: self._ws_status.col_values(self._col_index("Email"))  # header at index 0
+        )
         for i, cell in enumerate(col_values):
             if i == 0:  # skip header
                 continue
@@ -309,11 +1340,50 @@ class SheetsClient:
                 return i + 1  # convert 0-based list index to 1-based row number
         return None
 
+    @traced("sheets.read_status_column")
+    def read_status_column(self, col_name: str) -> list[str]:
+        """Values of one status column, data rows only (trailing blanks dropped).
+
+        One small API call — a cheap change probe compared to reading the
+        whole tab.
+        """
+        if self._serial_dates:
+            from src.storage.serial_dates import SERIAL_COLUMNS, decode_values
+
+            values = self._with_fresh_metadata(lambda: self._retry(
+                lambda: self._ws_status.col_values(
+                    self._col_index(col_name), value_render_option="UNFORMATTED_VALUE",
+                )
+            ))
+            if col_name in SERIAL_COLUMNS:
+                values = decode_values(values)
+        else:
+            values = self._with_fresh_metadata(lambda: self._retry(
+                lambda: self._ws_status.col_values(self._col_index(col_name))
+            ))
+        return [str(v) for v in values[1:]]
+
+    def _status_values(
+        self, rows: list[list[str]], headers: list[str] | None = None,
+    ) -> tuple[list[list[Any]], str]:
+        """Status (or archive) rows as sent to the API, with their valueInputOption.
+
+        USER_ENTERED (so text dates become dates) with formula-like text
+        quote-prefixed, or RAW with serial dates on.
+        """
+        if not self._serial_dates:
+            return [[_as_text(v) for v in row] for row in rows], "USER_ENTERED"
+        from src.storage.serial_dates import encode_rows, serial_positions
+
+        return encode_rows(rows, serial_positions(headers or self._headers_status)), "RAW"
+
     def _mark_input_duplicate(self, row_number: int) -> None:
         """Write 'Duplikat' to the marker column of the given input row."""
+        import gspread
+
         cell = gspread.utils.rowcol_to_a1(row_number, _INPUT_DUPLICATE_COL)
         try:
-            _with_retry(lambda: self._ws_input.batch_update(
+            self._retry(lambda: self._ws_input.batch_update(
                 [{"range": cell, "values": [["Duplikat"]]}],
                 value_input_option="USER_ENTERED",
             ))
@@ -0,0 +1,255 @@
+"""Local mirror of the status tab, re-synced block by block — opt-in, SQLite.
+
+The status tab changes little between runs (a few new rows, a few
+"Follow-up wykonany" entries), yet every read used to download all of
+it.  With a mirror, SheetsClient keeps the tab's rows here in blocks of
+BLOCK_ROWS rows, with a hash per block, and a read becomes:
+
+1. one values.batchGet of the header row and the PROBE_COLUMNS (narrow
+   columns: the lead identity, the send outcome other processes such as
+   the intake service write, the flag a sheet formula may recompute,
+   and the column salespeople fill in);
+2. block hashes of those probe values compared with the stored ones;
+3. one values.batchGet of only the blocks whose hash changed (or that
+   are new), written back into the mirror.
+
+Sheets cannot hash a range server-side, so the probe columns are the
+digest: steady-state transfer is those columns plus the edited blocks.
+Columns the job itself writes are covered by invalidation instead —
+every SheetsClient write to a status row clears its block's hash first
+(invalidate()), so the next read re-fetches it.  invalidate() also bumps
+a per-tab generation; a read that saves blocks fetched before a
+concurrent write (intake thread, another client) stores them with an
+empty hash, so the write is never masked.  A changed header row, a
+missing / unreadable mirror, or FULL_SYNC_AFTER since the last full read
+(a backstop for hand edits outside the probe columns) means a full read.
+
+Not for sharded workers: other processes write claims into rows this
+process would not re-fetch.
+
+Enabled by STAGE0_STATUS_MIRROR_PATH.  The file holds lead rows (names,
+emails), so it is created owner-only and must live outside version
+control (the default location ``.cache/`` is gitignored).
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+from contextlib import closing, contextmanager
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Iterable, Iterator, Sequence
+
+logger = logging.getLogger(__name__)
+
+BLOCK_ROWS = 200
+FULL_SYNC_AFTER = timedelta(hours=24)
+PROBE_COLUMNS = ("Email", "Email wysłany", "Status emaila", "Wymaga follow-upu", "Follow-up wykonany")
+
+# Bump when the stored layout changes; older files are rebuilt.
+_VERSION = 2
+
+
+@dataclass(frozen=True)
+class MirrorSnapshot:
+    """A stored copy of one status tab."""
+
+    headers: list[str]
+    rows: list[list[Any]]     # data rows; rows[0] is sheet row 2
+    hashes: list[str]         # probe hash per block; "" = must re-fetch
+    full_sync_at: datetime    # UTC
+    generation: int = 0       # invalidate() count when loaded — pass back to save()
+
+    def full_sync_due(self, now: datetime) -> bool:
+        return now - self.full_sync_at >= FULL_SYNC_AFTER
+
+
+def block_hashes(probe_columns: Sequence[Sequence[Any]], row_count: int, block_rows: int = BLOCK_ROWS) -> list[str]:
+    """Hash of the probe values per block of *block_rows* data rows.
+
+    *probe_columns* holds one value list per probe column (data rows only,
+    trailing blanks may be missing).
+    """
+    hashes = []
+    for start in range(0, row_count, block_rows):
+        digest = hashlib.sha256()
+        for column in probe_columns:
+            for value in column[start:start + block_rows]:
+                digest.update(str(value).strip().encode("utf-8"))
+                digest.update(b"\x1f")
+            # Positions past the column's end hash as blanks.
+            digest.update(b"\x1f" * max(0, min(start + block_rows, row_count) - max(len(column), start)))
+            digest.update(b"\x1e")
+        hashes.append(digest.hexdigest()[:16])
+    return hashes
+
+
+def changed_blocks(stored: Sequence[str], fresh: Sequence[str]) -> list[int]:
+    """Indexes of blocks whose fresh hash differs from the stored one."""
+    return [i for i, h in enumerate(fresh) if i >= len(stored) or not stored[i] or stored[i] != h]
+
+
+def block_of(row_number: int, block_rows: int = BLOCK_ROWS) -> int:
+    """Block index of 1-based sheet row *row_number* (row 2 = first data row)."""
+    return (row_number - 2) // block_rows
+
+
+class StatusMirror:
+    """SQLite store of MirrorSnapshot blocks keyed by (sheet_id, status_tab)."""
+
+    def __init__(self, path: str | Path, *, block_rows: int = BLOCK_ROWS) -> None:
+        self._path = Path(path)
+        self.block_rows = max(1, block_rows)
+
+    @property
+    def path(self) -> Path:
+        return self._path
+
+    @staticmethod
+    def key(sheet_id: str, status_tab: str) -> str:
+        return f"{sheet_id}|{status_tab}"
+
+    def _connect(self) -> sqlite3.Connection:
+        if not self._path.exists():
+            self._path.parent.mkdir(parents=True, exist_ok=True)
+            self._path.touch(mode=0o600)
+        conn = sqlite3.connect(self._path, timeout=30)
+        columns = {row[1] for row in conn.execute("PRAGMA table_info(tabs)")}
+        if columns and "gen" not in columns:
+            conn.executescript("DROP TABLE tabs; DROP TABLE IF EXISTS blocks;")  # version 1 layout
+        conn.executescript(
+            "CREATE TABLE IF NOT EXISTS tabs ("
+            " key TEXT PRIMARY KEY, version INTEGER, block_rows INTEGER,"
+            " headers TEXT, row_count INTEGER, full_sync_at TEXT, gen INTEGER NOT NULL DEFAULT 0);"
+            "CREATE TABLE IF NOT EXISTS blocks ("
+            " key TEXT, block INTEGER, hash TEXT, rows TEXT, PRIMARY KEY (key, block));"
+        )
+        return conn
+
+    @contextmanager
+    def _session(self) -> Iterator[sqlite3.Connection]:
+        """One connection per operation, committed on success."""
+        with closing(self._connect()) as conn, conn:
+            yield conn
+
+    def load(self, key: str) -> MirrorSnapshot | None:
+        """The stored snapshot, or None when missing, outdated or unreadable."""
+        try:
+            with self._session() as conn:
+                tab = conn.execute(
+                    "SELECT version, block_rows, headers, row_count, full_sync_at, gen FROM tabs WHERE key = ?",
+                    (key,),
+                ).fetchone()
+                if tab is None or tab[0] != _VERSION or tab[1] != self.block_rows:
+                    return None
+                blocks = conn.execute(
+                    "SELECT hash, rows FROM blocks WHERE key = ? ORDER BY block", (key,),
+                ).fetchall()
+        except (sqlite3.Error, OSError) as exc:
+            logger.warning("Status mirror unreadable, doing a full read: %s", exc)
+            return None
+        try:
+            rows = [row for _, block in blocks for row in json.loads(block)]
+            headers = json.loads(tab[2])
+            full_sync_at = datetime.fromisoformat(tab[4])
+        except ValueError:
+            return None
+        if len(rows) != tab[3]:
+            return None
+        return MirrorSnapshot(
+            headers=headers, rows=rows, hashes=[h for h, _ in blocks], full_sync_at=full_sync_at,
+            generation=tab[5],
+        )
+
+    def generation(self, key: str) -> int | None:
+        """Current invalidate() count of *key* (0 = never); None when unreadable.
+
+        Read it before fetching rows for a full save(), as load() does.
+        """
+        try:
+            with self._session() as conn:
+                tab = conn.execute("SELECT gen FROM tabs WHERE key = ?", (key,)).fetchone()
+        except (sqlite3.Error, OSError):
+            return None
+        return tab[0] if tab else 0
+
+    def save(
+        self,
+        key: str,
+        *,
+        headers: list[str],
+        rows: list[list[Any]],
+        hashes: list[str],
+        blocks: Iterable[int] | None = None,
+        full_sync_at: datetime | None = None,
+        generation: int | None = None,
+    ) -> None:
+        """Store *blocks* of *rows* (None = all) and drop blocks past the end.
+
+        *full_sync_at* is set after a full read; otherwise the stored
+        time is kept.  *generation* is the generation the rows were
+        fetched under (MirrorSnapshot.generation / generation()): when an
+        invalidate() ran since, the blocks are stored with an empty hash,
+        so the next read re-fetches them.  Failures are logged, never
+        raised — a mirror that could not be written is rebuilt by the next
+        full read.
+        """
+        size = self.block_rows
+        indexes = range(len(hashes)) if blocks is None else blocks
+        try:
+            with self._session() as conn:
+                conn.execute("BEGIN IMMEDIATE")  # generation check and write as one step
+                stored = conn.execute("SELECT full_sync_at, gen FROM tabs WHERE key = ?", (key,)).fetchone()
+                current = stored[1] if stored else 0
+                if generation is not None and generation != current:
+                    logger.info("Status mirror changed during the read — fetched blocks kept for re-fetch")
+                    hashes = [""] * len(hashes)
+                if full_sync_at is not None:
+                    synced = full_sync_at.isoformat()
+                elif stored and stored[0]:
+                    synced = stored[0]
+                else:
+                    synced = datetime.min.replace(tzinfo=timezone.utc).isoformat()
+                if blocks is None:
+                    conn.execute("DELETE FROM blocks WHERE key = ?", (key,))
+                conn.execute(
+                    "INSERT OR REPLACE INTO tabs VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    (key, _VERSION, size, json.dumps(headers, ensure_ascii=False), len(rows), synced, current),
+                )
+                conn.executemany(
+                    "INSERT OR REPLACE INTO blocks VALUES (?, ?, ?, ?)",
+                    [
+                        (key, i, hashes[i], json.dumps(rows[i * size:(i + 1) * size], ensure_ascii=False))
+                        for i in indexes
+                    ],
+                )
+                conn.execute("DELETE FROM blocks WHERE key = ? AND block >= ?", (key, len(hashes)))
+            os.chmod(self._path, 0o600)
+        except (sqlite3.Error, OSError) as exc:
+            logger.warning("Could not write status mirror: %s", exc)
+
+    def invalidate(self, key: str, row_numbers: Iterable[int] | None = None) -> None:
+        """Mark the blocks holding *row_numbers* for re-fetch (None = drop the tab).
+
+        Called before a write, so a write whose response is lost is still
+        re-read.  Errors propagate: a write the mirror cannot record must
+        not happen, or the next read could miss it (e.g. a sent email).
+        """
+        with self._session() as conn:
+            conn.execute(
+                "INSERT INTO tabs (key, gen) VALUES (?, 1) ON CONFLICT (key) DO UPDATE SET gen = gen + 1", (key,),
+            )
+            if row_numbers is None:
+                # version NULL: load() sees no snapshot; the generation stays.
+                conn.execute("UPDATE tabs SET version = NULL WHERE key = ?", (key,))
+                conn.execute("DELETE FROM blocks WHERE key = ?", (key,))
+                return
+            blocks = sorted({block_of(r, self.block_rows) for r in row_numbers if r >= 2})
+            conn.executemany(
+                "UPDATE blocks SET hash = '' WHERE key = ? AND block = ?", [(key, b) for b in blocks],
+            )
@@ -0,0 +1,165 @@
+"""HTTP transport for gspread — shared sessions and per-client request counts.
+
+Every SheetsClient talks to Google over a session built here:
+
+- a keep-alive connection pool sized for the threads that share it
+  (one per tenant worker, DEFAULT_POOL_SIZE for a standalone client);
+- gzip responses — Google compresses only when the request carries
+  ``Accept-Encoding: gzip`` *and* a User-Agent containing "gzip";
+- spreadsheet metadata fetched with a field mask (METADATA_FIELDS), so
+  per-row developer metadata (row anchors), formats and protected ranges
+  are not downloaded each time a worksheet is opened.
+
+CountingHTTPClient.stats() reports what the transport did: requests,
+gzip responses and wire bytes per client, plus the connections the
+session's pool opened and how many requests reused one.  Pool counters
+belong to the session, so tenants sharing a key file see the same
+(process-cumulative) numbers.
+
+Imports gspread / google-auth at module level, so import this module only
+from code paths that are about to talk to Sheets (never from an entry
+module — see the startup budget in benchmarks/startup.py).
+"""
+
+from __future__ import annotations
+
+import threading
+from collections import Counter
+from typing import Any
+
+import gspread
+from google.auth.transport.requests import AuthorizedSession
+from google.oauth2.service_account import Credentials
+from requests.adapters import HTTPAdapter
+
+from src.storage.sheets import SCOPES
+
+# A standalone SheetsClient is driven by one thread at a time.
+DEFAULT_POOL_SIZE = 1
+
+SESSION_HEADERS = {
+    "Accept-Encoding": "gzip",
+    "User-Agent": "stage0-sheets (gzip)",
+}
+
+# What gspread reads from spreadsheets.get when opening a spreadsheet or
+# worksheet (titles, ids, grid sizes; merges for combine_merged_cells,
+# row/column groups for list_dimension_group_*).  Callers that need more
+# pass their own "fields" (list_named_ranges, list_protected_ranges).
+METADATA_FIELDS = "spreadsheetId,properties,sheets(properties,merges,rowGroups,columnGroups)"
+
+
+class CountingHTTPClient(gspread.HTTPClient):
+    """gspread HTTPClient that counts requests per HTTP method.
+
+    One instance per SheetsClient, so counts are attributable to a single
+    tenant even when the underlying session (and its connection pool) is
+    shared between tenants.  Also applies METADATA_FIELDS to metadata
+    fetches that do not choose their own fields.
+    """
+
+    def __init__(self, auth: Any, session: Any = None) -> None:
+        super().__init__(auth, session)
+        self._lock = threading.Lock()
+        self.request_counts: Counter[str] = Counter()
+        self.gzip_responses = 0
+        self.response_bytes = 0  # as received, i.e. compressed when gzipped
+
+    @property
+    def auth(self) -> Any:
+        # HTTPClient only sets .auth when it builds its own session; with a
+        # shared session the credentials live on the session instead.
+        return self.__dict__.get("auth") or getattr(self.session, "credentials", None)
+
+    @auth.setter
+    def auth(self, value: Any) -> None:
+        self.__dict__["auth"] = value
+
+    def request(self, method: str, endpoint: str, *args: Any, **kwargs: Any) -> Any:
+        with self._lock:
+            self.request_counts[method.upper()] += 1
+        try:
+            response = super().request(method, endpoint, *args, **kwargs)
+        except gspread.exceptions.APIError as exc:
+            self._account(exc.response)
+            raise
+        self._account(response)
+        return response
+
+    def _account(self, response: Any) -> None:
+        gzipped = "gzip" in response.headers.get("Content-Encoding", "")
+        received = _wire_bytes(response)
+        with self._lock:
+            self.gzip_responses += gzipped
+            self.response_bytes += received
+
+    def fetch_sheet_metadata(self, id: str, params: Any = None) -> Any:  # noqa: A002 — gspread's signature
+        if params is None:
+            params = {"includeGridData": "false", "fields": METADATA_FIELDS}
+        return super().fetch_sheet_metadata(id, params=params)
+
+    @property
+    def total_requests(self) -> int:
+        return sum(self.request_counts.values())
+
+    def stats(self) -> dict[str, int]:
+        """Request / gzip / byte counts of this client and its session's pool counters."""
+        opened, served = pool_counters(self.session)
+        with self._lock:
+            return {
+                "requests": self.total_requests,
+                "gzip_responses": self.gzip_responses,
+                "response_bytes": self.response_bytes,
+                "connections_opened": opened,
+                "connections_reused": max(served - opened, 0),
+            }
+
+
+def _wire_bytes(response: Any) -> int:
+    """Body bytes read off the socket (urllib3 counts before decompressing)."""
+    try:
+        return int(response.raw.tell())
+    except (AttributeError, TypeError, ValueError, OSError):
+        return len(response.content or b"")
+
+
+def pool_counters(session: Any) -> tuple[int, int]:
+    """(connections opened, requests sent) over every urllib3 pool of *session*."""
+    opened = served = 0
+    for adapter in getattr(session, "adapters", {}).values():
+        manager = getattr(adapter, "poolmanager", None)
+        if manager is None:
+            continue
+        for key in manager.pools.keys():
+            pool = manager.pools.get(key)
+            opened += getattr(pool, "num_connections", 0)
+            served += getattr(pool, "num_requests", 0)
+    return opened, served
+
+
+def load_credentials(service_account_json: str) -> Credentials:
+    """Service-account credentials for the Sheets scope (local file read only)."""
+    return Credentials.from_service_account_file(service_account_json, scopes=SCOPES)
+
+
+def configure_session(session: Any, *, pool_size: int) -> Any:
+    """Mount a keep-alive pool for *pool_size* threads and ask for gzip on *session*."""
+    session.headers.update(SESSION_HEADERS)
+    for prefix in ("https://", "http://"):
+        session.mount(prefix, HTTPAdapter(pool_connections=1, pool_maxsize=max(pool_size, 1)))
+    return session
+
+
+def build_shared_session(credentials: Credentials, *, pool_size: int) -> AuthorizedSession:
+    """AuthorizedSession with a keep-alive pool sized for *pool_size* workers."""
+    return configure_session(AuthorizedSession(credentials), pool_size=pool_size)
+
+
+def client_for_session(session: AuthorizedSession) -> gspread.Client:
+    """gspread Client on *session* with its own CountingHTTPClient."""
+    return gspread.authorize(None, http_client=CountingHTTPClient, session=session)
+
+
+def authorize(credentials: Credentials, *, pool_size: int = DEFAULT_POOL_SIZE) -> gspread.Client:
+    """gspread Client on a new session of its own (the single-sheet setup)."""
+    return client_for_session(build_shared_session(credentials, pool_size=pool_size))
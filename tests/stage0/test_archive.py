@@ -0,0 +1,150 @@
+"""Tests for archival of settled leads — src.stage0.archive + archive_status_rows()."""
+
+from __future__ import annotations
+
+from datetime import datetime
+
+import pytest
+
+from benchmarks.sheets_emulator import SheetsEmulator
+from src.stage0.archive import run_archive, select_settled, settled_at
+from src.stage0.followup import WARSAW_TZ
+from src.storage.local import LocalSheetsClient
+from src.storage.sheets import ARCHIVE_HEADERS, INPUT_HEADERS, STATUS_HEADERS, SheetsClient, _delete_row_requests
+
+NOW = datetime(2025, 6, 1, 12, 0, tzinfo=WARSAW_TZ)
+
+INPUT = [
+    ["Anna", "anna@example.com", ""],
+    ["Jan", "jan@example.com", ""],
+    ["Ewa", "ewa@example.com", ""],
+    ["Olga", "olga@example.com", ""],
+]
+STATUS = [
+    ["Anna", "anna@example.com", "2025-01-10 09:00", "SENT", "2025-01-13 09:00", "NO", "2025-01-14 10:00"],
+    ["Jan", "jan@example.com", "2025-01-11 09:00", "SENT", "2025-01-14 09:00", "YES", ""],
+    ["Ewa", "ewa@example.com", "2025-01-12 09:00", "SENT", "2025-01-15 09:00", "NO", "zadzwoniono"],
+    ["Olga", "olga@example.com", "2025-05-30 09:00", "SENT", "2025-06-02 09:00", "NO", "2025-05-31 10:00"],
+]
+
+
+def _archive_row(row: list[str], at: str = "2025-06-01 12:00") -> list[str]:
+    return [*row, at]
+
+
+class TestSelectSettled:
+    def test_rules(self):
+        rows = [dict(zip(STATUS_HEADERS, r)) for r in STATUS]
+        rows.append(dict(zip(STATUS_HEADERS, ["X", "x@example.com", "", "ERROR: 421", "", "", "2025-01-01 10:00"])))
+        rows.append(dict(zip(STATUS_HEADERS, ["", "", "2025-01-10 09:00", "SENT", "", "", "2025-01-11 10:00"])))
+
+        assert select_settled(rows, now=NOW, after_days=30) == [0, 2]
+        assert select_settled(rows, now=NOW, after_days=0) == [0, 2, 3]
+
+    def test_later_date_counts(self):
+        row = {"Email wysłany": "2025-01-10 09:00", "Follow-up wykonany": "2025-03-01 10:00"}
+
+        assert settled_at(row) == datetime(2025, 3, 1, 10, 0, tzinfo=WARSAW_TZ)
+        assert settled_at({**row, "Follow-up wykonany": "tak"}) == datetime(2025, 1, 10, 9, 0, tzinfo=WARSAW_TZ)
+        assert settled_at({**row, "Follow-up wykonany": ""}) is None
+
+
+def test_delete_row_requests_group_runs_bottom_up():
+    requests = _delete_row_requests(7, [2, 3, 5, 9, 8])
+
+    assert [(r["deleteDimension"]["range"]["startIndex"], r["deleteDimension"]["range"]["endIndex"]) for r in requests] == [
+        (7, 9), (4, 5), (1, 3),
+    ]
+    assert {r["deleteDimension"]["range"]["sheetId"] for r in requests} == {7}
+
+
+class TestLocalStore:
+    @pytest.fixture
+    def store(self, tmp_path):
+        client = LocalSheetsClient(tmp_path / "leads.sqlite3")
+        client.append_input_rows(INPUT)
+        client.append_status_rows(STATUS)
+        yield client
+        client.close()
+
+    def test_moves_rows_and_renumbers(self, store):
+        report = run_archive(store, after_days=30, now=NOW)
+
+        assert (report.rows_scanned, report.rows_archived) == (4, 2)
+        assert [r["Email"] for r in store.read_status_rows()] == ["jan@example.com", "olga@example.com"]
+        assert store.get_status_row_number_by_email("olga@example.com") == 3
+        assert store.read_tab_values("archive") == [_archive_row(STATUS[0]), _archive_row(STATUS[2])]
+        assert store.get_archived_emails() == {"anna@example.com", "ewa@example.com"}
+
+    def test_archived_leads_are_never_resent(self, store):
+        run_archive(store, after_days=30, now=NOW)
+
+        store.ensure_status_rows_exist()
+
+        assert len(store.read_status_rows()) == 2
+        assert store.get_new_leads() == []
+
+    def test_dry_run_and_repeat(self, store):
+        assert run_archive(store, after_days=30, now=NOW, dry_run=True).rows_archived == 2
+        assert len(store.read_status_rows()) == 4
+
+        run_archive(store, after_days=30, now=NOW)
+        assert run_archive(store, after_days=30, now=NOW).rows_archived == 0
+
+
+class TestSheetsClient:
+    @pytest.fixture
+    def emulator(self):
+        with SheetsEmulator() as emu:
+            emu.add_spreadsheet("sheet", {
+                "input": [list(INPUT_HEADERS), *INPUT],
+                "status": [list(STATUS_HEADERS), *STATUS],
+            })
+            yield emu
+
+    def _client(self, emu, archive_tab="status_archive"):
+        return SheetsClient(
+            "", "sheet", input_tab="input", status_tab="status",
+            gspread_client=emu.gspread_client(), archive_tab=archive_tab,
+        )
+
+    def test_creates_archive_tab_and_deletes_in_one_batch(self, emulator):
+        sheets = self._client(emulator)
+        assert sheets.get_archived_emails() == frozenset()
+
+        run_archive(sheets, after_days=30, now=NOW)
+
+        assert emulator.values("sheet", "status_archive") == [
+            ARCHIVE_HEADERS, _archive_row(STATUS[0]), _archive_row(STATUS[2]),
+        ]
+        assert [r[1] for r in emulator.values("sheet", "status")[1:]] == ["jan@example.com", "olga@example.com"]
+        assert emulator.stats()["requests"]["values.append"] == 1
+
+        fresh = self._client(emulator)
+        assert fresh.get_archived_emails() == {"anna@example.com", "ewa@example.com"}
+        fresh.ensure_status_rows_exist()
+        assert len(emulator.values("sheet", "status")) == 3
+        assert fresh.get_new_leads() == []
+
+    def test_already_archived_rows_are_only_deleted(self, emulator):
+        emulator.add_spreadsheet("sheet", {
+            "input": [list(INPUT_HEADERS), *INPUT],
+            "status": [list(STATUS_HEADERS), *STATUS],
+            "status_archive": [ARCHIVE_HEADERS, _archive_row(STATUS[0], "2025-05-01 12:00")],
+        })
+
+        run_archive(self._client(emulator), after_days=30, now=NOW)
+
+        archive = emulator.values("sheet", "status_archive")
+        assert [r[1] for r in archive[1:]] == ["anna@example.com", "ewa@example.com"]
+        assert len(emulator.values("sheet", "status")) == 3
+
+    def test_without_archive_tab_nothing_is_read(self, emulator):
+        sheets = self._client(emulator, archive_tab=None)
+        before = emulator.stats()["requests"].get("values.get", 0)
+
+        assert sheets.get_archived_emails() == frozenset()
+        assert not sheets.archive_enabled
+        assert emulator.stats()["requests"].get("values.get", 0) == before
+        with pytest.raises(RuntimeError, match="archive"):
+            sheets.archive_status_rows({2: _archive_row(STATUS[0])})
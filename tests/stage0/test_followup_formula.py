@@ -0,0 +1,133 @@
+"""Tests for formula mode — followup_formula(), ensure_followup_formula(), run_followups(formula=True)."""
+
+from __future__ import annotations
+
+from datetime import datetime
+
+import pytest
+
+from benchmarks.sheets_emulator import SheetsEmulator
+from src.stage0.followup import WARSAW_TZ
+from src.stage0.process import run_followups
+from src.stage0.schedule import load_schedule
+from src.storage.local import LocalSheetsClient
+from src.storage.sheets import INPUT_HEADERS, STATUS_HEADERS, SheetsClient, followup_formula
+
+NOW = datetime(2025, 3, 14, 10, 0, tzinfo=WARSAW_TZ)
+
+STATUS = [
+    ["Anna", "anna@example.com", "2025-03-10 09:15", "SENT", "2025-03-13 09:15", "NO", ""],
+    ["Jan", "jan@example.com", "2025-03-13 08:00", "SENT", "", "", ""],
+]
+
+
+class SheetComputedStore(LocalSheetsClient):
+    """Local store standing in for a sheet whose formula owns the flag column."""
+
+    def ensure_followup_formula(self) -> bool:
+        return True
+
+
+@pytest.fixture
+def store(tmp_path):
+    client = SheetComputedStore(tmp_path / "leads.sqlite3")
+    client.append_status_rows(STATUS)
+    yield client
+    client.close()
+
+
+def test_formula_text():
+    assert followup_formula(list(STATUS_HEADERS)) == (
+        '={"Wymaga follow-upu"; ARRAYFORMULA(IF(B2:B="",, IF(E2:E="",, '
+        'IF(G2:G<>"", "NO", IF(NOW()>=E2:E, "YES", "NO")))))}'
+    )
+
+
+class TestRunFollowups:
+    def test_only_due_dates_are_written(self, store, tmp_path):
+        path = tmp_path / "followup.json"
+
+        report = run_followups(store, now=NOW, formula=True, schedule_path=path)
+
+        rows = store.read_status_rows()
+        assert report.rows_updated == 1
+        assert rows[0]["Wymaga follow-upu"] == "NO"  # due, but the sheet flips it
+        assert (rows[1]["Follow-up od"], rows[1]["Wymaga follow-upu"]) == ("2025-03-16 08:00", "")
+        assert "formula" in report.timings
+        assert load_schedule(path).due_times == ()
+
+    def test_store_without_formulas_keeps_writing_flags(self, tmp_path):
+        plain = LocalSheetsClient(tmp_path / "plain.sqlite3")
+        plain.append_status_rows(STATUS)
+
+        assert run_followups(plain, now=NOW, formula=True).rows_updated == 2
+        assert plain.read_status_rows()[0]["Wymaga follow-upu"] == "YES"
+        plain.close()
+
+
+class TestSheetsClient:
+    @pytest.fixture
+    def emulator(self):
+        with SheetsEmulator() as emu:
+            emu.add_spreadsheet("sheet", {
+                "input": [list(INPUT_HEADERS)],
+                "status": [list(STATUS_HEADERS), *STATUS],
+            })
+            yield emu
+
+    def _client(self, emu):
+        return SheetsClient("", "sheet", input_tab="input", status_tab="status", gspread_client=emu.gspread_client())
+
+    def test_installs_formula_once(self, emulator):
+        assert self._client(emulator).ensure_followup_formula()
+
+        values = emulator.values("sheet", "status")
+        assert values[0][5] == followup_formula(list(STATUS_HEADERS))
+        assert all(len(row) <= 5 for row in values[1:])  # flag column cleared for the array
+        writes = dict(emulator.stats()["requests"])
+
+        assert self._client(emulator).ensure_followup_formula()
+        assert emulator.stats()["requests"].get("values.update") == writes["values.update"]
+        assert emulator.stats()["requests"].get("batchUpdate") == writes["batchUpdate"] == 1
+
+    def test_install_sets_recalc_and_time_zone(self, emulator):
+        book = emulator._books["sheet"]
+        book.properties["timeZone"] = "America/New_York"
+
+        self._client(emulator).ensure_followup_formula()
+
+        assert (book.properties["autoRecalc"], book.properties["timeZone"]) == ("HOUR", "Europe/Warsaw")
+        assert emulator.stats()["requests"]["batchUpdate"] == 1
+
+    def test_installed_formula_in_another_zone_is_reset(self, emulator):
+        self._client(emulator).ensure_followup_formula()
+        book = emulator._books["sheet"]
+        book.properties["timeZone"] = "UTC"
+
+        self._client(emulator).ensure_followup_formula()
+
+        assert book.properties["timeZone"] == "Europe/Warsaw"
+        assert emulator.stats()["requests"]["batchUpdate"] == 2
+
+    def test_zone_read_once_when_metadata_is_cached(self, emulator):
+        self._client(emulator).ensure_followup_formula()
+        emulator._books["sheet"].properties["timeZone"] = "UTC"
+        sheets = self._client(emulator)
+        del sheets._spreadsheet._properties["timeZone"]  # as _apply_cached_metadata() leaves it
+        emulator.reset_stats()
+
+        sheets.ensure_followup_formula()
+        sheets.ensure_followup_formula()
+
+        assert emulator._books["sheet"].properties["timeZone"] == "Europe/Warsaw"
+        assert emulator.stats()["requests"]["spreadsheets.get"] == 1
+        assert emulator.stats()["requests"]["batchUpdate"] == 1
+
+    def test_flag_writes_refused_once_installed(self, emulator):
+        sheets = self._client(emulator)
+        sheets.update_row(2, {"Wymaga follow-upu": "YES"})
+        sheets.ensure_followup_formula()
+
+        with pytest.raises(ValueError, match="formula column"):
+            sheets.update_row(2, {"Wymaga follow-upu": "YES"})
+        sheets.update_row(3, {"Follow-up od": "2025-03-16 08:00"})
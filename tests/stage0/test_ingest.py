@@ -0,0 +1,155 @@
+"""Tests for Meta export ingestion — src.integrations.meta_export + src.stage0.ingest."""
+
+from __future__ import annotations
+
+import tracemalloc
+from unittest.mock import MagicMock
+
+import pytest
+
+from src.integrations.meta_export import iter_meta_leads
+from src.stage0.ingest import ingest_meta_export
+
+META_HEADER = "id\tcreated_time\tad_name\tfull_name\temail\tphone_number\n"
+
+
+def _write_meta_csv(path, rows, *, encoding="utf-16"):
+    lines = [META_HEADER] + [
+        f"l:{i}\t2026-03-01T10:00:00+0100\tAd\t{name}\t{email}\tp:{phone}\n"
+        for i, (name, email, phone) in enumerate(rows)
+    ]
+    path.write_text("".join(lines), encoding=encoding)
+    return path
+
+
+def _make_sheets(*, inputs=(), statuses=()):
+    client = MagicMock()
+    client.append_chunk_rows = None
+    client.read_input_rows.return_value = [{"Email": e} for e in inputs]
+    client.read_status_rows.return_value = [{"Email": e} for e in statuses]
+    return client
+
+
+class TestIterMetaLeads:
+    def test_utf16_tab_export_mapped_to_input_headers(self, tmp_path):
+        path = _write_meta_csv(tmp_path / "m.csv", [("Anna Kowalska", "Anna@Example.com", "+48600100200")])
+
+        leads = list(iter_meta_leads(path))
+
+        assert leads == [{
+            "Imię i nazwisko / Firma": "Anna Kowalska",
+            "Email": "Anna@Example.com",
+            "Telefon dodatkowy": "+48600100200",
+        }]
+
+    def test_comma_csv_with_first_and_last_name(self, tmp_path):
+        path = tmp_path / "m.csv"
+        path.write_text("First name,Last name,E-mail,Phone\nJan,Nowak,jan@example.com,600\n\n", encoding="utf-8-sig")
+
+        assert list(iter_meta_leads(path)) == [{
+            "Imię i nazwisko / Firma": "Jan Nowak",
+            "Email": "jan@example.com",
+            "Telefon dodatkowy": "600",
+        }]
+
+    def test_missing_email_column(self, tmp_path):
+        path = tmp_path / "m.csv"
+        path.write_text("full_name,phone\nJan,600\n", encoding="utf-8")
+
+        with pytest.raises(ValueError, match="email"):
+            list(iter_meta_leads(path))
+
+    def test_streams_in_constant_memory(self, tmp_path):
+        path = _write_meta_csv(
+            tmp_path / "big.csv",
+            ((f"Lead {i}", f"lead{i}@example.com", "600") for i in range(50_000)),
+        )
+
+        tracemalloc.start()
+        count = sum(1 for _ in iter_meta_leads(path))
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        assert count == 50_000
+        assert peak < 1_000_000  # the file itself is several MB
+
+
+class TestIngestMetaExport:
+    def test_dedupes_like_read_input_rows(self, tmp_path):
+        path = _write_meta_csv(tmp_path / "m.csv", [
+            ("Anna", " ANNA@example.com ", "1"),
+            ("Anna again", "anna@example.com", "2"),  # duplicate in file
+            ("Old", "old@example.com", "3"),          # already in sheet
+            ("No email", "", "4"),
+            ("Marek", "marek@example.com", "5"),
+        ])
+        sheets = _make_sheets(inputs=["old@example.com"])
+
+        report = ingest_meta_export(path, sheets)
+
+        assert (report.rows_read, report.appended) == (5, 2)
+        assert (report.duplicates_in_file, report.already_in_sheet, report.missing_email) == (1, 1, 1)
+        sheets.append_input_rows.assert_called_once_with([
+            ["Anna", "anna@example.com", "1"],
+            ["Marek", "marek@example.com", "5"],
+        ])
+
+    def test_status_rows_appended_first_and_skip_existing(self, tmp_path):
+        path = _write_meta_csv(tmp_path / "m.csv", [("A", "a@example.com", "1"), ("B", "b@example.com", "2")])
+        sheets = _make_sheets(statuses=["b@example.com"])
+
+        ingest_meta_export(path, sheets)
+
+        names = [c[0] for c in sheets.method_calls if c[0].startswith("append")]
+        assert names == ["append_status_rows_in_chunks", "append_input_rows"]
+        sheets.append_status_rows_in_chunks.assert_called_once_with([["A", "a@example.com", "", "", "", "", ""]])
+
+    def test_no_per_row_reads_and_chunked_appends(self, tmp_path):
+        path = _write_meta_csv(
+            tmp_path / "m.csv", [(f"L{i}", f"l{i}@example.com", "1") for i in range(2_500)]
+        )
+        sheets = _make_sheets()
+
+        report = ingest_meta_export(path, sheets, chunk_size=1_000)
+
+        sheets.read_input_rows.assert_called_once()
+        sheets.read_status_rows.assert_called_once()
+        assert sheets.append_input_rows.call_count == 3
+        assert report.append_calls == 6
+        assert report.appended == 2_500
+
+    def test_status_appends_follow_client_chunk_rows(self, tmp_path):
+        path = _write_meta_csv(
+            tmp_path / "m.csv", [(f"L{i}", f"l{i}@example.com", "1") for i in range(2_500)]
+        )
+        sheets = _make_sheets()
+        sheets.append_chunk_rows = 500
+
+        report = ingest_meta_export(path, sheets, chunk_size=1_000)
+
+        assert sheets.append_status_rows_in_chunks.call_count == 3
+        assert report.append_calls == 3 + 5
+
+    def test_nothing_new_makes_no_append(self, tmp_path):
+        path = _write_meta_csv(tmp_path / "m.csv", [("A", "a@example.com", "1")])
+        sheets = _make_sheets(inputs=["a@example.com"])
+
+        report = ingest_meta_export(path, sheets)
+
+        assert report.append_calls == 0
+        sheets.append_input_rows.assert_not_called()
+
+    def test_formula_like_names_land_as_text(self, tmp_path):
+        from benchmarks.sheets_emulator import SheetsEmulator
+        from src.storage.sheets import INPUT_HEADERS, STATUS_HEADERS, SheetsClient
+
+        names = ['=HYPERLINK("http://evil.example.com", "x")', "+48 Firma", "@anna"]
+        path = _write_meta_csv(tmp_path / "m.csv", [(n, f"l{i}@example.com", "1") for i, n in enumerate(names)])
+        with SheetsEmulator() as emu:
+            emu.add_spreadsheet("sheet", {"input": [list(INPUT_HEADERS)], "status": [list(STATUS_HEADERS)]})
+            sheets = SheetsClient("", "sheet", input_tab="input", status_tab="status", gspread_client=emu.gspread_client())
+
+            ingest_meta_export(path, sheets)
+
+            status_names = [row[0] for row in emu.values("sheet", "status")[1:]]
+            assert status_names == names and all(type(n) is str for n in status_names)
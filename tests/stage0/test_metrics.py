@@ -0,0 +1,132 @@
+"""Tests for stage timings and run metrics export — src.stage0.metrics."""
+
+from __future__ import annotations
+
+import json
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+import gspread
+
+from src.stage0.metrics import RunMetrics, StageTimer, export_run_metrics, write_prometheus_textfile
+from src.stage0.process import FollowupReport, ProcessReport, process_new_leads, run_followups
+from src.storage.sheets import _with_retry
+
+CALENDAR_URL = "https://calendly.com/flexihome/konsultacja"
+FAKE_ATTACHMENTS = [Path("a.pdf"), Path("b.pdf"), Path("c.pdf")]
+FAKE_SMTP = dict(
+    smtp_host="smtp.example.com",
+    smtp_port=587,
+    smtp_user="user",
+    smtp_password="pass",
+    smtp_from_email="sender@example.com",
+)
+
+REPORT = ProcessReport(
+    total_input_leads=10, new_leads_detected=3, emails_sent=2, emails_failed=1,
+    timings={"smtp": 1.5, "eligibility": 0.25},
+)
+
+
+def _metrics(tenant=None):
+    followups = FollowupReport(rows_scanned=10, rows_updated=4, timings={"read": 0.5})
+    return RunMetrics.from_reports(REPORT, followups, tenant=tenant)
+
+
+class TestStageTimer:
+    def test_accumulates_per_stage(self):
+        timer = StageTimer()
+        with patch("src.stage0.metrics.time.perf_counter", side_effect=[0.0, 1.0, 5.0, 5.5]):
+            with timer.stage("smtp"):
+                pass
+            with timer.stage("smtp"):
+                pass
+        timer.add("total", 2.0)
+
+        assert timer.as_dict() == {"smtp": 1.5, "total": 2.0}
+
+    def test_records_time_when_stage_raises(self):
+        timer = StageTimer()
+        try:
+            with timer.stage("build"):
+                raise ValueError
+        except ValueError:
+            pass
+
+        assert "build" in timer.as_dict()
+
+
+class TestReportTimings:
+    @patch("src.stage0.process.time.sleep")
+    @patch("src.stage0.process.get_stage0_attachments_from_env", return_value=FAKE_ATTACHMENTS)
+    @patch("src.stage0.process.build_stage0_email")
+    @patch("src.stage0.process.send_email_draft")
+    def test_process_report_has_stage_breakdown(self, _send, _build, _attach, _sleep):
+        sheets = MagicMock()
+        sheets.get_new_leads.return_value = [{"Email": "a@example.com", "Imię i nazwisko / Firma": "A"}]
+        sheets.read_status_rows.return_value = [{"Email": "a@example.com", "Email wysłany": "", "Status emaila": ""}]
+        sheets.backoff_seconds = 0.0
+
+        report = process_new_leads(sheets, CALENDAR_URL, **FAKE_SMTP)
+
+        assert {"status_sync", "eligibility", "build", "smtp", "status_write", "send_throttle", "total"} <= set(report.timings)
+        assert report.timings["sheets_backoff"] == 0.0
+
+    def test_timings_do_not_affect_report_equality(self):
+        assert REPORT == ProcessReport(total_input_leads=10, new_leads_detected=3, emails_sent=2, emails_failed=1)
+
+    def test_followup_report(self):
+        sheets = MagicMock()
+        sheets.read_status_rows.return_value = [{"Email": ""}]
+
+        report = run_followups(sheets)
+
+        assert (report.rows_scanned, report.rows_updated) == (1, 0)
+        assert {"read", "total"} <= set(report.timings)
+
+
+class TestBackoffAccounting:
+    def test_on_backoff_receives_each_delay(self):
+        response = MagicMock(status_code=429)
+        response.json.return_value = {"error": {"code": 429, "message": "quota", "status": "RESOURCE_EXHAUSTED"}}
+        fn = MagicMock(side_effect=[gspread.exceptions.APIError(response)] * 2 + ["ok"])
+        delays = []
+
+        with patch("src.storage.sheets.time.sleep"):
+            assert _with_retry(fn, base_delay=1, on_backoff=delays.append) == "ok"
+
+        assert delays == [1, 2]
+
+
+class TestExport:
+    def test_prometheus_textfile(self, tmp_path):
+        path = write_prometheus_textfile(tmp_path / "stage0.prom", _metrics())
+        text = path.read_text()
+
+        assert 'stage0_run_stage_seconds{stage="smtp"} 1.500000' in text
+        assert 'stage0_run_stage_seconds{stage="followup_read"} 0.500000' in text
+        assert "stage0_run_emails_sent 2" in text
+        assert "stage0_run_followup_rows_updated 4" in text
+        assert not list(tmp_path.glob("*.tmp"))
+
+    def test_tenant_gets_own_textfile_and_label(self, tmp_path):
+        path = write_prometheus_textfile(tmp_path / "stage0.prom", _metrics(tenant="acme"))
+
+        assert path.name == "stage0.acme.prom"
+        assert 'stage0_run_emails_sent{tenant="acme"} 2' in path.read_text()
+
+    def test_jsonl_appends_one_line_per_run(self, tmp_path):
+        target = tmp_path / "runs.jsonl"
+        for _ in range(2):
+            export_run_metrics(_metrics(), prom_path=None, jsonl_path=str(target))
+
+        lines = [json.loads(line) for line in target.read_text().splitlines()]
+        assert len(lines) == 2
+        assert lines[0]["counters"]["emails_failed"] == 1
+        assert lines[0]["timings_s"]["smtp"] == 1.5
+
+    def test_write_error_is_not_fatal(self, tmp_path):
+        blocker = tmp_path / "file"
+        blocker.write_text("")
+
+        export_run_metrics(_metrics(), prom_path=str(blocker / "x.prom"), jsonl_path=None)
@@ -7,7 +7,12 @@ from unittest.mock import MagicMock, call, patch
 
 import pytest
 
-from src.stage0.process import ProcessReport, _friendly_email_error_status, process_new_leads
+from src.stage0.process import (
+    ProcessReport,
+    _friendly_email_error_status,
+    prioritize_leads,
+    process_new_leads,
+)
 
 CALENDAR_URL = "https://calendly.com/flexihome/konsultacja"
 
@@ -343,3 +348,86 @@ class TestIdempotency:
         assert first.emails_sent == 2
         assert second.emails_sent == 0
         assert sheets.ensure_status_rows_exist.call_count == 2
+
+
+# ---------------------------------------------------------------------------
+# Priority order, time budget and send cap
+# ---------------------------------------------------------------------------
+
+LEAD_OLD = {"Email": "old@example.com", "Imię i nazwisko / Firma": "Old Lead"}
+LEAD_NEW = {"Email": "new@example.com", "Imię i nazwisko / Firma": "New Lead"}
+LEAD_RETRY = {"Email": "retry@example.com", "Imię i nazwisko / Firma": "Retry Lead"}
+
+_STATUS_ROWS = [
+    {"Email": "retry@example.com", "Email wysłany": "", "Status emaila": "ERROR: timeout"},
+    {"Email": "old@example.com", "Email wysłany": "", "Status emaila": ""},
+    {"Email": "new@example.com", "Email wysłany": "", "Status emaila": ""},
+]
+
+
+def _make_backlog_sheets():
+    sheets = _make_sheets(
+        input_rows=[LEAD_RETRY, LEAD_OLD, LEAD_NEW],
+        new_leads=[LEAD_RETRY, LEAD_OLD, LEAD_NEW],
+    )
+    sheets.read_status_rows.return_value = _STATUS_ROWS
+    return sheets
+
+
+def _sent_to(mock_send):
+    return [c.kwargs["to_email"] for c in mock_send.call_args_list]
+
+
+class TestPrioritizeLeads:
+    def test_fresh_newest_first_then_retries(self):
+        index = {r["Email"]: r for r in _STATUS_ROWS}
+
+        ordered = prioritize_leads([LEAD_RETRY, LEAD_OLD, LEAD_NEW], index)
+
+        assert ordered == [LEAD_NEW, LEAD_OLD, LEAD_RETRY]
+
+    def test_lead_without_status_row_is_fresh(self):
+        assert prioritize_leads([LEAD_RETRY, LEAD_1], {"retry@example.com": _STATUS_ROWS[0]}) == [
+            LEAD_1, LEAD_RETRY,
+        ]
+
+
+@patch("src.stage0.process.time.sleep")
+@patch("src.stage0.process.get_stage0_attachments_from_env", return_value=FAKE_ATTACHMENTS)
+@patch("src.stage0.process.build_stage0_email")
+@patch("src.stage0.process.send_email_draft")
+class TestRunLimits:
+    def test_sends_in_priority_order(self, mock_send, mock_build, mock_attach, mock_sleep):
+        report = process_new_leads(_make_backlog_sheets(), CALENDAR_URL, **FAKE_SMTP)
+
+        assert _sent_to(mock_send) == ["new@example.com", "old@example.com", "retry@example.com"]
+        assert report.carried_over == 0
+
+    def test_send_cap_carries_over_rest(self, mock_send, mock_build, mock_attach, mock_sleep):
+        sheets = _make_backlog_sheets()
+
+        report = process_new_leads(sheets, CALENDAR_URL, **FAKE_SMTP, max_sends=1)
+
+        assert _sent_to(mock_send) == ["new@example.com"]
+        assert report.emails_sent == 1
+        assert report.carried_over == 2
+        assert sheets.update_row.call_count == 1  # carried-over rows untouched
+
+    def test_time_budget_carries_over_rest(self, mock_send, mock_build, mock_attach, mock_sleep):
+        # start, lead 1 check, lead 2 check (budget exhausted)
+        with patch("src.stage0.process.time.monotonic", side_effect=[0.0, 1.0, 31.0]):
+            report = process_new_leads(
+                _make_backlog_sheets(), CALENDAR_URL, **FAKE_SMTP, time_budget_s=30,
+            )
+
+        assert _sent_to(mock_send) == ["new@example.com"]
+        assert report.carried_over == 2
+
+    def test_failed_send_does_not_count_towards_cap(self, mock_send, mock_build, mock_attach, mock_sleep):
+        mock_send.side_effect = [RuntimeError("SMTP down"), None, None]
+
+        report = process_new_leads(_make_backlog_sheets(), CALENDAR_URL, **FAKE_SMTP, max_sends=1)
+
+        assert report.emails_failed == 1
+        assert report.emails_sent == 1
+        assert report.carried_over == 1
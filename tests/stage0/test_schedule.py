@@ -0,0 +1,147 @@
+"""Tests for the next-due follow-up schedule — src.stage0.schedule + run_followups()."""
+
+from __future__ import annotations
+
+import json
+from datetime import datetime, timedelta
+from unittest.mock import patch
+
+import pytest
+
+from src.stage0.batch import evaluate_followups, to_columns
+from src.stage0.followup import WARSAW_TZ
+from src.stage0.process import run_followups
+from src.stage0.schedule import (
+    FollowupSchedule,
+    build_schedule,
+    clear_schedule,
+    load_schedule,
+    probe_fingerprint,
+    reason_to_run,
+)
+from src.storage.local import LocalSheetsClient
+from src.storage.sheets import STATUS_HEADERS
+
+NOW = datetime(2025, 3, 10, 12, 0, tzinfo=WARSAW_TZ)
+
+
+@pytest.fixture
+def store(tmp_path):
+    client = LocalSheetsClient(tmp_path / "leads.sqlite3")
+    client.append_status_rows([
+        ["A", "a@example.com", "2025-03-09 10:00", "SENT", "2025-03-12 10:00", "NO", ""],
+        ["B", "b@example.com", "2025-03-09 11:00", "SENT", "2025-03-12 11:00", "NO", ""],
+        ["C", "c@example.com", "", "ERROR: 421", "", "", ""],
+    ])
+    yield client
+    client.close()
+
+
+@pytest.fixture
+def path(tmp_path):
+    return tmp_path / "state" / "followup.json"
+
+
+def _flag(store, row_number):
+    return store.read_status_rows()[row_number - 2]["Wymaga follow-upu"]
+
+
+class TestRunFollowups:
+    def test_first_run_is_full_and_writes_schedule(self, store, path):
+        report = run_followups(store, now=NOW, schedule_path=path)
+
+        assert not report.skipped
+        assert report.rows_scanned == 3
+        assert load_schedule(path).due_times == ("2025-03-12 10:00", "2025-03-12 11:00")
+
+    def test_quiet_tick_is_skipped_without_reading_the_tab(self, store, path):
+        run_followups(store, now=NOW, schedule_path=path)
+
+        with patch.object(store, "read_status_rows", side_effect=AssertionError("full read")):
+            report = run_followups(store, now=NOW + timedelta(hours=1), schedule_path=path)
+
+        assert report.skipped
+        assert report.rows_scanned == 0
+        assert "probe" in report.timings
+
+    def test_runs_once_earliest_due_passes(self, store, path):
+        run_followups(store, now=NOW, schedule_path=path)
+
+        report = run_followups(store, now=datetime(2025, 3, 12, 10, 30, tzinfo=WARSAW_TZ), schedule_path=path)
+
+        assert not report.skipped
+        assert report.rows_updated == 1
+        assert _flag(store, 2) == "YES"
+        assert load_schedule(path).due_times == ("2025-03-12 11:00",)
+
+    def test_manual_edit_is_probed(self, store, path):
+        run_followups(store, now=NOW, schedule_path=path)
+        with store._lock:
+            store._conn.execute('UPDATE status SET "Follow-up wykonany" = ? WHERE row_number = 2', ("2025-03-10 12:30",))
+
+        report = run_followups(store, now=NOW + timedelta(hours=1), schedule_path=path)
+
+        assert not report.skipped
+        assert load_schedule(path).due_times == ("2025-03-12 11:00",)
+
+    def test_new_sends_force_a_pass(self, store, path):
+        run_followups(store, now=NOW, schedule_path=path)
+
+        assert not run_followups(store, now=NOW, schedule_path=path, new_sends=1).skipped
+
+    def test_corrupt_schedule_forces_a_pass(self, store, path):
+        path.parent.mkdir(parents=True)
+        path.write_text("{not json")
+
+        assert not run_followups(store, now=NOW, schedule_path=path).skipped
+        assert json.loads(path.read_text())["version"] == 1
+
+    def test_cleared_schedule_forces_a_pass(self, store, path):
+        run_followups(store, now=NOW, schedule_path=path)
+
+        clear_schedule(path)
+        clear_schedule(path)  # already gone
+        clear_schedule(None)
+
+        assert not run_followups(store, now=NOW, schedule_path=path).skipped
+
+    def test_without_schedule_path_every_run_is_full(self, store):
+        assert not run_followups(store, now=NOW).skipped
+        assert not run_followups(store, now=NOW).skipped
+
+
+class TestReasonToRun:
+    def _schedule(self, **kwargs):
+        fields = dict(due_times=("2025-03-12 10:00",), probe="p", full_pass_at="2025-03-10 12:00")
+        return FollowupSchedule(**{**fields, **kwargs})
+
+    def test_reasons(self):
+        schedule = self._schedule()
+
+        assert reason_to_run(None, now=NOW, new_sends=0, probe="p") == "no_schedule"
+        assert reason_to_run(schedule, now=NOW, new_sends=2, probe="p") == "new_sends"
+        assert reason_to_run(schedule, now=NOW, new_sends=0, probe="q") == "manual_edit"
+        assert reason_to_run(schedule, now=NOW + timedelta(days=2), new_sends=0, probe="p") == "due"
+        assert reason_to_run(self._schedule(due_times=()), now=NOW + timedelta(days=1), new_sends=0, probe="p") == "refresh"
+        assert reason_to_run(schedule, now=NOW + timedelta(hours=3), new_sends=0, probe="p") is None
+
+    def test_probe_is_position_sensitive(self):
+        assert probe_fingerprint(["", "x"]) != probe_fingerprint(["x", ""])
+        assert probe_fingerprint(["x"]) != probe_fingerprint(["x", ""])
+
+
+class TestBuildSchedule:
+    def test_only_open_future_rows(self):
+        rows = [
+            {"Email wysłany": "2025-03-09 10:00", "Follow-up od": "2025-03-12 10:00", "Wymaga follow-upu": "NO", "Follow-up wykonany": ""},
+            {"Email wysłany": "2025-03-09 10:00", "Follow-up od": "2025-03-12 09:00", "Wymaga follow-upu": "NO", "Follow-up wykonany": "x"},
+            {"Email wysłany": "2025-03-01 10:00", "Follow-up od": "2025-03-04 10:00", "Wymaga follow-upu": "NO", "Follow-up wykonany": ""},
+            {"Email wysłany": "2025-03-10 08:00", "Follow-up od": "", "Wymaga follow-upu": "", "Follow-up wykonany": ""},
+            {"Email wysłany": "2025-03-09 10:00", "Follow-up od": "bad", "Wymaga follow-upu": "NO", "Follow-up wykonany": ""},
+        ]
+        columns = to_columns(rows, STATUS_HEADERS)
+
+        schedule = build_schedule(columns, evaluate_followups(columns, now=NOW), now=NOW, probe="p")
+
+        assert schedule.due_times == ("2025-03-12 10:00", "2025-03-13 08:00")
+        assert schedule.full_pass_at == "2025-03-10 12:00"
@@ -0,0 +1,386 @@
+"""Tests for src.stage0.sharding — no real Sheets, no SMTP.
+
+The status tab is emulated by a small SQLite file so several worker
+processes can share it; "SMTP" records deliveries in the same file.
+"""
+
+from __future__ import annotations
+
+import multiprocessing
+import random
+import sqlite3
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Callable
+
+import pytest
+
+from src.stage0.sharding import (
+    CLAIMED,
+    IN_DOUBT_STATUS,
+    SENDING,
+    Lease,
+    parse_lease,
+    process_shard,
+    shard_for_email,
+)
+from src.storage.sheets import SYSTEM_COLUMNS, is_eligible_for_send
+
+CALENDAR_URL = "https://calendly.com/flexihome/konsultacja"
+
+FAKE_ATTACHMENTS = [Path("a.pdf"), Path("b.pdf"), Path("c.pdf")]
+
+FAKE_SMTP = dict(
+    smtp_host="smtp.example.com",
+    smtp_port=587,
+    smtp_user="user",
+    smtp_password="pass",
+    smtp_from_email="sender@example.com",
+)
+
+_STATUS_COLUMNS = {
+    "Lead": "lead",
+    "Email": "email",
+    "Email wysłany": "sent_at",
+    "Status emaila": "status",
+    "Follow-up od": "fu_from",
+    "Wymaga follow-upu": "fu_required",
+    "Follow-up wykonany": "fu_done",
+}
+
+
+class SqliteSheet:
+    """The subset of SheetsClient used by process_shard, on a shared SQLite file."""
+
+    def __init__(self, path: str | Path) -> None:
+        self._path = str(path)
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self._path, timeout=30, isolation_level=None)
+
+    @classmethod
+    def create(cls, path: str | Path, leads: list[tuple[str, str]]) -> "SqliteSheet":
+        sheet = cls(path)
+        with sheet._connect() as conn:
+            conn.execute("CREATE TABLE input (pos INTEGER PRIMARY KEY, name TEXT, email TEXT)")
+            conn.execute(
+                "CREATE TABLE status (row_number INTEGER PRIMARY KEY, "
+                + ", ".join(f"{c} TEXT DEFAULT ''" for c in _STATUS_COLUMNS.values())
+                + ")"
+            )
+            conn.execute("CREATE TABLE deliveries (id INTEGER PRIMARY KEY, email TEXT)")
+            conn.executemany("INSERT INTO input (name, email) VALUES (?, ?)", leads)
+        return sheet
+
+    def read_input_rows(self) -> list[dict[str, str]]:
+        with self._connect() as conn:
+            rows = conn.execute("SELECT name, email FROM input ORDER BY pos").fetchall()
+        return [{"Imię i nazwisko / Firma": n, "Email": e} for n, e in rows]
+
+    def read_status_rows(self) -> list[dict[str, str]]:
+        cols = ", ".join(_STATUS_COLUMNS.values())
+        with self._connect() as conn:
+            rows = conn.execute(f"SELECT {cols} FROM status ORDER BY row_number").fetchall()
+        return [dict(zip(_STATUS_COLUMNS, r)) for r in rows]
+
+    def get_status_index_by_email(self) -> dict[str, dict[str, str]]:
+        return {r["Email"].strip().lower(): r for r in self.read_status_rows()}
+
+    def get_new_leads(self) -> list[dict[str, str]]:
+        index = self.get_status_index_by_email()
+        return [
+            r for r in self.read_input_rows()
+            if is_eligible_for_send(index.get(r["Email"].strip().lower()))
+        ]
+
+    def ensure_status_rows_exist(self, *, email_filter: Callable[[str], bool] | None = None) -> None:
+        index = self.get_status_index_by_email()
+        new_rows = [
+            (r["Imię i nazwisko / Firma"], r["Email"].strip().lower())
+            for r in self.read_input_rows()
+            if r["Email"].strip().lower() not in index
+            and (email_filter is None or email_filter(r["Email"].strip().lower()))
+        ]
+        if new_rows:
+            with self._connect() as conn:
+                conn.executemany("INSERT INTO status (lead, email) VALUES (?, ?)", new_rows)
+
+    def update_row(self, row_number: int, updates: dict[str, str]) -> None:
+        for col_name in updates:
+            if col_name not in SYSTEM_COLUMNS:
+                raise ValueError(f"Refusing to write non-system column: {col_name}")
+        assignments = ", ".join(f"{_STATUS_COLUMNS[c]} = ?" for c in updates)
+        with self._connect() as conn:
+            conn.execute(
+                f"UPDATE status SET {assignments} WHERE row_number = ?",
+                [*updates.values(), row_number - 1],
+            )
+
+    # Test helpers -------------------------------------------------------
+
+    def deliver(self, email: str) -> None:
+        with self._connect() as conn:
+            conn.execute("INSERT INTO deliveries (email) VALUES (?)", (email,))
+
+    def delivery_counts(self) -> dict[str, int]:
+        with self._connect() as conn:
+            rows = conn.execute("SELECT email, COUNT(*) FROM deliveries GROUP BY email").fetchall()
+        return dict(rows)
+
+    def set_status(self, email: str, status: str) -> None:
+        with self._connect() as conn:
+            conn.execute("UPDATE status SET status = ? WHERE email = ?", (status, email))
+
+
+def _leads(n: int) -> list[tuple[str, str]]:
+    return [(f"Lead {i}", f"lead{i}@example.com") for i in range(n)]
+
+
+def _fast_kwargs(**overrides):
+    kwargs = dict(
+        attachments=FAKE_ATTACHMENTS,
+        send_interval_s=0,
+        safety_margin_s=0,
+        clock_skew_s=0,
+        **FAKE_SMTP,
+    )
+    kwargs.update(overrides)
+    return kwargs
+
+
+@pytest.fixture
+def smtp(monkeypatch):
+    sent: list[str] = []
+    monkeypatch.setattr(
+        "src.stage0.sharding.send_email_draft",
+        lambda **kw: sent.append(kw["to_email"]),
+    )
+    return sent
+
+
+# ---------------------------------------------------------------------------
+# Shard assignment and lease markers
+# ---------------------------------------------------------------------------
+
+class TestShardForEmail:
+    def test_normalized_email_maps_to_same_shard(self):
+        assert shard_for_email(" Jan@Example.COM ", 7) == shard_for_email("jan@example.com", 7)
+
+    def test_stable_value(self):
+        # Fixed expectation — guards against switching to the salted hash().
+        assert [shard_for_email(f"lead{i}@example.com", 4) for i in range(6)] == [1, 0, 0, 0, 1, 3]
+        assert shard_for_email("lead0@example.com", 1) == 0
+
+    def test_all_shards_used(self):
+        shards = {shard_for_email(f"lead{i}@example.com", 4) for i in range(200)}
+        assert shards == {0, 1, 2, 3}
+
+    def test_invalid_shard_count(self):
+        with pytest.raises(ValueError):
+            shard_for_email("a@example.com", 0)
+
+
+class TestLease:
+    def test_round_trip(self):
+        lease = Lease(CLAIMED, "host-a:12", datetime(2026, 3, 1, 10, 0, tzinfo=timezone.utc))
+        assert parse_lease(lease.format()) == lease
+
+    def test_other_statuses_are_not_leases(self):
+        assert parse_lease("SENT") is None
+        assert parse_lease("ERROR: timeout") is None
+        assert parse_lease("") is None
+
+    def test_leased_rows_not_eligible(self):
+        lease = Lease(SENDING, "w1", datetime(2026, 3, 1, tzinfo=timezone.utc))
+        assert not is_eligible_for_send({"Email wysłany": "", "Status emaila": lease.format()})
+        assert not is_eligible_for_send({"Email wysłany": "", "Status emaila": IN_DOUBT_STATUS})
+
+
+# ---------------------------------------------------------------------------
+# Single-process behaviour
+# ---------------------------------------------------------------------------
+
+class TestProcessShard:
+    def test_workers_split_leads_without_overlap(self, tmp_path, smtp):
+        sheet = SqliteSheet.create(tmp_path / "s.db", _leads(30))
+
+        for shard in range(3):
+            before = len(smtp)
+            process_shard(
+                sheet, CALENDAR_URL, shard_index=shard, shard_count=3,
+                worker_id=f"w{shard}", **_fast_kwargs(),
+            )
+            assert all(shard_for_email(e, 3) == shard for e in smtp[before:])
+
+        assert sorted(smtp) == sorted(e for _, e in _leads(30))
+        assert all(r["Status emaila"] == "SENT" for r in sheet.read_status_rows())
+
+    def test_only_own_shard_gets_status_rows(self, tmp_path, smtp):
+        sheet = SqliteSheet.create(tmp_path / "s.db", _leads(20))
+
+        process_shard(sheet, CALENDAR_URL, shard_index=1, shard_count=2, worker_id="w", **_fast_kwargs())
+
+        assert {r["Email"] for r in sheet.read_status_rows()} == {
+            e for _, e in _leads(20) if shard_for_email(e, 2) == 1
+        }
+
+    def test_live_claim_of_other_worker_is_respected(self, tmp_path, smtp):
+        sheet = SqliteSheet.create(tmp_path / "s.db", _leads(1))
+        sheet.ensure_status_rows_exist()
+        future = datetime.now(timezone.utc) + timedelta(minutes=10)
+        sheet.set_status("lead0@example.com", Lease(CLAIMED, "other", future).format())
+
+        report = process_shard(sheet, CALENDAR_URL, shard_index=0, shard_count=1, worker_id="w", **_fast_kwargs())
+
+        assert report.emails_sent == 0
+        assert smtp == []
+
+    def test_expired_claim_is_reclaimed(self, tmp_path, smtp):
+        sheet = SqliteSheet.create(tmp_path / "s.db", _leads(1))
+        sheet.ensure_status_rows_exist()
+        past = datetime.now(timezone.utc) - timedelta(minutes=1)
+        sheet.set_status("lead0@example.com", Lease(CLAIMED, "dead", past).format())
+
+        report = process_shard(sheet, CALENDAR_URL, shard_index=0, shard_count=1, worker_id="w", **_fast_kwargs())
+
+        assert report.emails_sent == 1
+        assert smtp == ["lead0@example.com"]
+
+    def test_expired_sending_is_parked_not_resent(self, tmp_path, smtp):
+        sheet = SqliteSheet.create(tmp_path / "s.db", _leads(1))
+        sheet.ensure_status_rows_exist()
+        past = datetime.now(timezone.utc) - timedelta(minutes=1)
+        sheet.set_status("lead0@example.com", Lease(SENDING, "dead", past).format())
+
+        report = process_shard(sheet, CALENDAR_URL, shard_index=0, shard_count=1, worker_id="w", **_fast_kwargs())
+
+        assert report.in_doubt == 1
+        assert smtp == []
+        assert sheet.read_status_rows()[0]["Status emaila"] == IN_DOUBT_STATUS
+
+    def test_was_delivered_settles_interrupted_send(self, tmp_path, smtp):
+        sheet = SqliteSheet.create(tmp_path / "s.db", _leads(2))
+        sheet.ensure_status_rows_exist()
+        past = datetime.now(timezone.utc) - timedelta(minutes=1)
+        for i in range(2):
+            sheet.set_status(f"lead{i}@example.com", Lease(SENDING, "dead", past).format())
+
+        report = process_shard(
+            sheet, CALENDAR_URL, shard_index=0, shard_count=1, worker_id="w",
+            was_delivered=lambda email: email == "lead0@example.com", **_fast_kwargs(),
+        )
+
+        assert report.reconciled == 2
+        assert smtp == ["lead1@example.com"]  # only the confirmed-undelivered one
+        assert [r["Status emaila"] for r in sheet.read_status_rows()] == ["SENT", "SENT"]
+
+    def test_slow_worker_stops_when_claim_runs_out(self, tmp_path, monkeypatch):
+        sheet = SqliteSheet.create(tmp_path / "s.db", _leads(3))
+        clock = [datetime(2026, 3, 1, 10, 0, tzinfo=timezone.utc)]
+        sent: list[str] = []
+
+        def slow_send(**kw):
+            sent.append(kw["to_email"])
+            clock[0] += timedelta(seconds=50)
+
+        monkeypatch.setattr("src.stage0.sharding.send_email_draft", slow_send)
+        report = process_shard(
+            sheet, CALENDAR_URL, shard_index=0, shard_count=1, worker_id="w",
+            now=lambda: clock[0],
+            **_fast_kwargs(lease_seconds=120, safety_margin_s=30),
+        )
+
+        # 0 s and 50 s are safe; at 100 s only 20 s of the lease is left.
+        assert report.emails_sent == 2
+        assert parse_lease(sheet.read_status_rows()[2]["Status emaila"]).phase == CLAIMED
+
+    def test_send_error_keeps_row_retryable(self, tmp_path, monkeypatch):
+        sheet = SqliteSheet.create(tmp_path / "s.db", _leads(1))
+
+        def boom(**kw):
+            raise RuntimeError("SMTP timeout")
+
+        monkeypatch.setattr("src.stage0.sharding.send_email_draft", boom)
+        report = process_shard(sheet, CALENDAR_URL, shard_index=0, shard_count=1, worker_id="w", **_fast_kwargs())
+
+        assert report.emails_failed == 1
+        assert is_eligible_for_send(sheet.read_status_rows()[0])
+
+    def test_invalid_worker_id(self, tmp_path):
+        sheet = SqliteSheet.create(tmp_path / "s.db", [])
+        with pytest.raises(ValueError, match="worker_id"):
+            process_shard(sheet, CALENDAR_URL, shard_index=0, shard_count=1, worker_id="a b", **_fast_kwargs())
+
+
+# ---------------------------------------------------------------------------
+# Multi-process: exactly-once under random worker kills
+# ---------------------------------------------------------------------------
+
+_LEASE_S = 0.6
+
+
+def _worker_main(db_path: str, shard_index: int, shard_count: int, worker_id: str) -> None:
+    import src.stage0.sharding as sharding
+
+    sheet = SqliteSheet(db_path)
+
+    def fake_send(**kw):
+        time.sleep(0.02)  # SMTP round trip — widens the window a kill can hit
+        sheet.deliver(kw["to_email"])
+
+    def was_delivered(email: str) -> bool:
+        # Stands in for an operator checking the Sent folder.
+        return sheet.delivery_counts().get(email, 0) > 0
+
+    sharding.send_email_draft = fake_send
+    process_shard(
+        sheet, CALENDAR_URL, shard_index=shard_index, shard_count=shard_count,
+        worker_id=worker_id, was_delivered=was_delivered,
+        **_fast_kwargs(lease_seconds=_LEASE_S, sending_lease_seconds=_LEASE_S, batch_size=5),
+    )
+
+
+class TestExactlyOnceUnderKills:
+    def test_random_kills_never_double_send(self, tmp_path):
+        leads = _leads(60)
+        db = str(tmp_path / "sheet.db")
+        sheet = SqliteSheet.create(db, leads)
+        shard_count = 3
+        rng = random.Random(1234)
+        ctx = multiprocessing.get_context("spawn")
+        kills = 0
+
+        for round_no in range(40):
+            counts = sheet.delivery_counts()
+            assert all(c == 1 for c in counts.values()), f"double send: {counts}"
+            rows = sheet.read_status_rows()
+            if len(rows) == len(leads) and all(r["Status emaila"] == "SENT" for r in rows):
+                break
+
+            # Rotate shard → worker so a different worker picks up a shard
+            # that was interrupted in the previous round.
+            procs = [
+                ctx.Process(
+                    target=_worker_main,
+                    args=(db, (w + round_no) % shard_count, shard_count, f"w{w}-r{round_no}"),
+                )
+                for w in range(shard_count)
+            ]
+            for p in procs:
+                p.start()
+            victims = rng.sample(procs, rng.randint(1, shard_count))
+            time.sleep(rng.uniform(0.3, 1.0))
+            for p in victims:
+                if p.is_alive():
+                    p.kill()
+                    kills += 1
+            for p in procs:
+                p.join(timeout=60)
+                assert p.exitcode is not None
+            time.sleep(_LEASE_S)  # let leases of killed workers expire
+
+        counts = sheet.delivery_counts()
+        assert counts == {email: 1 for _, email in leads}
+        assert all(r["Status emaila"] == "SENT" and r["Email wysłany"] for r in sheet.read_status_rows())
+        assert kills > 0  # the run must actually have exercised crashes
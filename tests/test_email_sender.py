@@ -8,7 +8,7 @@ from unittest.mock import MagicMock, patch
 import pytest
 
 from src.email.template_stage0 import EmailDraft
-from src.integrations.email_sender import send_email_draft
+from src.integrations.email_sender import read_attachment_bytes, send_email_draft
 
 FAKE_DRAFT = EmailDraft(
     subject="Test subject",
@@ -104,3 +104,29 @@ class TestSendEmailDraft:
         payloads = sent_msg.get_payload()
         filenames = [p.get_filename() for p in payloads if p.get_filename()]
         assert "offer.pdf" in filenames
+
+
+class TestAttachmentCache:
+    def test_same_file_read_once(self, tmp_path):
+        pdf = tmp_path / "offer.pdf"
+        pdf.write_bytes(b"%PDF-1.4 cached")
+
+        with patch("builtins.open", wraps=open) as mock_open:
+            first = read_attachment_bytes(pdf)
+            second = read_attachment_bytes(pdf)
+
+        assert first == second == b"%PDF-1.4 cached"
+        assert mock_open.call_count <= 1
+
+    def test_changed_file_reloaded(self, tmp_path):
+        import os
+
+        pdf = tmp_path / "offer.pdf"
+        pdf.write_bytes(b"v1")
+        assert read_attachment_bytes(pdf) == b"v1"
+
+        pdf.write_bytes(b"version-2")
+        stat = pdf.stat()
+        os.utime(pdf, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+        assert read_attachment_bytes(pdf) == b"version-2"
@@ -0,0 +1,62 @@
+"""Guards on Stage 0 Sheets / SMTP call counts, via benchmarks.load (small sizes)."""
+
+from __future__ import annotations
+
+import pytest
+
+from benchmarks.load import FakeSpreadsheet, FakeWorksheet, compare, generate_sheet, run_scenario
+
+
+@pytest.fixture(scope="module")
+def results():
+    return {n: run_scenario(n, trace_memory=False) for n in (200, 400)}
+
+
+class TestGenerateSheet:
+    def test_mix_adds_up(self):
+        book, mix = generate_sheet(1_000)
+        assert sum(mix.values()) == 1_000
+        assert len(book.worksheet("input").rows) == 1_001
+        assert len(book.worksheet("status").rows) == 1_001 - mix["new"]
+
+
+class TestFakeWorksheet:
+    def test_batch_update_writes_whole_blocks(self):
+        ws = FakeWorksheet(FakeSpreadsheet("load"), 1, "status", [["a", "b", "c"]])
+
+        ws.batch_update([
+            {"range": "B2:C3", "values": [["1", "2"], ["3", "4"]]},
+            {"range": "'status'!A4", "values": [["x"]]},
+        ])
+
+        assert ws.rows == [["a", "b", "c"], ["", "1", "2"], ["", "3", "4"], ["x"]]
+
+
+class TestLoadScenario:
+    def test_every_eligible_lead_sent_once(self, results):
+        for result in results.values():
+            expected = result.mix["new"] + result.mix["error_retry"]
+            assert result.emails_sent == expected
+            assert result.smtp_messages == expected
+            assert result.emails_failed == 0
+
+    def test_reads_do_not_scale_with_leads(self, results):
+        small, large = results[200].sheets_calls, results[400].sheets_calls
+        for method in ("get_all_records", "row_values", "open_by_key", "worksheet", "append_rows"):
+            assert small[method] == large[method], method
+        assert small["append_rows"] == 1  # all new status rows in one call
+
+    def test_one_write_per_changed_row(self, results):
+        result = results[400]
+        sends = result.mix["new"] + result.mix["error_retry"]
+        followup_updates = sends + result.mix["sent_due"] + result.mix["sent_unscheduled"]
+        assert result.sheets_calls["batch_update"] == sends + followup_updates
+
+    def test_compare_flags_more_calls(self, results, capsys):
+        result = results[200]
+        baseline = {"scenarios": [{
+            "leads": 200, "wall_s": 1.0, "peak_mb": 0.0, "sheets_calls_total": result.sheets_calls_total - 1,
+        }]}
+        assert compare([result], baseline)
+        baseline["scenarios"][0]["sheets_calls_total"] += 1
+        assert compare([result], baseline) == []
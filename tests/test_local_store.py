@@ -0,0 +1,173 @@
+"""Tests for the SQLite lead store — src.storage.local.LocalSheetsClient."""
+
+from __future__ import annotations
+
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from src.stage0.process import process_new_leads, run_followups
+from src.storage.local import LocalSheetsClient, copy_tabs
+from src.storage.sheets import SheetsClient
+
+CALENDAR_URL = "https://calendly.com/flexihome/konsultacja"
+FAKE_SMTP = dict(
+    smtp_host="smtp.example.com",
+    smtp_port=587,
+    smtp_user="user",
+    smtp_password="pass",
+    smtp_from_email="sender@example.com",
+)
+
+
+@pytest.fixture
+def store(tmp_path):
+    client = LocalSheetsClient(tmp_path / "leads.sqlite3")
+    yield client
+    client.close()
+
+
+def _add_leads(store, *leads):
+    store.append_input_rows([[name, email, ""] for name, email in leads])
+
+
+class TestRows:
+    def test_is_a_sheets_client(self, store):
+        assert isinstance(store, SheetsClient)
+
+    def test_append_numbers_rows_like_the_sheet(self, store):
+        assert store.append_status_rows([["A", "a@example.com", "", "", "", "", ""]]) == 2
+        assert store.append_status_rows([["B", "b@example.com", "", "", "", "", ""]] * 2) == 3
+        assert store.get_status_row_number_by_email(" B@Example.com ") == 3
+        assert store.get_status_row_number_by_email("nobody@example.com") is None
+
+    def test_input_dedup_marks_duplicate(self, store):
+        _add_leads(store, ("Anna", " Anna@Example.com"), ("Anna 2", "anna@example.com"), ("", ""))
+
+        rows = store.read_input_rows()
+
+        assert [r["Email"] for r in rows] == ["anna@example.com"]
+        assert store.read_tab_values("input")[1] == ["Anna 2", "anna@example.com", "", "Duplikat"]
+
+    def test_system_columns_guard(self, store):
+        store.append_status_rows([["A", "a@example.com", "", "", "", "", ""]])
+        with pytest.raises(ValueError, match="non-system column"):
+            store.update_row(2, {"Email": "x@example.com"})
+
+    def test_inherited_methods_work_offline(self, store):
+        inherited = {
+            name for name in dir(SheetsClient)
+            if not name.startswith("_") and name not in vars(LocalSheetsClient)
+        }
+        assert inherited == {
+            "append_status_rows_in_chunks", "ensure_status_rows_exist", "get_all_rows", "get_new_leads",
+            "get_status_index_by_email", "read_input_rows", "read_status_rows",
+        }  # a new SheetsClient method must be exercised here too
+        _add_leads(store, ("Anna", "anna@example.com"), ("Ewa", "ewa@example.com"))
+
+        assert store.append_status_rows_in_chunks([["Anna", "anna@example.com", "", "", "", "", ""]]) == {
+            "anna@example.com": 2,
+        }
+        assert store.ensure_status_rows_exist() == {"ewa@example.com": 3}
+        assert [r["Email"] for r in store.read_input_rows()] == ["anna@example.com", "ewa@example.com"]
+        assert [r["Email"] for r in store.get_new_leads()] == ["anna@example.com", "ewa@example.com"]
+        assert store.update_lead("ewa@example.com", {"Status emaila": "SENT"}) is True
+        assert store.update_lead("nobody@example.com", {"Status emaila": "SENT"}) is False
+        assert store.get_status_index_by_email()["ewa@example.com"]["Status emaila"] == "SENT"
+        assert store.read_status_rows() == store.get_all_rows()
+
+    def test_update_missing_row_raises(self, store):
+        with pytest.raises(ValueError, match="does not exist"):
+            store.update_row(5, {"Status emaila": "SENT"})
+
+    def test_reopen_keeps_rows(self, tmp_path):
+        path = tmp_path / "leads.sqlite3"
+        first = LocalSheetsClient(path)
+        _add_leads(first, ("Anna", "anna@example.com"))
+        first.close()
+
+        assert LocalSheetsClient(path).read_input_rows()[0]["Email"] == "anna@example.com"
+
+    def test_header_mismatch_rejected(self, tmp_path):
+        path = tmp_path / "leads.sqlite3"
+        LocalSheetsClient(path).close()
+        import sqlite3
+
+        with sqlite3.connect(path) as conn:
+            conn.execute("UPDATE headers SET names = 'Lead\tEmail' WHERE tab = 'status'")
+
+        with pytest.raises(RuntimeError, match="Invalid headers"):
+            LocalSheetsClient(path)
+
+
+class TestPipeline:
+    @patch("src.stage0.process.time.sleep")
+    @patch("src.stage0.process.get_stage0_attachments_from_env", return_value=[Path("a.pdf")] * 3)
+    @patch("src.stage0.process.build_stage0_email")
+    @patch("src.stage0.process.send_email_draft")
+    def test_send_then_followup(self, mock_send, _build, _attach, _sleep, store):
+        _add_leads(store, ("Anna", "anna@example.com"), ("Marek", "marek@example.com"))
+
+        report = process_new_leads(store, CALENDAR_URL, **FAKE_SMTP)
+        followups = run_followups(store)
+
+        assert report.emails_sent == 2
+        assert followups.rows_updated == 2
+        rows = store.read_status_rows()
+        assert [r["Status emaila"] for r in rows] == ["SENT", "SENT"]
+        assert all(r["Follow-up od"] and r["Wymaga follow-upu"] == "NO" for r in rows)
+
+        # Second run: nothing left to send.
+        assert process_new_leads(store, CALENDAR_URL, **FAKE_SMTP).emails_sent == 0
+        assert mock_send.call_count == 2
+
+
+class TestCopy:
+    def test_round_trip_keeps_positions_and_marker(self, tmp_path, store):
+        _add_leads(store, ("Anna", "anna@example.com"), ("Dup", "anna@example.com"))
+        store.read_input_rows()  # marks the duplicate
+        store.ensure_status_rows_exist()
+        other = LocalSheetsClient(tmp_path / "copy.sqlite3")
+
+        assert copy_tabs(store, other) == {"input": 2, "status": 1}
+        assert other.read_tab_values("input") == store.read_tab_values("input")
+        assert other.read_status_rows() == store.read_status_rows()
+        other.close()
+
+
+    def test_export_writes_before_clearing_leftovers(self, store):
+        from benchmarks.sheets_emulator import SheetsEmulator
+        from src.storage.sheets import INPUT_HEADERS, STATUS_HEADERS
+
+        _add_leads(store, ("Anna", "anna@example.com"))
+        with SheetsEmulator() as emu:
+            emu.add_spreadsheet("sheet", {
+                "input": [list(INPUT_HEADERS), ["Old", "old@example.com", "1", "Duplikat"], ["Gone", "gone@example.com"]],
+                "status": [list(STATUS_HEADERS)],
+            })
+            google = SheetsClient("", "sheet", input_tab="input", status_tab="status", gspread_client=emu.gspread_client())
+            ws = google._ws_input
+            calls = []
+            for method in ("update", "batch_clear"):
+                original = getattr(ws, method)
+                setattr(ws, method, lambda *a, _m=method, _f=original, **kw: calls.append(_m) or _f(*a, **kw))
+
+            copy_tabs(store, google)
+
+            assert calls == ["update", "batch_clear"]
+            assert emu.values("sheet", "input")[1:] == [["Anna", "anna@example.com"]]  # marker and old row gone
+
+
+class TestBackendSelection:
+    def test_sqlite_backend_from_config(self, tmp_path, monkeypatch):
+        from src.core import config
+        from src.stage0.job import _build_sheets_client
+
+        monkeypatch.setattr(config, "STAGE0_STORAGE_BACKEND", "sqlite", raising=False)
+        monkeypatch.setattr(config, "STAGE0_SQLITE_PATH", str(tmp_path / "s.sqlite3"), raising=False)
+
+        client = _build_sheets_client(None)
+
+        assert isinstance(client, LocalSheetsClient)
+        client.close()
@@ -0,0 +1,43 @@
+"""Tests for the domain-function microbenchmark harness (benchmarks.micro)."""
+
+from __future__ import annotations
+
+import json
+
+from benchmarks.micro import DEFAULT_BASELINE, MicroResult, cases, compare, measure
+
+FUNCTIONS = {
+    "apply_followup_logic",
+    "is_eligible_for_send",
+    "generate_vocative",
+    "warsaw_now_formatted",
+    "followup_due_formatted",
+    "is_followup_due",
+}
+
+
+def test_every_per_row_function_is_covered():
+    names = {case.name.split("(")[0] for case in cases(50)}
+    assert FUNCTIONS <= names
+
+
+def test_baseline_file_covers_all_cases():
+    baseline = json.loads(DEFAULT_BASELINE.read_text(encoding="utf-8"))
+    assert {case.name for case in cases(10)} <= set(baseline["results"])
+
+
+def test_measure_reports_time_and_allocations():
+    case = next(c for c in cases(200) if c.name == "followup_due_formatted")
+
+    result = measure(case, repeat=1, memory_sample=50)
+
+    assert result.rows == len(case.rows)
+    assert result.ns_per_row > 0
+    assert result.peak_bytes_per_row > 0
+
+
+def test_compare_flags_slowdown_beyond_tolerance(capsys):
+    baseline = {"results": {"f": {"ns_per_row": 100.0}}}
+
+    assert compare([MicroResult("f", 10, 120.0, 0.0)], baseline, tolerance=1.25) == []
+    assert compare([MicroResult("f", 10, 130.0, 0.0)], baseline, tolerance=1.25)
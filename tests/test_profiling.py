@@ -0,0 +1,83 @@
+"""Tests for src.core.profiling — per-run cProfile / tracemalloc reports."""
+
+from __future__ import annotations
+
+import pstats
+import tracemalloc
+
+import pytest
+
+from src.core import profiling
+from src.stage0.job import _profile_artifacts
+from src.stage0.metrics import RunMetrics
+from src.stage0.process import ProcessReport
+
+
+def _work() -> list[str]:
+    return [f"anna{i}@example.com" for i in range(5_000)]
+
+
+class TestParseModes:
+    def test_values(self):
+        assert profiling.parse_modes("") == frozenset()
+        assert profiling.parse_modes("off") == frozenset()
+        assert profiling.parse_modes("CPU") == {"cpu"}
+        assert profiling.parse_modes("all") == {"cpu", "memory"}
+        assert profiling.parse_modes("cpu, memory") == {"cpu", "memory"}
+
+    def test_invalid(self):
+        with pytest.raises(RuntimeError, match="STAGE0_PROFILE"):
+            profiling.parse_modes("gpu")
+
+
+class TestSession:
+    def test_off_does_nothing(self, tmp_path):
+        with profiling.session("", tmp_path) as profile:
+            assert profile is None
+            assert profiling.current() is None
+        assert not list(tmp_path.iterdir())
+
+    def test_writes_reports_without_pii(self, tmp_path):
+        with profiling.session("all", tmp_path / "logs", top=5) as profile:
+            assert profiling.current() is profile
+            kept = _work()
+
+        assert profiling.current() is None
+        assert not tracemalloc.is_tracing()
+        paths = profile.paths
+        assert set(paths) == {"cpu_profile", "cpu_report", "memory_report"}
+        assert pstats.Stats(str(paths["cpu_profile"])).total_calls > 0
+        assert "_work" in paths["cpu_report"].read_text()
+        alloc = paths["memory_report"].read_text()
+        assert "test_profiling.py" in alloc
+        for path in paths.values():
+            assert b"anna" not in path.read_bytes()
+        assert kept
+
+    def test_reports_written_when_run_fails(self, tmp_path):
+        with pytest.raises(ValueError):
+            with profiling.session("cpu", tmp_path) as profile:
+                raise ValueError("boom")
+
+        assert profile.paths["cpu_profile"].exists()
+
+    def test_outer_tracemalloc_left_running(self, tmp_path):
+        tracemalloc.start()
+        try:
+            with profiling.session("memory", tmp_path):
+                _work()
+            assert tracemalloc.is_tracing()
+        finally:
+            tracemalloc.stop()
+
+
+class TestRunSummary:
+    def test_paths_reach_metrics_json(self, tmp_path):
+        assert _profile_artifacts() == {}
+        with profiling.session("cpu", tmp_path) as profile:
+            artifacts = _profile_artifacts()
+
+        assert artifacts == profile.summary()
+        data = RunMetrics.from_reports(ProcessReport(1, 0, 0, 0), artifacts=artifacts).to_json()
+        assert data["artifacts"]["cpu_profile"].endswith(".prof")
+        assert "artifacts" not in RunMetrics.from_reports(ProcessReport(1, 0, 0, 0)).to_json()
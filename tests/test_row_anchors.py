@@ -0,0 +1,119 @@
+"""Tests for row anchors — SheetsClient(row_anchors=True).update_lead() + process._write_status()."""
+
+from __future__ import annotations
+
+from unittest.mock import MagicMock
+
+import pytest
+
+from benchmarks.sheets_emulator import SheetsEmulator
+from src.stage0.process import _write_status
+from src.storage.sheets import INPUT_HEADERS, STATUS_HEADERS, SheetsClient
+
+INPUT = [
+    ["Anna", "anna@example.com", ""],
+    ["Jan", "jan@example.com", ""],
+    ["Ewa", "ewa@example.com", ""],
+]
+
+
+@pytest.fixture
+def emulator():
+    with SheetsEmulator() as emu:
+        emu.add_spreadsheet("sheet", {
+            "input": [list(INPUT_HEADERS), *INPUT],
+            "status": [list(STATUS_HEADERS)],
+        })
+        yield emu
+
+
+def _client(emu: SheetsEmulator) -> SheetsClient:
+    return SheetsClient(
+        "", "sheet", input_tab="input", status_tab="status",
+        gspread_client=emu.gspread_client(), row_anchors=True,
+    )
+
+
+def _status_of(emu: SheetsEmulator, email: str) -> list:
+    return next(row for row in emu.values("sheet", "status") if row[1] == email)
+
+
+def _move_row(sheets: SheetsClient, row_number: int, before_row: int) -> None:
+    """What dragging a row in the UI sends (moveDimension)."""
+    sheets._spreadsheet.batch_update({"requests": [{"moveDimension": {
+        "source": {"sheetId": sheets._ws_status.id, "dimension": "ROWS",
+                   "startIndex": row_number - 1, "endIndex": row_number},
+        "destinationIndex": before_row - 1,
+    }}]})
+
+
+def test_new_rows_are_anchored_in_one_call(emulator):
+    _client(emulator).ensure_status_rows_exist()
+
+    requests = emulator.stats()["requests"]
+    assert requests["values.append"] == 1
+    assert requests["batchUpdate"] == 1
+    sheet = emulator._books["sheet"].tabs["status"]
+    assert sorted(entry["row"] for entry in sheet.row_metadata.values()) == [1, 2, 3]
+
+
+def test_write_follows_a_moved_row(emulator):
+    sheets = _client(emulator)
+    sheets.ensure_status_rows_exist()
+    _move_row(sheets, 4, before_row=2)  # Ewa dragged above Anna
+    emulator.reset_stats()
+
+    assert sheets.update_lead("anna@example.com", {"Status emaila": "SENT", "Email wysłany": "2025-03-09 10:00"})
+
+    assert [row[1] for row in emulator.values("sheet", "status")[1:]] == [
+        "ewa@example.com", "anna@example.com", "jan@example.com",
+    ]
+    assert _status_of(emulator, "anna@example.com")[2:4] == ["2025-03-09 10:00", "SENT"]
+    assert len(_status_of(emulator, "ewa@example.com")) == 2
+    assert emulator.stats()["requests"] == {"values.batchUpdateByDataFilter": 1}
+
+
+def test_write_after_rows_above_are_deleted(emulator):
+    sheets = _client(emulator)
+    sheets.ensure_status_rows_exist()
+    sheets._spreadsheet.batch_update({"requests": [{"deleteDimension": {"range": {
+        "sheetId": sheets._ws_status.id, "dimension": "ROWS", "startIndex": 1, "endIndex": 2,
+    }}}]})
+
+    sheets.update_lead("ewa@example.com", {"Follow-up od": "2025-03-12 10:00"})
+
+    assert _status_of(emulator, "ewa@example.com")[4] == "2025-03-12 10:00"
+    assert len(_status_of(emulator, "jan@example.com")) == 2
+
+
+def test_unanchored_row_falls_back_once_and_gets_anchored(emulator):
+    legacy = SheetsClient("", "sheet", input_tab="input", status_tab="status", gspread_client=emulator.gspread_client())
+    legacy.ensure_status_rows_exist()
+    sheets = _client(emulator)
+    emulator.reset_stats()
+
+    sheets.update_lead("jan@example.com", {"Status emaila": "SENT"})
+    scans = emulator.stats()["requests"]["values.get"]
+    sheets.update_lead("jan@example.com", {"Wymaga follow-upu": "NO"})
+
+    assert _status_of(emulator, "jan@example.com")[3:6] == ["SENT", "", "NO"]
+    assert emulator.stats()["requests"]["values.get"] == scans == 1
+    assert not sheets.update_lead("nobody@example.com", {"Status emaila": "SENT"})
+
+
+def test_column_rules_apply(emulator):
+    sheets = _client(emulator)
+
+    with pytest.raises(ValueError, match="non-system column"):
+        sheets.update_lead("anna@example.com", {"Email": "x@example.com"})
+
+
+@pytest.mark.parametrize(("anchors", "expected"), [(True, "update_lead"), (False, "update_row"), (MagicMock(), "update_row")])
+def test_write_status_dispatch(anchors, expected):
+    client = MagicMock(row_anchors=anchors)
+
+    _write_status(client, 5, "anna@example.com", {"Status emaila": "SENT"})
+
+    assert getattr(client, expected).call_count == 1
+    other = "update_row" if expected == "update_lead" else "update_lead"
+    assert getattr(client, other).call_count == 0
@@ -0,0 +1,105 @@
+"""Tests for benchmarks.sheets_emulator — SheetsClient over real HTTP, with faults."""
+
+from __future__ import annotations
+
+import time
+from unittest.mock import patch
+
+import gspread
+import pytest
+import requests
+
+from benchmarks.sheets_emulator import Faults, SheetsEmulator, _parse_cells, _split_sheet
+from src.storage.sheets import INPUT_HEADERS, STATUS_HEADERS, SheetsClient
+
+
+@pytest.fixture
+def emulator():
+    with SheetsEmulator() as emu:
+        emu.add_spreadsheet("sheet", {
+            "input": [list(INPUT_HEADERS), ["Anna", "anna@example.com", "600000001"]],
+            "status": [list(STATUS_HEADERS), ["Anna", "anna@example.com", "", "", "", "", ""]],
+        })
+        yield emu
+
+
+def _client(emu: SheetsEmulator) -> SheetsClient:
+    return SheetsClient("", "sheet", input_tab="input", status_tab="status", gspread_client=emu.gspread_client())
+
+
+class TestRanges:
+    def test_split_sheet(self):
+        assert _split_sheet("'It''s'!A1:B2") == ("It's", "A1:B2")
+        assert _split_sheet("'status'") == ("status", "")
+        assert _split_sheet("A2") == (None, "A2")
+
+    def test_parse_cells(self):
+        assert _parse_cells("A2:Z") == (2, 1, None, 26)
+        assert _parse_cells("B1:B") == (1, 2, None, 2)
+        assert _parse_cells("1:1") == (1, 1, 1, None)
+        assert _parse_cells("C5") == (5, 3, 5, 3)
+
+
+class TestSheetsClient:
+    def test_round_trip(self, emulator):
+        sheets = _client(emulator)
+
+        assert [r["Email"] for r in sheets.read_input_rows()] == ["anna@example.com"]
+        first = sheets.append_status_rows([["Jan", "jan@example.com", "", "", "", "", ""]])
+        assert first == 3
+        assert sheets.get_status_row_number_by_email("JAN@example.com") == 3
+        sheets.update_row(3, {"Status emaila": "SENT"})
+
+        assert emulator.values("sheet", "status")[2] == ["Jan", "jan@example.com", "", "SENT"]
+        assert emulator.stats()["requests"]["values.batchUpdate"] == 1
+
+    def test_stats_endpoint(self, emulator):
+        _client(emulator)
+
+        stats = requests.get(emulator.base_url.replace("/v4/spreadsheets", "/_emulator/stats"), timeout=5).json()
+        assert stats["requests"]["spreadsheets.get"] >= 1
+        assert stats["bytes_out"] > 0
+
+
+class TestFaults:
+    def test_write_quota_returns_429_and_client_backs_off(self, emulator):
+        sheets = _client(emulator)
+        emulator.faults = Faults(write_quota=1)
+        sheets.update_row(2, {"Status emaila": "SENT"})
+
+        with patch("src.storage.sheets.time.sleep") as sleep, pytest.raises(gspread.exceptions.APIError) as exc:
+            sheets.update_row(2, {"Status emaila": "ERROR"})
+
+        assert exc.value.response.status_code == 429
+        assert sleep.call_count == 4
+        assert sheets.backoff_seconds > 0
+        assert emulator.stats()["throttled"] == 5
+
+    def test_read_quota_is_separate(self, emulator):
+        sheets = _client(emulator)
+        emulator.faults = Faults(write_quota=1)
+
+        for _ in range(3):
+            sheets.read_status_rows()
+
+        assert emulator.stats()["throttled"] == 0
+
+    def test_server_errors_are_not_retried(self, emulator):
+        sheets = _client(emulator)
+        emulator.faults = Faults(error_rate=1.0, seed=1)
+
+        with patch("src.storage.sheets.time.sleep") as sleep, pytest.raises(gspread.exceptions.APIError) as exc:
+            sheets.read_status_rows()
+
+        assert exc.value.response.status_code in (500, 503)
+        sleep.assert_not_called()
+        assert emulator.stats()["errors"] == 1
+
+    def test_latency(self, emulator):
+        sheets = _client(emulator)
+        emulator.faults = Faults(latency_ms=30)
+
+        started = time.perf_counter()
+        sheets.read_status_rows()
+
+        assert time.perf_counter() - started >= 0.03
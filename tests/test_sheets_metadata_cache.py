@@ -0,0 +1,230 @@
+"""Tests for the opt-in Sheets metadata cache — no network, no credentials.
+
+Covers:
+- MetadataCache round trip, hash check, token expiry rule
+- SheetsClient construction from cache makes zero API calls
+- Stale headers detected on read → metadata reloaded once and read retried
+"""
+
+from __future__ import annotations
+
+import json
+from datetime import datetime, timedelta
+from unittest.mock import MagicMock, patch
+
+import gspread
+import pytest
+
+from src.storage.metadata_cache import MetadataCache, SheetsMetadata, headers_hash
+from src.storage.sheets import INPUT_HEADERS, STATUS_HEADERS, SheetsClient
+
+SHEET_ID = "sheet-abc-123"
+INPUT_TAB = "automation_stage0_input"
+STATUS_TAB = "automation_stage0_status"
+
+
+def _meta(*, token_expiry: datetime | None = None, headers_status=None) -> SheetsMetadata:
+    expiry = token_expiry or (datetime.utcnow() + timedelta(minutes=50))
+    return SheetsMetadata(
+        sheet_id=SHEET_ID,
+        spreadsheet_title="Leads",
+        input_tab=INPUT_TAB,
+        status_tab=STATUS_TAB,
+        input_properties={"sheetId": 0, "title": INPUT_TAB, "index": 0},
+        status_properties={"sheetId": 111, "title": STATUS_TAB, "index": 1},
+        headers_input=list(INPUT_HEADERS),
+        headers_status=list(headers_status or STATUS_HEADERS),
+        access_token="cached-token",
+        token_expiry=expiry.isoformat(),
+    )
+
+
+# ---------------------------------------------------------------------------
+# MetadataCache
+# ---------------------------------------------------------------------------
+
+class TestMetadataCache:
+    def test_round_trip(self, tmp_path):
+        cache = MetadataCache(tmp_path / "meta.json")
+        cache.save(_meta())
+
+        loaded = cache.load(SHEET_ID, INPUT_TAB, STATUS_TAB)
+
+        assert loaded is not None
+        assert loaded.headers_status == STATUS_HEADERS
+        assert loaded.status_properties["sheetId"] == 111
+        assert loaded.headers_hash == headers_hash(INPUT_HEADERS) + headers_hash(STATUS_HEADERS)
+
+    def test_missing_file_returns_none(self, tmp_path):
+        assert MetadataCache(tmp_path / "nope.json").load(SHEET_ID, INPUT_TAB, STATUS_TAB) is None
+
+    def test_other_tabs_not_returned(self, tmp_path):
+        cache = MetadataCache(tmp_path / "meta.json")
+        cache.save(_meta())
+        assert cache.load(SHEET_ID, INPUT_TAB, "other_status") is None
+
+    def test_tampered_headers_fail_hash_check(self, tmp_path):
+        path = tmp_path / "meta.json"
+        cache = MetadataCache(path)
+        cache.save(_meta())
+        data = json.loads(path.read_text(encoding="utf-8"))
+        entry = next(iter(data["entries"].values()))
+        entry["headers_status"] = ["Lead", "Email"]
+        path.write_text(json.dumps(data), encoding="utf-8")
+
+        assert cache.load(SHEET_ID, INPUT_TAB, STATUS_TAB) is None
+
+    def test_corrupt_file_ignored(self, tmp_path):
+        path = tmp_path / "meta.json"
+        path.write_text("{not json", encoding="utf-8")
+        assert MetadataCache(path).load(SHEET_ID, INPUT_TAB, STATUS_TAB) is None
+
+    def test_invalidate_drops_entry(self, tmp_path):
+        cache = MetadataCache(tmp_path / "meta.json")
+        cache.save(_meta())
+        cache.invalidate(SHEET_ID, INPUT_TAB, STATUS_TAB)
+        assert cache.load(SHEET_ID, INPUT_TAB, STATUS_TAB) is None
+
+    def test_concurrent_saves_keep_every_sheet(self, tmp_path):
+        from dataclasses import replace
+        from threading import Thread
+
+        cache = MetadataCache(tmp_path / "meta.json")
+        threads = [Thread(target=cache.save, args=(replace(_meta(), sheet_id=f"sheet-{i}"),)) for i in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        assert all(cache.load(f"sheet-{i}", INPUT_TAB, STATUS_TAB) is not None for i in range(8))
+
+    def test_token_usable_until_margin(self):
+        now = datetime(2025, 3, 10, 12, 0)
+        assert _meta(token_expiry=now + timedelta(minutes=30)).token_usable(now) is True
+        assert _meta(token_expiry=now + timedelta(minutes=2)).token_usable(now) is False
+
+
+# ---------------------------------------------------------------------------
+# SheetsClient with a cache
+# ---------------------------------------------------------------------------
+
+def _fake_gc():
+    """gspread Client stand-in whose HTTP client passes gspread's isinstance check."""
+    gc = MagicMock()
+    gc.http_client = MagicMock(spec=gspread.HTTPClient)
+    gc.http_client.auth = MagicMock(token=None, expiry=None)
+    return gc
+
+
+def _live_worksheet(headers, records, sheet_id):
+    ws = MagicMock()
+    ws.row_values.return_value = headers
+    ws.get_all_records.return_value = records
+    ws._properties = {"sheetId": sheet_id, "title": "t", "index": 0}
+    return ws
+
+
+def _build_client(gc, cache):
+    with patch("google.oauth2.service_account.Credentials.from_service_account_file"), \
+         patch("gspread.authorize", return_value=gc):
+        return SheetsClient(
+            "sa.json", SHEET_ID,
+            input_tab=INPUT_TAB, status_tab=STATUS_TAB, metadata_cache=cache,
+        )
+
+
+class TestSheetsClientCache:
+    def test_cache_hit_makes_no_api_calls(self, tmp_path):
+        cache = MetadataCache(tmp_path / "meta.json")
+        cache.save(_meta())
+        gc = _fake_gc()
+
+        client = _build_client(gc, cache)
+
+        gc.open_by_key.assert_not_called()
+        assert gc.http_client.mock_calls == []
+        gc.http_client.auth.refresh.assert_not_called()
+        assert gc.http_client.auth.token == "cached-token"
+        assert client._ws_status.id == 111
+
+    def test_cache_miss_loads_from_api_and_saves(self, tmp_path):
+        cache = MetadataCache(tmp_path / "meta.json")
+        gc = _fake_gc()
+        spreadsheet = gc.open_by_key.return_value
+        spreadsheet.title = "Leads"
+        spreadsheet.worksheet.side_effect = [
+            _live_worksheet(INPUT_HEADERS, [], 0),
+            _live_worksheet(STATUS_HEADERS, [], 111),
+        ]
+        gc.http_client.auth.token = "fresh-token"
+        gc.http_client.auth.expiry = datetime.utcnow() + timedelta(minutes=59)
+
+        _build_client(gc, cache)
+
+        gc.open_by_key.assert_called_once_with(SHEET_ID)
+        saved = cache.load(SHEET_ID, INPUT_TAB, STATUS_TAB)
+        assert saved is not None
+        assert saved.access_token == "fresh-token"
+        assert saved.headers_status == STATUS_HEADERS
+
+    def test_expired_token_refreshed_once_and_persisted(self, tmp_path):
+        cache = MetadataCache(tmp_path / "meta.json")
+        cache.save(_meta(token_expiry=datetime.utcnow() - timedelta(minutes=1)))
+        gc = _fake_gc()
+
+        def _refresh(_request):
+            gc.http_client.auth.token = "new-token"
+            gc.http_client.auth.expiry = datetime.utcnow() + timedelta(minutes=60)
+
+        gc.http_client.auth.refresh.side_effect = _refresh
+
+        with patch("google.auth.transport.requests.Request"):
+            _build_client(gc, cache)
+
+        gc.http_client.auth.refresh.assert_called_once()
+        gc.open_by_key.assert_not_called()
+        assert cache.load(SHEET_ID, INPUT_TAB, STATUS_TAB).access_token == "new-token"
+
+    def test_stale_headers_reload_and_retry_once(self, tmp_path):
+        """Cached headers lack a column the sheet now has → reload metadata, read again."""
+        cache = MetadataCache(tmp_path / "meta.json")
+        cache.save(_meta())
+        gc = _fake_gc()
+        client = _build_client(gc, cache)
+
+        live_headers = ["Notatka"] + STATUS_HEADERS  # user inserted a column at A
+        row = {h: "" for h in live_headers}
+        row["Email"] = "lead@example.com"
+        stale_ws = MagicMock()
+        stale_ws.get_all_records.return_value = [row]
+        client._ws_status = stale_ws
+
+        spreadsheet = gc.open_by_key.return_value
+        spreadsheet.title = "Leads"
+        spreadsheet.worksheet.side_effect = [
+            _live_worksheet(INPUT_HEADERS, [], 0),
+            _live_worksheet(live_headers, [row], 111),
+        ]
+
+        rows = client.read_status_rows()
+
+        gc.open_by_key.assert_called_once_with(SHEET_ID)
+        assert rows[0]["Email"] == "lead@example.com"
+        assert client._col_index("Email wysłany") == STATUS_HEADERS.index("Email wysłany") + 2
+        assert cache.load(SHEET_ID, INPUT_TAB, STATUS_TAB).headers_status == live_headers
+
+    def test_quota_error_does_not_trigger_reload(self, tmp_path):
+        cache = MetadataCache(tmp_path / "meta.json")
+        cache.save(_meta())
+        gc = _fake_gc()
+        client = _build_client(gc, cache)
+
+        response = MagicMock(status_code=500)
+        response.json.return_value = {"error": {"code": 500, "message": "boom", "status": "INTERNAL"}}
+        failing_ws = MagicMock()
+        failing_ws.get_all_records.side_effect = gspread.exceptions.APIError(response)
+        client._ws_status = failing_ws
+
+        with pytest.raises(gspread.exceptions.APIError):
+            client.read_status_rows()
+        gc.open_by_key.assert_not_called()
@@ -0,0 +1,99 @@
+"""Tests for the typed date path — src.storage.serial_dates + SheetsClient(serial_dates=True)."""
+
+from __future__ import annotations
+
+import pytest
+
+from benchmarks.sheets_emulator import SheetsEmulator
+from src.storage.serial_dates import decode_records, serial_to_text, text_to_serial
+from src.storage.sheets import INPUT_HEADERS, STATUS_HEADERS, SheetsClient
+
+# 2025-03-09 10:00 — what Sheets stores for that date-time.
+SENT_SERIAL = 45725 + 10 / 24
+
+
+@pytest.fixture
+def emulator():
+    with SheetsEmulator() as emu:
+        emu.add_spreadsheet("sheet", {
+            "input": [list(INPUT_HEADERS), ["Anna", "anna@example.com", ""]],
+            "status": [
+                list(STATUS_HEADERS),
+                ["Anna", "anna@example.com", SENT_SERIAL, "SENT", SENT_SERIAL + 3, "NO", ""],
+                ["Ewa", "ewa@example.com", "2025-03-01 08:00", "SENT", "", "", ""],
+            ],
+        })
+        yield emu
+
+
+def _client(emu: SheetsEmulator) -> SheetsClient:
+    return SheetsClient(
+        "", "sheet", input_tab="input", status_tab="status",
+        gspread_client=emu.gspread_client(), serial_dates=True,
+    )
+
+
+class TestConversion:
+    @pytest.mark.parametrize("text", ["2025-03-09 10:00", "1899-12-30 00:00", "2024-02-29 23:59", "2025-12-31 00:01"])
+    def test_round_trip(self, text):
+        assert serial_to_text(text_to_serial(text)) == text
+
+    def test_known_serials(self):
+        assert text_to_serial("2025-03-09 10:00") == SENT_SERIAL
+        assert serial_to_text(45725) == "2025-03-09 00:00"
+        assert serial_to_text(SENT_SERIAL + 1e-9) == "2025-03-09 10:00"
+
+    @pytest.mark.parametrize("value", ["", "  ", "SENT", "2025-02-30 10:00", "ERROR: 421", None, 3])
+    def test_non_dates_pass_through(self, value):
+        assert text_to_serial(value) == value
+
+    def test_decode_records_only_touches_numbers_in_date_columns(self):
+        records = [
+            {"Lead": 7, "Email wysłany": SENT_SERIAL, "Follow-up od": "legacy text", "Follow-up wykonany": ""},
+            {"Lead": "x", "Email wysłany": SENT_SERIAL, "Follow-up od": "", "Follow-up wykonany": 45726},
+        ]
+
+        decode_records(records)
+
+        assert records == [
+            {"Lead": 7, "Email wysłany": "2025-03-09 10:00", "Follow-up od": "legacy text", "Follow-up wykonany": ""},
+            {"Lead": "x", "Email wysłany": "2025-03-09 10:00", "Follow-up od": "", "Follow-up wykonany": "2025-03-10 00:00"},
+        ]
+
+
+class TestSheetsClient:
+    def test_reads_serials_as_canonical_strings(self, emulator):
+        rows = _client(emulator).read_status_rows()
+
+        assert rows[0]["Email wysłany"] == "2025-03-09 10:00"
+        assert rows[0]["Follow-up od"] == "2025-03-12 10:00"
+        assert rows[1]["Email wysłany"] == "2025-03-01 08:00"  # legacy text cell
+
+    def test_writes_serials_raw(self, emulator):
+        sheets = _client(emulator)
+
+        sheets.update_row(3, {"Follow-up od": "2025-03-04 08:00", "Wymaga follow-upu": "YES"})
+        sheets.append_status_rows([["Jan", "jan@example.com", "2025-03-09 10:00", "SENT", "", "", ""]])
+
+        values = emulator.values("sheet", "status")
+        assert values[2][4] == text_to_serial("2025-03-04 08:00")
+        assert values[2][5] == "YES"
+        assert values[3][2] == SENT_SERIAL
+        assert sheets.read_status_rows()[2]["Email wysłany"] == "2025-03-09 10:00"
+
+    def test_status_column_and_tab_values(self, emulator):
+        sheets = _client(emulator)
+
+        assert sheets.read_status_column("Email wysłany") == ["2025-03-09 10:00", "2025-03-01 08:00"]
+        rows = sheets.read_tab_values("status")
+        sheets.write_tab_values("status", rows)
+
+        assert emulator.values("sheet", "status")[2][2] == text_to_serial("2025-03-01 08:00")
+        assert sheets.read_tab_values("status") == rows
+
+    def test_default_is_unchanged(self, emulator):
+        sheets = SheetsClient("", "sheet", input_tab="input", status_tab="status", gspread_client=emulator.gspread_client())
+
+        sheets.update_row(3, {"Follow-up od": "2025-03-04 08:00"})
+
+        assert emulator.values("sheet", "status")[2][4] == "2025-03-04 08:00"
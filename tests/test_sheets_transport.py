@@ -0,0 +1,86 @@
+"""Tests for the Sheets HTTP transport — src.storage.transport + SheetsClient.transport_stats()."""
+
+from __future__ import annotations
+
+from unittest.mock import MagicMock
+
+import pytest
+
+from benchmarks.sheets_emulator import SheetsEmulator
+from src.stage0.metrics import RunMetrics
+from src.stage0.process import ProcessReport
+from src.storage import transport
+from src.storage.local import LocalSheetsClient
+from src.storage.sheets import INPUT_HEADERS, STATUS_HEADERS, SheetsClient
+
+INPUT = [[f"Lead {i}", f"lead{i:03d}@example.com", ""] for i in range(200)]
+
+
+@pytest.fixture
+def emulator():
+    with SheetsEmulator() as emu:
+        emu.add_spreadsheet("sheet", {
+            "input": [list(INPUT_HEADERS), *INPUT],
+            "status": [list(STATUS_HEADERS)],
+        })
+        yield emu
+
+
+def _client(emu: SheetsEmulator, **kwargs) -> SheetsClient:
+    return SheetsClient("", "sheet", input_tab="input", status_tab="status", gspread_client=emu.gspread_client(), **kwargs)
+
+
+def test_responses_are_gzipped_and_counted(emulator):
+    sheets = _client(emulator)
+    sheets.ensure_status_rows_exist()
+    sheets.read_status_rows()
+
+    stats = sheets.transport_stats()
+    assert stats["requests"] == emulator.stats()["requests_total"]
+    assert stats["gzip_responses"] == stats["requests"]
+    assert stats["response_bytes"] == emulator.stats()["bytes_out"]
+
+
+def test_one_kept_alive_connection_serves_every_request(emulator):
+    sheets = _client(emulator)
+    for _ in range(3):
+        sheets.read_input_rows()
+
+    stats = sheets.transport_stats()
+    assert stats["connections_opened"] == 1
+    assert stats["connections_reused"] == stats["requests"] - 1
+
+
+def test_metadata_fetches_skip_row_anchors(emulator):
+    sheets = _client(emulator, row_anchors=True)
+    sheets.ensure_status_rows_exist()
+    http_client = sheets._gc.http_client
+
+    full = http_client.fetch_sheet_metadata("sheet", params={"includeGridData": "false"})
+    masked = http_client.fetch_sheet_metadata("sheet")
+
+    status = {s["properties"]["title"]: s for s in full["sheets"]}["status"]
+    assert len(status["developerMetadata"]) == len(INPUT)
+    assert all(set(s) == {"properties"} for s in masked["sheets"])
+    assert masked["properties"] == full["properties"]
+    assert "spreadsheetUrl" not in masked
+
+
+def test_shared_session_asks_for_gzip():
+    session = transport.build_shared_session(MagicMock(), pool_size=4)
+
+    assert session.headers["Accept-Encoding"] == "gzip"
+    assert "gzip" in session.headers["User-Agent"]
+    assert session.get_adapter("https://sheets.googleapis.com")._pool_maxsize == 4
+
+
+def test_counters_reach_run_metrics(tmp_path):
+    stats = {"requests": 7, "gzip_responses": 7, "response_bytes": 900, "connections_opened": 1, "connections_reused": 6}
+
+    counters = RunMetrics.from_reports(ProcessReport(1, 0, 0, 0), transport=stats).counters
+
+    assert counters["sheets_connections_reused"] == 6
+    assert counters["sheets_response_bytes"] == 900
+    store = LocalSheetsClient(tmp_path / "leads.sqlite3")
+    assert store.transport_stats() == {}
+    store.close()
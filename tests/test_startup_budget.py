@@ -0,0 +1,98 @@
+"""Startup budget for the scheduler entrypoint — no network, no credentials.
+
+Guards the lazy-import structure of src.stage0.job: importing it must not
+load gspread / google-auth / dotenv / the SMTP + MIME stack, and its
+cumulative import time must stay under the startup budget.
+"""
+
+from __future__ import annotations
+
+import importlib
+import sys
+
+import pytest
+
+from benchmarks.startup import (
+    HEAVY_MODULES,
+    StartupProfile,
+    _parse_importtime,
+    budget_ms,
+    check_budget,
+    measure_startup,
+)
+
+_SAMPLE_IMPORTTIME = """\
+import time: self [us] | cumulative | imported package
+import time:       120 |        120 |   src.core
+import time:      4000 |     127405 |   gspread
+import time:       129 |      14480 | src.stage0.job
+"""
+
+
+class TestParseImporttime:
+    def test_cumulative_times_in_ms(self):
+        parsed = _parse_importtime(_SAMPLE_IMPORTTIME)
+        assert parsed["src.stage0.job"] == pytest.approx(14.48)
+        assert parsed["gspread"] == pytest.approx(127.405)
+
+    def test_header_line_ignored(self):
+        parsed = _parse_importtime(_SAMPLE_IMPORTTIME)
+        assert "imported package" not in parsed
+
+
+class TestCheckBudget:
+    def test_within_budget_no_problems(self):
+        profile = StartupProfile("src.stage0.job", 10.0, 50.0, {"src.stage0.job": 10.0})
+        assert check_budget(profile, 60.0) == []
+
+    def test_over_budget_reported(self):
+        profile = StartupProfile("src.stage0.job", 90.0, 150.0, {"src.stage0.job": 90.0})
+        problems = check_budget(profile, 60.0)
+        assert len(problems) == 1
+        assert "budget" in problems[0]
+
+    def test_heavy_module_reported(self):
+        profile = StartupProfile(
+            "src.stage0.job", 10.0, 50.0,
+            {"src.stage0.job": 10.0, "gspread.auth": 5.0, "email.mime.text": 1.0},
+        )
+        assert profile.heavy_imports() == ["email.mime.text", "gspread.auth"]
+        assert any("heavy modules" in p for p in check_budget(profile, 60.0))
+
+
+class TestLazyConfig:
+    def test_config_import_reads_no_env(self, monkeypatch):
+        """Importing config must not validate anything (no env vars set)."""
+        import src.core
+
+        monkeypatch.delenv("GOOGLE_SHEET_ID", raising=False)
+        # Fresh module object; monkeypatch restores the original afterwards so
+        # other tests keep patching the instance that job.py sees.
+        monkeypatch.delitem(sys.modules, "src.core.config", raising=False)
+        monkeypatch.delattr(src.core, "config", raising=False)
+
+        cfg = importlib.import_module("src.core.config")
+
+        assert "GOOGLE_SHEET_ID" not in vars(cfg)
+        with pytest.raises(RuntimeError, match="GOOGLE_SHEET_ID"):
+            cfg.GOOGLE_SHEET_ID
+
+
+class TestEntrypointStartup:
+    """Runs a real cold interpreter — the actual regression gate."""
+
+    def test_no_heavy_modules_on_import(self):
+        profile = measure_startup()
+        assert profile.heavy_imports() == [], (
+            f"Startup pulled in heavy modules: {profile.heavy_imports()} "
+            f"(lazy-import them inside the step that uses them; see {HEAVY_MODULES})"
+        )
+
+    def test_import_time_within_budget(self):
+        limit = budget_ms()
+        # Best of three to absorb one-off disk / scheduler noise.
+        best = min(measure_startup().import_ms for _ in range(3))
+        assert best <= limit, (
+            f"src.stage0.job import took {best:.1f} ms, budget is {limit:.1f} ms "
+            "(run `python -m benchmarks.startup` for the breakdown)"
+        )
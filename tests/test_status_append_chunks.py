@@ -0,0 +1,136 @@
+"""Tests for chunked status appends — SheetsClient.append_status_rows_in_chunks()."""
+
+from __future__ import annotations
+
+import pytest
+import requests
+
+from benchmarks.sheets_emulator import SheetsEmulator
+from src.storage.local import LocalSheetsClient
+from src.storage.sheets import INPUT_HEADERS, STATUS_HEADERS, SheetsClient
+
+INPUT = [[f"Lead {i}", f"lead{i:02d}@example.com", ""] for i in range(25)]
+
+
+@pytest.fixture
+def emulator():
+    with SheetsEmulator() as emu:
+        emu.add_spreadsheet("sheet", {
+            "input": [list(INPUT_HEADERS), *INPUT],
+            "status": [list(STATUS_HEADERS), ["Old", "old@example.com", "", "", "", "", ""]],
+        })
+        yield emu
+
+
+def _client(emu: SheetsEmulator, chunk_rows: int = 10) -> SheetsClient:
+    return SheetsClient(
+        "", "sheet", input_tab="input", status_tab="status",
+        gspread_client=emu.gspread_client(), append_chunk_rows=chunk_rows,
+    )
+
+
+def _status_emails(emu: SheetsEmulator) -> list[str]:
+    return [row[1] for row in emu.values("sheet", "status")[1:]]
+
+
+def _assert_rows_match(emu: SheetsEmulator, appended: dict[str, int]) -> None:
+    emails = _status_emails(emu)
+    assert {email: emails.index(email) + 2 for email in appended} == appended
+
+
+def test_appends_in_chunks_and_maps_rows(emulator):
+    appended = _client(emulator).ensure_status_rows_exist()
+
+    assert emulator.stats()["requests"]["values.append"] == 3
+    assert len(appended) == 25 and appended["lead00@example.com"] == 3
+    _assert_rows_match(emulator, appended)
+
+
+def test_oversized_chunks_are_halved(emulator, monkeypatch):
+    sheets = _client(emulator)
+    original = sheets.append_status_rows
+    sizes = []
+
+    def append(rows):
+        sizes.append(len(rows))
+        if len(rows) > 4:
+            raise requests.exceptions.ReadTimeout("payload too slow")
+        return original(rows)
+
+    monkeypatch.setattr(sheets, "append_status_rows", append)
+
+    appended = sheets.ensure_status_rows_exist()
+
+    assert sizes[:3] == [10, 5, 2]
+    assert set(sizes[3:]) <= {2, 1}
+    assert _status_emails(emulator)[1:] == [row[1] for row in INPUT]
+    _assert_rows_match(emulator, appended)
+
+
+def test_lost_response_is_not_appended_twice(emulator, monkeypatch):
+    sheets = _client(emulator)
+    original = sheets.append_status_rows
+    calls = []
+
+    def append(rows):
+        first = original(rows)
+        calls.append(len(rows))
+        if len(calls) == 2:
+            raise requests.exceptions.ConnectionError("connection reset")
+        return first
+
+    monkeypatch.setattr(sheets, "append_status_rows", append)
+
+    appended = sheets.ensure_status_rows_exist()
+
+    assert calls == [10, 10, 5]
+    assert len(_status_emails(emulator)) == 26
+    _assert_rows_match(emulator, appended)
+
+
+def test_failed_pass_resumes_from_committed_chunks(emulator, monkeypatch):
+    sheets = _client(emulator)
+    original = sheets.append_status_rows
+    calls = []
+
+    def append(rows):
+        calls.append(len(rows))
+        if len(calls) > 1:
+            raise requests.exceptions.ConnectionError("down")
+        return original(rows)
+
+    monkeypatch.setattr(sheets, "append_status_rows", append)
+    with pytest.raises(requests.exceptions.ConnectionError):
+        sheets.ensure_status_rows_exist()
+    assert calls == [10, 10, 5, 2, 1]
+    assert len(_status_emails(emulator)) == 11
+
+    appended = _client(emulator).ensure_status_rows_exist()
+
+    assert len(appended) == 15
+    assert _status_emails(emulator)[1:] == [row[1] for row in INPUT]
+
+
+def test_other_errors_propagate_at_once(emulator, monkeypatch):
+    sheets = _client(emulator)
+    calls = []
+
+    def append(rows):
+        calls.append(len(rows))
+        raise ValueError("bad row")
+
+    monkeypatch.setattr(sheets, "append_status_rows", append)
+
+    with pytest.raises(ValueError):
+        sheets.ensure_status_rows_exist()
+    assert calls == [10]
+
+
+def test_local_store_appends_in_one_transaction(tmp_path):
+    store = LocalSheetsClient(tmp_path / "leads.sqlite3")
+    store.append_input_rows(INPUT)
+
+    appended = store.ensure_status_rows_exist()
+
+    assert appended["lead24@example.com"] == 26
+    store.close()
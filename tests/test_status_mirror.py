@@ -0,0 +1,181 @@
+"""Tests for the status tab mirror — src.storage.status_mirror + SheetsClient(status_mirror=...)."""
+
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from benchmarks.sheets_emulator import SheetsEmulator
+from src.stage0.followup import WARSAW_TZ
+from src.stage0.process import run_followups
+from src.storage import status_mirror
+from src.storage.sheets import INPUT_HEADERS, STATUS_HEADERS, SheetsClient
+from src.storage.status_mirror import StatusMirror, block_hashes, changed_blocks
+
+NOW = datetime(2025, 3, 14, 10, 0, tzinfo=WARSAW_TZ)
+STATUS = [
+    [f"Lead {i}", f"lead{i:03d}@example.com", "2025-03-01 09:00", "SENT", "2025-03-04 09:00", "YES", ""]
+    for i in range(450)
+]
+
+
+@pytest.fixture
+def emulator():
+    with SheetsEmulator() as emu:
+        emu.add_spreadsheet("sheet", {
+            "input": [list(INPUT_HEADERS)],
+            "status": [list(STATUS_HEADERS), *STATUS],
+        })
+        yield emu
+
+
+@pytest.fixture
+def mirror(tmp_path):
+    return StatusMirror(tmp_path / "status_mirror.sqlite3", block_rows=100)
+
+
+def _client(emu: SheetsEmulator, mirror: StatusMirror | None = None) -> SheetsClient:
+    return SheetsClient(
+        "", "sheet", input_tab="input", status_tab="status",
+        gspread_client=emu.gspread_client(), status_mirror=mirror,
+    )
+
+
+def _hand_edit(emu: SheetsEmulator, row_number: int, col: int, value: str) -> None:
+    emu._books["sheet"].tabs["status"].write(row_number, col, [[value]])
+
+
+def _read(emu: SheetsEmulator, sheets: SheetsClient) -> tuple[list[dict[str, str]], dict[str, int]]:
+    emu.reset_stats()
+    rows = sheets.read_status_rows()
+    return rows, emu.stats()["requests"]
+
+
+def test_first_read_is_full_then_probe_only(emulator, mirror):
+    sheets = _client(emulator, mirror)
+
+    first, full_calls = _read(emulator, sheets)
+    full_bytes = emulator.stats()["bytes_out"]
+    second, probe_calls = _read(emulator, sheets)
+    probe_bytes = emulator.stats()["bytes_out"]
+
+    assert first == second == _client(emulator).read_status_rows()
+    assert full_calls == {"values.get": 1}
+    assert probe_calls == {"values.batchGet": 1}
+    assert probe_bytes < full_bytes
+
+
+def test_hand_edit_refetches_one_block(emulator, mirror):
+    sheets = _client(emulator, mirror)
+    sheets.read_status_rows()
+    _hand_edit(emulator, 250, STATUS_HEADERS.index("Follow-up wykonany") + 1, "2025-03-05 12:00")
+
+    rows, calls = _read(emulator, sheets)
+
+    assert calls == {"values.batchGet": 2}
+    assert rows[248]["Follow-up wykonany"] == "2025-03-05 12:00"
+    assert rows == _client(emulator).read_status_rows()
+
+
+def test_own_writes_are_refetched(emulator, mirror):
+    sheets = _client(emulator, mirror)
+    sheets.read_status_rows()
+
+    sheets.update_row(10, {"Status emaila": "ERROR: 550"})
+    sheets.update_rows({400: {"Email wysłany": "2025-03-09 10:00"}})
+    rows, _ = _read(emulator, sheets)
+
+    assert (rows[8]["Status emaila"], rows[398]["Email wysłany"]) == ("ERROR: 550", "2025-03-09 10:00")
+    assert mirror.load(mirror.key("sheet", "status")).hashes.count("") == 0
+
+
+def test_send_outcome_written_by_another_client_is_probed(emulator, mirror):
+    sheets = _client(emulator, mirror)
+    sheets.read_status_rows()
+
+    _client(emulator).update_row(10, {"Status emaila": "ERROR: 550", "Email wysłany": ""})
+    rows, calls = _read(emulator, sheets)
+
+    assert calls == {"values.batchGet": 2}
+    assert (rows[8]["Status emaila"], rows[8]["Email wysłany"]) == ("ERROR: 550", "")
+
+
+def test_write_during_a_read_is_not_masked(emulator, mirror):
+    sheets = _client(emulator, mirror)
+    sheets.read_status_rows()
+    key = mirror.key("sheet", "status")
+    snapshot = mirror.load(key)
+
+    mirror.invalidate(key, [150])  # a write lands after load(), before save()
+    mirror.save(key, headers=snapshot.headers, rows=snapshot.rows, hashes=snapshot.hashes,
+                blocks=[0, 1], generation=snapshot.generation)
+
+    assert mirror.load(key).hashes[:2] == ["", ""]
+    assert mirror.load(key).generation == snapshot.generation + 1
+
+
+def test_appended_and_deleted_rows(emulator, mirror):
+    sheets = _client(emulator, mirror)
+    sheets.read_status_rows()
+    sheets.append_status_rows([["New", "new@example.com", "", "", "", "", ""]])
+    sheets._spreadsheet.batch_update({"requests": [{"deleteDimension": {"range": {
+        "sheetId": sheets._ws_status.id, "dimension": "ROWS", "startIndex": 5, "endIndex": 7,
+    }}}]})
+
+    rows, _ = _read(emulator, sheets)
+
+    assert len(rows) == 449
+    assert rows == _client(emulator).read_status_rows()
+
+
+def test_header_change_or_age_forces_a_full_read(emulator, mirror, monkeypatch):
+    sheets = _client(emulator, mirror)
+    sheets.read_status_rows()
+    _hand_edit(emulator, 1, len(STATUS_HEADERS) + 1, "Notatki")
+
+    assert _read(emulator, sheets)[1] == {"values.batchGet": 1, "values.get": 1}
+    assert _read(emulator, sheets)[1] == {"values.batchGet": 1}
+
+    monkeypatch.setattr(status_mirror, "FULL_SYNC_AFTER", timedelta(0))
+    assert _read(emulator, sheets)[1] == {"values.get": 1}
+
+
+def test_followup_pass_runs_on_the_mirror(emulator, mirror):
+    _hand_edit(emulator, 3, STATUS_HEADERS.index("Follow-up wykonany") + 1, "2025-03-05 12:00")
+    sheets = _client(emulator, mirror)
+    sheets.read_status_rows()
+
+    assert run_followups(sheets, now=NOW).rows_updated == 1
+    assert sheets.read_status_rows()[1]["Wymaga follow-upu"] == "NO"
+
+
+def test_block_hashes():
+    assert block_hashes([["a", "b", "c"], ["x"]], 3, block_rows=2) == block_hashes([["a", "b", "c"], ["x", ""]], 3, block_rows=2)
+    assert len(block_hashes([["a"] * 5], 5, block_rows=2)) == 3
+    assert changed_blocks(["h1", "", "h3"], ["h1", "h2", "h3", "h4"]) == [1, 3]
+
+
+def test_version_1_file_is_rebuilt(tmp_path):
+    import sqlite3
+
+    path = tmp_path / "old.sqlite3"
+    with sqlite3.connect(path) as conn:
+        conn.execute("CREATE TABLE tabs (key TEXT PRIMARY KEY, version INTEGER, block_rows INTEGER,"
+                     " headers TEXT, row_count INTEGER, full_sync_at TEXT)")
+        conn.execute("INSERT INTO tabs VALUES ('sheet|status', 1, 200, '[]', 0, '2025-03-14T10:00:00+00:00')")
+    conn.close()
+    mirror = StatusMirror(path)
+
+    assert mirror.load("sheet|status") is None
+    mirror.save("sheet|status", headers=["Email"], rows=[["a@example.com"]], hashes=["h"],
+                full_sync_at=datetime.now(timezone.utc), generation=mirror.generation("sheet|status"))
+    assert mirror.load("sheet|status").rows == [["a@example.com"]]
+
+
+def test_unreadable_mirror_means_full_read(tmp_path):
+    path = tmp_path / "broken.sqlite3"
+    path.write_bytes(b"not a database")
+
+    assert StatusMirror(path).load("sheet|status") is None
+    StatusMirror(path).save("sheet|status", headers=[], rows=[], hashes=[], full_sync_at=datetime.now(timezone.utc))
@@ -0,0 +1,161 @@
+"""Tests for src.core.tracing — spans, PII scrubbing, Chrome trace export."""
+
+from __future__ import annotations
+
+import json
+import time
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from src.core import tracing
+from src.stage0.process import process_new_leads
+
+CALENDAR_URL = "https://calendly.com/flexihome/konsultacja"
+FAKE_SMTP = dict(
+    smtp_host="smtp.example.com",
+    smtp_port=587,
+    smtp_user="user",
+    smtp_password="pass",
+    smtp_from_email="sender@example.com",
+)
+
+
+@pytest.fixture(autouse=True)
+def _tracing_off():
+    tracing.disable()
+    yield
+    tracing.disable()
+
+
+def _spans(tracer):
+    return [e for e in tracer.events() if e["ph"] == "X"]
+
+
+class TestDisabled:
+    def test_span_is_shared_noop(self):
+        assert tracing.span("a") is tracing.span("b", email="x@example.com")
+        assert not tracing.enabled()
+
+    def test_traced_calls_through(self):
+        fn = tracing.traced("t")(lambda x: x * 2)
+        assert fn(21) == 42
+
+    def test_overhead_is_negligible(self):
+        def plain():
+            return None
+
+        wrapped = tracing.traced("t")(plain)
+        n = 100_000
+        started = time.perf_counter()
+        for _ in range(n):
+            wrapped()
+        per_call = (time.perf_counter() - started) / n
+
+        assert per_call < 5e-6
+
+
+class TestEnabled:
+    def test_span_recorded_with_hashed_email(self):
+        tracer = tracing.enable()
+        with tracing.span("smtp.send", email=" Anna@Example.com ") as sp:
+            sp.set(attempt=1)
+
+        (event,) = _spans(tracer)
+        assert event["name"] == "smtp.send"
+        assert event["args"] == {"lead": tracing.hash_email("anna@example.com"), "attempt": 1}
+        assert "anna" not in json.dumps(tracer.events()).lower()
+
+    def test_error_recorded_by_type_only(self):
+        tracer = tracing.enable()
+        with pytest.raises(RuntimeError):
+            with tracing.span("x"):
+                raise RuntimeError("rejected anna@example.com")
+
+        assert _spans(tracer)[0]["args"] == {"error": "RuntimeError"}
+
+    def test_traced_nests(self):
+        tracer = tracing.enable()
+
+        @tracing.traced("outer")
+        def outer():
+            with tracing.span("inner"):
+                pass
+
+        outer()
+
+        inner, outer_event = _spans(tracer)
+        assert (inner["name"], outer_event["name"]) == ("inner", "outer")
+        assert outer_event["ts"] <= inner["ts"]
+        assert outer_event["dur"] >= inner["dur"]
+
+
+class TestSession:
+    def test_writes_chrome_trace(self, tmp_path):
+        path = tmp_path / "trace-{pid}.json"
+        with tracing.session(str(path)):
+            with tracing.span("work"):
+                pass
+
+        (written,) = tmp_path.glob("trace-*.json")
+        data = json.loads(written.read_text())
+        assert any(e["name"] == "work" and e["ph"] == "X" for e in data["traceEvents"])
+        assert any(e["ph"] == "M" for e in data["traceEvents"])
+        assert not tracing.enabled()
+
+    def test_empty_path_does_nothing(self):
+        with tracing.session("") as tracer:
+            assert tracer is None
+            assert not tracing.enabled()
+
+
+class TestInstrumentation:
+    @patch("src.stage0.process.time.sleep")
+    @patch("src.stage0.process.get_stage0_attachments_from_env", return_value=[Path("a.pdf")])
+    @patch("src.stage0.process.build_stage0_email")
+    @patch("src.stage0.process.send_email_draft")
+    def test_lead_spans_are_pii_free(self, _send, _build, _attach, _sleep):
+        sheets = MagicMock()
+        sheets.get_new_leads.return_value = [{"Email": "anna@example.com", "Imię i nazwisko / Firma": "Anna"}]
+        sheets.read_status_rows.return_value = [{"Email": "anna@example.com", "Email wysłany": "", "Status emaila": ""}]
+
+        tracer = tracing.enable()
+        process_new_leads(sheets, CALENDAR_URL, **FAKE_SMTP)
+
+        (lead,) = [e for e in _spans(tracer) if e["name"] == "stage0.lead"]
+        assert lead["args"]["lead"] == tracing.hash_email("anna@example.com")
+        assert "anna" not in json.dumps(tracer.events()).lower()
+
+    def test_smtp_phases(self):
+        draft = MagicMock(subject="S", body="B", attachments=[])
+        tracer = tracing.enable()
+
+        with patch("smtplib.SMTP"):
+            from src.integrations.email_sender import send_email_draft
+
+            send_email_draft(to_email="anna@example.com", draft=draft, **{
+                "smtp_host": "h", "smtp_port": 587, "smtp_user": "u", "smtp_password": "p", "from_email": "f@example.com",
+            })
+
+        names = [e["name"] for e in _spans(tracer)]
+        assert names == ["smtp.mime", "smtp.connect", "smtp.starttls", "smtp.login", "smtp.send"]
+
+    def test_retry_attempts_are_spans(self):
+        import gspread
+
+        from src.storage.sheets import _with_retry
+
+        response = MagicMock(status_code=429)
+        response.json.return_value = {"error": {"code": 429, "message": "quota", "status": "RESOURCE_EXHAUSTED"}}
+        fn = MagicMock(side_effect=[gspread.exceptions.APIError(response), "ok"])
+        tracer = tracing.enable()
+
+        with patch("src.storage.sheets.time.sleep"):
+            _with_retry(fn, base_delay=1)
+
+        assert [(e["name"], e["args"]) for e in _spans(tracer)] == [
+            ("sheets.attempt", {"attempt": 1, "error": "APIError"}),
+            ("sheets.backoff", {"seconds": 1}),
+            ("sheets.attempt", {"attempt": 2}),
+        ]